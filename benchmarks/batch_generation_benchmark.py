@@ -0,0 +1,144 @@
+""" Benchmark of creating trades and prices a record at a time versus a
+column at a time.
+
+The per-record factories below reproduce TradeFactory and PriceFactory as
+they were prior to the batch creation methods of Creatable: every attribute
+of every record is created by a separate call through the 'random' module.
+The batch factories are the current TradeFactory and PriceFactory, which
+create each attribute for every record of a job at once using NumPy.
+
+Creates a new dependencies.db in the working directory holding the
+instruments and accounts that trades and prices select from, which is
+deleted afterwards. Run from the top-level directory of the repository:
+    python benchmarks/batch_generation_benchmark.py
+"""
+
+import os
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database
+from domainobjectfactories.account_factory import AccountFactory
+from domainobjectfactories.creatable import Creatable
+from domainobjectfactories.instrument_factory import InstrumentFactory
+from domainobjectfactories.price_factory import PriceFactory
+from domainobjectfactories.trade_factory import TradeFactory
+
+
+class PerRecordTradeFactory(Creatable):
+    """ TradeFactory creating one record at a time """
+
+    def create(self, record_count, start_id):
+        return [self.create_record(i)
+                for i in range(start_id, start_id + record_count)]
+
+    def create_record(self, id):
+        booking_datetime = trade_datetime = datetime.now(timezone.utc)
+        value_datetime = (
+            datetime.now(timezone.utc) + timedelta(days=2)
+        ).replace(hour=0, minute=1, second=0, microsecond=0)
+        instrument = self.get_random_instrument()
+        quantity = self.create_random_integer()
+        record = {
+            'trade_id': id,
+            'contract_id': self.create_random_string(10),
+            'booking_datetime': booking_datetime,
+            'trade_datetime': trade_datetime,
+            'value_datetime': value_datetime,
+            'order_id': self.create_random_integer(),
+            'account_id': self.get_random_record_with_valid_attribute(
+                'accounts', 'account_type', ['Client', 'Firm']
+            )['account_id'],
+            'counterparty_id': self.get_random_record_with_valid_attribute(
+                'accounts', 'account_type', ['Counterparty']
+            )['account_id'],
+            'trader_id': self.create_random_string(10),
+            'price': round(
+                self.create_random_decimal(min=1, max=10) * quantity, 2
+            ),
+            'currency': self.create_currency(),
+            'isin': instrument['isin'],
+            'market': instrument['market'],
+            'trade_leg': random.choice(TradeFactory.TRADE_LEGS),
+            'is_otc': self.create_random_boolean(),
+            'direction': random.choice(TradeFactory.DIRECTIONS),
+            'quantity': quantity,
+            'created_timestamp': datetime.now(timezone.utc)
+        }
+        for key, value in self.create_dummy_field_generator():
+            record[key] = value
+        return record
+
+
+class PerRecordPriceFactory(Creatable):
+    """ PriceFactory creating one record at a time """
+
+    def create(self, record_count, start_id):
+        records = []
+        for _ in range(record_count):
+            instrument = self.get_random_instrument()
+            record = {
+                'instrument_id': instrument['instrument_id'],
+                'price': self.create_random_decimal(min=1, max=10, dp=2),
+                'currency': self.create_currency(),
+                'created_timestamp': datetime.now(timezone.utc),
+                'last_updated_time_stamp': datetime.now(timezone.utc)
+            }
+            for key, value in self.create_dummy_field_generator():
+                record[key] = value
+            records.append(record)
+        return records
+
+
+def get_factory_config(item_name):
+    """ Return the factory config of a domain object without dummy fields """
+    return {'file_type_args': {'xml_item_name': item_name},
+            'dummy_fields': []}
+
+
+def main():
+    parser = ArgumentParser(description='Batch generation benchmark')
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--records_per_job', type=int, default=5000)
+    args = parser.parse_args()
+
+    if os.path.exists('dependencies.db'):
+        sys.exit('dependencies.db already exists, remove it first')
+
+    Sqlite_Database().close_connection()
+    try:
+        InstrumentFactory(get_factory_config('instrument'), {}).create(1000, 0)
+        AccountFactory(get_factory_config('account'), {}).create(1000, 0)
+
+        benchmarks = (
+            ('trade', PerRecordTradeFactory, TradeFactory),
+            ('price', PerRecordPriceFactory, PriceFactory)
+        )
+
+        for item_name, per_record_class, batch_class in benchmarks:
+            for name, factory_class in (('per record', per_record_class),
+                                        ('batch', batch_class)):
+                factory = factory_class(get_factory_config(item_name), {})
+                # load the dependency cache outside of the timed section
+                factory.create(1, 0)
+
+                start = time.perf_counter()
+                for start_id in range(0, args.records, args.records_per_job):
+                    factory.create(args.records_per_job, start_id)
+                elapsed = time.perf_counter() - start
+
+                print(f'{item_name:>5} {name:>10}: {elapsed:.3f}s, '
+                      f'{args.records / elapsed:,.0f} records/s')
+    finally:
+        for file_name in ('dependencies.db', 'dependencies.db-wal',
+                          'dependencies.db-shm'):
+            if os.path.exists(file_name):
+                os.unlink(file_name)
+
+
+if __name__ == '__main__':
+    main()
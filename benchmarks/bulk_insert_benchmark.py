@@ -0,0 +1,98 @@
+""" Benchmark of inserting instrument rows into the dependency database from
+concurrent writers.
+
+Each of a number of writer processes inserts its share of the rows in
+batches, as create child processes do for every create job, using either:
+    * a single 'INSERT ... VALUES (...),(...)' statement built by joining
+      quoted values (the behaviour prior to parameterized inserts), or
+    * Sqlite_Database.persist_batch, which runs a parameterized query over
+      chunks of rows, each in its own transaction.
+
+Creates a new dependencies.db in the working directory for each method, which
+is deleted afterwards. Run from the top-level directory of the repository:
+    python benchmarks/bulk_insert_benchmark.py --rows 10000000
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from multiprocessing import Pool
+
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database, INSERT_CHUNK_SIZE
+
+
+def get_instrument_rows(start, count):
+    """ Return instrument rows in the format persisted by InstrumentFactory """
+    return [[str(i), f'RIC{i}.L', f'{i:09d}', f'GB{i:010d}', 'LN']
+            for i in range(start, start + count)]
+
+
+def formatted_insert(database, table_name, value_lists):
+    """ Insert rows with one statement of quoted values, then commit """
+    formatted_lists = ["('" + "','".join(values) + "')"
+                       for values in value_lists]
+    query = " ".join(("INSERT INTO", table_name, "VALUES",
+                      ",".join(formatted_lists)))
+    database.get_connection().execute(query)
+    database.commit_changes()
+
+
+def parameterized_insert(database, table_name, value_lists, chunk_size):
+    """ Insert rows with Sqlite_Database.persist_batch, then commit """
+    database.persist_batch(table_name, value_lists, chunk_size)
+    database.commit_changes()
+
+
+def run_writer(method, start, count, batch_size, chunk_size):
+    """ Insert 'count' rows from 'start' in batches of 'batch_size' """
+    database = Sqlite_Database()
+    for batch_start in range(start, start + count, batch_size):
+        rows = get_instrument_rows(
+            batch_start, min(batch_size, start + count - batch_start)
+        )
+        if method == 'formatted':
+            formatted_insert(database, 'instruments', rows)
+        else:
+            parameterized_insert(database, 'instruments', rows, chunk_size)
+    database.close_connection()
+
+
+def main():
+    parser = ArgumentParser(description='Bulk insert benchmark')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--batch_size', type=int, default=5000)
+    parser.add_argument('--chunk_size', type=int, default=INSERT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if os.path.exists('dependencies.db'):
+        sys.exit('dependencies.db already exists, remove it first')
+
+    rows_per_writer = args.rows // args.writers
+
+    for method in ('formatted', 'parameterized'):
+        Sqlite_Database().close_connection()
+        try:
+            start = time.perf_counter()
+            with Pool(args.writers) as pool:
+                pool.starmap(run_writer, [
+                    (method, writer * rows_per_writer, rows_per_writer,
+                     args.batch_size, args.chunk_size)
+                    for writer in range(args.writers)
+                ])
+            elapsed = time.perf_counter() - start
+
+            database = Sqlite_Database()
+            inserted = database.get_table_size('instruments')
+            database.close_connection()
+        finally:
+            os.unlink('dependencies.db')
+
+        print(f'{method:>13}: {elapsed:.3f}s, {inserted:,} rows, '
+              f'{inserted / elapsed:,.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+""" Benchmark of writing records to Parquet and Arrow IPC files versus JSONL
+files, measuring the throughput of each builder and the size of the file it
+writes.
+
+Records resemble trades with string and numeric dummy fields, held as a
+RecordBatch as the trade factory creates them. Each builder writes the same
+records to a single file, uncompressed and with each compression given.
+Requires pyarrow, and zstandard and lz4 for JSONL with those compressions.
+
+Files are written to a temporary directory, which is deleted afterwards. Run
+from the top-level directory of the repository:
+    python benchmarks/columnar_builder_benchmark.py
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.record_batch import RecordBatch
+from filebuilders.arrow_builder import ArrowBuilder
+from filebuilders.file_builder import get_missing_compression_package
+from filebuilders.jsonl_builder import JSONLBuilder
+from filebuilders.parquet_builder import ParquetBuilder
+
+BUILDERS = (('JSONL', JSONLBuilder), ('PARQUET', ParquetBuilder),
+            ('ARROW', ArrowBuilder))
+
+
+def create_columns(record_count, number_of_dummy_fields):
+    """ Return columns of values resembling those of trades: ids, creation
+    timestamps, currencies and prices, then alternately string and numeric
+    dummy fields. """
+    created_timestamp = datetime.now(timezone.utc)
+    columns = {
+        'trade_id': list(range(record_count)),
+        'created_timestamp': [created_timestamp] * record_count,
+        'currency': random.choices(['USD', 'GBP', 'EUR'], k=record_count),
+        'price': [round(random.uniform(1, 10), 2)
+                  for _ in range(record_count)]
+    }
+    for field_number in range(1, number_of_dummy_fields + 1):
+        if field_number % 2:
+            values = [''.join(random.choices(string.ascii_uppercase, k=10))
+                      for _ in range(record_count)]
+        else:
+            values = [random.randint(10 ** 9, 10 ** 10 - 1)
+                      for _ in range(record_count)]
+        columns[f'trade_field{field_number}'] = values
+    return columns
+
+
+def get_factory_config(output_type, output_directory, record_count,
+                       number_of_dummy_fields, compression):
+    """ Return the factory config of trades written to the given type """
+    factory_config = {
+        'output_file_type': output_type, 'file_name': 'trades',
+        'output_directory': output_directory,
+        'max_objects_per_file': record_count,
+        'file_type_args': {'xml_item_name': 'trade'},
+        'dummy_fields': [
+            {'field_count': 1, 'data_type': data_type, 'data_length': 10}
+            for field_number in range(1, number_of_dummy_fields + 1)
+            for data_type in ('string' if field_number % 2 else 'numeric',)
+        ]
+    }
+    if compression is not None:
+        factory_config['compression'] = compression
+    return factory_config
+
+
+def main():
+    parser = ArgumentParser(description='Columnar builder benchmark')
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--dummy_fields', type=int, default=20)
+    parser.add_argument('--compressions', nargs='*',
+                        default=['gzip', 'zstd', 'lz4'])
+    args = parser.parse_args()
+
+    batch = RecordBatch(create_columns(args.records, args.dummy_fields))
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        for compression in [None] + args.compressions:
+            for output_type, builder_class in BUILDERS:
+                if output_type == 'JSONL' and compression is not None and \
+                        get_missing_compression_package(compression):
+                    continue
+                if output_type == 'ARROW' and compression == 'gzip':
+                    continue
+
+                file_builder = builder_class(None, get_factory_config(
+                    output_type, output_directory, args.records,
+                    args.dummy_fields, compression
+                ))
+                start = time.perf_counter()
+                file_builder.build(0, batch)
+                elapsed = time.perf_counter() - start
+                file_size = os.path.getsize(os.path.join(
+                    output_directory, file_builder.get_numbered_file_name(0)
+                ))
+
+                print(f'{output_type:>7} {compression or "none":>5}: '
+                      f'{elapsed:.3f}s, '
+                      f'{args.records / elapsed:,.0f} records/s, '
+                      f'{file_size / 2 ** 20:,.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+""" Benchmark of writing a list of dictionaries to CSV with csv.DictWriter
+versus CSVBuilder, which writes each record as a tuple of its values.
+
+The DictWriter builder below reproduces CSVBuilder as it was prior: the
+columns are taken from the first record and every record is written by a
+csv.DictWriter. Records resemble trades with dummy fields; a RecordBatch of
+the same records is also written by CSVBuilder for comparison.
+
+Files are written to a temporary directory, which is deleted afterwards. Run
+from the top-level directory of the repository:
+    python benchmarks/csv_builder_benchmark.py
+"""
+
+import csv
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.record_batch import RecordBatch
+from filebuilders.csv_builder import CSVBuilder
+
+
+class DictWriterBuilder(CSVBuilder):
+    """ CSVBuilder writing records with csv.DictWriter """
+
+    def build(self, file_number, data):
+        output_dir = self.get_output_directory()
+        file_name = self.get_numbered_file_name(file_number)
+
+        with open(os.path.join(output_dir, file_name),
+                  'w+', newline='') as output_file:
+            fieldnames = data[0].keys()  # get keys from first dict
+            dict_writer = csv.DictWriter(output_file, restval="-",
+                                         fieldnames=fieldnames,
+                                         delimiter=',')
+            dict_writer.writeheader()
+            dict_writer.writerows(data)
+
+
+def create_columns(record_count, number_of_fields):
+    """ Return columns of values resembling those of trades: ids, random
+    strings, integers, decimals, and timestamps, alternately of each record's
+    creation and of a shared value date """
+    now = datetime.now(timezone.utc)
+    strings = [''.join(random.choices(string.ascii_uppercase, k=10))
+               for _ in range(1000)]
+    columns = {'trade_id': list(range(record_count))}
+    for field_number in range(number_of_fields - 1):
+        if field_number % 4 == 0:
+            values = random.choices(strings, k=record_count)
+        elif field_number % 4 == 1:
+            values = [random.randint(1, 10000) for _ in range(record_count)]
+        elif field_number % 4 == 2:
+            values = [round(random.uniform(1, 10), 2)
+                      for _ in range(record_count)]
+        elif field_number % 8 == 3:
+            values = [now + timedelta(microseconds=record_id)
+                      for record_id in range(record_count)]
+        else:
+            values = [now.replace(hour=0, minute=1, second=0, microsecond=0)
+                      for _ in range(record_count)]
+        columns[f'trade_field{field_number + 1}'] = values
+    return columns
+
+
+def main():
+    parser = ArgumentParser(description='CSV builder benchmark')
+    parser.add_argument('--records', type=int, default=1000000)
+    parser.add_argument('--fields', type=int, default=10)
+    args = parser.parse_args()
+
+    batch = RecordBatch(create_columns(args.records, args.fields))
+    records = batch.to_records()
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        factory_config = {
+            'output_file_type': 'CSV', 'file_name': 'trades',
+            'output_directory': output_directory,
+            'max_objects_per_file': args.records
+        }
+        benchmarks = (
+            ('DictWriter', DictWriterBuilder, records),
+            ('CSVBuilder', CSVBuilder, records),
+            ('CSVBuilder RecordBatch', CSVBuilder, batch)
+        )
+        for name, builder_class, data in benchmarks:
+            file_builder = builder_class(None, factory_config)
+            start = time.perf_counter()
+            file_builder.build(0, data)
+            elapsed = time.perf_counter() - start
+            print(f'{name:>22}: {elapsed:.3f}s, '
+                  f'{args.records / elapsed:,.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
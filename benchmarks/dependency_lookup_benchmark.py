@@ -0,0 +1,59 @@
+""" Benchmark of selecting random dependency records.
+
+Compares selecting a random account of a valid type with a query per record
+('ORDER BY RANDOM() LIMIT 1', the behaviour prior to the introduction of
+DependencyCache) with selecting it from the in-memory DependencyCache, as
+done by TradeFactory and the position factories for every record created.
+
+Creates a new dependencies.db in the working directory, which is deleted
+afterwards. Run from the top-level directory of the repository:
+    python benchmarks/dependency_lookup_benchmark.py
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database
+from database.dependency_cache import DependencyCache
+from domainobjectfactories.account_factory import AccountFactory
+
+
+def main():
+    parser = ArgumentParser(description='Dependency lookup benchmark')
+    parser.add_argument('--accounts', type=int, default=5000)
+    parser.add_argument('--lookups', type=int, default=5000)
+    args = parser.parse_args()
+
+    if os.path.exists('dependencies.db'):
+        sys.exit('dependencies.db already exists, remove it first')
+
+    database = Sqlite_Database()
+    try:
+        AccountFactory(
+            {'file_type_args': {'xml_item_name': 'account'},
+             'dummy_fields': []}, {}
+        ).create(args.accounts, 0)
+        cache = DependencyCache(database)
+
+        lookups = (
+            ('query per record', database.retrieve_row_with_valid_attribute),
+            ('dependency cache', cache.get_random_row_with_valid_attribute)
+        )
+
+        for name, lookup in lookups:
+            start = time.perf_counter()
+            for _ in range(args.lookups):
+                lookup('accounts', 'account_type', ['ICP', 'ECP'])
+            elapsed = time.perf_counter() - start
+            print(f'{name:>16}: {elapsed:.3f}s total, '
+                  f'{1e6 * elapsed / args.lookups:.1f}us per lookup')
+    finally:
+        database.close_connection()
+        os.unlink('dependencies.db')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+""" Benchmark of uploading output files to Google Drive as each file was
+uploaded before, finding the folders of the run for every file and
+uploading files one at a time, versus through a DriveUploadService, which
+finds the folders once and uploads files from several threads at once.
+
+Uploads go to an offline, in-memory Drive (FakeDriveService), which sleeps
+through a given latency on every request to model the round trip to Drive.
+The number of requests of each kind is reported alongside the time taken.
+
+Files are written to a temporary directory, which is deleted afterwards. Run
+from the top-level directory of the repository:
+    python benchmarks/drive_upload_benchmark.py
+"""
+
+import os
+import queue
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+sys.path.insert(0, '.')
+sys.path.insert(0, 'src/')
+from utils.google_drive_connector import GoogleDriveConnector
+from utils.drive_upload_service import DriveUploadService
+from tests.resources.drive_files.fake_drive_service import FakeDriveService
+
+
+def upload_per_file(google_drive_connector, local_folder_name, file_name):
+    """ Upload a file as FileBuilder.upload_to_google_drive did before the
+    upload service: finding, or creating, the date and time folders of the
+    run before every upload """
+    todays_date = datetime.now(timezone.utc).date().strftime('%Y-%m-%d')
+    date_folder_id = google_drive_connector.get_or_create_folder(
+        todays_date, google_drive_connector.root_folder_id
+    )
+    timestamp_folder_id = google_drive_connector.get_or_create_folder(
+        google_drive_connector.current_time_string, date_folder_id
+    )
+    google_drive_connector.create_file(local_folder_name, file_name,
+                                       timestamp_folder_id)
+
+
+def get_connector(latency):
+    """ Return a connector to a new in-memory Drive, and the Drive """
+    drive_service = FakeDriveService(latency)
+    drive_service.files_by_id['root'] = {'id': 'root', 'name': 'root',
+                                         'parents': []}
+    return GoogleDriveConnector('root', '000000',
+                                build_service=lambda: drive_service), \
+        drive_service
+
+
+def main():
+    parser = ArgumentParser(description='Drive upload benchmark')
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--file_size', type=int, default=2 ** 16)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--threads', type=int, nargs='*', default=[1, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as local_folder_name:
+        file_names = [f'file_{number:03}.csv' for number in range(args.files)]
+        for file_name in file_names:
+            with open(os.path.join(local_folder_name, file_name), 'wb') \
+                    as output_file:
+                output_file.write(os.urandom(args.file_size))
+
+        google_drive_connector, drive_service = get_connector(args.latency)
+        start = time.perf_counter()
+        for file_name in file_names:
+            upload_per_file(google_drive_connector, local_folder_name,
+                            file_name)
+        report('per file', time.perf_counter() - start, args.files,
+               drive_service)
+
+        for number_of_threads in args.threads:
+            google_drive_connector, drive_service = \
+                get_connector(args.latency)
+            start = time.perf_counter()
+            upload_service = DriveUploadService(
+                google_drive_connector, queue.Queue(2 * number_of_threads),
+                number_of_threads
+            )
+            uploader = upload_service.get_uploader()
+            for file_name in file_names:
+                uploader.upload_file(local_folder_name, file_name)
+            upload_service.flush()
+            upload_service.stop()
+            report(f'{number_of_threads} threads',
+                   time.perf_counter() - start, args.files, drive_service)
+
+
+def report(name, elapsed, number_of_files, drive_service):
+    """ Print the upload rate and the requests made to Drive """
+    requests = ', '.join(f'{count} {request_kind}' for request_kind, count
+                         in sorted(drive_service.request_counts.items()))
+    print(f'{name:>10}: {elapsed:.3f}s, {number_of_files / elapsed:,.1f} '
+          f'files/s ({requests})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+""" Benchmark of adding dummy fields to records one record at a time by
+interpreting the config, versus all records of a job at once from the
+compiled dummy field plan.
+
+The per-record method below reproduces Creatable.create_dummy_field_generator
+as it was prior to the dummy field plan: the config is re-read, every field
+name re-formatted and the method creating values re-selected per record.
+Run from the top-level directory of the repository:
+    python benchmarks/dummy_field_benchmark.py
+"""
+
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.creatable import Creatable
+
+
+class DummyFieldFactory(Creatable):
+    """ Factory creating records holding only an id and dummy fields """
+
+    def __init__(self, factory_args, shared_args):
+        super().__init__(factory_args, shared_args)
+        self.config = factory_args
+
+    def create(self, record_count, start_id):
+        return self.add_dummy_fields(
+            [{'id': i} for i in range(start_id, start_id + record_count)]
+        )
+
+    def create_per_record(self, record_count, start_id):
+        records = []
+        for i in range(start_id, start_id + record_count):
+            record = {'id': i}
+            for key, value in self.interpret_dummy_fields():
+                record[key] = value
+            records.append(record)
+        return records
+
+    def interpret_dummy_fields(self):
+        object_name = self.config["file_type_args"]["xml_item_name"]
+        field_number = 1
+        for dummy_field in self.config["dummy_fields"]:
+            field_count = dummy_field["field_count"]
+            if field_count < 1:
+                continue
+            data_type = dummy_field["data_type"]
+            data_length = dummy_field["data_length"]
+            if data_type == "string":
+                data_method = self.create_random_string
+            elif data_type == "numeric":
+                data_method = self.create_random_integer
+            for _ in range(field_count):
+                yield f'{object_name}_field{field_number}',\
+                      data_method(length=data_length)
+                field_number += 1
+
+
+def main():
+    parser = ArgumentParser(description='Dummy field benchmark')
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--records_per_job', type=int, default=5000)
+    parser.add_argument('--fields', type=int, default=200)
+    args = parser.parse_args()
+
+    factory = DummyFieldFactory({
+        'file_type_args': {'xml_item_name': 'trade'},
+        'dummy_fields': [
+            {'field_count': args.fields // 2, 'data_type': 'string',
+             'data_length': 10},
+            {'field_count': args.fields - args.fields // 2,
+             'data_type': 'numeric', 'data_length': 10}
+        ]
+    }, {})
+
+    for name, create in (('per record', factory.create_per_record),
+                         ('plan', factory.create)):
+        start = time.perf_counter()
+        for start_id in range(0, args.records, args.records_per_job):
+            create(args.records_per_job, start_id)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>10}: {elapsed:.3f}s, '
+              f'{args.records / elapsed:,.0f} records/s, '
+              f'{args.records * args.fields / elapsed:,.0f} fields/s')
+
+
+if __name__ == '__main__':
+    main()
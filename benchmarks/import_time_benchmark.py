@@ -0,0 +1,99 @@
+""" Benchmark of the time taken to import app.py, the start-up cost paid
+before any record is generated, and again by every spawned child process.
+
+app.py is imported in a new interpreter, run with -X importtime, several
+times. The fastest total import time is reported, along with the modules
+imported by app.py which took the longest, including the modules each
+imported in turn.
+
+The libraries app.py no longer imports at start-up, pandas, loaded only to
+read the prerequisite csv files, and the Google Drive client libraries,
+loaded only when files are uploaded, are imported the same way, to show
+the time each would add.
+
+Run from the top-level directory of the repository:
+    python benchmarks/import_time_benchmark.py
+"""
+
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+IMPORT_TIME_LINE = re.compile(
+    r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)'
+)
+
+# Libraries once imported whenever app.py was started
+DEFERRED_IMPORTS = ('pandas', 'googleapiclient.discovery',
+                    'google_auth_oauthlib.flow')
+
+
+def get_import_times(statement):
+    """ Run an import statement in a new interpreter, returning the
+    cumulative import time, in seconds, of each module imported directly by
+    the statement, and of the modules imported by those modules """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd='src', capture_output=True, text=True, check=True
+    )
+    import_times = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            cumulative, indent, module = match.group(2, 3, 4)
+            import_times.append((len(indent) // 2, module,
+                                 int(cumulative) / 10 ** 6))
+    return import_times
+
+
+def get_total_import_time(module_name, repeats):
+    """ Return the fastest time taken to import a module, over a number of
+    runs """
+    return min(seconds for _ in range(repeats) for depth, module, seconds
+               in get_import_times(f'import {module_name}')
+               if depth == 0 and module == module_name)
+
+
+def get_imports_of(module_name):
+    """ Return the cumulative import time, in seconds, of each module
+    imported directly by a module. Modules are listed by -X importtime
+    before the module importing them, so the modules imported by a module
+    are those listed one level deeper since the previous top-level module
+    """
+    imports = []
+    for depth, module, seconds in get_import_times(f'import {module_name}'):
+        if depth == 1:
+            imports.append((seconds, module))
+        elif depth == 0:
+            if module == module_name:
+                return imports
+            imports = []
+    return imports
+
+
+def main():
+    parser = ArgumentParser(description='app.py import time benchmark')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    total = get_total_import_time('app', args.repeats)
+    print(f'{"app":>28}: {total * 1000:8.1f} ms')
+
+    for seconds, module in sorted(get_imports_of('app'),
+                                   reverse=True)[:args.top]:
+        print(f'{module:>28}: {seconds * 1000:8.1f} ms')
+
+    print('not imported at start-up:')
+    for module in DEFERRED_IMPORTS:
+        try:
+            total = get_total_import_time(module, args.repeats)
+        except subprocess.CalledProcessError:
+            print(f'{module:>28}: not installed')
+            continue
+        print(f'{module:>28}: {total * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
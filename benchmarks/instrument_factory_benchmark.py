@@ -0,0 +1,160 @@
+""" Benchmark of creating instruments a record at a time, selecting
+exchanges and tickers from the database, versus a column at a time from
+lookup tables.
+
+The per-record factory below reproduces InstrumentFactory as it was prior
+to lookup tables: the tickers table is read from the database for every
+job, under a lock shared by every create child process, and three rows of
+the exchanges table are selected for every instrument through the
+dependency cache, which is discarded whenever another process commits to
+the database. The batch factory is the current InstrumentFactory, which
+loads exchanges and tickers once into read-only arrays and selects the
+rows of every instrument of a job at once.
+
+Between jobs, a commit is made through a second connection to the
+database, as other create child processes persisting instruments would
+make during a run.
+
+Creates a new dependencies.db in the working directory, which is deleted
+afterwards. Run from the top-level directory of the repository:
+    python benchmarks/instrument_factory_benchmark.py
+"""
+
+import itertools
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from multiprocessing import Lock
+
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database
+from domainobjectfactories.creatable import Creatable
+from domainobjectfactories.instrument_factory import InstrumentFactory
+
+
+class PerRecordInstrumentFactory(Creatable):
+    """ InstrumentFactory creating one record at a time """
+
+    def create(self, record_count, start_id, lock):
+        lock.acquire()
+        self.tickers = self.retrieve_column('tickers', "symbol")
+        lock.release()
+
+        records = []
+        for i in range(start_id, start_id + record_count):
+            record = self.create_record(i)
+            records.append(record)
+            self.persist_record([str(record['instrument_id']), record['ric'],
+                                 str(record['cusip']), str(record['isin']),
+                                 str(record['market'])])
+
+        self.persist_records("instruments")
+        return self.add_dummy_fields(records)
+
+    def create_record(self, id):
+        ticker = self.get_random().choice(self.tickers)
+        exchanges_row = self.get_random_row('exchanges')
+        cusip = self.create_random_integer(length=9)
+        asset_class = self.get_random().choice(
+            list(InstrumentFactory.ASSET_CLASS_TO_SUBCLASS.keys())
+        )
+        primary_market = self.get_random_row('exchanges')['exchange_code']
+        market = self.get_random_row('exchanges')['exchange_code']
+        return {
+            'instrument_id': id,
+            'ric': self.create_ric(ticker, exchanges_row['exchange_code']),
+            'isin': self.create_isin(exchanges_row['country_of_issuance'],
+                                     cusip),
+            'sedol': self.create_random_integer(length=7),
+            'ticker': ticker,
+            'cusip': cusip,
+            'valoren': self.create_random_integer(100000, 999999999),
+            'quick': self.create_random_integer(length=4),
+            'sicovam': self.create_random_integer(length=6),
+            'asset_class': asset_class,
+            'asset_subclass': self.get_random().choice(
+                InstrumentFactory.ASSET_CLASS_TO_SUBCLASS[asset_class]
+            ),
+            'country_of_issuance': exchanges_row['country_of_issuance'],
+            'primary_market': primary_market,
+            'market': market,
+            'is_primary_listing': primary_market == market,
+            'figi': self.create_figi(),
+            'issuer_name': self.create_random_string(10),
+            'industry_classification': self.get_random().choice(
+                InstrumentFactory.INDUSTRY_CLASSIFICATIONS
+            ),
+            'created_timestamp': datetime.now(timezone.utc),
+            'last_updated_time_stamp': datetime.now(timezone.utc)
+        }
+
+    def create_figi(self):
+        consonants = list(InstrumentFactory.FIGI_CONSONANTS)
+        self.get_random().shuffle(consonants)
+        combination_generator = map(''.join,
+                                    itertools.permutations(consonants, 2))
+        while True:
+            combination = next(combination_generator)
+            if combination in InstrumentFactory.FIGI_PREFIXES:
+                break
+        return combination + 'G' + ''.join(self.get_random().choices(
+            InstrumentFactory.FIGI_CONSONANTS_AND_NUMBERS, k=8
+        )) + str(self.get_random().randint(0, 9))
+
+
+def get_factory_config():
+    """ Return the factory config of instruments without dummy fields """
+    return {'file_type_args': {'xml_item_name': 'instrument'},
+            'dummy_fields': []}
+
+
+def main():
+    parser = ArgumentParser(description='Instrument factory benchmark')
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--records_per_job', type=int, default=1000)
+    args = parser.parse_args()
+
+    if os.path.exists('dependencies.db'):
+        sys.exit('dependencies.db already exists, remove it first')
+
+    other_process_database = Sqlite_Database()
+    other_process_database.create_table_from_dict('benchmark_commits',
+                                                  {'job': 'text'})
+    lock = Lock()
+    try:
+        for name, factory, create_job in (
+            ('per record', PerRecordInstrumentFactory(get_factory_config(),
+                                                      {}),
+             lambda factory, start_id: factory.create(
+                 args.records_per_job, start_id, lock
+             )),
+            ('batch', InstrumentFactory(get_factory_config(), {}),
+             lambda factory, start_id: factory.create(
+                 args.records_per_job, start_id
+             ))
+        ):
+            start = time.perf_counter()
+            for start_id in range(0, args.records, args.records_per_job):
+                factory.refresh_dependency_cache()
+                factory.seed_random_generators(start_id)
+                create_job(factory, start_id)
+
+                other_process_database.persist_batch('benchmark_commits',
+                                                     [[str(start_id)]])
+                other_process_database.commit_changes()
+            elapsed = time.perf_counter() - start
+
+            print(f'{name:>10}: {elapsed:.3f}s, '
+                  f'{args.records / elapsed:,.0f} instruments/s')
+    finally:
+        other_process_database.close_connection()
+        for file_name in ('dependencies.db', 'dependencies.db-wal',
+                          'dependencies.db-shm'):
+            if os.path.exists(file_name):
+                os.unlink(file_name)
+
+
+if __name__ == '__main__':
+    main()
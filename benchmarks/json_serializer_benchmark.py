@@ -0,0 +1,91 @@
+""" Benchmark of serialising the records of each domain object to JSON by
+each serialiser of the JSON and JSONL file builders: orjson, ujson and the
+standard library's json.
+
+Records are created by the factory of each domain object of src/config.json,
+with its dummy fields, in the order of the config so that the instruments
+and accounts other domain objects depend on are created first. Each
+serialiser then serialises every record of each domain object one at a time,
+as the file builders do, and the best of several runs is reported. orjson
+is skipped where it is not installed.
+
+Creates a new dependencies.db in the working directory, which is deleted
+afterwards. Run from the top-level directory of the repository:
+    python benchmarks/json_serializer_benchmark.py
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from collections import deque
+
+sys.path.insert(0, 'src/')
+from database.sqlite_database import Sqlite_Database
+from filebuilders.json_serializers import JSON_SERIALIZERS, \
+    get_json_serializer, get_missing_json_serializer_package
+
+
+def create_records(factory_definitions, factory_locations, record_count):
+    """ Return records of each domain object, by domain object name """
+    records = {}
+    for factory_definition in factory_definitions:
+        object_name, factory_config = list(factory_definition.items())[0]
+        factory_location = factory_locations[object_name]
+        factory_class = getattr(importlib.import_module(
+            f'domainobjectfactories.{factory_location["module_name"]}'
+        ), factory_location['class_name'])
+        factory = factory_class(factory_config, {})
+        records[object_name] = list(factory.create(record_count, 0))
+    return records
+
+
+def time_serializer(serialize, records, repeats):
+    """ Return the least time taken to serialise every record """
+    elapsed = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        deque(map(serialize, records), maxlen=0)
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main():
+    parser = ArgumentParser(description='JSON serializer benchmark')
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    if os.path.exists('dependencies.db'):
+        sys.exit('dependencies.db already exists, remove it first')
+
+    with open('src/config.json') as config_file:
+        factory_definitions = json.load(config_file)['factory_definitions']
+    with open('src/dev_config.json') as dev_config_file:
+        factory_locations = json.load(dev_config_file)['dev_factory_args'][0]
+
+    serializer_names = [name for name in JSON_SERIALIZERS
+                        if get_missing_json_serializer_package(name) is None]
+
+    Sqlite_Database().close_connection()
+    try:
+        records = create_records(factory_definitions, factory_locations,
+                                 args.records)
+
+        for object_name, object_records in records.items():
+            for name in serializer_names:
+                elapsed = time_serializer(get_json_serializer(name),
+                                          object_records, args.repeats)
+                print(f'{object_name:>22} {name:>6}: {elapsed:.3f}s, '
+                      f'{len(object_records) / elapsed:,.0f} records/s')
+    finally:
+        for file_name in ('dependencies.db', 'dependencies.db-wal',
+                          'dependencies.db-shm'):
+            if os.path.exists(file_name):
+                os.unlink(file_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+""" Benchmark of the per-batch overhead of running create jobs over a pool.
+
+Compares starting a new pool of create child processes for every batch of
+create jobs (the behaviour prior to the introduction of WorkerPools) with
+running every batch over one long-lived pool. The object factory used creates
+trivial records so that the measured time is dominated by pool overhead.
+
+Run from the top-level directory of the repository:
+    python benchmarks/pool_overhead_benchmark.py
+"""
+
+import pickle
+import sys
+import time
+from argparse import ArgumentParser
+from multiprocessing import Pool
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.creatable import Creatable
+from multi_processing import pool_tasks
+
+
+class TrivialFactory(Creatable):
+    """ Factory creating records with a single id field """
+
+    def create(self, record_count, start_id):
+        return [{'id': i} for i in range(start_id, start_id + record_count)]
+
+
+def get_batches(number_of_batches, jobs_per_batch, records_per_job):
+    """ Return batches of create jobs covering consecutive ids """
+    batches = []
+    start_id = 0
+    for _ in range(number_of_batches):
+        batch = []
+        for _ in range(jobs_per_batch):
+            batch.append({'quantity': records_per_job, 'start_id': start_id})
+            start_id += records_per_job
+        batches.append(batch)
+    return batches
+
+
+def run_with_pool_per_batch(batches, processes, object_factory):
+    """ Start and stop a pool for every batch, pickling the object factory
+    for every job """
+    for batch in batches:
+        pool = Pool(processes=processes)
+        results = [
+            pool.apply_async(
+                pool_tasks.create_records_from_create_job,
+                args=(create_job, None, pickle.dumps(object_factory))
+            ) for create_job in batch
+        ]
+        [result.get() for result in results]
+        pool.close()
+        pool.join()
+        pool_tasks.object_factories.clear()
+
+
+def run_with_persistent_pool(batches, processes, object_factory):
+    """ Run every batch over one long-lived pool """
+    pool = pool_tasks.start_create_pool(processes)
+    pickled_object_factory = pickle.dumps(object_factory)
+    for batch in batches:
+        pool_tasks.run_create_jobs(
+            batch, pool, 'benchmark', pickled_object_factory
+        )
+    pool.close()
+    pool.join()
+
+
+def main():
+    parser = ArgumentParser(description='Pool overhead benchmark')
+    parser.add_argument('--batches', type=int, default=50)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--records_per_job', type=int, default=25)
+    args = parser.parse_args()
+
+    object_factory = TrivialFactory(None, None)
+    batches = get_batches(args.batches, 2 * args.processes,
+                          args.records_per_job)
+
+    for name, run in (('pool per batch', run_with_pool_per_batch),
+                      ('persistent pool', run_with_persistent_pool)):
+        start = time.perf_counter()
+        run(batches, args.processes, object_factory)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>16}: {elapsed:.3f}s total, '
+              f'{1000 * elapsed / args.batches:.2f}ms per batch')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+""" Benchmark of holding and writing records as a list of dictionaries
+versus as a RecordBatch.
+
+Records resembling trades with dummy fields are held both ways, measuring
+the memory each takes with tracemalloc, then each is written to CSV by
+CSVBuilder. Files are written to a temporary directory, which is deleted
+afterwards. Run from the top-level directory of the repository:
+    python benchmarks/record_batch_benchmark.py
+"""
+
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.record_batch import RecordBatch
+from filebuilders.csv_builder import CSVBuilder
+
+
+def create_columns(record_count, number_of_fields):
+    """ Return columns of values resembling those of trades: ids, random
+    strings, integers, decimals and timestamps """
+    now = datetime.now(timezone.utc)
+    columns = {'trade_id': list(range(record_count))}
+    for field_number in range(number_of_fields - 1):
+        if field_number % 4 == 0:
+            values = [''.join(random.choices(string.ascii_uppercase, k=10))
+                      for _ in range(record_count)]
+        elif field_number % 4 == 1:
+            values = [random.randint(1, 10000) for _ in range(record_count)]
+        elif field_number % 4 == 2:
+            values = [round(random.uniform(1, 10), 2)
+                      for _ in range(record_count)]
+        else:
+            values = [now] * record_count
+        columns[f'field{field_number}'] = values
+    return columns
+
+
+def measure_memory(create):
+    """ Return the result of calling create and the memory it allocated """
+    tracemalloc.start()
+    result = create()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, memory
+
+
+def main():
+    parser = ArgumentParser(description='Record batch benchmark')
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--fields', type=int, default=38)
+    args = parser.parse_args()
+
+    columns = create_columns(args.records, args.fields)
+    field_names = list(columns)
+
+    # memory is measured of the containers alone, as the values are shared
+    records, records_memory = measure_memory(lambda: [
+        dict(zip(field_names, values)) for values in zip(*columns.values())
+    ])
+    batch, batch_memory = measure_memory(
+        lambda: RecordBatch({name: list(values)
+                             for name, values in columns.items()})
+    )
+    print(f'list of dictionaries: {records_memory / 2 ** 20:,.1f} MiB')
+    print(f'         RecordBatch: {batch_memory / 2 ** 20:,.1f} MiB')
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        file_builder = CSVBuilder(None, {
+            'output_file_type': 'CSV', 'file_name': 'trades',
+            'output_directory': output_directory,
+            'max_objects_per_file': args.records
+        })
+        for name, data in (('list of dictionaries', records),
+                           ('RecordBatch', batch)):
+            start = time.perf_counter()
+            file_builder.build(0, data)
+            elapsed = time.perf_counter() - start
+            print(f'{name:>20} to CSV: {elapsed:.3f}s, '
+                  f'{args.records / elapsed:,.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+""" Benchmark of created record throughput for each created record transport.
+
+Runs the full create/write pipeline of a Coordinator for a factory producing
+wide records (a trade-like record with 20 dummy fields), writing to a file
+builder that discards its input, so that the measured time is dominated by
+moving records between processes rather than creating or writing them.
+
+Run from the top-level directory of the repository:
+    python benchmarks/transport_benchmark.py
+"""
+
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.creatable import Creatable
+from filebuilders.file_builder import FileBuilder
+from multi_processing.coordinator import Coordinator
+from multi_processing.worker_pools import WorkerPools, TRANSPORTS
+
+
+class WideRecordFactory(Creatable):
+    """ Factory creating records of 18 fields plus 20 dummy fields """
+
+    def create(self, record_count, start_id):
+        record = {f'field{i}': 'X' * 10 for i in range(18)}
+        record.update({f'trade_field{i}': 'Y' * 10 for i in range(20)})
+        return [dict(record, id=i)
+                for i in range(start_id, start_id + record_count)]
+
+    def get_record_count(self):
+        return self.get_factory_config()['fixed_args']['record_count']
+
+
+class DiscardingBuilder(FileBuilder):
+    """ File builder which writes nothing """
+
+    def build(self, file_number, data):
+        pass
+
+
+def main():
+    parser = ArgumentParser(description='Created record transport benchmark')
+    parser.add_argument('--records', type=int, default=500000)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--records_per_job', type=int, default=5000)
+    args = parser.parse_args()
+
+    factory_config = {
+        'max_objects_per_file': args.records_per_job * 4,
+        'file_name': 'discarded',
+        'output_file_type': 'NONE',
+        'output_directory': 'out',
+        'fixed_args': {'record_count': args.records}
+    }
+
+    for transport in TRANSPORTS:
+        shared_args = {
+            'number_of_create_child_processes': args.processes,
+            'number_of_write_child_processes': args.processes,
+            'number_of_records_per_job': args.records_per_job,
+            'created_record_transport': transport
+        }
+        worker_pools = WorkerPools(shared_args)
+        coordinator = Coordinator(
+            DiscardingBuilder(None, factory_config),
+            WideRecordFactory(factory_config, shared_args),
+            worker_pools
+        )
+
+        start = time.perf_counter()
+        coordinator.start_create_parent_thread()
+        coordinator.start_write_parent_thread()
+        coordinator.populate_create_job_queue()
+        coordinator.join_parent_threads()
+        elapsed = time.perf_counter() - start
+        worker_pools.close()
+
+        print(f'{transport:>8}: {elapsed:.3f}s, '
+              f'{args.records / elapsed:,.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+""" Benchmark of writing records to XML with the dicttoxml library versus
+XMLBuilder, which writes each record to the file as it is formatted.
+
+The dicttoxml builder below reproduces XMLBuilder as it was prior: the whole
+document is built by dicttoxml as bytes, decoded to a string, and the 'type'
+attributes of strings, integers and dictionaries replaced away, before being
+written to the file at once. The time taken and the peak memory allocated,
+measured with tracemalloc, are reported for each, for both a list of
+dictionaries and a RecordBatch of records resembling trades.
+
+Files are written to a temporary directory, which is deleted afterwards. Run
+from the top-level directory of the repository:
+    python benchmarks/xml_builder_benchmark.py
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+import dicttoxml
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.record_batch import RecordBatch
+from filebuilders.xml_builder import XMLBuilder
+
+
+class DicttoxmlBuilder(XMLBuilder):
+    """ XMLBuilder building the whole document with dicttoxml """
+
+    def build(self, file_number, data):
+        output_dir = self.get_output_directory()
+        file_name = self.get_numbered_file_name(file_number)
+        item_name = self.get_item_name()
+
+        with open(os.path.join(output_dir, file_name), 'w') as output_file:
+            if isinstance(data, RecordBatch):
+                data = data.to_records()
+            xml = dicttoxml.dicttoxml(
+                data, custom_root=self.get_root_element_name(),
+                ids=False, item_func=lambda _: item_name
+            )
+            xml = str(xml, 'utf-8')
+            xml = xml.replace(' type=\"str\"', '')\
+                .replace(' type=\"dict\"', '')\
+                .replace(' type=\"int\"', '')
+            output_file.write(xml)
+
+
+def create_columns(record_count, number_of_fields):
+    """ Return columns of values resembling those of trades: ids, random
+    strings, integers, decimals, booleans and timestamps """
+    now = datetime.now(timezone.utc)
+    columns = {'trade_id': list(range(record_count))}
+    for field_number in range(number_of_fields - 1):
+        if field_number % 5 == 0:
+            values = [''.join(random.choices(string.ascii_uppercase, k=10))
+                      for _ in range(record_count)]
+        elif field_number % 5 == 1:
+            values = [random.randint(1, 10000) for _ in range(record_count)]
+        elif field_number % 5 == 2:
+            values = [round(random.uniform(1, 10), 2)
+                      for _ in range(record_count)]
+        elif field_number % 5 == 3:
+            values = [random.random() < 0.5 for _ in range(record_count)]
+        else:
+            values = [now] * record_count
+        columns[f'trade_field{field_number + 1}'] = values
+    return columns
+
+
+def main():
+    parser = ArgumentParser(description='XML builder benchmark')
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--fields', type=int, default=20)
+    args = parser.parse_args()
+
+    columns = create_columns(args.records, args.fields)
+    batch = RecordBatch(columns)
+    records = batch.to_records()
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        factory_config = {
+            'output_file_type': 'XML', 'file_name': 'trades',
+            'output_directory': output_directory,
+            'max_objects_per_file': args.records,
+            'file_type_args': {'xml_root_element': 'trades',
+                               'xml_item_name': 'trade'}
+        }
+
+        for name, builder_class in (('dicttoxml', DicttoxmlBuilder),
+                                    ('streaming', XMLBuilder)):
+            file_builder = builder_class(None, factory_config)
+            for data_name, data in (('list of dictionaries', records),
+                                    ('RecordBatch', batch)):
+                tracemalloc.start()
+                file_builder.build(0, data)
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                # time is measured separately, without the overhead of
+                # tracemalloc
+                start = time.perf_counter()
+                file_builder.build(0, data)
+                elapsed = time.perf_counter() - start
+
+                print(f'{name:>9} {data_name:>20}: {elapsed:.3f}s, '
+                      f'{args.records / elapsed:,.0f} records/s, '
+                      f'peak {peak_memory / 2 ** 20:,.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,9 +14,12 @@
         * Cash Flow
         * Settlement Instruction
 
-    Domain objects are created sequentially, with one domain object having all
-    output files written before starting on the next domain object. This is
-    sequenced to ensure that inter-object dependencies are created correctly.
+    Domain objects are created concurrently, subject to the dependencies
+    between them: a domain object is only started once every domain object it
+    depends on has had all output files written. This ensures that
+    inter-object dependencies are created correctly, while domain objects
+    that are independent of each other share the pools of child processes.
+    The dependencies of each domain object are declared in the dev config.
 
     Dependencies are established using a local SQLite database file. When
     creating a domain object, any fields that may be referenced by dependant
@@ -24,15 +27,32 @@
     the database is queried to retrieve an appropriate value.
 
     When creating domain object records and writing them to files,
-    multiprocessing is used to increase time efficiency. A Coordinator object
-    is responsible for creating and managing these processes, and it will
-    spawn two parent processes: 'create_parent_process' and
-    'write_parent_process'. These each spawn a number of child processes as
-    specified in the 'shared_args' section of the user config.
+    multiprocessing is used to increase time efficiency. Two long-lived pools
+    of child processes, one for creating records and one for writing them,
+    are started once per run with the number of processes specified in the
+    'shared_args' section of the user config. For each domain object a
+    Coordinator object starts two parent threads, 'create_parent_thread' and
+    'write_parent_thread', which run jobs over these pools. Alternatively, in
+    the 'fused' execution mode, each create child process both creates and
+    writes one output file's worth of records.
 
     See the class docstrings for Writer and Creator for more detail on the
     multiprocessing implementation.
 
+    The progress of a run is recorded to a run manifest file as domain
+    objects, create jobs and output files are completed. A run which is
+    interrupted can be resumed with the '--resume' command line argument and
+    the same config: the dependency database is kept, domain objects already
+    completed are skipped, and each domain object which was in progress
+    either continues from the output files it had written or, where that
+    cannot be done safely, is started again. See the README for detail.
+
+    A dataset may also be split between several runs, each creating one
+    shard of the records of every domain object, given by the '--shard_index'
+    and '--shard_count' command line arguments. Dependency domain objects are
+    then created once by a separate run, exported with '--export_snapshot'
+    and imported by every shard with '--import_snapshot'.
+
 """
 
 import importlib
@@ -40,21 +60,37 @@ import ujson
 import os
 import sys
 from argparse import ArgumentParser
-from database.sqlite_database import Sqlite_Database
-from multi_processing.coordinator import Coordinator
+from database.sqlite_database import Sqlite_Database, import_snapshot
+from multi_processing.coordinator import Coordinator, \
+    PIPELINED_EXECUTION_MODE, FUSED_EXECUTION_MODE
+from multi_processing.worker_pools import WorkerPools
+from multi_processing.scheduler import Scheduler
+from multi_processing.run_manifest import RunManifest, \
+    get_configuration_digest
 from exceptions.config_error import ConfigError
 from configuration.configuration import Configuration
 import validator.config_validator as config_validator
-from utils.google_drive_connector import GoogleDriveConnector
+from utils.drive_upload_service import DriveUploadService, \
+    DEFAULT_NUMBER_OF_UPLOAD_THREADS, QUEUED_UPLOADS_PER_THREAD
 from datetime import datetime, timezone
+from functools import partial
 
 
 def main():
-    delete_database()
-
+    args = get_args()
     configurations = parse_config_files()
+    set_shard_args(configurations.get_shared_args(), args)
     validate_configs(configurations)
 
+    run_manifest = RunManifest()
+    configuration_digest = get_configuration_digest(configurations)
+    resumed = args.resume and resume_run(run_manifest, configuration_digest)
+    if not resumed:
+        delete_database()
+        if args.import_snapshot is not None:
+            import_snapshot(args.import_snapshot)
+        run_manifest.start_run(configuration_digest)
+
     factory_definitions = configurations.get_factory_definitions()
     shared_args = configurations.get_shared_args()
     dev_file_builder_args = configurations.get_dev_file_builder_args()
@@ -62,11 +98,71 @@ def main():
 
     current_time_string = datetime.now(timezone.utc).strftime("%H:%M:%S")
 
-    for factory_definition in factory_definitions:
-        google_drive_connector = get_google_drive_connector(
-            factory_definition,
-            current_time_string,
-            shared_args)
+    # create the dependency database and its prerequisite tables before any
+    # domain objects are processed, as several may then connect at once
+    Sqlite_Database().close_connection()
+
+    worker_pools = WorkerPools(shared_args)
+    drive_upload_service = start_drive_upload_service(
+        factory_definitions, current_time_string, shared_args, worker_pools
+    )
+    scheduler = Scheduler(
+        shared_args.get('number_of_concurrent_domain_objects')
+    )
+
+    domain_objects = []
+    for index, factory_definition in enumerate(factory_definitions):
+        object_factory_name = list(factory_definition.keys())[0]
+        dev_object_factory_config = get_dev_object_factory_config(
+            dev_factory_args, object_factory_name
+        )
+        progress = run_manifest.get_domain_object_progress(
+            index, object_factory_name
+        )
+
+        if not resumed and args.import_snapshot is not None and \
+                is_provided_by_snapshot(dev_object_factory_config):
+            progress.record_provided_by_snapshot()
+
+        domain_objects.append((factory_definition, object_factory_name,
+                               dev_object_factory_config, progress))
+
+    # tables persisted by the domain objects this run creates, which only
+    # hold the records of this run when it is one of several shards
+    run_table_names = {
+        table_name
+        for _, _, dev_object_factory_config, progress in domain_objects
+        if not progress.is_provided_by_snapshot()
+        for table_name in dev_object_factory_config.get(
+            'persisted_tables', []
+        )
+    }
+
+    for factory_definition, object_factory_name, dev_object_factory_config, \
+            progress in domain_objects:
+        dependencies = dev_object_factory_config.get('dependencies', [])
+        persisted_table_names = \
+            dev_object_factory_config.get('persisted_tables', [])
+
+        if progress.is_provided_by_snapshot():
+            print(f"Skipping {object_factory_name}, provided by the "
+                  "dependency snapshot")
+            scheduler.add_domain_object(
+                object_factory_name, dependencies, lambda: None
+            )
+            continue
+
+        if progress.is_complete():
+            print(f"Skipping {object_factory_name}, completed by a previous "
+                  "run")
+            scheduler.add_domain_object(
+                object_factory_name, dependencies, lambda: None
+            )
+            continue
+
+        google_drive_connector = get_google_drive_uploader(
+            factory_definition, drive_upload_service
+        )
 
         file_builder = instantiate_file_builder(factory_definition,
                                                 dev_file_builder_args,
@@ -74,15 +170,130 @@ def main():
         object_factory = instantiate_object_factory(dev_factory_args,
                                                     factory_definition,
                                                     shared_args)
-        process_object_factory(file_builder, object_factory)
 
+        shard = get_shard(shared_args, dev_object_factory_config,
+                          run_table_names)
+        if 'shard_count' in shared_args:
+            file_builder.set_shard(shared_args['shard_index'],
+                                   shared_args['shard_count'])
+
+        scheduler.add_domain_object(
+            object_factory_name,
+            dependencies,
+            partial(process_object_factory, file_builder, object_factory,
+                    worker_pools, progress, persisted_table_names, shard)
+        )
+
+    try:
+        scheduler.run()
+        if drive_upload_service is not None:
+            drive_upload_service.flush()
+    finally:
+        if drive_upload_service is not None:
+            drive_upload_service.stop()
+        worker_pools.close()
+
+    if args.export_snapshot is not None:
+        database = Sqlite_Database()
+        database.export_snapshot(args.export_snapshot)
+        database.close_connection()
+        print(f"Exported dependency snapshot to {args.export_snapshot}")
+
+
+def set_shard_args(shared_args, args):
+    """ Set the shard of the run in the shared args from the command line
+    arguments, where given, which override any set in the user config. A
+    shard count given without a shard index makes the run the first shard.
+
+    Parameters
+    ----------
+    shared_args : dict
+        The "shared_args" section of the user config
+    args : namespace
+        Parsed command line arguments
+    """
+
+    if args.shard_count is not None:
+        shared_args['shard_count'] = args.shard_count
+    if args.shard_index is not None:
+        shared_args['shard_index'] = args.shard_index
+    if 'shard_count' in shared_args:
+        shared_args.setdefault('shard_index', 0)
 
-def process_object_factory(file_builder, object_factory):
+
+def get_shard(shared_args, dev_object_factory_config, run_table_names):
+    """ Return the shard of a domain object's records this run is to create,
+    where the run is one of several shards.
+
+    The create jobs of a domain object are sliced between the shards, unless
+    its create jobs each read a slice of a table, given by 'source_table' in
+    the dev config, which is persisted by a domain object of this run. Such
+    a table holds only this shard's records, so every create job is run, each
+    reading the same slice of the shard's records as it would of all
+    records.
+
+    Parameters
+    ----------
+    shared_args : dict
+        The "shared_args" section of the user config
+    dev_object_factory_config : dict
+        Developer config of the domain object
+    run_table_names : set
+        Names of the tables persisted by the domain objects of this run
+
+    Returns
+    -------
+    tuple
+        The index of the shard and the number of shards, or None if every
+        record is to be created
+    """
+
+    shard_count = shared_args.get('shard_count', 1)
+    if shard_count == 1 or \
+            dev_object_factory_config.get('source_table') in run_table_names:
+        return None
+    return shared_args['shard_index'], shard_count
+
+
+def is_provided_by_snapshot(dev_object_factory_config):
+    """ Return whether a domain object's records have been imported from a
+    dependency snapshot, i.e. whether it persists records and every table it
+    persists to already holds records
+
+    Parameters
+    ----------
+    dev_object_factory_config : dict
+        Developer config of the domain object
+
+    Returns
+    -------
+    bool
+        True if the domain object is not to be created by the run
+    """
+
+    persisted_table_names = \
+        dev_object_factory_config.get('persisted_tables', [])
+    if not persisted_table_names:
+        return False
+
+    database = Sqlite_Database()
+    provided = all(database.get_table_size(table_name)
+                   for table_name in persisted_table_names)
+    database.close_connection()
+    return provided
+
+
+def process_object_factory(file_builder, object_factory, worker_pools,
+                           progress, persisted_table_names, shard):
     """
     This method is called once per domain object, and instantiates a
-    Coordinator object for that domain object. The Coordinator spawns create
-    and write processes that use the instantiated object factory and file
-    builder respectively to create records and write them to output files.
+    Coordinator object for that domain object. The Coordinator starts create
+    and write threads that use the instantiated object factory and file
+    builder respectively to create records and write them to output files,
+    running jobs over the run's long-lived worker pools.
+
+    The domain object is recorded as complete in the run manifest once all
+    of its records are written and persisted.
 
     Parameters
     ----------
@@ -92,14 +303,161 @@ def process_object_factory(file_builder, object_factory):
     object_factory : ObjectFactory
         Instantiated subclass of Creatable for the domain object being created.
         Contains creation parameters and multiprocessing shared arguments.
+    worker_pools : WorkerPools
+        Long-lived pools of create and write child processes shared by every
+        domain object in the run
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest
+    persisted_table_names : list
+        Names of the tables of the dependency database the domain object
+        persists records to, as given in the dev config
+    shard : tuple
+        Index of the shard of the run and the number of shards, where the
+        run creates only a slice of the domain object's records, else None
     """
 
-    coordinator = Coordinator(file_builder, object_factory)
+    start_domain_object(file_builder, object_factory, progress,
+                        persisted_table_names)
+
+    coordinator = Coordinator(file_builder, object_factory, worker_pools,
+                              progress, shard)
+
+    if is_fused(file_builder, object_factory):
+        coordinator.run_fused_jobs()
+    else:
+        coordinator.start_create_parent_thread()
+        coordinator.start_write_parent_thread()
+        coordinator.populate_create_job_queue()
+        coordinator.join_parent_threads()
+        coordinator.report_queue_depth()
+
+    # records persisted for dependant domain objects must be in the database
+    # before the domain object counts as finished
+    worker_pools.flush_persisted_records()
+    progress.complete()
+
+
+def start_domain_object(file_builder, object_factory, progress,
+                        persisted_table_names):
+    """ Record the start of a domain object in the run manifest. Where the
+    domain object was started by a previous run which was interrupted, either
+    continue from its recorded progress or, if it cannot be continued, undo
+    that progress so that the domain object is started again.
+
+    Undoing the progress of a domain object deletes the records it persisted
+    to the dependency database and the output files it wrote.
+
+    Parameters
+    ----------
+    file_builder : File_Builder
+        Instantiated file builder of the domain object
+    object_factory : ObjectFactory
+        Instantiated subclass of Creatable for the domain object
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest
+    persisted_table_names : list
+        Names of the tables of the dependency database the domain object
+        persists records to
+    """
+
+    if progress.is_started():
+        if can_continue_domain_object(file_builder, object_factory,
+                                      persisted_table_names):
+            print(f"Resuming {file_builder.get_file_name().format('*')} "
+                  f"after {len(progress.get_files_written())} files written "
+                  "by a previous run")
+            return
+
+        print(f"Restarting {file_builder.get_file_name().format('*')}, "
+              "which cannot be resumed")
+        database = Sqlite_Database()
+        for table_name, row_id in \
+                progress.get_persisted_table_sizes().items():
+            database.delete_rows_after(table_name, row_id)
+        database.close_connection()
+
+        for file_number in progress.get_files_written():
+            file_path = os.path.join(
+                file_builder.get_output_directory(),
+                file_builder.get_numbered_file_name(file_number)
+            )
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+
+    database = Sqlite_Database()
+    progress.start({
+        table_name: database.get_table_size(table_name) or 0
+        for table_name in persisted_table_names
+    })
+    database.close_connection()
+
+
+def can_continue_domain_object(file_builder, object_factory,
+                               persisted_table_names):
+    """ Return whether a domain object interrupted by a previous run can be
+    continued from the output files that run wrote, rather than being
+    started again.
+
+    A domain object which persists records cannot be continued, as records
+    persisted by jobs whose output was not written would be duplicated, nor
+    can one which creates records in chunks, as its chunks are written in no
+    particular order. In the 'fused' execution mode each output file is
+    written by a single create job, so the remaining files can simply be
+    written. Otherwise the create job whose records were partly written must
+    be run again and create the same records, so a 'seed' must be given.
+
+    Parameters
+    ----------
+    file_builder : File_Builder
+        Instantiated file builder of the domain object
+    object_factory : ObjectFactory
+        Instantiated subclass of Creatable for the domain object
+    persisted_table_names : list
+        Names of the tables of the dependency database the domain object
+        persists records to
+
+    Returns
+    -------
+    bool
+        True if the domain object can be continued
+    """
+
+    if persisted_table_names or object_factory.creates_records_in_chunks():
+        return False
+
+    if is_fused(file_builder, object_factory):
+        return True
+    return object_factory.get_shared_args().get('seed') is not None
+
 
-    coordinator.start_create_parent_process()
-    coordinator.start_write_parent_process()
-    coordinator.populate_create_job_queue()
-    coordinator.join_parent_processes()
+def is_fused(file_builder, object_factory):
+    """ Return whether a domain object is run in the 'fused' execution mode,
+    each output file being created and written by a single create job.
+
+    Records created in chunks are streamed to the write parent thread, as
+    are records written to files limited to 'max_bytes_per_file', whose
+    number of records is not known in advance, so such domain objects are
+    always pipelined.
+
+    Parameters
+    ----------
+    file_builder : File_Builder
+        Instantiated file builder of the domain object
+    object_factory : ObjectFactory
+        Instantiated subclass of Creatable for the domain object
+
+    Returns
+    -------
+    bool
+        True if the domain object is run in the 'fused' execution mode
+    """
+
+    execution_mode = object_factory.get_shared_args().get(
+        'execution_mode', PIPELINED_EXECUTION_MODE
+    )
+    return execution_mode == FUSED_EXECUTION_MODE \
+        and not object_factory.creates_records_in_chunks() \
+        and file_builder.get_max_bytes_per_file() is None
 
 
 def instantiate_file_builder(factory_definition,
@@ -114,8 +472,8 @@ def instantiate_file_builder(factory_definition,
     dev_file_builder_args: dict
         Developer arguments defining where in the codebase file builder
         classes are defined
-    google_drive_connector: GoogleDriveConnector
-        Connection to enable files created to be uploaded to Google Drive
+    google_drive_connector: DriveUploader
+        Uploader queueing files created to be uploaded to Google Drive
 
     Returns
     -------
@@ -140,13 +498,61 @@ def instantiate_file_builder(factory_definition,
     return file_builder_class(google_drive_connector, factory_args)
 
 
-def get_google_drive_connector(factory_definition,
-                               current_time_string,
-                               shared_args):
-    """ Return an instance of the Google Drive Connector object if the
-    object factory specified in factory_definition is configured to have
-    records uploaded to google drive. The Google Drive root folder id specified
-    in shared_args is used as the Drive directory for upload.
+def start_drive_upload_service(factory_definitions, current_time_string,
+                               shared_args, worker_pools):
+    """ Start the service uploading files to Google Drive, if any domain
+    object is configured to have its files uploaded. A single connector is
+    used for the whole run, such that the folder files are uploaded to,
+    named by current_time_string within a folder named by the date within
+    the root folder given in shared_args, is found or created only once.
+
+    Parameters
+    ----------
+    factory_definitions : list
+        Domain object configurations as provided by user
+    current_time_string : string
+        Current time in HHMMSS format.  If the files created are uploaded to
+        GDrive this will be used as the name of the folder they are uploaded
+        into
+    shared_args: dict
+        User arguments defining parameters for multiprocessing and google drive
+        upload, which are fixed for all object factories and file builders
+    worker_pools : WorkerPools
+        Long-lived pools of the run, through whose queue manager write child
+        processes queue files to upload
+
+    Returns
+    -------
+    DriveUploadService
+        The started service, or None if no domain object uploads files
+    """
+
+    if not any(get_google_drive_flag(factory_definition)
+               for factory_definition in factory_definitions):
+        return None
+
+    number_of_upload_threads = shared_args.get(
+        'number_of_upload_threads', DEFAULT_NUMBER_OF_UPLOAD_THREADS
+    )
+    # the Google client libraries are slow to import, so are only imported
+    # where files are uploaded
+    google_drive_connector_class = get_class(
+        'utils', 'google_drive_connector', 'GoogleDriveConnector'
+    )
+    google_drive_connector = google_drive_connector_class(
+        shared_args['google_drive_root_folder_id'], current_time_string
+    )
+    upload_queue = worker_pools.get_queue_manager().Queue(
+        number_of_upload_threads * QUEUED_UPLOADS_PER_THREAD
+    )
+    return DriveUploadService(google_drive_connector, upload_queue,
+                              number_of_upload_threads)
+
+
+def get_google_drive_uploader(factory_definition, drive_upload_service):
+    """ Return an uploader queueing files on the Google Drive upload service
+    if the object factory specified in factory_definition is configured to
+    have records uploaded to google drive.
 
     If the factory_definition is not configured to upload to Drive, the method
     will return None.
@@ -155,26 +561,40 @@ def get_google_drive_connector(factory_definition,
     ----------
     factory_definition : dict
         A domain object configuration as provided by user
-    shared_args: dict
-        User arguments defining parameters for multiprocessing and google drive
-        upload, which are fixed for all object factories and file builders
-    current_time_string : string
-        Current time in HHMMSS format.  If the files created are uploaded to
-        GDrive this will be used as the name of the folder they are uploaded
-        into
+    drive_upload_service : DriveUploadService
+        The upload service of the run, or None if no domain object uploads
+        files
 
     Returns
     -------
-    GoogleDriveConnector
-        Instantiated connector object for uploading to a pre-defined google
-        drive directory.
+    DriveUploader
+        Uploader queueing files to be uploaded to a pre-defined google drive
+        directory.
     """
+
+    if get_google_drive_flag(factory_definition):
+        return drive_upload_service.get_uploader()
+    return None
+
+
+def get_google_drive_flag(factory_definition):
+    """ Return whether a domain object is configured to have its files
+    uploaded to Google Drive
+
+    Parameters
+    ----------
+    factory_definition : dict
+        A domain object configuration as provided by user
+
+    Returns
+    -------
+    bool
+        True if the domain object's files are to be uploaded
+    """
+
     google_drive_flag = \
         list(factory_definition.values())[0]['upload_to_google_drive'].upper()
-
-    if google_drive_flag == 'TRUE':
-        root_folder_id = shared_args['google_drive_root_folder_id']
-        return GoogleDriveConnector(root_folder_id, current_time_string)
+    return google_drive_flag == 'TRUE'
 
 
 def instantiate_object_factory(
@@ -306,7 +726,9 @@ def get_dev_object_factory_config(dev_factory_args, object_factory_name):
 def get_class(package_name, module_name, class_name):
     """ Return a given class which sits within a specified heirarchy.
     Used to return classes of filebuilders and domainobjectfactories to only
-    instantiate as and when that domainobject/filebuilder is required.
+    instantiate as and when that domainobject/filebuilder is required, and
+    of modules whose dependencies are slow to import, such as the Google
+    Drive connector, to only import them when they are used.
 
     Parameters
     ----------
@@ -377,6 +799,18 @@ def get_args():
                         help='JSON Configuration File Location')
     parser.add_argument('--dev_config', default='src/dev_config.json',
                         help='Developer Configuration File Location')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume the interrupted run of the same config')
+    parser.add_argument('--shard_index', '--shard-index', type=int,
+                        help='Index of the shard this run creates, from 0')
+    parser.add_argument('--shard_count', '--shard-count', type=int,
+                        help='Number of shards the records are split into')
+    parser.add_argument('--import_snapshot', '--import-snapshot',
+                        help='Dependency snapshot file to start the '
+                             'dependency database from')
+    parser.add_argument('--export_snapshot', '--export-snapshot',
+                        help='File to export the dependency database to as '
+                             'a snapshot once the run is finished')
     return parser.parse_args()
 
 
@@ -412,14 +846,46 @@ def validate_configs(configurations):
         sys.exit()
 
 
+def resume_run(run_manifest, configuration_digest):
+    """ Load the progress of a previous run of the same config from the run
+    manifest, such that it can be resumed.
+
+    Parameters
+    ----------
+    run_manifest : RunManifest
+        The manifest to load the progress of the previous run into
+    configuration_digest : String
+        Digest of the config of this run
+
+    Returns
+    -------
+    bool
+        True if the previous run can be resumed, False if there is no
+        dependency database, no run manifest, or the manifest is of a run
+        with a different config
+    """
+
+    if os.path.isfile('dependencies.db') and \
+            run_manifest.resume_run(configuration_digest):
+        print("Resuming previous run")
+        return True
+
+    print("No previous run of this config to resume, starting a new run")
+    return False
+
+
 def delete_database():
     """ Remove an existing database if one already exists. Used to ensure
     that subsequent generation is from a valid set of pre-generated
     dependencies.
     """
 
-    if os.path.exists('dependencies.db'):
-        os.unlink('dependencies.db')
+    # a database in WAL mode may leave its log and shared memory files behind,
+    # which must not be applied to the next run's database
+    for file_name in ('dependencies.db', 'dependencies.db-wal',
+                      'dependencies.db-shm'):
+        if os.path.exists(file_name):
+            os.unlink(file_name)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,224 @@
+import random
+
+
+class DependencyCache:
+    """ An in-memory copy of the database tables an object factory selects
+    random dependency records from, such as instruments and accounts.
+
+    Selecting a random row with SQL ('ORDER BY RANDOM() LIMIT 1') scans and
+    sorts the whole table for every record created. Instead, each table is
+    loaded once per process when first used and kept in memory, together with
+    its rows partitioned by the value of any attribute that rows are filtered
+    on, so a random (valid) row is selected in constant time.
+
+    Rows are cached in order of their values rather than the order they were
+    inserted, which varies between runs where several processes insert into
+    a table at once, and are selected using the random number generator of
+    the object factory. Selections are therefore reproducible when the object
+    factory's generator is seeded.
+
+    Cached tables are discarded, and so reloaded when next used, when records
+    are persisted to them through this process (see 'invalidate'), or when
+    another process has since added rows to them (see 'refresh'). Rows are
+    only ever appended to tables while records are created, so a table has
+    changed exactly when its greatest row ID has.
+
+    Attributes
+    ----------
+    database : Sqlite_Database
+        Connection to the database the cached tables are loaded from
+    random : Random
+        Random number generator rows are selected with
+    tables : dict
+        Rows of each cached table, keyed by table name
+    partitions : dict
+        Rows of cached tables satisfying a filter, keyed by the table name,
+        filtered attribute and its valid values
+    table_sizes : dict
+        Greatest row ID of each cached table when it was loaded, keyed by
+        table name
+    data_version : int
+        Data version of the database when the cached tables were last
+        checked for changes
+
+    Methods
+    -------
+    get_rows(table_name)
+        Return every row of a table
+    get_random_row(table_name)
+        Return a random row of a table
+    get_random_row_with_valid_attribute(table_name, attribute_to_validate,
+                                        valid_values)
+        Return a random row of a table with a valid value for an attribute
+    get_rows_with_valid_attribute(table_name, attribute_to_validate,
+                                  valid_values)
+        Return every row of a table with a valid value for an attribute
+    invalidate(table_name)
+        Discard a cached table
+    refresh()
+        Discard the cached tables other connections have added rows to since
+        they were loaded
+    """
+
+    def __init__(self, database, random_number_generator=None):
+        """ Set initial values of instance attributes. No tables are loaded
+        until first used.
+
+        Parameters
+        ----------
+        database : Sqlite_Database
+            Connection to the database tables are to be loaded from
+        random_number_generator : Random
+            Random number generator rows are selected with, which may be
+            reseeded between selections. Defaults to the 'random' module
+        """
+
+        self.__database = database
+        self.__random = random_number_generator or random
+        self.__tables = {}
+        self.__partitions = {}
+        self.__table_sizes = {}
+        self.__data_version = None
+
+    def get_rows(self, table_name):
+        """ Return every row of a table, loading it if not already cached
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to return the rows of
+
+        Returns
+        -------
+        List
+            SQLite3 Rows of the table, ordered by their values
+        """
+
+        if table_name not in self.__tables:
+            if self.__data_version is None:
+                self.__data_version = self.__database.get_data_version()
+            # the size is read before the rows, so rows committed in between
+            # are at worst reloaded by the next refresh, never missed
+            self.__table_sizes[table_name] = \
+                self.__database.get_table_size(table_name)
+            # values are compared as strings, as a column may hold NULLs
+            self.__tables[table_name] = sorted(
+                self.__database.retrieve(table_name),
+                key=lambda row: tuple(str(value) for value in row)
+            )
+        return self.__tables[table_name]
+
+    def get_random_row(self, table_name):
+        """ Return a random row of a table
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to select a row from
+
+        Returns
+        -------
+        SQLite3 Row
+            The randomly selected row
+        """
+
+        return self.__random.choice(self.get_rows(table_name))
+
+    def get_random_row_with_valid_attribute(
+            self, table_name, attribute_to_validate, valid_values
+    ):
+        """ Return a random row of a table, subject to the constraint that a
+        specified attribute must have a value in a specified list of valid
+        values. Every valid row is equally likely to be selected.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to select the valid row from
+        attribute_to_validate: String
+            Attribute for which the value will determine if row is valid
+        valid_values: List
+            List of 1 or more valid values for the attribute given by the
+            attribute_to_validate parameter
+
+        Returns
+        -------
+        SQLite3 Row
+            The randomly selected row, or None if no row is valid
+        """
+
+        valid_rows = self.get_rows_with_valid_attribute(
+            table_name, attribute_to_validate, valid_values
+        )
+        return self.__random.choice(valid_rows) if valid_rows else None
+
+    def get_rows_with_valid_attribute(
+            self, table_name, attribute_to_validate, valid_values
+    ):
+        """ Return every row of a table with a value for a specified
+        attribute in a specified list of valid values
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to return the valid rows of
+        attribute_to_validate: String
+            Attribute for which the value will determine if row is valid
+        valid_values: List
+            List of 1 or more valid values for the attribute given by the
+            attribute_to_validate parameter
+
+        Returns
+        -------
+        List
+            SQLite3 Rows of the table which are valid
+        """
+
+        key = (table_name, attribute_to_validate, tuple(valid_values))
+
+        if key not in self.__partitions:
+            valid_values = set(valid_values)
+            self.__partitions[key] = [
+                row for row in self.get_rows(table_name)
+                if row[attribute_to_validate] in valid_values
+            ]
+
+        return self.__partitions[key]
+
+    def invalidate(self, table_name):
+        """ Discard a cached table and its partitions, such that it is
+        reloaded when next used
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to discard
+        """
+
+        self.__tables.pop(table_name, None)
+        self.__table_sizes.pop(table_name, None)
+        self.__partitions = {
+            key: rows for key, rows in self.__partitions.items()
+            if key[0] != table_name
+        }
+
+    def refresh(self):
+        """ Discard each cached table another connection has added rows to
+        since it was loaded. Tables are only checked once another connection
+        has committed to the database since the last check, and only those
+        whose greatest row ID has changed are discarded, so commits to tables
+        which are not cached leave the cache intact. """
+
+        if not self.__tables:
+            return
+
+        data_version = self.__database.get_data_version()
+        if data_version == self.__data_version:
+            return
+
+        # the data version is read before the sizes, so a commit made while
+        # the sizes are compared is checked again by the next refresh
+        self.__data_version = data_version
+        for table_name, table_size in list(self.__table_sizes.items()):
+            if self.__database.get_table_size(table_name) != table_size:
+                self.invalidate(table_name)
@@ -0,0 +1,133 @@
+import queue
+import traceback
+from multiprocessing import Event, JoinableQueue, Process
+from database.sqlite_database import Sqlite_Database
+
+# Ways in which records created by create child processes are persisted to
+# the dependency database. With 'direct' persistence every create child
+# process inserts its own records. With 'service' persistence create child
+# processes put their records on a queue and carry on creating, while a
+# single dedicated process inserts them, so create child processes never wait
+# on the database's write lock.
+DIRECT_PERSISTENCE = 'direct'
+SERVICE_PERSISTENCE = 'service'
+PERSISTENCE_MODES = [DIRECT_PERSISTENCE, SERVICE_PERSISTENCE]
+
+# The maximum number of batches of records inserted in one transaction by the
+# persistence service
+MAXIMUM_BATCHES_PER_TRANSACTION = 64
+
+
+class PersistenceService:
+    """ A dedicated process which is the only writer to the dependency
+    database. Batches of records to persist are put on the service's queue as
+    (table name, records) tuples, usually by create child processes via
+    Creatable.persist_records, and inserted in order.
+
+    Attributes
+    ----------
+    persistence_queue : Multiprocessing JoinableQueue
+        Queue of batches of records to persist, passed to create child
+        processes when they are started
+    failed : Multiprocessing Event
+        Set by the service process should persisting any batch fail
+    process : Multiprocessing Process
+        The service process
+
+    Methods
+    -------
+    get_persistence_queue()
+        Return the queue of batches of records to persist
+    flush()
+        Wait for every batch put on the queue so far to be persisted
+    stop()
+        Persist every outstanding batch, then stop the service process
+    """
+
+    def __init__(self):
+        """ Start the service process """
+
+        self.__persistence_queue = JoinableQueue()
+        self.__failed = Event()
+        self.__process = Process(
+            target=run_persistence_service,
+            args=(self.__persistence_queue, self.__failed),
+            daemon=True
+        )
+        self.__process.start()
+
+    def get_persistence_queue(self):
+        """ Return the queue of batches of records to persist
+
+        Returns
+        -------
+        Multiprocessing JoinableQueue
+            Queue of (table name, records) tuples
+        """
+        return self.__persistence_queue
+
+    def flush(self):
+        """ Wait for every batch put on the queue so far to be persisted, such
+        that the records are visible to all other database connections.
+
+        Raises
+        ------
+        RuntimeError
+            If the service failed to persist any batch
+        """
+
+        self.__persistence_queue.join()
+        if self.__failed.is_set():
+            raise RuntimeError("Dependency persistence service failed to " +
+                               "persist records, see its output above")
+
+    def stop(self):
+        """ Persist every outstanding batch, then stop the service process """
+
+        self.__persistence_queue.put(None)
+        self.__process.join()
+
+
+def run_persistence_service(persistence_queue, failed):
+    """ Target of the persistence service process. Inserts batches of records
+    from the queue until a None is dequeued. Batches already on the queue
+    when a batch is dequeued are inserted in the same transaction.
+
+    Parameters
+    ----------
+    persistence_queue : Multiprocessing JoinableQueue
+        Queue of (table name, records) tuples to insert
+    failed : Multiprocessing Event
+        Set should inserting any batch fail
+    """
+
+    database = Sqlite_Database()
+    connection = database.get_connection()
+    stopping = False
+
+    while not stopping:
+        batches = [persistence_queue.get()]
+        while len(batches) < MAXIMUM_BATCHES_PER_TRANSACTION:
+            try:
+                batches.append(persistence_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        stopping = None in batches
+
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for batch in batches:
+                if batch is not None:
+                    table_name, records = batch
+                    database.persist_batch(table_name, records)
+            database.commit_changes()
+        except Exception:
+            traceback.print_exc()
+            connection.rollback()
+            failed.set()
+        finally:
+            for _ in batches:
+                persistence_queue.task_done()
+
+    database.close_connection()
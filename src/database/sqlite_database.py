@@ -1,7 +1,35 @@
+import csv
 import os.path
+import pathlib
 import sqlite3
-
-import pandas as pd
+from array import array
+
+# The default maximum number of records inserted per transaction by
+# persist_batch
+INSERT_CHUNK_SIZE = 10000
+
+# Pragmas set on every connection. The database is written ahead to a log
+# (WAL), so readers never block the writer nor the writer readers, and with
+# 'NORMAL' synchronous mode only checkpoints wait for the disk. The database
+# is rebuilt on every run, so durability on power loss is not required.
+CONNECTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -65536,  # negative values are in KiB, i.e. 64MiB
+    'mmap_size': 268435456,  # 256MiB
+    'temp_store': 'MEMORY'
+}
+
+# Tables read a batch at a time by the create jobs of domain objects
+# depending on them (see retrieve_batch). Each row is given a 'job_key' by
+# the create job persisting it: the job's start ID times JOB_KEYS_PER_JOB,
+# plus the position of the row among those the job persisted. Unlike the
+# order rows are inserted in, which varies between runs where several
+# processes insert into a table at once, the job keys of a table are the
+# same in every seeded run, and are indexed so batches are read in their
+# order without sorting the table.
+JOB_KEYED_TABLE_NAMES = ("counterparties", "swap_contracts", "swap_positions")
+JOB_KEYS_PER_JOB = 2 ** 32
 
 
 class Sqlite_Database:
@@ -15,6 +43,10 @@ class Sqlite_Database:
 
     Methods
     -------
+    configure_connection()
+        Set the pragmas tuning the database for concurrent use on the
+        connection.
+
     populate_prerequisite_table(table_name, file_name)
         Populate a prerequisite table, table_name from a file with name
         and location from the working directory given by file_name.
@@ -22,17 +54,16 @@ class Sqlite_Database:
     persist_batch(table_name, value_lists)
         Insertion of a set of records into a specified table.
 
-    format_list_for_insertion(value_list)
-        Utility method for persist methods where given lists are joined into
-        a query-friendly format.
-
     retrieve(table_name)
         Returns all records within a specified table.
 
-    retrieve_batch(table_name, batch_size, offset)
+    retrieve_batch(table_name, batch_size, offset, ordered)
         Retrieves a given number of records from a specified table from a
         given point onward.
 
+    get_job_keys(table_name)
+        Returns the job keys of a specified table, in order.
+
     retrieve_column_as_list(table_name, column_name)
         Retrieves one column of records from a given table.
 
@@ -42,6 +73,13 @@ class Sqlite_Database:
     get_table_size(table_name)
         Returns the number of records in a specified table.
 
+    delete_rows_after(table_name, row_id)
+        Deletes the records of a specified table inserted after a given row.
+
+    get_data_version()
+        Returns a value which changes whenever another connection commits
+        changes to the database.
+
     drop_table(table_name)
         Deletes a specified table.
 
@@ -52,6 +90,9 @@ class Sqlite_Database:
     commit_changes()
         Commit any changes made to the database since opening the connection.
 
+    export_snapshot(file_path)
+        Copies the database to a single, self-contained snapshot file.
+
     close_connection()
         Close the connection to the database.
 
@@ -72,10 +113,13 @@ class Sqlite_Database:
             Connection to the database.
         """
 
+        self.__job_keys = {}
+
         if not os.path.isfile("dependencies.db"):
             self.__connection = sqlite3.connect("dependencies.db",
                                                 timeout=30.0)
             self.__connection.row_factory = sqlite3.Row
+            self.configure_connection()
 
             instrument_def = {"instrument_id": "text",
                               "ric": "text",  # Todo remove this once the
@@ -89,15 +133,18 @@ class Sqlite_Database:
                             "account_type": "text",
                             "iban": "text"}
 
-            counterparty_def = {"id": "text"}
+            counterparty_def = {"id": "text",
+                                "job_key": "integer"}
 
-            swap_contract_def = {"id": "text"}
+            swap_contract_def = {"id": "text",
+                                 "job_key": "integer"}
 
             swap_position_def = {"swap_contract_id": "text",
                                  "ric": "text",
                                  "position_type": "text",
                                  "effective_date": "text",
-                                 "long_short": "text"}
+                                 "long_short": "text",
+                                 "job_key": "integer"}
 
             exchanges_def = {"country_of_issuance": "text",
                              "exchange_code": "text",
@@ -122,6 +169,12 @@ class Sqlite_Database:
                 self.drop_table(table_name)
                 self.create_table_from_dict(table_name, table_def)
 
+            for table_name in JOB_KEYED_TABLE_NAMES:
+                self.__connection.execute(
+                    "CREATE INDEX " + table_name + "_job_key ON " +
+                    table_name + " (job_key)"
+                )
+
             """ Populate exchange info and tickers """
             self.populate_prerequisite_table("exchanges", "exchange_info.csv")
             self.populate_prerequisite_table("tickers", "tickers.csv")
@@ -131,6 +184,16 @@ class Sqlite_Database:
             self.__connection = sqlite3.connect("dependencies.db",
                                                 timeout=30.0)
             self.__connection.row_factory = sqlite3.Row
+            self.configure_connection()
+
+    def configure_connection(self):
+        """ Set the pragmas given by CONNECTION_PRAGMAS on the connection.
+        The journal mode is stored in the database file itself, so setting it
+        only has an effect for the connection which creates the database.
+        """
+
+        for pragma, value in CONNECTION_PRAGMAS.items():
+            self.__connection.execute(f"PRAGMA {pragma} = {value}")
 
     def populate_prerequisite_table(self, table_name, file_name):
         """ Populate a prerequisite table, table_name from a file with name
@@ -145,14 +208,20 @@ class Sqlite_Database:
             relative to the working directory
         """
 
-        value_list = pd.read_csv(file_name).values.tolist()
-        self.persist_batch(table_name, value_list)
+        self.persist_batch(table_name, read_csv_rows(file_name))
 
-    def persist_batch(self, table_name, value_lists):
+    def persist_batch(self, table_name, value_lists,
+                      chunk_size=INSERT_CHUNK_SIZE):
         """ Insert a given list of records into a specified table of the
-        database. Each element of the value_lists list is formatted to be
-        syntactically correct for database insertion, and a single query
-        ran to insert all formatted rows.
+        database, using a parameterized query run over chunks of records.
+
+        If the connection is already in a transaction, the records are
+        inserted as part of it and committing them is left to the caller.
+        Otherwise each chunk is inserted in its own transaction, which takes
+        the database's write lock up front and is committed once the chunk is
+        inserted, so concurrent writers wait for each other (up to the
+        connection timeout) rather than failing, and no writer holds the lock
+        for longer than one chunk.
 
         Parameters
         ----------
@@ -167,33 +236,30 @@ class Sqlite_Database:
             [attr1_2, attr2_2, ..., attN_2],
             ...,
             [attr1_X, attr2_X, ..., attN_X]]
+        chunk_size : int
+            Maximum number of records to insert per transaction
         """
 
-        formatted_lists = []
-        for list in value_lists:
-            formatted_lists.append(self.format_list_for_insertion(list))
-        prepared_rows = ",".join(formatted_lists)
-        query = " ".join(("INSERT INTO", table_name, "VALUES", prepared_rows))
-        self.__connection.execute(query)
+        if not value_lists:
+            return
 
-    def format_list_for_insertion(self, value_list):
-        """ Format a given record to be syntactically correct for insertion
-        queries. This assumes that the value being inserted is of type 'text'
-        and wraps each value with apostraphes as such.
+        placeholders = ",".join("?" * len(value_lists[0]))
+        query = f"INSERT INTO {table_name} VALUES ({placeholders})"
 
-        Parameters
-        ----------
-        value_list : List
-            A single list representing the record to format.
+        if self.__connection.in_transaction:
+            self.__connection.executemany(query, value_lists)
+            return
 
-        Returns
-        -------
-        String
-            Syntactically correct string for insertion of a record .
-        """
-
-        values = "','".join(value_list)
-        return "".join(("('", values, "')"))
+        for start in range(0, len(value_lists), chunk_size):
+            self.__connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.__connection.executemany(
+                    query, value_lists[start:start + chunk_size]
+                )
+            except sqlite3.Error:
+                self.__connection.rollback()
+                raise
+            self.__connection.commit()
 
     def retrieve(self, table_name):
         """ Retrieves all records within a given table.
@@ -277,10 +343,17 @@ class Sqlite_Database:
         list = [row[column_name] for row in rows]
         return list
 
-    def retrieve_batch(self, table_name, batch_size, offset):
+    def retrieve_batch(self, table_name, batch_size, offset, ordered=False):
         """ Retrieves a batch of records from a specified table of a given
         size starting at a given offset.
 
+        Rows are otherwise in the order they were inserted, which varies
+        between runs where several processes insert into the table at once.
+        Rows of a table of JOB_KEYED_TABLE_NAMES may instead be ordered by
+        their job keys, which gives the same batches in every seeded run.
+        The batch is then read from the index of job keys, from the job key
+        at the offset, so the table is never sorted.
+
         Parameters
         ----------
         table_name : String
@@ -289,6 +362,8 @@ class Sqlite_Database:
             Amount of records to retrieve in the batch
         offset : int
             The RowID from which to start retrieval
+        ordered : bool
+            Whether to order rows by their job keys
 
         Returns
         -------
@@ -297,11 +372,47 @@ class Sqlite_Database:
         """
 
         cur = self.__connection.cursor()
-        cur.execute("SELECT * FROM " + table_name + " LIMIT ? OFFSET ?",
-                    (batch_size, offset))
+        if ordered:
+            job_keys = self.get_job_keys(table_name)
+            if offset >= len(job_keys):
+                return []
+            cur.execute("SELECT * FROM " + table_name +
+                        " WHERE job_key >= ? ORDER BY job_key LIMIT ?",
+                        (job_keys[offset], batch_size))
+        else:
+            cur.execute("SELECT * FROM " + table_name + " LIMIT ? OFFSET ?",
+                        (batch_size, offset))
         rows = cur.fetchall()
         return rows
 
+    def get_job_keys(self, table_name):
+        """ Returns the job keys of a table of JOB_KEYED_TABLE_NAMES, in
+        order, such that the job key at any offset is found without reading
+        the table. The keys are read from the table's index once, and again
+        only once rows have been added to the table.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table
+
+        Returns
+        -------
+        array
+            Job key of every row of the table, in ascending order
+        """
+
+        table_size = self.get_table_size(table_name)
+        if table_name not in self.__job_keys or \
+                self.__job_keys[table_name][0] != table_size:
+            cur = self.__connection.cursor()
+            cur.execute("SELECT job_key FROM " + table_name +
+                        " ORDER BY job_key")
+            self.__job_keys[table_name] = (
+                table_size, array('q', (row[0] for row in cur))
+            )
+        return self.__job_keys[table_name][1]
+
     # Retrieve randomly sampled amount of records from a table #
     # Currently Unused #
     def retrieve_sample(self, table_name, amount):
@@ -344,6 +455,40 @@ class Sqlite_Database:
         cur.execute("SELECT max(ROWID) from " + table_name)
         return cur.fetchone()[0]
 
+    def delete_rows_after(self, table_name, row_id):
+        """ Delete every record of a specified table with a greater row ID
+        than that given, i.e. those inserted since the table had that size,
+        and commit the deletion
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the table to delete records from
+        row_id : int
+            Row ID of the last record to keep, as returned by get_table_size
+        """
+
+        self.__connection.execute(
+            "DELETE FROM " + table_name + " WHERE ROWID > ?", (row_id,)
+        )
+        self.commit_changes()
+        self.__job_keys.pop(table_name, None)
+
+    def get_data_version(self):
+        """ Returns the data version of the database as seen by this
+        connection. The value differs between two calls if any other
+        connection has committed changes to the database in between.
+
+        Returns
+        -------
+        int
+            Data version of the database for this connection
+        """
+
+        cur = self.__connection.cursor()
+        cur.execute("PRAGMA data_version")
+        return cur.fetchone()[0]
+
     def drop_table(self, table_name):
         """ Delete a given table if it exists
 
@@ -388,6 +533,28 @@ class Sqlite_Database:
         """ Commit changes to a database, saving them. """
         self.__connection.commit()
 
+    def export_snapshot(self, file_path):
+        """ Copy the database, including changes committed by any other
+        connection, to a snapshot file, which can be imported by
+        import_snapshot as the dependency database of other runs. The
+        snapshot does not use a write ahead log, so is a single file.
+
+        Parameters
+        ----------
+        file_path : String
+            Path of the snapshot file, which is replaced if it exists
+        """
+
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+        snapshot = sqlite3.connect(file_path)
+        try:
+            self.__connection.backup(snapshot)
+            snapshot.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            snapshot.close()
+
     def close_connection(self):
         """ Close the connection to the database. """
         self.__connection.close()
@@ -395,3 +562,51 @@ class Sqlite_Database:
     def get_connection(self):
         """Return the database connection. For testing purposes mainly """
         return self.__connection
+
+
+def read_csv_rows(file_name):
+    """ Return the rows of a csv file, less its header row, with every value
+    as a string. The prerequisite tables hold only text, so the rows are
+    read with the csv library rather than pandas, which is then never
+    imported by the application.
+
+    Parameters
+    ----------
+    file_name : String
+        Name of the csv file, relative to the working directory
+
+    Returns
+    -------
+    List
+        List of the values of each row
+    """
+
+    with open(file_name, newline='') as csv_file:
+        rows = csv.reader(csv_file)
+        next(rows, None)
+        return list(rows)
+
+
+def import_snapshot(file_path):
+    """ Create the dependency database as a copy of a snapshot file exported
+    by Sqlite_Database.export_snapshot. The snapshot is opened read-only, and
+    is left unchanged by the records the run persists. Any existing
+    dependency database must have been deleted beforehand.
+
+    Parameters
+    ----------
+    file_path : String
+        Path of the snapshot file
+    """
+
+    snapshot_uri = pathlib.Path(file_path).resolve().as_uri() + "?mode=ro"
+    snapshot = sqlite3.connect(snapshot_uri, uri=True)
+    connection = sqlite3.connect("dependencies.db")
+    try:
+        snapshot.backup(connection)
+        connection.execute(
+            f"PRAGMA journal_mode = {CONNECTION_PRAGMAS['journal_mode']}"
+        )
+    finally:
+        connection.close()
+        snapshot.close()
@@ -1,5 +1,4 @@
 from domainobjectfactories.creatable import Creatable
-import random
 
 
 class AccountFactory(Creatable):
@@ -12,7 +11,7 @@ class AccountFactory(Creatable):
                         'Rehypo', 'Collateral']
     ACCOUNT_STATUSES = ['Open', 'Closed']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of accounts
 
         Parameters
@@ -21,9 +20,6 @@ class AccountFactory(Creatable):
             Number of accounts to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -45,7 +41,7 @@ class AccountFactory(Creatable):
             )
 
         self.persist_records('accounts')
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self, id):
         """ Create a single account
@@ -76,9 +72,6 @@ class AccountFactory(Creatable):
             'closing_date': self.__create_closing_date(opening_date)
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     def __create_account_type(self):
@@ -89,7 +82,7 @@ class AccountFactory(Creatable):
         String
             randomly selected account type
         """
-        return random.choice(self.ACCOUNT_TYPES)
+        return self.get_random().choice(self.ACCOUNT_TYPES)
 
     def __create_account_purpose(self):
         """ Return an account purpose for from a collection of valid strings
@@ -99,7 +92,7 @@ class AccountFactory(Creatable):
         String
             randomly selected account purpose
         """
-        return random.choice(self.ACCOUNT_PURPOSES)
+        return self.get_random().choice(self.ACCOUNT_PURPOSES)
 
     def __create_account_description(self):
         """ Return an account purpose dummy string
@@ -119,7 +112,7 @@ class AccountFactory(Creatable):
         String
             randomly selected account status
         """
-        return random.choice(self.ACCOUNT_STATUSES)
+        return self.get_random().choice(self.ACCOUNT_STATUSES)
 
     def __create_iban(self):
         """
@@ -131,7 +124,7 @@ class AccountFactory(Creatable):
         String
            representative IBAN string
         """
-        country = random.choice(['GB', 'CH', 'FR', 'DE', 'SA'])
+        country = self.get_random().choice(['GB', 'CH', 'FR', 'DE', 'SA'])
         check_digits = str(self.create_random_integer(length=2))
         if country == 'GB':
             bban = self.create_random_string(4, include_numbers=False).upper()\
@@ -194,7 +187,7 @@ class AccountFactory(Creatable):
             randomly generated date in YYYYMMDD format, or "Empty"
         """
 
-        if random.getrandbits(1):  # fastest way to flip a coin
+        if self.get_random().getrandbits(1):  # fastest way to flip a coin
             return "Empty"
         else:
             from_year = int(opening_date[:4])
@@ -1,4 +1,3 @@
-import random
 from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
@@ -12,7 +11,7 @@ class BackOfficePositionFactory(Creatable):
     LEDGERS = ['TD', 'SD']
     PURPOSES = ['Outright', 'Obligation']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of back office positions
 
         Parameters
@@ -21,9 +20,6 @@ class BackOfficePositionFactory(Creatable):
             Number of back office positions to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
     factory subclasses
         Returns
@@ -37,7 +33,7 @@ class BackOfficePositionFactory(Creatable):
         for _ in range(start_id, start_id+record_count):
             records.append(self.__create_record())
 
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self):
         """ Create a single back office position
@@ -63,9 +59,6 @@ class BackOfficePositionFactory(Creatable):
             'purpose': self.__create_purpose()
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     @staticmethod
@@ -78,8 +71,7 @@ class BackOfficePositionFactory(Creatable):
         """
         return datetime.now(timezone.utc).date()
 
-    @staticmethod
-    def __create_value_date():
+    def __create_value_date(self):
         """ Return the 'value date', which must be today or in 2 days time
         Returns
         -------
@@ -89,7 +81,7 @@ class BackOfficePositionFactory(Creatable):
         """
         today = datetime.now(timezone.utc).date()
         day_after_tomorrow = today + timedelta(days=2)
-        return random.choice((today, day_after_tomorrow))
+        return self.get_random().choice((today, day_after_tomorrow))
 
     def __create_ledger(self):
         """ Return the 'ledger' string, which must be of the values specified'
@@ -97,7 +89,7 @@ class BackOfficePositionFactory(Creatable):
         String
            The ledger, one of 'TD' or 'SD'
         """
-        return random.choice(self.LEDGERS)
+        return self.get_random().choice(self.LEDGERS)
 
     def __get_instrument_details(self):
         """ Return the instrument id and isin of an instrument persisted in the
@@ -144,7 +136,7 @@ class BackOfficePositionFactory(Creatable):
             positive or negative integer with magnitude <= 10000
         """
         return self.create_random_integer(
-            negative=random.choice(self.TRUE_FALSE)
+            negative=self.get_random().choice(self.TRUE_FALSE)
         )
 
     def __create_purpose(self):
@@ -156,4 +148,4 @@ class BackOfficePositionFactory(Creatable):
             Back office position purposes are 'outright' or 'obligation''
         """
 
-        return random.choice(self.PURPOSES)
+        return self.get_random().choice(self.PURPOSES)
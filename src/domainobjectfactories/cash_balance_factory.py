@@ -1,4 +1,3 @@
-import random
 from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
@@ -12,7 +11,7 @@ class CashBalanceFactory(Creatable):
     CASH_BALANCE_PURPOSES = ['Cash Balance', 'P&L', 'Fees',
                              'Collateral Posted', 'Collateral Received']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of cash balances
 
         Parameters
@@ -21,9 +20,6 @@ class CashBalanceFactory(Creatable):
             Number of cash balances to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -36,7 +32,7 @@ class CashBalanceFactory(Creatable):
         for _ in range(start_id, start_id+record_count):
             records.append(self.__create_record())
 
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self):
         """ Create a single cash balance
@@ -58,13 +54,9 @@ class CashBalanceFactory(Creatable):
             'purpose': self.__create_purpose()
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
-    @staticmethod
-    def __create_as_of_date():
+    def __create_as_of_date(self):
         """ Return an 'as of date', being either the current date or the date
         in 2 days time
 
@@ -76,7 +68,7 @@ class CashBalanceFactory(Creatable):
         """
         today = datetime.now(timezone.utc).date()
         day_after_tomorrow = today + timedelta(days=2)
-        return random.choice((today, day_after_tomorrow))
+        return self.get_random().choice((today, day_after_tomorrow))
 
     def __create_amount(self):
         """ Return cash balance amount, being a positive or negative integer
@@ -88,7 +80,7 @@ class CashBalanceFactory(Creatable):
             positive or negative integer with magnitude < 10000
         """
         return self.create_random_integer(
-            negative=random.choice(self.TRUE_FALSE)
+            negative=self.get_random().choice(self.TRUE_FALSE)
         )
 
     def __create_account_details(self):
@@ -119,4 +111,4 @@ class CashBalanceFactory(Creatable):
             One of the possible purposes relevant for cash balances
         """
 
-        return random.choice(self.CASH_BALANCE_PURPOSES)
+        return self.get_random().choice(self.CASH_BALANCE_PURPOSES)
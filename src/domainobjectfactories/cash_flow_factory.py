@@ -1,5 +1,4 @@
 from datetime import datetime, timezone
-import random
 
 from domainobjectfactories.creatable import Creatable
 
@@ -9,7 +8,7 @@ class CashFlowFactory(Creatable):
         a set amount of cash flows."""
     PAYMENT_STATUSES = ['Actual', 'Contractual']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of cash flows
 
         Parameters
@@ -18,9 +17,6 @@ class CashFlowFactory(Creatable):
             Number of cash flows to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -33,7 +29,7 @@ class CashFlowFactory(Creatable):
         for _ in range(start_id, start_id+record_count):
             records.append(self.__create_record())
 
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self):
         """ Create a single cash flow
@@ -54,9 +50,6 @@ class CashFlowFactory(Creatable):
             'payment_date': self.__create_payment_date()
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     def __get_account_id(self):
@@ -101,7 +94,7 @@ class CashFlowFactory(Creatable):
             String
                 payment status, must be one of 'Contractual' or 'Actual'
             """
-        return random.choice(self.PAYMENT_STATUSES)
+        return self.get_random().choice(self.PAYMENT_STATUSES)
 
     @staticmethod
     def __create_payment_type():
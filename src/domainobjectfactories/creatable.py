@@ -1,9 +1,18 @@
+import hashlib
 import random
 import string
+import numpy as np
 from abc import ABC, abstractmethod
+from functools import partial
 from datetime import datetime, timezone, timedelta
 
-from database.sqlite_database import Sqlite_Database
+from database.sqlite_database import Sqlite_Database, INSERT_CHUNK_SIZE, \
+    JOB_KEYED_TABLE_NAMES, JOB_KEYS_PER_JOB
+from database.dependency_cache import DependencyCache
+
+# The default maximum number of records in each chunk created by factories
+# which create records in chunks, see Creatable.create_chunks
+DEFAULT_NUMBER_OF_RECORDS_PER_CHUNK = 10000
 
 
 class Creatable(ABC):
@@ -51,11 +60,32 @@ class Creatable(ABC):
         Records, or partial records, to persist to the database. Used to store
         attributes or objects other creations depend on
 
+    random : Random
+        Random number generator used to create single values, and to select
+        dependency records
+
+    random_generator : NumPy Generator
+        Random generator used by the batch creation methods, which create
+        values for many records at once rather than one record at a time
+
+    dummy_field_plan : List
+        Dummy fields specified in config, compiled on first use into the
+        names of the fields and the methods creating their values
+
     Methods
     -------
     create(record_count, start_id) : Abstract
         Create a given number of records, if id'd starting from given number
 
+    creates_records_in_chunks()
+        Return whether create jobs' records are created in bounded chunks
+
+    create_chunks(record_count, start_id)
+        Create the records of create, in chunks where supported
+
+    get_number_of_records_per_chunk()
+        Get the maximum number of records in each chunk
+
     create_random_string(length, include_letters, include_numbers)
         Create a random string of letters and/or numbers of given length
 
@@ -76,6 +106,52 @@ class Creatable(ABC):
     create_currency()
         Select a random currency from a pre-defined set
 
+    get_random()
+        Get the random number generator used to create single values
+
+    get_random_generator()
+        Get the NumPy random generator used by the batch creation methods
+
+    seed_random_generators(start_id)
+        Seed both random number generators for the create job starting from
+        the given id
+
+    start_create_job(start_id)
+        Prepare the object factory to run the create job starting from the
+        given id
+
+    create_random_strings(count, length, include_letters, include_numbers)
+        Create a given number of random strings at once
+
+    create_random_integers(count, min, max, length, negative)
+        Create a given number of random integers at once
+
+    create_random_decimals(count, min, max, dp)
+        Create a given number of random decimal numbers at once
+
+    create_random_choices(choices, count)
+        Select a given number of random values from a provided set at once
+
+    create_random_booleans(count)
+        Select a given number of random boolean values at once
+
+    create_currencies(count)
+        Select a given number of random currencies at once
+
+    get_dummy_field_plan()
+        Get the dummy fields specified in config, compiled into a plan of
+        columns
+
+    create_dummy_field_generator()
+        Create the dummy fields of a single record
+
+    create_dummy_field_columns(count)
+        Create the dummy fields of a given number of records at once, as one
+        list of values per field
+
+    add_dummy_fields(records)
+        Add dummy fields to each of a list of records, creating them at once
+
     create_asset_class()
         Select a random asset class from a pre-defined set
 
@@ -110,6 +186,44 @@ class Creatable(ABC):
     get_random_instrument()
         Return a random instrument from the set of all created intruments
 
+    get_random_account()
+        Return a random account from the set of all created accounts
+
+    get_random_instruments(count)
+        Return a given number of random instruments at once
+
+    get_random_row(table_name)
+        Return a random record from the given table
+
+    get_random_record_with_valid_attribute(table_name, attribute_to_validate,
+                                           valid_values)
+        Return a random record from the given table with a valid value for
+        the given attribute
+
+    get_random_records_with_valid_attribute(table_name, attribute_to_validate,
+                                            valid_values, count)
+        Return a given number of random records at once from the given table
+        with a valid value for the given attribute
+
+    get_dependency_cache()
+        Get the in-memory cache of tables dependency records are selected
+        from
+
+    get_lookup_table(table_name)
+        Get the columns of a prerequisite table, loaded once per object
+        factory
+
+    get_random_lookup_values(table_name, count)
+        Return the values of a given number of random rows of a
+        prerequisite table at once
+
+    set_persistence_queue(persistence_queue)
+        Set the queue of the persistence service to send persisted records to
+
+    refresh_dependency_cache()
+        Discard cached tables which have had rows added since they were
+        loaded
+
     persist_record(record)
         Add record to list of those to be persisted
 
@@ -161,33 +275,99 @@ class Creatable(ABC):
         self.__config = factory_args
         self.__shared_args = shared_args
         self.__database = None
+        self.__dependency_cache = None
+        self.__lookup_tables = {}
+        self.__persistence_queue = None
+        self.__random = random.Random()
+        self.__random_generator = None
+        self.__dummy_field_plan = None
         self.__persisting_records = []
-        self.instruments = None
-        self.accounts = None
+        self.__job_start_id = 0
+        self.__job_records_persisted = 0
 
     @abstractmethod
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of records for a domain object, where ID's
         are sequential, start from a given id. Concrete implementations
         provided by each domain object """
 
         pass
 
-    def create_dummy_field_generator(self):
-        """ Return generator of dummy fields based on user
-        specification in config for the domain object subclass calling
-        this function
+    def creates_records_in_chunks(self):
+        """ Return whether the records of a create job are created in chunks
+        by create_chunks, to be sent on for writing as each chunk is created,
+        rather than all at once by create. Factories for which a single job
+        may create an unbounded number of records override this, along with
+        create_chunks.
 
         Returns
         -------
-        Generator:
-            iterable that yields key/value pairs as specified in the config
+        bool
+            True if create_chunks creates records in bounded chunks
         """
+        return False
+
+    def create_chunks(self, record_count, start_id):
+        """ Create the records of a create job in chunks of at most
+        'number_of_records_per_chunk' records, where the factory creates
+        records in chunks. Otherwise all records are created by create and
+        produced as a single chunk.
+
+        Parameters
+        ----------
+        record_count : int
+            Number of records to create, as given to create
+        start_id : int
+            Starting id to create from
+
+        Returns
+        -------
+        Generator
+            Lists of records, or RecordBatches, in creation order
+        """
+        yield self.create(record_count, start_id)
+
+    def get_number_of_records_per_chunk(self):
+        """ Return the maximum number of records in each chunk created by
+        create_chunks, as set by 'number_of_records_per_chunk' in the user
+        config, or DEFAULT_NUMBER_OF_RECORDS_PER_CHUNK if not set
+
+        Returns
+        -------
+        int
+            Maximum number of records per chunk
+        """
+        return (self.__shared_args or {}).get(
+            'number_of_records_per_chunk', DEFAULT_NUMBER_OF_RECORDS_PER_CHUNK
+        )
+
+    def get_dummy_field_plan(self):
+        """ Return the dummy fields specified in config for the domain object
+        subclass calling this function, compiled into a plan of columns. The
+        config is compiled once per factory, on first use, so that creating
+        dummy fields does not re-read the config, re-format field names or
+        re-select the method creating values of each field.
+
+        Each entry of the plan describes the fields of one dummy field
+        specification in config, all of which have the same data type and
+        length: the names of those fields in order, and the method creating
+        a given number of values of that type and length at once.
+
+        Returns
+        -------
+        List
+            Tuples of field names and a method taking a number of values to
+            create and returning a list of values
+        """
+        if self.__dummy_field_plan is not None:
+            return self.__dummy_field_plan
+
+        self.__dummy_field_plan = []
         if self.__config is None:
             # workaround since testing does not always use a config file
             # eventually a testing config will be created and used
             # at which point this 'if' statement can be removed
-            return iter(())
+            return self.__dummy_field_plan
 
         object_name = self.__config["file_type_args"]["xml_item_name"]
         field_number = 1
@@ -201,14 +381,87 @@ class Creatable(ABC):
             data_length = dummy_field["data_length"]
 
             if data_type == "string":
-                data_method = self.create_random_string
+                create_values = partial(
+                    self.create_random_strings, length=data_length
+                )
             elif data_type == "numeric":
-                data_method = self.create_random_integer
+                create_values = partial(
+                    self.create_random_integers, length=data_length
+                )
+
+            field_names = [
+                f'{object_name}_field{number}' for number in
+                range(field_number, field_number + field_count)
+            ]
+            self.__dummy_field_plan.append((field_names, create_values))
+            field_number += field_count
+
+        return self.__dummy_field_plan
+
+    def create_dummy_field_generator(self):
+        """ Return generator of dummy fields based on user
+        specification in config for the domain object subclass calling
+        this function
+
+        Returns
+        -------
+        Generator:
+            iterable that yields key/value pairs as specified in the config
+        """
+        for field_names, create_values in self.get_dummy_field_plan():
+            yield from zip(field_names, create_values(len(field_names)))
 
-            for _ in range(field_count):
-                yield f'{object_name}_field{field_number}',\
-                      data_method(length=data_length)
-                field_number += 1
+    def create_dummy_field_columns(self, count):
+        """ Return the dummy fields specified in config for the domain object
+        subclass calling this function, for a given number of records at once,
+        as one list of values per field. The values of all fields of each
+        entry of the dummy field plan are created by a single call, then
+        divided between the fields.
+
+        Parameters
+        ----------
+        count : int
+            Number of records to create dummy fields for
+
+        Returns
+        -------
+        Dict
+            Values of each dummy field for every record, keyed by field name
+        """
+        columns = {}
+
+        for field_names, create_values in self.get_dummy_field_plan():
+            values = create_values(count * len(field_names))
+            for index, field_name in enumerate(field_names):
+                columns[field_name] = values[index * count:
+                                             (index + 1) * count]
+
+        return columns
+
+    def add_dummy_fields(self, records):
+        """ Add the dummy fields specified in config for the domain object
+        subclass calling this function to each of the given records, creating
+        the values of every record at once
+
+        Parameters
+        ----------
+        records : List
+            Records as dictionaries, which are updated in place
+
+        Returns
+        -------
+        List
+            The given records
+        """
+        columns = self.create_dummy_field_columns(len(records))
+        if not columns:
+            return records
+
+        field_names = list(columns)
+        for record, values in zip(records, zip(*columns.values())):
+            record.update(zip(field_names, values))
+
+        return records
 
     def create_random_string(self, length,
                                include_letters=True, include_numbers=True):
@@ -236,7 +489,7 @@ class Creatable(ABC):
         if include_numbers:
             choices += string.digits
 
-        return ''.join(random.choices(choices, k=length))
+        return ''.join(self.get_random().choices(choices, k=length))
 
     def create_random_boolean(self):
         """ Return a random boolean value
@@ -247,10 +500,9 @@ class Creatable(ABC):
             Random True or False value
         """
 
-        return random.choice(self.TRUE_FALSE)
+        return self.get_random().choice(self.TRUE_FALSE)
 
-    @staticmethod
-    def create_random_date(from_year=2016, from_month=1, from_day=1):
+    def create_random_date(self, from_year=2016, from_month=1, from_day=1):
         """ Creates a random date between a 'from_date' and today. if not
         specified, the 'from_date' defaults to 1/1/2016 to ensure a reasonably
         range of dates is available to be selected from.
@@ -275,7 +527,7 @@ class Creatable(ABC):
         if date_range_in_days < 0:
             raise Exception("from date is in the future")
         return from_date + timedelta(
-            days=random.randint(0, date_range_in_days)
+            days=self.get_random().randint(0, date_range_in_days)
         )
 
     def create_random_integer(self, min=1, max=10000,
@@ -305,7 +557,7 @@ class Creatable(ABC):
             min = 10 ** (length - 1)
             max = (10 ** length) - 1
 
-        value = random.randint(min, max)
+        value = self.get_random().randint(min, max)
         return value if not negative else -value
 
     def create_random_decimal(self, min=10, max=10000, dp=2):
@@ -327,7 +579,7 @@ class Creatable(ABC):
             Randomly created value between min and max to dp decimal places
         """
 
-        return round(random.uniform(min, max), dp)
+        return round(self.get_random().uniform(min, max), dp)
 
     def create_currency(self):
         """ Create a random currency from a set list
@@ -338,7 +590,242 @@ class Creatable(ABC):
             Random currency from a pre-defined list
         """
 
-        return random.choice(self.CURRENCIES)
+        return self.get_random().choice(self.CURRENCIES)
+
+    def get_random(self):
+        """ Returns the random number generator used to create single values
+        and to select dependency records. It is reseeded for every create
+        job by seed_random_generators, rather than using the global state of
+        the 'random' module which every forked child process shares.
+
+        Returns
+        -------
+        Random
+            Random number generator of this object factory
+        """
+        return self.__random
+
+    def get_random_generator(self):
+        """ Returns the NumPy random generator used by the batch creation
+        methods, creating it on first use. The generator is replaced for
+        every create job by seed_random_generators.
+
+        Returns
+        -------
+        NumPy Generator
+            Random generator of this object factory
+        """
+
+        if self.__random_generator is None:
+            self.__random_generator = np.random.default_rng()
+        return self.__random_generator
+
+    def seed_random_generators(self, start_id):
+        """ Seed both random number generators for the create job starting
+        from the given id.
+
+        Where 'seed' is given in the user config, the generators are seeded
+        from a hash of that seed, the name of the object factory and the
+        start id, so every create job draws from its own stream of random
+        numbers which is the same in every run, whichever child process runs
+        the job and in whatever order. Otherwise they are seeded from the
+        operating system's source of randomness.
+
+        Parameters
+        ----------
+        start_id : int
+            Starting id of the create job
+        """
+
+        seed = (self.__shared_args or {}).get('seed')
+        if seed is None:
+            self.__random.seed()
+            self.__random_generator = np.random.default_rng()
+            return
+
+        digest = hashlib.sha256(
+            f'{seed}:{self.__class__.__name__}:{start_id}'.encode()
+        ).digest()
+        self.__random.seed(int.from_bytes(digest[:16], 'big'))
+        self.__random_generator = np.random.default_rng(
+            int.from_bytes(digest[16:], 'big')
+        )
+
+    def start_create_job(self, start_id):
+        """ Prepare the object factory to run the create job starting from
+        the given id, seeding its random number generators and numbering
+        the records it persists from the start of the job.
+
+        Parameters
+        ----------
+        start_id : int
+            Starting id of the create job
+        """
+
+        self.seed_random_generators(start_id)
+        self.__job_start_id = start_id
+        self.__job_records_persisted = 0
+
+    def create_random_strings(self, count, length,
+                              include_letters=True, include_numbers=True):
+        """ Creates a number of random strings at once, each as would be
+        created by create_random_string.
+
+        Parameters
+        ----------
+        count : int
+            Number of random strings to create
+        length : int
+            Length of each random string
+        include_letters : Boolean
+            Boolean flag of whether letters are included in the strings
+        include_numbers : Boolean
+            Boolean flag of whether numbers are included in the strings
+
+        Returns
+        -------
+        List
+            'count' random strings of letters or numbers or both
+        """
+
+        choices = ''
+        if include_letters:
+            choices += string.ascii_uppercase
+
+        if include_numbers:
+            choices += string.digits
+
+        if length == 0:
+            return [''] * count
+
+        # select 'length' characters for each string as a 2D array of single
+        # character strings, then view each row as one string of 'length'
+        characters = np.array(list(choices))[
+            self.get_random_generator().integers(
+                0, len(choices), size=(count, length)
+            )
+        ]
+        return characters.view(f'U{length}').ravel().tolist()
+
+    def create_random_integers(self, count, min=1, max=10000,
+                               length=None, negative=False):
+        """ Create a number of random integers at once, each as would be
+        created by create_random_integer.
+
+        Parameters
+        ----------
+        count : int
+            Number of random integers to create
+        min : int
+            Minimum value of the range
+        max : int
+            Maximum value of the range
+        length : int
+            Length of each integer
+        negative : Boolean
+            Boolean flag indicating if values should be negative
+
+        Returns
+        -------
+        List
+            'count' integers between given min, max values, or of given
+            length, and negative if specified.
+        """
+
+        if length is not None:
+            min = 10 ** (length - 1)
+            max = (10 ** length) - 1
+
+        # integers beyond the range of a 64-bit integer cannot be created by
+        # NumPy, so are created one at a time
+        if max >= np.iinfo(np.int64).max:
+            values = [self.get_random().randint(min, max)
+                      for _ in range(count)]
+        else:
+            values = self.get_random_generator().integers(
+                min, max, size=count, endpoint=True
+            ).tolist()
+
+        return values if not negative else [-value for value in values]
+
+    def create_random_decimals(self, count, min=10, max=10000, dp=2):
+        """ Create a number of random numbers between a given range to a
+        given number of decimal places at once, each as would be created by
+        create_random_decimal.
+
+        Parameters
+        ----------
+        count : int
+            Number of random numbers to create
+        min : int
+            Minimum value of the range
+        max : int
+            Maximum value of the range
+        dp : int
+            Number of decimal places to create the values to
+
+        Returns
+        -------
+        List
+            'count' random floats between min and max to dp decimal places
+        """
+
+        return np.round(
+            self.get_random_generator().uniform(min, max, size=count), dp
+        ).tolist()
+
+    def create_random_choices(self, choices, count):
+        """ Select a number of random values from a given list at once
+
+        Parameters
+        ----------
+        choices : List
+            Values to select from
+        count : int
+            Number of values to select
+
+        Returns
+        -------
+        List
+            'count' values, each selected at random from 'choices'
+        """
+
+        indices = self.get_random_generator().integers(
+            0, len(choices), size=count
+        )
+        return [choices[index] for index in indices.tolist()]
+
+    def create_random_booleans(self, count):
+        """ Create a number of random boolean values at once
+
+        Parameters
+        ----------
+        count : int
+            Number of boolean values to create
+
+        Returns
+        -------
+        List
+            'count' random True or False values
+        """
+
+        return self.create_random_choices(self.TRUE_FALSE, count)
+
+    def create_currencies(self, count):
+        """ Create a number of random currencies from a set list at once
+
+        Parameters
+        ----------
+        count : int
+            Number of currencies to create
+
+        Returns
+        -------
+        List
+            'count' random currencies from a pre-defined list
+        """
+
+        return self.create_random_choices(self.CURRENCIES, count)
 
     def create_asset_class(self):
         """ Create a random asset class from a set list
@@ -349,7 +836,7 @@ class Creatable(ABC):
             Random asset class from a pre-defined list
         """
 
-        return random.choice(self.ASSET_CLASSES)
+        return self.get_random().choice(self.ASSET_CLASSES)
 
     def create_ric(self, ticker, exchange_code):
         """ Appends two input values to "ticker.exchange_code"
@@ -395,7 +882,7 @@ class Creatable(ABC):
             Random value between credit or debit
         """
 
-        return random.choice(self.CREDIT_DEBIT)
+        return self.get_random().choice(self.CREDIT_DEBIT)
 
     def create_long_short(self):
         """ Create a random long or short value
@@ -406,7 +893,7 @@ class Creatable(ABC):
             Random value between long or short
         """
 
-        return random.choice(self.LONG_SHORT)
+        return self.get_random().choice(self.LONG_SHORT)
 
     def create_position_type(self, no_sd=False, no_td=False):
         """ Create a random position type
@@ -429,7 +916,7 @@ class Creatable(ABC):
             choices.remove('SD')
         if no_td:
             choices.remove('TD')
-        return random.choice(choices)
+        return self.get_random().choice(choices)
 
     def create_knowledge_date(self):
         """ Create a knowledge day value
@@ -480,8 +967,8 @@ class Creatable(ABC):
             appended with a 4-digit random string of characters
         """
         # TODO: REMOVE COMPLETELY ONCE ALL FACTORIES UPDATED
-        account_type = random.choice(account_types)
-        random_string = ''.join(random.choices(string.digits, k=4))
+        account_type = self.get_random().choice(account_types)
+        random_string = ''.join(self.get_random().choices(string.digits, k=4))
         return ''.join([account_type, random_string])
 
     def create_return_type(self):
@@ -493,7 +980,7 @@ class Creatable(ABC):
             Random return type chosen from a pre-determined list
         """
 
-        return random.choice(self.RETURN_TYPES)
+        return self.get_random().choice(self.RETURN_TYPES)
 
     # THESE ARE NON-GENERATING, UTILITY METHODS USED WHERE NECESSARY #
 
@@ -519,13 +1006,11 @@ class Creatable(ABC):
         Returns
         -------
         SQLite3 Row
-            The single row returned by the query
+            The randomly selected record, or None if no record is valid
         """
 
-        if self.__database is None:
-            self.establish_db_connection()
-
-        return self.__database.retrieve_row_with_valid_attribute(
+        return self.get_dependency_cache(
+        ).get_random_row_with_valid_attribute(
             table_name, attribute_to_validate, valid_values
         )
 
@@ -534,37 +1019,193 @@ class Creatable(ABC):
 
         Returns
         -------
-        List
+        SQLite3 Row
             Single record from the instruments table of the database
         """
 
-        if self.instruments is None:
-            self.instruments = self.retrieve_records('instruments')
-        return random.choice(self.instruments)
+        return self.get_dependency_cache().get_random_row('instruments')
 
     def get_random_account(self):
-        """ Returns a random instrument from those created prior
+        """ Returns a random account from those created prior
+
+        Returns
+        -------
+        SQLite3 Row
+            Single record from the accounts table of the database
+        """
+
+        return self.get_dependency_cache().get_random_row('accounts')
+
+    def get_random_instruments(self, count):
+        """ Returns a number of random instruments from those created prior
+
+        Parameters
+        ----------
+        count : int
+            Number of instruments to return
 
         Returns
         -------
         List
-            Single record from the instruments table of the database
+            'count' SQLite3 Rows from the instruments table of the database
         """
 
-        if self.accounts is None:
-            self.accounts = self.retrieve_records('accounts')
-        return random.choice(self.accounts)
+        return self.create_random_choices(
+            self.get_dependency_cache().get_rows('instruments'), count
+        )
+
+    def get_random_records_with_valid_attribute(
+            self, table_name, attribute_to_validate, valid_values, count
+    ):
+        """ returns a number of random records from a specified database
+        table at once, each as would be returned by
+        get_random_record_with_valid_attribute
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the database table to select the valid records from
+        attribute_to_validate: String
+            Attribute for which the value will determine if record is valid
+        valid_values: List
+            List of 1 or more valid values for the attribute given by the
+            attribute_to_validate parameter
+        count : int
+            Number of records to return
+
+        Returns
+        -------
+        List
+            'count' randomly selected records, or Nones if no record is valid
+        """
+
+        valid_records = self.get_dependency_cache(
+        ).get_rows_with_valid_attribute(
+            table_name, attribute_to_validate, valid_values
+        )
+
+        if not valid_records:
+            return [None] * count
+        return self.create_random_choices(valid_records, count)
 
     def get_random_row(self, table_name):
-        """ Returns a random from from provided table
+        """ Returns a random record from provided table
+
+        Returns
+        -------
+        SQLite3 Row
+            Single record from the table passed in
+        """
 
-                Returns
-                -------
-                List
-                    Single record from the table passed in
-                """
+        return self.get_dependency_cache().get_random_row(table_name)
 
-        return random.choice(self.retrieve_records(table_name))
+    def get_dependency_cache(self):
+        """ Returns the in-memory cache of the database tables that random
+        dependency records are selected from, creating it on first use. The
+        cache lives as long as this object factory, which a child process
+        keeps between create jobs.
+
+        Returns
+        -------
+        DependencyCache
+            Cache of tables loaded from the database by this process
+        """
+
+        if self.__dependency_cache is None:
+            if self.__database is None:
+                self.establish_db_connection()
+            self.__dependency_cache = DependencyCache(
+                self.__database, self.__random
+            )
+        return self.__dependency_cache
+
+    def get_lookup_table(self, table_name):
+        """ Returns the columns of a lookup table: one of the prerequisite
+        tables, such as exchanges and tickers, populated from csv files
+        before any records are created and never changed afterwards. Each is
+        therefore loaded once per object factory, and so once per child
+        process, when first used, and is unaffected by changes to the
+        dependency cache.
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the prerequisite table
+
+        Returns
+        -------
+        dict
+            Read-only NumPy array of the values of each column, in the order
+            of the table's rows, keyed by column name
+        """
+
+        if table_name not in self.__lookup_tables:
+            rows = self.retrieve_records(table_name)
+            columns = {}
+            for column_name in rows[0].keys() if rows else []:
+                values = np.array([row[column_name] for row in rows])
+                values.flags.writeable = False
+                columns[column_name] = values
+            self.__lookup_tables[table_name] = columns
+        return self.__lookup_tables[table_name]
+
+    def get_random_lookup_values(self, table_name, count):
+        """ Selects a number of random rows of a lookup table at once (see
+        get_lookup_table)
+
+        Parameters
+        ----------
+        table_name : String
+            Name of the prerequisite table to select rows from
+        count : int
+            Number of rows to select
+
+        Returns
+        -------
+        dict
+            Lists of the values of each column of the selected rows, keyed
+            by column name
+
+        Raises
+        ------
+        IndexError
+            If the table is empty
+        """
+
+        columns = self.get_lookup_table(table_name)
+        if not columns:
+            raise IndexError(f"Cannot select from empty table {table_name}")
+
+        indices = self.get_random_generator().integers(
+            0, len(next(iter(columns.values()))), size=count
+        )
+        return {column_name: values[indices].tolist()
+                for column_name, values in columns.items()}
+
+    def set_persistence_queue(self, persistence_queue):
+        """ Sets the queue of the persistence service that persist_records
+        sends records to, instead of inserting them itself. Set by create
+        child processes after unpickling the object factory, since the queue
+        cannot be pickled with it.
+
+        Parameters
+        ----------
+        persistence_queue : Multiprocessing JoinableQueue
+            Queue of the persistence service, or None to insert records
+            directly
+        """
+
+        self.__persistence_queue = persistence_queue
+
+    def refresh_dependency_cache(self):
+        """ Discards cached dependency tables to which another process has
+        added rows since they were loaded. Called
+        before each create job, so records created by a job are selected from
+        up-to-date tables.
+        """
+
+        if self.__dependency_cache is not None:
+            self.__dependency_cache.refresh()
 
     def persist_record(self, record):
         """ Adds a given record to the list of records to persist in storage
@@ -579,7 +1220,15 @@ class Creatable(ABC):
 
     def persist_records(self, table_name):
         """ Insert all records currently set to be persisted into a specified
-        table
+        table, then empty the list of records to persist. The list is emptied
+        since an object factory is reused for every create job a child
+        process runs for its domain object. Records are inserted in
+        transactions of at most 'number_of_records_per_insert' records, as
+        given in the shared args, unless a persistence queue is set, in which
+        case the records are sent to the persistence service to insert.
+
+        Records persisted to a table of JOB_KEYED_TABLE_NAMES are given a job
+        key, following from those persisted earlier in the create job.
 
         Parameters
         ----------
@@ -587,10 +1236,34 @@ class Creatable(ABC):
             Name of the table to persist records to
         """
 
-        if self.__database is None:
-            self.establish_db_connection()
-        self.__database.persist_batch(table_name, self.__persisting_records)
-        self.__database.commit_changes()
+        if table_name in JOB_KEYED_TABLE_NAMES:
+            first_job_key = self.__job_start_id * JOB_KEYS_PER_JOB + \
+                self.__job_records_persisted
+            self.__persisting_records = [
+                list(record) + [first_job_key + position]
+                for position, record in enumerate(self.__persisting_records)
+            ]
+            self.__job_records_persisted += len(self.__persisting_records)
+
+        if self.__persistence_queue is not None:
+            self.__persistence_queue.put(
+                (table_name, self.__persisting_records)
+            )
+        else:
+            if self.__database is None:
+                self.establish_db_connection()
+
+            chunk_size = (self.__shared_args or {}).get(
+                'number_of_records_per_insert', INSERT_CHUNK_SIZE
+            )
+            self.__database.persist_batch(
+                table_name, self.__persisting_records, chunk_size
+            )
+            self.__database.commit_changes()
+        self.__persisting_records = []
+
+        if self.__dependency_cache is not None:
+            self.__dependency_cache.invalidate(table_name)
 
     def retrieve_records(self, table_name):
         """ Selects all records from a given database table
@@ -635,6 +1308,9 @@ class Creatable(ABC):
         """ Selects a batch of records from a given table. Retrieval will
         start from the given position, and take the next amount of records
 
+        Where 'seed' is given in the user config, rows are ordered by their
+        job keys, so that the batch is the same in every run.
+
         Parameters
         ----------
         table_name : String
@@ -653,7 +1329,13 @@ class Creatable(ABC):
 
         if self.__database is None:
             self.establish_db_connection()
-        return self.__database.retrieve_batch(table_name, amount, start_pos)
+
+        # the order rows were inserted in varies between runs, so batches are
+        # only the same in every run if rows are ordered by their job keys
+        return self.__database.retrieve_batch(
+            table_name, amount, start_pos,
+            ordered=(self.__shared_args or {}).get('seed') is not None
+        )
 
     def get_database(self):
         """ Returns the database connection object
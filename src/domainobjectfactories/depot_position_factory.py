@@ -1,4 +1,3 @@
-import random
 from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
@@ -11,7 +10,7 @@ class DepotPositionFactory(Creatable):
 
     DEPOT_POSITION_PURPOSES = ['Holdings', 'Seg', 'Pending Holdings']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of depot positions
 
         Parameters
@@ -20,9 +19,6 @@ class DepotPositionFactory(Creatable):
             Number of depot positions to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -35,7 +31,7 @@ class DepotPositionFactory(Creatable):
         for _ in range(start_id, start_id+record_count):
             records.append(self.__create_record())
 
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self):
         """ Create a single depot position
@@ -59,9 +55,6 @@ class DepotPositionFactory(Creatable):
             'quantity': self.__create_quantity()
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     @staticmethod
@@ -74,8 +67,7 @@ class DepotPositionFactory(Creatable):
         """
         return datetime.now(timezone.utc).date()
 
-    @staticmethod
-    def __create_value_date():
+    def __create_value_date(self):
         """ Return the 'value date', which must be today or in 2 days time
         Returns
         -------
@@ -85,7 +77,7 @@ class DepotPositionFactory(Creatable):
         """
         today = datetime.now(timezone.utc).date()
         day_after_tomorrow = today + timedelta(days=2)
-        return random.choice((today, day_after_tomorrow))
+        return self.get_random().choice((today, day_after_tomorrow))
 
     def __get_instrument_details(self):
         """ Return the isin, cusip and market of an instrument persisted in the
@@ -129,7 +121,7 @@ class DepotPositionFactory(Creatable):
             Depot position purposes are one of Holdings, Seg, or
             Pending Holdings
         """
-        return random.choice(self.DEPOT_POSITION_PURPOSES)
+        return self.get_random().choice(self.DEPOT_POSITION_PURPOSES)
 
     def __create_quantity(self):
         return self.create_random_integer()
@@ -1,4 +1,3 @@
-import random
 from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
@@ -10,7 +9,7 @@ class FrontOfficePositionFactory(Creatable):
     where front office positions are the only domain object requiring them.
     """
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of front office positions
 
         Parameters
@@ -19,9 +18,6 @@ class FrontOfficePositionFactory(Creatable):
             Number of front office positions to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -33,7 +29,7 @@ class FrontOfficePositionFactory(Creatable):
 
         for _ in range(start_id, start_id + record_count):
             records.append(self.__create_record())
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self):
         """ Create a single front office position
@@ -53,9 +49,6 @@ class FrontOfficePositionFactory(Creatable):
             'purpose': self.__create_purpose()
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     @staticmethod
@@ -69,8 +62,7 @@ class FrontOfficePositionFactory(Creatable):
         """
         return datetime.now(timezone.utc).date()
 
-    @staticmethod
-    def __create_value_date():
+    def __create_value_date(self):
         """ Return the 'value date', which must be today or in 2 days time
 
         Returns
@@ -81,7 +73,7 @@ class FrontOfficePositionFactory(Creatable):
         """
         today = datetime.now(timezone.utc).date()
         day_after_tomorrow = today + timedelta(days=2)
-        return random.choice((today, day_after_tomorrow))
+        return self.get_random().choice((today, day_after_tomorrow))
 
     def __create_account_id(self):
         """ Return a account id from an account persisted in the database where
@@ -118,7 +110,7 @@ class FrontOfficePositionFactory(Creatable):
             positive or negative integer with magnitude < 10000
         """
         return self.create_random_integer(
-            negative=random.choice(self.TRUE_FALSE)
+            negative=self.get_random().choice(self.TRUE_FALSE)
         )
 
     @staticmethod
@@ -1,14 +1,20 @@
 import itertools
-import random
 from datetime import datetime, timezone
 
+import numpy as np
+
 from domainobjectfactories.creatable import Creatable
+from domainobjectfactories.record_batch import RecordBatch
 
 
 class InstrumentFactory(Creatable):
     """ Class to create instruments. Create method creates a set amount
     of positions. Other creation methods included where instruments are the
     only domain object requiring these.
+
+    Exchanges and tickers are selected from lookup tables, loaded from the
+    database once per child process (see Creatable.get_lookup_table), rather
+    than queried for every job or record.
     """
 
     ASSET_CLASS_TO_SUBCLASS = {'Equity': ['Common', 'Preferred'],
@@ -18,7 +24,19 @@ class InstrumentFactory(Creatable):
     INDUSTRY_CLASSIFICATIONS = \
         ['MANUFACTURING', 'TELECOMS', 'FINANCIAL SERVICES', 'GROCERIES']
 
-    def create(self, record_count, start_id, lock):
+    FIGI_CONSONANTS = ['B', 'C', 'D', 'F', 'G', 'H', 'J', 'K', 'L', 'M', 'N',
+                       'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'Y', 'Z']
+    FIGI_CONSONANTS_AND_NUMBERS = FIGI_CONSONANTS + \
+        ['1', '2', '3', '4', '5', '6', '7', '8', '9']
+
+    # pairs of distinct consonants which may begin a FIGI
+    FIGI_PREFIXES = [
+        ''.join(pair)
+        for pair in itertools.permutations(FIGI_CONSONANTS, 2)
+        if ''.join(pair) not in ['BS', 'BM', 'GG', 'GB', 'GH', 'KY', 'VG']
+    ]
+
+    def create(self, record_count, start_id):
         """ Create a set number of instruments
 
         Parameters
@@ -27,175 +45,120 @@ class InstrumentFactory(Creatable):
             Number of instruments to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Lock ensures database access will be thread safe if multiple
-            processes are attempting to generate instruments
 
         Returns
         -------
-        List
+        RecordBatch
             Containing 'record_count' instruments
         """
 
-        lock.acquire()
-        self.tickers = self.retrieve_column('tickers', "symbol")
-        lock.release()
-
-        records = []
+        exchanges = self.get_random_lookup_values('exchanges', record_count)
+        countries_of_issuance = exchanges['country_of_issuance']
+        exchange_codes = exchanges['exchange_code']
+        tickers = self.__create_tickers(record_count)
+        cusips = self.create_random_integers(record_count, length=9)
+        asset_classes = self.__create_asset_classes(record_count)
+        primary_markets = self.__get_markets(record_count)
+        markets = self.__get_markets(record_count)
+
+        # each attribute is created for every record of the job at once, and
+        # the records are returned column by column as a RecordBatch
+        columns = {
+            'instrument_id': range(start_id, start_id + record_count),
+            'ric': [self.create_ric(ticker, exchange_code) for
+                    ticker, exchange_code in zip(tickers, exchange_codes)],
+            'isin': [self.create_isin(country_of_issuance, cusip) for
+                     country_of_issuance, cusip in
+                     zip(countries_of_issuance, cusips)],
+            'sedol': self.create_random_integers(record_count, length=7),
+            'ticker': tickers,
+            'cusip': cusips,
+            'valoren': self.create_random_integers(record_count, 100000,
+                                                   999999999),
+            'quick': self.create_random_integers(record_count, length=4),
+            'sicovam': self.create_random_integers(record_count, length=6),
+            'asset_class': asset_classes,
+            'asset_subclass': self.__create_asset_sub_classes(asset_classes),
+            'country_of_issuance': countries_of_issuance,
+            'primary_market': primary_markets,
+            'market': markets,
+            'is_primary_listing': [
+                primary_market == market for primary_market, market
+                in zip(primary_markets, markets)
+            ],
+            'figi': self.__create_figis(record_count),
+            'issuer_name': self.create_random_strings(record_count, 10),
+            'industry_classification':
+                self.__get_industry_classifications(record_count),
+            'created_timestamp': [datetime.now(timezone.utc)
+                                  for _ in range(record_count)],
+            'last_updated_time_stamp': [datetime.now(timezone.utc)
+                                        for _ in range(record_count)]
+        }
 
-        for i in range(start_id, start_id + record_count):
-            record = self.__create_record(i)
-            records.append(record)
+        for instrument_id, ric, cusip, isin, market in zip(
+                columns['instrument_id'], columns['ric'], cusips,
+                columns['isin'], markets
+        ):
             self.persist_record(
-                [str(record['instrument_id']),
-                 record['ric'],
-                 str(record['cusip']),
-                 str(record['isin']),
-                 str(record['market'])]
+                [str(instrument_id), ric, str(cusip), str(isin), str(market)]
             )
-
         self.persist_records("instruments")
-        return records
 
-    def __create_record(self, id):
-        """ Create a single instrument
+        columns.update(self.create_dummy_field_columns(record_count))
 
-        Parameters
-        ----------
-        id : int
-            Current id of the instrument to create, used as a pseudo
-            exchange code to ensure uniquely created instruments
+        return RecordBatch(columns)
 
-        Returns
-        -------
-        dict
-            A single back office position object
-        """
-
-        ticker = self.__create_ticker()
-        random_exchanges_row = self.get_random_row('exchanges')
-        country_of_issuance = \
-            self.__create_country_of_issuance(random_exchanges_row)
-        exchange_code = self.__create_exchange_code(random_exchanges_row)
-        ric = self.create_ric(ticker, exchange_code)
-        cusip = self.create_random_integer(length=9)
-        isin = self.create_isin(country_of_issuance, cusip)
-        sedol = self.create_random_integer(length=7)
-        valoren = self.create_random_integer(100000,
-                                             999999999)
-        quick = self.create_random_integer(length=4)
-        sicovam = self.create_random_integer(length=6)
-        asset_class = self.__create_asset_class()
-        asset_subclass = self.__create_asset_sub_class(asset_class)
-        primary_market = self.__get_market()
-        market = self.__get_market()
-        is_primary_listing = primary_market == market
-        figi = self.__create_figi()
-        issuer_name = self.create_random_string(10)
-        industry_classification = self.__get_industry_classification()
-
-        record = {
-            'instrument_id': id,
-            'ric': ric,
-            'isin': isin,
-            'sedol': sedol,
-            'ticker': ticker,
-            'cusip': cusip,
-            'valoren': valoren,
-            'quick': quick,
-            'sicovam': sicovam,
-            'asset_class': asset_class,
-            'asset_subclass': asset_subclass,
-            'country_of_issuance': country_of_issuance,
-            'primary_market': primary_market,
-            'market': market,
-            'is_primary_listing': is_primary_listing,
-            'figi': figi,
-            'issuer_name': issuer_name,
-            'industry_classification': industry_classification,
-            'created_timestamp': datetime.now(timezone.utc),
-            'last_updated_time_stamp': datetime.now(timezone.utc)
-        }
-
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
-        return record
-
-    def __create_asset_class(self):
-        """ Create a predetermined asset class for instruments
+    def __create_asset_classes(self, count):
+        """ Create predetermined asset classes for instruments
 
         Returns
         -------
-        String
-            Asset class of an instrument will be one of
-            'Stock', 'Equity', 'Index' or 'Derivative'
-        """
-
-        return random.choice(list(self.ASSET_CLASS_TO_SUBCLASS.keys()))
-
-    def __create_asset_sub_class(self, asset_class):
-        """ Create a predetermined asset sub-class for instruments
-
-        Returns
-        -------
-        String
-            Asset sub-class of an instrument depends on its asset class
+        List
+            Asset class of each instrument, each one of 'Equity', 'Fund' or
+            'Derivative'
         """
 
-        return random.choice(self.ASSET_CLASS_TO_SUBCLASS[asset_class])
+        return self.create_random_choices(
+            list(self.ASSET_CLASS_TO_SUBCLASS.keys()), count
+        )
 
-    def __get_market(self):
-        """Select a random country to be market
+    def __create_asset_sub_classes(self, asset_classes):
+        """ Create predetermined asset sub-classes for instruments
 
         Returns
         -------
-        String
-            Randomly selected country selected from database
+        List
+            Asset sub-class of each instrument, which depends on its asset
+            class
         """
-        return self.get_random_row('exchanges')['exchange_code']
 
-    @staticmethod
-    def __create_country_of_issuance(random_exchanges_row):
-        """ Select a random country of issuance
-
-        Returns
-        -------
-        String
-            Select country of issuance field from the randomly selected row
-            from the exchanges table
-        """
-        assert ('country_of_issuance' in random_exchanges_row.keys()), \
-            f"country_of_issuance not present in row.  Fields are: " \
-            f"{random_exchanges_row.keys()}"
-        return random_exchanges_row['country_of_issuance']
+        return [self.get_random().choice(
+            self.ASSET_CLASS_TO_SUBCLASS[asset_class]
+        ) for asset_class in asset_classes]
 
-    def __create_ticker(self):
-        """ Create a random ticker
+    def __get_markets(self, count):
+        """Select random exchanges to be markets
 
         Returns
         -------
-        String
-            Randomly selected ticker from those in the database
+        List
+            Exchange codes of randomly selected rows of the exchanges table
         """
+        return self.get_random_lookup_values(
+            'exchanges', count
+        )['exchange_code']
 
-        return random.choice(self.tickers)
-
-    @staticmethod
-    def __create_exchange_code(random_exchanges_row):
-        """ Select a random exchange code
+    def __create_tickers(self, count):
+        """ Create random tickers
 
         Returns
         -------
-        String
-            Select exchange code field from the randomly selected row from the
-            exchanges table
+        List
+            Randomly selected tickers from those in the database
         """
 
-        assert ('exchange_code' in random_exchanges_row.keys()), \
-            f"exchange_code not present in row.  Fields are: " \
-            f"{random_exchanges_row.keys()}"
-        return random_exchanges_row['exchange_code']
+        return self.get_random_lookup_values('tickers', count)['symbol']
 
     def __create_issuer_name(self):
         """Create a random 10 character issuer name
@@ -207,49 +170,43 @@ class InstrumentFactory(Creatable):
         """
         return self.create_random_string(length=10, include_numbers=False)
 
-    @staticmethod
-    def __create_figi():
-        """Create a random valid FIGI
+    def __create_figis(self, count):
+        """Create random valid FIGIs
 
         Returns
         -------
-        String
-            Randomly generate a FIGI
+        List
+            Randomly generated FIGIs
         """
 
-        consonants = ['B', 'C', 'D', 'F', 'G', 'H', 'J', 'K', 'L', 'M', 'N',
-                      'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'Y', 'Z']
-        consonants_and_numbers = consonants + ['1', '2', '3', '4', '5', '6',
-                                               '7', '8', '9']
-
-        random.shuffle(consonants)
-        combination_generator = map(''.join,
-                                    itertools.permutations(consonants, 2))
-        invalid_combinations = ['BS', 'BM', 'GG', 'GB', 'GH', 'KY', 'VG']
-
-        while True:
-            combination = next(combination_generator)
-            if combination not in invalid_combinations:
-                break
+        prefixes = self.create_random_choices(self.FIGI_PREFIXES, count)
 
         character_three = 'G'
 
-        characters_four_to_eleven = \
-            random.choices(consonants_and_numbers, k=8)
+        # select 8 characters for each FIGI as a 2D array of single
+        # character strings, then view each row as one string of 8
+        characters_four_to_eleven = np.array(
+            self.FIGI_CONSONANTS_AND_NUMBERS
+        )[self.get_random_generator().integers(
+            0, len(self.FIGI_CONSONANTS_AND_NUMBERS), size=(count, 8)
+        )].view('U8').ravel().tolist()
 
         # TODO Currently the final digit is being randomly generated,
         #  whereas in a true FIGI it is based on the preceding characters
-        character_twelve = str(random.randint(0, 9))
+        characters_twelve = self.create_random_integers(count, 0, 9)
 
-        return combination + character_three + ''.join(
-            characters_four_to_eleven) + character_twelve
+        return [prefix + character_three + characters + str(character_twelve)
+                for prefix, characters, character_twelve
+                in zip(prefixes, characters_four_to_eleven,
+                       characters_twelve)]
 
-    def __get_industry_classification(self):
-        """Randomly select an industry classification
+    def __get_industry_classifications(self, count):
+        """Randomly select industry classifications
 
         Returns
         -------
-        String
-            A randomly chosen industry classification
+        List
+            Randomly chosen industry classifications
         """
-        return random.choice(self.INDUSTRY_CLASSIFICATIONS)
+        return self.create_random_choices(self.INDUSTRY_CLASSIFICATIONS,
+                                          count)
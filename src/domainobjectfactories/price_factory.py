@@ -1,13 +1,14 @@
 from datetime import datetime, timezone
 
 from domainobjectfactories.creatable import Creatable
+from domainobjectfactories.record_batch import RecordBatch
 
 
 class PriceFactory(Creatable):
     """ Class to create prices. Create method will create a set amount
     of prices. """
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of prices
 
         Parameters
@@ -16,43 +17,30 @@ class PriceFactory(Creatable):
             Number of prices to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
-        List
+        RecordBatch
             Containing 'record_count' prices
         """
 
-        records = []
-
-        for _ in range(start_id, start_id+record_count):
-            record = self.__create_record()
-            records.append(record)
-
-        return records
-
-    def __create_record(self):
-        """ Create a single price
-
-        Returns
-        -------
-        dict
-            A single price object
-        """
-
-        instrument = self.get_random_instrument()
-        record = {
-            'instrument_id': instrument['instrument_id'],
-            'price': self.create_random_decimal(min=1, max=10, dp=2),
-            'currency': self.create_currency(),
-            'created_timestamp': datetime.now(timezone.utc),
-            'last_updated_time_stamp': datetime.now(timezone.utc)
-            }
-
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
-        return record
+        instruments = self.get_random_instruments(record_count)
+
+        # each attribute is created for every record of the job at once, and
+        # the records are returned column by column as a RecordBatch
+        columns = {
+            'instrument_id': [instrument['instrument_id']
+                              for instrument in instruments],
+            'price': self.create_random_decimals(
+                record_count, min=1, max=10, dp=2
+            ),
+            'currency': self.create_currencies(record_count),
+            'created_timestamp': [datetime.now(timezone.utc)
+                                  for _ in range(record_count)],
+            'last_updated_time_stamp': [datetime.now(timezone.utc)
+                                        for _ in range(record_count)]
+        }
+
+        columns.update(self.create_dummy_field_columns(record_count))
+
+        return RecordBatch(columns)
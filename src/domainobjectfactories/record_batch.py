@@ -0,0 +1,216 @@
+from itertools import chain
+
+
+class RecordBatch:
+    """ A batch of records held column by column, i.e. as one list of values
+    per field rather than one dictionary per record. Object factories which
+    create records a column at a time may return a RecordBatch from their
+    create method in place of a list of records, saving a dictionary (and
+    the hashing of every key) per record, and file builders may then write
+    the columns directly.
+
+    A RecordBatch otherwise behaves as a read-only list of records:
+    iterating over it, or indexing it with an integer, produces each record
+    as a dictionary, so code expecting a list of records is unaffected.
+    Slicing it produces another RecordBatch.
+
+    Attributes
+    ----------
+    columns : dict
+        Values of each field, keyed by field name in record order. Every
+        column is of the same length
+
+    Methods
+    -------
+    from_records(records) : Class Method
+        Return a RecordBatch holding the given list of records
+    concatenate(batches) : Class Method
+        Return a RecordBatch holding the records of each given batch in turn
+    get_field_names()
+        Return the names of the fields of each record
+    get_column(field_name)
+        Return the values of a field for every record
+    get_rows()
+        Return an iterator over the values of each record as tuples
+    to_records()
+        Return the records as a list of dictionaries
+    """
+
+    def __init__(self, columns):
+        """ Set the columns of the batch.
+
+        Parameters
+        ----------
+        columns : dict
+            Values of each field, keyed by field name in record order. Values
+            may be any iterable, and are stored as lists
+
+        Raises
+        ------
+        ValueError
+            If the columns are not all of the same length
+        """
+
+        self.__columns = {
+            field_name: values if isinstance(values, list) else list(values)
+            for field_name, values in columns.items()
+        }
+
+        if len({len(values) for values in self.__columns.values()}) > 1:
+            raise ValueError("All columns of a RecordBatch must be of the " +
+                             "same length")
+
+    @classmethod
+    def from_records(cls, records):
+        """ Return a RecordBatch holding the given list of records, each of
+        which must have the same fields as the first
+
+        Parameters
+        ----------
+        records : List
+            Records as dictionaries
+
+        Returns
+        -------
+        RecordBatch
+            Batch holding the records
+        """
+
+        if not records:
+            return cls({})
+
+        return cls({
+            field_name: [record[field_name] for record in records]
+            for field_name in records[0]
+        })
+
+    @classmethod
+    def concatenate(cls, batches):
+        """ Return a RecordBatch holding the records of each given batch in
+        turn. Empty batches are ignored.
+
+        Parameters
+        ----------
+        batches : List
+            RecordBatches with the same fields
+
+        Returns
+        -------
+        RecordBatch
+            Batch holding the records of all the given batches
+
+        Raises
+        ------
+        ValueError
+            If the batches do not have the same fields
+        """
+
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls({})
+
+        field_names = batches[0].get_field_names()
+        if any(batch.get_field_names() != field_names for batch in batches):
+            raise ValueError("RecordBatches with different fields cannot " +
+                             "be concatenated")
+
+        return cls({
+            field_name: list(chain.from_iterable(
+                batch.get_column(field_name) for batch in batches
+            ))
+            for field_name in field_names
+        })
+
+    def get_field_names(self):
+        """ Return the names of the fields of each record
+
+        Returns
+        -------
+        List
+            Field names in record order
+        """
+        return list(self.__columns)
+
+    def get_column(self, field_name):
+        """ Return the values of a field for every record
+
+        Parameters
+        ----------
+        field_name : String
+            Name of the field
+
+        Returns
+        -------
+        List
+            Value of the field for each record in turn
+        """
+        return self.__columns[field_name]
+
+    def get_rows(self):
+        """ Return an iterator over the values of each record, as tuples
+        ordered as the field names
+
+        Returns
+        -------
+        Iterator
+            Tuple of field values for each record in turn
+        """
+        return zip(*self.__columns.values())
+
+    def to_records(self):
+        """ Return the records as a list of dictionaries
+
+        Returns
+        -------
+        List
+            Records as dictionaries
+        """
+        return list(self)
+
+    def __len__(self):
+        """ Return the number of records in the batch """
+        if not self.__columns:
+            return 0
+        return len(next(iter(self.__columns.values())))
+
+    def __iter__(self):
+        """ Iterate over the records of the batch, each as a dictionary """
+        field_names = self.get_field_names()
+        for values in self.get_rows():
+            yield dict(zip(field_names, values))
+
+    def __getitem__(self, index):
+        """ Return the record at an integer index as a dictionary, or the
+        records of a slice as a RecordBatch """
+
+        if isinstance(index, slice):
+            return RecordBatch({
+                field_name: values[index]
+                for field_name, values in self.__columns.items()
+            })
+
+        return {field_name: values[index]
+                for field_name, values in self.__columns.items()}
+
+
+def concatenate_records(record_lists):
+    """ Return the records of each given list or RecordBatch of records in
+    turn, as a RecordBatch if every one given is a RecordBatch, otherwise as
+    a list of records.
+
+    Parameters
+    ----------
+    record_lists : List
+        Lists or RecordBatches of records
+
+    Returns
+    -------
+    List or RecordBatch
+        All records given
+    """
+
+    if record_lists and all(isinstance(records, RecordBatch)
+                            for records in record_lists):
+        return RecordBatch.concatenate(record_lists)
+
+    return [record for records in record_lists for record in records]
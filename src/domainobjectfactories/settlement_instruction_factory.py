@@ -1,4 +1,3 @@
-import random
 from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
@@ -10,9 +9,8 @@ class SettlementInstructionFactory(Creatable):
     ACCOUNT_TYPE = ['SAFE', 'CASH']
     INSTRUCTION_TYPE = ['DVP', 'RVP', 'DELIVERY FREE', 'RECEIVABLE FREE']
     STATUS = ['MATCHED', 'UNMATCHED']
-    message_reference_list = []
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of settlement instructions
 
         Parameters
@@ -21,9 +19,6 @@ class SettlementInstructionFactory(Creatable):
             Number of settlement instructions to create
         start_id : int
             Starting id to use when creating message references
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -33,17 +28,35 @@ class SettlementInstructionFactory(Creatable):
 
         message_reference_beginning = self.create_random_string(10)
 
+        # settlement instructions link only to those created earlier in the
+        # same job, so that the links do not depend on which jobs happened
+        # to run before it in the same process
+        message_reference_list = []
+
         records = []
 
         for i in range(start_id, record_count + start_id):
-            record = self.__create_record(i, message_reference_beginning)
+            record = self.__create_record(
+                i, message_reference_beginning, message_reference_list
+            )
             records.append(record)
 
-        return records
+        return self.add_dummy_fields(records)
 
-    def __create_record(self, id, message_reference_beginning):
+    def __create_record(self, id, message_reference_beginning,
+                        message_reference_list):
         """ Create a single instrument
 
+        Parameters
+        ----------
+        id : int
+            Id to append to the message reference
+        message_reference_beginning : String
+            Beginning of the message reference shared by the job
+        message_reference_list : List
+            Message references of the settlement instructions created
+            earlier in the job, to which this one's is appended
+
         Returns
         -------
         dict
@@ -57,11 +70,11 @@ class SettlementInstructionFactory(Creatable):
         function = self.__get_function()
         message_creation_timestamp = datetime.now(timezone.utc)
         linked_message = \
-            self.__get_linked_message(self.message_reference_list)
+            self.__get_linked_message(message_reference_list)
         # message_reference is added to message_reference_list after
         # generating linked_message, otherwise the linked_message
         # could be this settlement instruction's own message reference
-        self.message_reference_list.append(message_reference)
+        message_reference_list.append(message_reference)
         linkage_type = self.__get_linkage_type()
         place_of_trade = self.__get_place_of_trade()
         trade_datetime = datetime.now(timezone.utc)
@@ -106,9 +119,6 @@ class SettlementInstructionFactory(Creatable):
             'status': status
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     def __create_message_reference(self, message_reference_beginning, id):
@@ -124,10 +134,9 @@ class SettlementInstructionFactory(Creatable):
         String
             A randomly chosen function
         """
-        return random.choice(self.FUNCTIONS)
+        return self.get_random().choice(self.FUNCTIONS)
 
-    @staticmethod
-    def __get_linked_message(message_reference_list):
+    def __get_linked_message(self, message_reference_list):
         """ 50/50 chance of returning EMPTY or the message reference of
         a previously generated settlement instruction
 
@@ -140,8 +149,8 @@ class SettlementInstructionFactory(Creatable):
         if not message_reference_list:
             return "EMPTY"
         else:
-            return random.choice(
-                ["EMPTY", random.choice(message_reference_list)])
+            return self.get_random().choice(
+                ["EMPTY", self.get_random().choice(message_reference_list)])
 
     def __get_linkage_type(self):
         """ Randomly select a linkage type
@@ -151,7 +160,7 @@ class SettlementInstructionFactory(Creatable):
         String
             A randomly chosen linkage type
         """
-        return random.choice(self.LINKAGE_TYPE)
+        return self.get_random().choice(self.LINKAGE_TYPE)
 
     def __get_place_of_trade(self):
         """ Select a random exchange code
@@ -220,7 +229,7 @@ class SettlementInstructionFactory(Creatable):
         String
             A randomly chosen account type
         """
-        return random.choice(self.ACCOUNT_TYPE)
+        return self.get_random().choice(self.ACCOUNT_TYPE)
 
     @staticmethod
     def __get_settlement_type():
@@ -271,7 +280,7 @@ class SettlementInstructionFactory(Creatable):
         String
             A randomly chosen instruction type
         """
-        return random.choice(self.INSTRUCTION_TYPE)
+        return self.get_random().choice(self.INSTRUCTION_TYPE)
 
     def __get_status(self):
         """Randomly select a status
@@ -281,4 +290,4 @@ class SettlementInstructionFactory(Creatable):
         String
             A randomly chosen status
         """
-        return random.choice(self.STATUS)
+        return self.get_random().choice(self.STATUS)
@@ -1,4 +1,3 @@
-import random
 from datetime import datetime, timezone
 
 from domainobjectfactories.creatable import Creatable
@@ -12,7 +11,7 @@ class StockLoanPositionFactory(Creatable):
     COLLATERAL_TYPES = ['Cash', 'Non Cash']
     STOCK_LOAN_POSITION_PURPOSES = ['Borrow', 'Loan']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of stock loan positions
 
         Parameters
@@ -21,9 +20,6 @@ class StockLoanPositionFactory(Creatable):
             Number of stock loan positions to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
@@ -32,11 +28,10 @@ class StockLoanPositionFactory(Creatable):
 
         """
         records = []
-        self.instruments = self.retrieve_records('instruments')
 
         for i in range(start_id, start_id+record_count):
             records.append(self.create_record(i))
-        return records
+        return self.add_dummy_fields(records)
 
     def create_record(self, id):
         """ Create a single stock loan position record
@@ -79,9 +74,6 @@ class StockLoanPositionFactory(Creatable):
                 'time_stamp': datetime.now(timezone.utc)
             }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     def create_haircut(self, collateral_type):
@@ -125,7 +117,7 @@ class StockLoanPositionFactory(Creatable):
             'Cash' or 'Non Cash'
         """
 
-        return random.choice(self.COLLATERAL_TYPES)
+        return self.get_random().choice(self.COLLATERAL_TYPES)
 
     def create_termination_date(self):
         """ Creates a date for the termination of the loan
@@ -138,7 +130,7 @@ class StockLoanPositionFactory(Creatable):
             where end date chosen to not exist
         """
 
-        does_exist = random.choice([True, False])
+        does_exist = self.get_random().choice([True, False])
         return None if not does_exist else self.create_knowledge_date()
 
     def create_rebate_rate(self, collateral_type):
@@ -182,4 +174,4 @@ class StockLoanPositionFactory(Creatable):
             Random choice between Borrow or Loan
         """
 
-        return random.choice(self.STOCK_LOAN_POSITION_PURPOSES)
+        return self.get_random().choice(self.STOCK_LOAN_POSITION_PURPOSES)
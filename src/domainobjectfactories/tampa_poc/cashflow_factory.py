@@ -1,5 +1,4 @@
 import calendar
-import random
 from datetime import datetime, date
 
 from domainobjectfactories.creatable import Creatable
@@ -17,7 +16,7 @@ class CashflowFactory(Creatable):
     cashflows created.
     """
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of cashflows
 
         Parameters
@@ -42,8 +41,8 @@ class CashflowFactory(Creatable):
                    for swap_position in swap_position_batch
                    for cf_arg in cashflow_gen_args
                    if swap_position['position_type'] == 'E']
-        records = filter(None, records)
-        return records
+        records = [record for record in records if record is not None]
+        return self.add_dummy_fields(records)
 
     def create_record(self, swap_position, cf_arg):
         """ Create a single cashflow
@@ -80,9 +79,6 @@ class CashflowFactory(Creatable):
                 'long_short': swap_position['long_short']
             }
 
-            for key, value in self.create_dummy_field_generator():
-                record[key] = value
-
             return record
 
     def effective_date(self, effective_date):
@@ -195,5 +191,5 @@ class CashflowFactory(Creatable):
                 [(31, 3), (30, 6), (30, 9), (31, 12)]:
             return True
         elif accrual == "CHANCE_ACCRUAL" and \
-                random.random() < (int(probability) / 100):
+                self.get_random().random() < (int(probability) / 100):
             return True
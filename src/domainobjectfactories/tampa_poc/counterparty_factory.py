@@ -7,7 +7,7 @@ class CounterpartyFactory(Creatable):
     """ A class to create counterparties. Create method will create a
     set amount of positions. """
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of counterparties.
 
         Parameters
@@ -30,7 +30,7 @@ class CounterpartyFactory(Creatable):
             self.persist_record([str(i)])
 
         self.persist_records("counterparties")
-        return records
+        return self.add_dummy_fields(records)
 
     def __create_record(self, current_id):
         """ Create a single counterparty record
@@ -52,7 +52,4 @@ class CounterpartyFactory(Creatable):
             'time_stamp': datetime.now(timezone.utc)
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
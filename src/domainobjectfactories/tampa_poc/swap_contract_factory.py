@@ -1,4 +1,3 @@
-import random
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -18,7 +17,7 @@ class SwapContractFactory(Creatable):
     SWAP_TYPES = ['Equity', 'Portfolio']
     REFERENCE_RATES = ['LIBOR']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of swap contracts
 
         Parameters
@@ -43,7 +42,7 @@ class SwapContractFactory(Creatable):
                    for _ in range(0, self.get_number_of_swaps())]
 
         self.persist_records("swap_contracts")
-        return records
+        return self.add_dummy_fields(records)
 
     def create_record(self, counterparty):
         """ Create a single swap contract
@@ -62,7 +61,11 @@ class SwapContractFactory(Creatable):
 
         status = self.create_status()
         start_date = self.create_random_date()
-        contract_id = str(uuid.uuid1())
+        # a random (version 4) UUID drawn from the factory's generator, so
+        # contract ids are reproducible when the generator is seeded
+        contract_id = str(uuid.UUID(
+            int=self.get_random().getrandbits(128), version=4
+        ))
         self.persist_record([contract_id])
 
         record = {
@@ -81,9 +84,6 @@ class SwapContractFactory(Creatable):
             'time_stamp': datetime.now(timezone.utc)
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
     def get_number_of_swaps(self):
@@ -100,7 +100,7 @@ class SwapContractFactory(Creatable):
         swaps_per_counterparty = custom_args['swap_per_counterparty']
         swap_min = int(swaps_per_counterparty['min'])
         swap_max = int(swaps_per_counterparty['max'])
-        return random.randint(swap_min, swap_max)
+        return self.get_random().randint(swap_min, swap_max)
 
     def create_swap_end_date(self, years_to_add=5,
                                start_date=None, status=None):
@@ -137,7 +137,7 @@ class SwapContractFactory(Creatable):
 
         """
 
-        return random.choice(self.SWAP_TYPES)
+        return self.get_random().choice(self.SWAP_TYPES)
 
     def create_reference_rate(self):
         """ Create the reference rate
@@ -148,7 +148,7 @@ class SwapContractFactory(Creatable):
             Randomly chosen reference rate
         """
 
-        return random.choice(self.REFERENCE_RATES)
+        return self.get_random().choice(self.REFERENCE_RATES)
 
     def create_status(self):
         """ Create the current status of the swap
@@ -159,4 +159,4 @@ class SwapContractFactory(Creatable):
             Random choice between 'Live' and 'Dead'
         """
 
-        return random.choice(['Live', 'Dead'])
+        return self.get_random().choice(['Live', 'Dead'])
@@ -1,8 +1,6 @@
-import random
 import string
-from datetime import datetime, timezone
-
-import pandas as pd
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
 
 from domainobjectfactories.creatable import Creatable
 
@@ -22,7 +20,7 @@ class SwapPositionFactory(Creatable):
     PURPOSES = ['Outright']
     POSITION_TYPES = ['S', 'I', 'E']
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of swap positions
 
         Parameters
@@ -38,25 +36,91 @@ class SwapPositionFactory(Creatable):
             Containing 'record_count' swap positions
         """
 
-        self.all_instruments = self.retrieve_records('instruments')
+        return list(chain.from_iterable(
+            self.create_chunks(record_count, start_id)
+        ))
 
-        start_date = datetime.strptime(self.get_start_date(), '%Y%m%d')
-        date_range = pd.date_range(
-            start_date, datetime.now(timezone.utc).date(), freq='D'
+    def creates_records_in_chunks(self):
+        """ Swap positions are created in chunks, as every swap contract
+        expands into a record per instrument, position type and day since the
+        start date, so a single create job may create any number of records
+
+        Returns
+        -------
+        bool
+            Always True
+        """
+        return True
+
+    def create_chunks(self, record_count, start_id):
+        """ Create the swap positions of a set number of swap contracts in
+        chunks of at most 'number_of_records_per_chunk' records. Swap
+        positions are created lazily as each chunk is taken, and the end of
+        day positions of each chunk are persisted before it is produced, so
+        no more than one chunk of swap positions is held at once.
+
+        Parameters
+        ----------
+        record_count : int
+            Number of swap contracts to create swap positions of
+        start_id : int
+            Starting id to create from
+
+        Returns
+        -------
+        Generator
+            Lists of at most 'number_of_records_per_chunk' swap positions
+        """
+
+        records = self.__generate_records(record_count, start_id)
+        number_of_records_per_chunk = self.get_number_of_records_per_chunk()
+
+        while True:
+            chunk = list(islice(records, number_of_records_per_chunk))
+            if not chunk:
+                break
+
+            self.persist_records('swap_positions')
+            yield self.add_dummy_fields(chunk)
+
+    def __generate_records(self, record_count, start_id):
+        """ Return a generator of the swap positions of a set number of swap
+        contracts: one for every instrument chosen for each contract,
+        position type, and date from the user-specified start date until
+        today's date
+
+        Parameters
+        ----------
+        record_count : int
+            Number of swap contracts to create swap positions of
+        start_id : int
+            Starting id to create from
+
+        Returns
+        -------
+        Generator
+            Swap positions, created as they are taken
+        """
+
+        self.all_instruments = self.get_dependency_cache().get_rows(
+            'instruments'
         )
+
+        start_date = datetime.strptime(self.get_start_date(), '%Y%m%d')
+        number_of_days = (datetime.now(timezone.utc).date()
+                          - start_date.date()).days + 1
+        date_range = [start_date + timedelta(days=day)
+                      for day in range(number_of_days)]
         swap_contract_batch =\
             self.retrieve_batch_records('swap_contracts',
                                         record_count, start_id)
 
-        records = [self.create_record(swap_contract, instrument,
-                                        position_type, date)
-                   for swap_contract in swap_contract_batch
-                   for instrument in self.get_random_instruments()
-                   for position_type in self.POSITION_TYPES
-                   for date in date_range]
-
-        self.persist_records('swap_positions')
-        return records
+        return (self.create_record(swap_contract, instrument,
+                                   position_type, date)
+                for swap_contract in swap_contract_batch
+                for instrument in self.choose_contract_instruments()
+                for position_type in self.POSITION_TYPES
+                for date in date_range)
 
     def create_record(self, swap_contract, instrument, position_type, date):
         """ Create a single swap position
@@ -111,22 +175,20 @@ class SwapPositionFactory(Creatable):
             'time_stamp': datetime.now(timezone.utc)
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
         return record
 
-    def get_random_instruments(self):
-        """ Retrieves a random batch of instruments
+    def choose_contract_instruments(self):
+        """ Chooses a random number of instruments for a swap contract, each
+        of which the contract holds a position in
 
         Returns
         -------
-        SQLite3 Row
+        List
             Random number of instruments retrieved from the database
         """
 
         ins_count = self.get_number_of_instruments()
-        return random.sample(self.all_instruments, ins_count)
+        return self.get_random().sample(self.all_instruments, ins_count)
 
     def get_number_of_instruments(self):
         """ Return a random number between the user-specified limits for the
@@ -143,7 +205,7 @@ class SwapPositionFactory(Creatable):
         ins_per_swap_range = custom_args['ins_per_swap']
         min_ins = int(ins_per_swap_range['min'])
         max_ins = int(ins_per_swap_range['max'])
-        return random.randint(min_ins, max_ins)
+        return self.get_random().randint(min_ins, max_ins)
 
     def get_start_date(self):
         """ Get the user-specified start date
@@ -165,8 +227,8 @@ class SwapPositionFactory(Creatable):
             Random account type, appended with 4 random digits
         """
 
-        account_type = random.choice(self.ACCOUNT_TYPES)
-        random_string = ''.join(random.choices(string.digits, k=4))
+        account_type = self.get_random().choice(self.ACCOUNT_TYPES)
+        random_string = ''.join(self.get_random().choices(string.digits, k=4))
         return ''.join([account_type, random_string])
 
     def create_long_short(self):
@@ -178,7 +240,7 @@ class SwapPositionFactory(Creatable):
             Random choice between 'Long' or 'Short'
         """
 
-        return random.choice(self.LONG_SHORT)
+        return self.get_random().choice(self.LONG_SHORT)
 
     def create_purpose(self):
         """ Create swap positions purpose
@@ -189,4 +251,4 @@ class SwapPositionFactory(Creatable):
             Always returns 'outright'
         """
 
-        return random.choice(self.PURPOSES)
+        return self.get_random().choice(self.PURPOSES)
@@ -1,7 +1,7 @@
-import random
 from datetime import datetime, timezone, timedelta
 
 from domainobjectfactories.creatable import Creatable
+from domainobjectfactories.record_batch import RecordBatch
 
 
 class TradeFactory(Creatable):
@@ -11,7 +11,7 @@ class TradeFactory(Creatable):
     TRADE_LEGS = ["EMPTY", "1", "2"]
     DIRECTIONS = ["BUY", "SELL"]
 
-    def create(self, record_count, start_id, lock=None):
+    def create(self, record_count, start_id):
         """ Create a set number of trades
 
         Parameters
@@ -20,92 +20,54 @@ class TradeFactory(Creatable):
             Number of trades to create
         start_id : int
             Starting id to create from
-        lock : Lock
-            Locks critical section of InstrumentFactory class.
-            Defaults to None in all other Factory classes.
 
         Returns
         -------
-        List
+        RecordBatch
             Containing 'record_count' trades
         """
 
-        records = []
-
-        for i in range(start_id, start_id+record_count):
-            records.append(self.create_record(i))
-
-        return records
-
-    def create_record(self, id):
-        """ Create a single trade
-
-        Parameters
-        ----------
-        id : int
-            ID of this creation
-
-        Returns
-        -------
-        dict
-            A single trade object
-        """
-
-        booking_datetime, trade_datetime, value_datetime = \
-            self.__create_trade_lifecycle_dates()
-        isin, market = self.__get_instrument_details()
-        quantity = self.__create_quantity()
-
-        record = {
-            'trade_id': id,
-            'contract_id': self.__create_contract_id(),
-            'booking_datetime': booking_datetime,
-            'trade_datetime': trade_datetime,
-            'value_datetime': value_datetime,
-            'order_id': self.__create_order_id(),
-            'account_id': self.__get_account_id(),
-            'counterparty_id': self.__get_counterparty_id(),
-            'trader_id': self.__create_trader_id(),
-            'price': self.__create_price(quantity),
-            'currency': self.create_currency(),
-            'isin': isin,
-            'market': market,
-            'trade_leg': self.__create_trade_leg(),
-            'is_otc': self.create_random_boolean(),
-            'direction': self.__create_direction(),
-            'quantity': quantity,
-            'created_timestamp': self.__create_created_timestamp()
+        instruments = self.get_random_instruments(record_count)
+        quantities = self.__create_quantities(record_count)
+        lifecycle_dates = [self.__create_trade_lifecycle_dates()
+                           for _ in range(record_count)]
+
+        # each attribute is created for every record of the job at once, and
+        # the records are returned column by column as a RecordBatch
+        columns = {
+            'trade_id': range(start_id, start_id + record_count),
+            'contract_id': self.__create_contract_ids(record_count),
+            'booking_datetime': [dates[0] for dates in lifecycle_dates],
+            'trade_datetime': [dates[1] for dates in lifecycle_dates],
+            'value_datetime': [dates[2] for dates in lifecycle_dates],
+            'order_id': self.__create_order_ids(record_count),
+            'account_id': self.__get_account_ids(record_count),
+            'counterparty_id': self.__get_counterparty_ids(record_count),
+            'trader_id': self.__create_trader_ids(record_count),
+            'price': self.__create_prices(quantities),
+            'currency': self.create_currencies(record_count),
+            'isin': [instrument['isin'] for instrument in instruments],
+            'market': [instrument['market'] for instrument in instruments],
+            'trade_leg': self.__create_trade_legs(record_count),
+            'is_otc': self.create_random_booleans(record_count),
+            'direction': self.__create_directions(record_count),
+            'quantity': quantities,
+            'created_timestamp': [self.__create_created_timestamp()
+                                  for _ in range(record_count)]
         }
 
-        for key, value in self.create_dummy_field_generator():
-            record[key] = value
-
-        return record
+        columns.update(self.create_dummy_field_columns(record_count))
 
-    def __get_instrument_details(self):
-        """ Return the isin and market of an instrument persisted in the
-        local database.
+        return RecordBatch(columns)
 
+    def __create_contract_ids(self, count):
+        """ Return ids of trade contracts
         Returns
         -------
-        String
-            isin of instrument from local database
-        String
-            market of instrument from local database
-        """
-        instrument = self.get_random_instrument()
-        isin = instrument['isin']
-        market = instrument['market']
-        return isin, market
-
-    def __create_contract_id(self):
-        """ Return id of the trade contract
-        Returns
-        -------
-        String
-            10 character random string representing trade contract id
+        List
+            10 character random strings representing trade contract ids
         """
-        return self.create_random_string(10)
+        return self.create_random_strings(count, 10)
 
     @staticmethod
     def __create_trade_lifecycle_dates():
@@ -135,91 +97,94 @@ class TradeFactory(Creatable):
         )
         return booking_datetime, trade_datetime, value_datetime
 
-    def __create_order_id(self):
-        """ Return id of the order
+    def __create_order_ids(self, count):
+        """ Return ids of orders
         Returns
         -------
-        Integer
-            random integer between 1 and 10000
+        List
+            random integers between 1 and 10000
         """
-        return self.create_random_integer()
+        return self.create_random_integers(count)
 
-    def __get_account_id(self):
-        """ Return the account id value of an account persisted in the
-        database that is type 'Client' or 'Firm'
+    def __get_account_ids(self, count):
+        """ Return the account id values of accounts persisted in the
+        database that are type 'Client' or 'Firm'
 
         Returns
         -------
-        String
-            account id of 'Client' or 'Firm' type account from database
+        List
+            account ids of 'Client' or 'Firm' type accounts from database
         """
-        account = self.get_random_record_with_valid_attribute(
-            'accounts', 'account_type', ['Client', 'Firm']
+        accounts = self.get_random_records_with_valid_attribute(
+            'accounts', 'account_type', ['Client', 'Firm'], count
         )
-        return account['account_id']
+        return [account['account_id'] for account in accounts]
 
-    def __get_counterparty_id(self):
-        """ Return the account id value of an account persisted in the
-        database that is type 'Counterparty'
+    def __get_counterparty_ids(self, count):
+        """ Return the account id values of accounts persisted in the
+        database that are type 'Counterparty'
 
         Returns
         -------
-        String
-            account id of 'Counterparty' type account from database
+        List
+            account ids of 'Counterparty' type accounts from database
         """
-        account = self.get_random_record_with_valid_attribute(
-            'accounts', 'account_type', ['Counterparty']
+        accounts = self.get_random_records_with_valid_attribute(
+            'accounts', 'account_type', ['Counterparty'], count
         )
-        return account['account_id']
+        return [account['account_id'] for account in accounts]
 
-    def __create_trader_id(self):
-        """ Return id of the trader
+    def __create_trader_ids(self, count):
+        """ Return ids of traders
         Returns
         -------
-        String
-            10 character random string representing trader id
+        List
+            10 character random strings representing trader ids
         """
-        return self.create_random_string(10)
+        return self.create_random_strings(count, 10)
 
-    def __create_price(self, quantity):
-        """ Return total value of the trade, found by multiplying instrument
+    def __create_prices(self, quantities):
+        """ Return total values of trades, found by multiplying instrument
         quantity by a randomly generated unit price. Unit price is generated
         to represent the trade being done at a different price to the market
         price that might be given by a Price domain object
         Returns
         -------
-        Float
-            Total trade price to 2 decimal places
+        List
+            Total trade prices to 2 decimal places
         """
-        unit_price = self.create_random_decimal(min=1, max=10)
-        return round(unit_price * quantity, 2)
+        unit_prices = self.create_random_decimals(
+            len(quantities), min=1, max=10
+        )
+        return [round(unit_price * quantity, 2)
+                for unit_price, quantity in zip(unit_prices, quantities)]
 
-    def __create_trade_leg(self):
-        """ Return trade leg
+    def __create_trade_legs(self, count):
+        """ Return trade legs
         Returns
         -------
-        String
-            one of "1", "2" or "EMPTY"
+        List
+            each one of "1", "2" or "EMPTY"
         """
-        return random.choice(self.TRADE_LEGS)
+        return self.create_random_choices(self.TRADE_LEGS, count)
 
-    def __create_direction(self):
-        """ Return direction
+    def __create_directions(self, count):
+        """ Return directions
         Returns
         -------
-        String
-            one of "BUY", "SELL"
+        List
+            each one of "BUY", "SELL"
         """
-        return random.choice(self.DIRECTIONS)
+        return self.create_random_choices(self.DIRECTIONS, count)
 
-    def __create_quantity(self):
-        """ Return quantity of instruments in the trade
+    def __create_quantities(self, count):
+        """ Return quantities of instruments in trades
         Returns
         -------
-        Integer
-            random integer between 1 and 10000
+        List
+            random integers between 1 and 10000
         """
-        return self.create_random_integer()
+        return self.create_random_integers(count)
 
     @staticmethod
     def __create_created_timestamp():
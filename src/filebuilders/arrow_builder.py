@@ -0,0 +1,28 @@
+from filebuilders.columnar_file_builder import ColumnarFileBuilder
+import pyarrow
+import pyarrow.ipc
+
+# Arrow IPC codec of each compression, of those supported
+ARROW_COMPRESSIONS = {
+    None: None,
+    'zstd': 'zstd',
+    'lz4': 'lz4_frame'
+}
+
+
+class ArrowBuilder(ColumnarFileBuilder):
+    """ A class to generate an Arrow IPC file from records. Uses pyarrow to
+    achieve this. Each file is written as a single record batch, as no file
+    holds more than max_objects_per_file records, and its buffers are
+    compressed by Arrow itself with the configured compression. """
+
+    def write_table(self, file_path, table):
+        options = pyarrow.ipc.IpcWriteOptions(
+            compression=ARROW_COMPRESSIONS[self.get_compression()]
+        )
+        with pyarrow.OSFile(file_path, 'wb') as sink, \
+                pyarrow.ipc.new_file(sink, table.schema,
+                                     options=options) as writer:
+            writer.write_table(
+                table, max_chunksize=self.get_max_objects_per_file() or None
+            )
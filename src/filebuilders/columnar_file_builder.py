@@ -0,0 +1,230 @@
+from filebuilders.file_builder import FileBuilder
+from domainobjectfactories.record_batch import RecordBatch
+from itertools import chain
+import abc
+import os
+import pyarrow
+
+# Greatest number of digits of a numeric dummy field held as a 64-bit
+# integer; longer numeric dummy fields are held as decimals
+MAX_INT64_DIGITS = 18
+
+# Greatest number of digits of a 128-bit decimal
+MAX_DECIMAL128_DIGITS = 38
+
+
+class ColumnarFileBuilder(FileBuilder):
+    """ A base class for file builders writing records as Arrow tables,
+    column by column. Defines an abstract method write_table for which a
+    concrete implementation is provided in all children.
+
+    The schema of every file written is fixed once per domain object, from
+    the first records written, before copies of the file builder are given
+    to child processes to write files (see FileBuilder.has_file_layout).
+    Dummy fields are typed from the dummy field config of the domain object:
+    strings, or integers of their configured number of digits, which are
+    held as decimals where too long for a 64-bit integer. Every other field
+    is typed from its values in the first records, or as a string where
+    every one of them is None; records lacking a field of the schema hold
+    null for it.
+
+    Attributes
+    ----------
+    dummy_field_types : dict
+        Arrow type of each dummy field, by field name
+    schema : Schema
+        Arrow schema of every file, once fixed
+
+    Methods
+    -------
+    build(file_number, data)
+        Write records to the file of the given number
+    write_table(file_path, table) : Abstract
+        Write a table to a file
+    get_table(data)
+        Return records as an Arrow table of the schema
+    get_schema()
+        Returns the schema of every file
+    has_file_layout()
+        Returns True, the schema being fixed for every file
+    fix_file_layout(data)
+        Fix the schema of every file from the first records written
+    get_file_layout()
+        Returns the schema of every file
+    set_file_layout(file_layout)
+        Set the schema of every file
+    """
+
+    def __init__(self, google_drive_connector, factory_config):
+        """ Initialise the file builder, typing the dummy fields of the
+        domain object, with the schema not yet known
+
+        Parameters
+        ----------
+        google_drive_connector : Google_Drive_Connector
+            Instantiated connector object for uploading to a pre-defined
+            google drive directory.
+        factory_config : Dict
+            Dictionary containing the parsed json user-defined configuration
+            for the current factory.
+        """
+
+        super().__init__(google_drive_connector, factory_config)
+        self.__dummy_field_types = get_dummy_field_types(factory_config)
+        self.__schema = None
+
+    def build(self, file_number, data):
+        output_dir = self.get_output_directory()
+        file_name = self.get_numbered_file_name(file_number)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.write_table(os.path.join(output_dir, file_name),
+                         self.get_table(data))
+
+        if self.google_drive_connector_exists():
+            self.upload_to_google_drive(output_dir, file_name)
+
+    @abc.abstractmethod
+    def write_table(self, file_path, table):
+        """ Write a table of records to a file
+
+        Parameters
+        ----------
+        file_path : String
+            Path of the file to write
+        table : Table
+            Arrow table of the records
+        """
+        pass
+
+    def get_table(self, data):
+        """ Return records as an Arrow table of the schema of every file,
+        fixing the schema from the records if they are the first written
+
+        Parameters
+        ----------
+        data : List or RecordBatch
+            Records as dictionaries, or a RecordBatch of records
+
+        Returns
+        -------
+        Table
+            The records
+        """
+
+        self.fix_file_layout(data)
+
+        return pyarrow.Table.from_pydict(
+            get_columns(data, self.__schema.names), schema=self.__schema
+        )
+
+    def get_schema(self):
+        """ Return the Arrow schema of every file
+
+        Returns
+        -------
+        Schema
+            The schema, or None if it is not yet fixed
+        """
+        return self.__schema
+
+    def has_file_layout(self):
+        return True
+
+    def fix_file_layout(self, data):
+        if self.__schema is not None:
+            return
+
+        if isinstance(data, RecordBatch):
+            field_names = data.get_field_names()
+        else:
+            field_names = list(dict.fromkeys(chain.from_iterable(data)))
+
+        fields = []
+        for field_name, values in get_columns(data, field_names).items():
+            data_type = pyarrow.array(
+                values, type=self.__dummy_field_types.get(field_name)
+            ).type
+            # a field which is None in every one of the first records is
+            # held as a string, rather than as null in every file
+            if pyarrow.types.is_null(data_type):
+                data_type = pyarrow.string()
+            fields.append(pyarrow.field(field_name, data_type))
+        self.__schema = pyarrow.schema(fields)
+
+    def get_file_layout(self):
+        return self.__schema
+
+    def set_file_layout(self, file_layout):
+        self.__schema = file_layout
+
+
+def get_columns(data, field_names):
+    """ Return the values of each of the given fields of records, None for
+    a record lacking the field
+
+    Parameters
+    ----------
+    data : List or RecordBatch
+        Records as dictionaries, or a RecordBatch of records
+    field_names : List
+        Names of the fields
+
+    Returns
+    -------
+    dict
+        Values of the records for each field, by field name
+    """
+
+    if isinstance(data, RecordBatch):
+        batch_field_names = set(data.get_field_names())
+        return {field_name: data.get_column(field_name)
+                if field_name in batch_field_names else [None] * len(data)
+                for field_name in field_names}
+
+    return {field_name: [record.get(field_name) for record in data]
+            for field_name in field_names}
+
+
+def get_dummy_field_types(factory_config):
+    """ Return the Arrow type of each dummy field of a domain object, named
+    as the domain object's factory names them
+
+    Parameters
+    ----------
+    factory_config : Dict
+        Dictionary containing the parsed json user-defined configuration
+        for the factory
+
+    Returns
+    -------
+    dict
+        Arrow type of each dummy field, by field name
+    """
+
+    object_name = factory_config.get('file_type_args', {}) \
+        .get('xml_item_name')
+    dummy_field_types = {}
+    field_number = 1
+
+    for dummy_field in factory_config.get('dummy_fields', []):
+        field_count = dummy_field['field_count']
+        if field_count < 1:
+            continue
+
+        data_length = dummy_field['data_length']
+        if dummy_field['data_type'] == 'string':
+            data_type = pyarrow.string()
+        elif data_length <= MAX_INT64_DIGITS:
+            data_type = pyarrow.int64()
+        elif data_length <= MAX_DECIMAL128_DIGITS:
+            data_type = pyarrow.decimal128(data_length, 0)
+        else:
+            data_type = pyarrow.decimal256(data_length, 0)
+
+        for number in range(field_number, field_number + field_count):
+            dummy_field_types[f'{object_name}_field{number}'] = data_type
+        field_number += field_count
+
+    return dummy_field_types
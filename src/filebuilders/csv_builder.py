@@ -1,27 +1,387 @@
-from filebuilders.file_builder import FileBuilder
-import csv
+from filebuilders.text_file_builder import TextFileBuilder
+from domainobjectfactories.record_batch import RecordBatch
+from datetime import datetime
+from itertools import chain
+from operator import itemgetter
 import os
+import re
 
+DELIMITER = ','
+LINE_TERMINATOR = '\r\n'
 
-class CSVBuilder(FileBuilder):
-    """ A class to generate a CSV file from records. Uses the csv library to
-    achieve this. """
+# Characters of a field for which it is quoted
+QUOTED_CHARACTERS = re.compile('[,"\r\n]')
+
+# Row written for a record of a single column whose value is empty
+EMPTY_ROW = '""'
+
+# Value written for a field a record does not have
+MISSING_VALUE = '-'
+
+# Number of records whose rows are made and written together
+ROWS_PER_CHUNK = 10000
+
+
+class CSVBuilder(TextFileBuilder):
+    """ A class to generate a CSV file from records, written as by the csv
+    library. Records are written a chunk at a time: the values of each
+    column of the chunk are encoded together, by a single conversion to
+    strings for a column of numbers, or none at all for a column of strings
+    which need no quoting, and the encoded rows are joined and written at
+    once to the file.
+
+    The columns of every file written are fixed once per domain object,
+    from the first records written: the fields of a RecordBatch, or the
+    fields of every record of a list of dictionaries in the order they are
+    first found. They are fixed before copies of the file builder are given
+    to child processes to write files (see FileBuilder.has_file_layout), so
+    every file has the same columns. Records which lack a column are written
+    with MISSING_VALUE in its place.
+
+    Attributes
+    ----------
+    field_names : List
+        Names of the columns of every file, once fixed
+
+    Methods
+    -------
+    build(file_number, data)
+        Write records to the file of the given number
+    format_records(data)
+        Return each record formatted as a row
+    get_column_chunks(data)
+        Return the values of each column for each chunk of records
+    get_column_chunks_of_records(records)
+        Return the values of each column for each chunk of dictionaries
+    get_row_of_missing_fields(record)
+        Return the values of a record which may lack some columns
+    get_field_names()
+        Returns the names of the columns
+    has_file_layout()
+        Returns True, the columns being fixed for every file
+    fix_file_layout(data)
+        Fix the columns of every file from the first records written
+    get_file_layout()
+        Returns the names of the columns
+    set_file_layout(file_layout)
+        Set the names of the columns
+    """
+
+    def __init__(self, google_drive_connector, factory_config):
+        """ Initialise the file builder, with the columns not yet known
+
+        Parameters
+        ----------
+        google_drive_connector : Google_Drive_Connector
+            Instantiated connector object for uploading to a pre-defined
+            google drive directory.
+        factory_config : Dict
+            Dictionary containing the parsed json user-defined configuration
+            for the current factory.
+        """
+
+        super().__init__(google_drive_connector, factory_config)
+        self.__field_names = None
 
     def build(self, file_number, data):
         output_dir = self.get_output_directory()
-        file_name = self.get_file_name().format(f'{file_number:03}')
+        file_name = self.get_numbered_file_name(file_number)
+
+        os.makedirs(output_dir, exist_ok=True)
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+        chunks = self.get_column_chunks(data)
 
-        with open(os.path.join(output_dir, file_name),
-                  'w+', newline='') as output_file:
-            fieldnames = data[0].keys()  # get keys from first dict
-            dict_writer = csv.DictWriter(output_file, restval="-",
-                                         fieldnames=fieldnames,
-                                         delimiter=',')
-            dict_writer.writeheader()
-            dict_writer.writerows(data)
+        with self.open_records_file(file_name) as output_file:
+            output_file.write(self.get_file_header())
+            for columns in chunks:
+                output_file.write(''.join(format_rows(columns)))
 
         if self.google_drive_connector_exists():
             self.upload_to_google_drive(output_dir, file_name)
+
+    def format_records(self, data):
+        # the columns are fixed before the first row is formatted, such that
+        # the header of the file may be written
+        chunks = self.get_column_chunks(data)
+        return chain.from_iterable(map(format_rows, chunks))
+
+    def open_records_file(self, file_name):
+        return self.open_output_file(file_name, newline='')
+
+    def get_file_header(self):
+        return format_rows([[field_name]
+                            for field_name in self.__field_names])[0]
+
+    def get_column_chunks(self, data):
+        """ Return the values of each column for each chunk of records,
+        fixing the columns from the records if they are the first written
+
+        Parameters
+        ----------
+        data : List or RecordBatch
+            Records as dictionaries, or a RecordBatch of records
+
+        Returns
+        -------
+        Iterator
+            For each chunk of records in turn, a sequence of the values of
+            the records for each column, in the order of the columns
+
+        Raises
+        ------
+        ValueError
+            If a record has a field which is not a column
+        """
+
+        self.fix_file_layout(data)
+
+        if isinstance(data, RecordBatch) \
+                and data.get_field_names() == self.__field_names:
+            # every record has every field, so take each chunk of columns
+            # directly rather than creating a dictionary per record
+            return (
+                [data.get_column(field_name)[chunk_start:chunk_end]
+                 for field_name in self.__field_names]
+                for chunk_start, chunk_end in get_chunks(len(data))
+            )
+
+        if isinstance(data, RecordBatch):
+            data = data.to_records()
+        return self.get_column_chunks_of_records(data)
+
+    def get_column_chunks_of_records(self, records):
+        """ Return the values of each column for each chunk of records held
+        as dictionaries
+
+        Parameters
+        ----------
+        records : List
+            Records as dictionaries
+
+        Returns
+        -------
+        Iterator
+            For each chunk of records in turn, a sequence of the values of
+            the records for each column, in the order of the columns
+
+        Raises
+        ------
+        ValueError
+            If a record has a field which is not a column
+        """
+
+        field_getters = list(map(itemgetter, self.__field_names))
+        number_of_fields = len(field_getters)
+
+        for chunk_start, chunk_end in get_chunks(len(records)):
+            chunk = records[chunk_start:chunk_end]
+            # where every record has every column, and the records have only
+            # as many fields in all as the columns, no record has another
+            if sum(map(len, chunk)) == number_of_fields * len(chunk):
+                try:
+                    yield [list(map(get_field, chunk))
+                           for get_field in field_getters]
+                    continue
+                except KeyError:
+                    pass
+            yield list(zip(*map(self.get_row_of_missing_fields, chunk)))
+
+    def get_row_of_missing_fields(self, record):
+        """ Return the values of a record which may lack some columns, in
+        the order of the columns
+
+        Parameters
+        ----------
+        record : dict
+            The record
+
+        Returns
+        -------
+        tuple
+            Value of each column, or MISSING_VALUE where the record lacks it
+
+        Raises
+        ------
+        ValueError
+            If the record has a field which is not a column
+        """
+
+        unknown_fields = record.keys() - self.__field_names
+        if unknown_fields:
+            raise ValueError('record contains fields not in the columns of '
+                             f'{self.get_file_name()}: '
+                             f'{", ".join(sorted(map(str, unknown_fields)))}')
+        return tuple(record.get(field_name, MISSING_VALUE)
+                     for field_name in self.__field_names)
+
+    def get_field_names(self):
+        """ Return the names of the columns of every file, in order
+
+        Returns
+        -------
+        List
+            Column names, or None if they are not yet fixed
+        """
+        return self.__field_names
+
+    def has_file_layout(self):
+        return True
+
+    def fix_file_layout(self, data):
+        if self.__field_names is None:
+            if isinstance(data, RecordBatch):
+                self.__field_names = data.get_field_names()
+            else:
+                self.__field_names = list(dict.fromkeys(
+                    chain.from_iterable(data)
+                ))
+
+    def get_file_layout(self):
+        return self.__field_names
+
+    def set_file_layout(self, file_layout):
+        self.__field_names = file_layout
+
+
+def get_chunks(number_of_records):
+    """ Return the bounds of each chunk of a number of records
+
+    Parameters
+    ----------
+    number_of_records : int
+        Number of records to split into chunks
+
+    Returns
+    -------
+    Iterator
+        Index of the first record of each chunk and of the record after its
+        last
+    """
+    return ((chunk_start, min(chunk_start + ROWS_PER_CHUNK, number_of_records))
+            for chunk_start in range(0, number_of_records, ROWS_PER_CHUNK))
+
+
+def format_rows(columns):
+    """ Return rows of values formatted as by the csv library with its
+    default dialect, given the values of each column. Each column is encoded
+    as a whole, so that a value repeated within it is only encoded once.
+
+    Parameters
+    ----------
+    columns : List
+        Sequence of values of each column
+
+    Returns
+    -------
+    List
+        Each row of values, terminated by a carriage return and line feed
+    """
+
+    encoded_columns = [encode_column(values) for values in columns]
+
+    if len(encoded_columns) == 1:
+        # the csv library quotes a row of a single empty value, which would
+        # otherwise be an empty line
+        return [f'{value or EMPTY_ROW}{LINE_TERMINATOR}'
+                for value in encoded_columns[0]]
+
+    return [f'{row}{LINE_TERMINATOR}'
+            for row in map(DELIMITER.join, zip(*encoded_columns))]
+
+
+def encode_column(values):
+    """ Return the values of a column encoded as CSV fields
+
+    Parameters
+    ----------
+    values : Sequence
+        The values of the column
+
+    Returns
+    -------
+    Sequence
+        The values encoded as strings, quoted where necessary
+    """
+
+    value_types = set(map(type, values))
+
+    if value_types <= {int, float, bool}:
+        return list(map(str, values))
+    elif value_types <= {str}:
+        # only where some value needs quoting is each value checked
+        if QUOTED_CHARACTERS.search(''.join(values)) is None:
+            return values
+        return list(map(encode_string, values))
+
+    elif value_types <= {datetime, type(None)}:
+        return encode_datetimes(values)
+    return list(map(encode_value, values))
+
+
+def encode_datetimes(values):
+    """ Return a column of datetimes encoded as CSV fields. Datetimes are
+    costly to encode and often repeated from one record to the next, as
+    with the value dates of trades, so a datetime equal to the one before it
+    and of the same timezone is not encoded again.
+
+    Parameters
+    ----------
+    values : Sequence
+        Datetimes, or None
+
+    Returns
+    -------
+    List
+        The datetimes as strings, or an empty string for None
+    """
+
+    encoded_column = []
+    # nothing is equal to the first previous value, so the first datetime
+    # is always encoded
+    previous_value = encoded_value = object()
+    for value in values:
+        if value != previous_value or (
+                value is not None
+                and value.tzinfo is not previous_value.tzinfo):
+            encoded_value = '' if value is None else str(value)
+            previous_value = value
+        encoded_column.append(encoded_value)
+    return encoded_column
+
+
+def encode_value(value):
+    """ Return a value encoded as a CSV field
+
+    Parameters
+    ----------
+    value : object
+        The value
+
+    Returns
+    -------
+    String
+        The value as a string, quoted where necessary, or an empty string if
+        it is None
+    """
+    if value is None:
+        return ''
+    return encode_string(value if type(value) is str else str(value))
+
+
+def encode_string(value):
+    """ Return a string encoded as a CSV field, quoted with any quotes
+    doubled where it contains the delimiter, a quote or a line break
+
+    Parameters
+    ----------
+    value : String
+        The string
+
+    Returns
+    -------
+    String
+        The string as a field
+    """
+    if QUOTED_CHARACTERS.search(value) is None:
+        return value
+    return '"' + value.replace('"', '""') + '"'
@@ -1,6 +1,45 @@
 import abc
+import gzip
+import io
 import os
-from datetime import datetime, timezone
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Compressions output files may be written with, by the extension added to
+# the names of compressed files and the package required, if not part of the
+# standard library
+COMPRESSIONS = {
+    'gzip': {'file_extension': 'gz', 'package': None},
+    'zstd': {'file_extension': 'zst', 'package': 'zstandard'},
+    'lz4': {'file_extension': 'lz4', 'package': 'lz4'}
+}
+
+# File types whose builders compress files themselves, rather than the text
+# written to them, by the compressions each supports. The names of their
+# files are not given the extension of the compression.
+INTERNALLY_COMPRESSED_FILE_TYPES = {
+    'PARQUET': ('gzip', 'zstd', 'lz4'),
+    'ARROW': ('zstd', 'lz4')
+}
+
+# File types whose files may be limited to 'max_bytes_per_file', as they
+# are written as text a record at a time
+SIZE_LIMITED_FILE_TYPES = ('CSV', 'JSON', 'JSONL', 'XML')
+
+# Compression level of gzip, traded for speed against the default of 9
+GZIP_COMPRESSION_LEVEL = 6
+
+# Size in bytes of the buffer of an uncompressed output file
+WRITE_BUFFER_SIZE = 2 ** 20
+
 
 class FileBuilder(abc.ABC):
     """ A base class for all file builders. Contains utility functions for
@@ -15,9 +54,16 @@ class FileBuilder(abc.ABC):
         the sequential naming formatting and file extension.
     file_extension : String
         The output file type
+    compression : String
+        The compression output files are written with, one of COMPRESSIONS,
+        or None if they are not compressed
+    json_serializer : String
+        For JSON formatting, the serialiser of records, one of
+        JSON_SERIALIZERS, or None for the fastest installed
     google_drive_connector : Google_Drive_Connector
         Instantiated connector object for uploading to a pre-defined google
-        drive directory.
+        drive directory, or a DriveUploader queueing files to be uploaded
+        through one.
     google_drive_flag : bool
         Boolean flag stating whether to upload the output files generated to
         google drive
@@ -27,6 +73,16 @@ class FileBuilder(abc.ABC):
         For XML formatting, the top-most, all-encapsulating tag.
     item_name : String
         For XML formatting, the tag surrounding each written object.
+    max_objects_per_file : int
+        The maximum number of records written to each file
+    max_bytes_per_file : int
+        The maximum size of each file in bytes, before compression, or None
+        if files are limited only by their number of records
+    shard_index : int
+        Index of the shard of the run, where the run is one of several
+        shards, otherwise 0
+    shard_count : int
+        Number of shards the run is one of, otherwise 1
 
     Methods
     -------
@@ -34,8 +90,8 @@ class FileBuilder(abc.ABC):
         An abstract class defining the name and mathod variables for all
         child-implemented build methods.
     upload_to_google_drive(local_folder_name, file_name)
-        Create a given directory/file_name structure in a remote directory on
-        google drive and upload data.
+        Upload a file to the folder of the run on google drive, or queue it
+        to be uploaded
     open_file()
         Opens the current file
     close_file()
@@ -44,6 +100,16 @@ class FileBuilder(abc.ABC):
         Returns the output directory
     get_file_name()
         Returns the file name
+    open_output_file(file_name, newline, encoding)
+        Opens an output file for writing text, compressed if configured
+    get_numbered_file_name(file_number)
+        Returns the name of the file of a given number
+    get_compression()
+        Returns the compression output files are written with
+    get_json_serializer()
+        Returns the name of the serialiser of records to JSON
+    set_shard(shard_index, shard_count)
+        Number files such that no two shards write files of the same name
     get_google_drive_connector()
         Returns the google drive connector object
     get_root_element_name()
@@ -52,6 +118,18 @@ class FileBuilder(abc.ABC):
         Returns the name of each XML item
     get_google_drive_flag()
         Returns the google drive boolean flag
+    get_max_objects_per_file()
+        Returns the maximum number of records written to each file
+    get_max_bytes_per_file()
+        Returns the maximum size of each file
+    has_file_layout()
+        Returns whether every file is written with the same fixed layout
+    fix_file_layout(data)
+        Fix the layout of every file from the first records written
+    get_file_layout()
+        Returns the layout every file is written with
+    set_file_layout(file_layout)
+        Set the layout every file is written with
     """
 
     def __init__(self, google_drive_connector, factory_config):
@@ -72,11 +150,22 @@ class FileBuilder(abc.ABC):
         file_type = factory_config['output_file_type']
         file_name = factory_config['file_name']
         file_extension = file_type.lower()
+        compression = factory_config.get('compression')
+
+        if compression is not None \
+                and file_type not in INTERNALLY_COMPRESSED_FILE_TYPES:
+            file_extension += \
+                '.' + COMPRESSIONS[compression]['file_extension']
 
         self.__google_drive_connector = google_drive_connector
+        self.__compression = compression
+        self.__json_serializer = factory_config.get('json_serializer')
         self.__file_name = file_name + '_{}.' + file_extension
         self.__output_dir = factory_config['output_directory']
         self.__max_objects_per_file = factory_config['max_objects_per_file']
+        self.__max_bytes_per_file = factory_config.get('max_bytes_per_file')
+        self.__shard_index = 0
+        self.__shard_count = 1
 
         if file_type == 'XML':
             file_specific_config = factory_config['file_type_args']
@@ -94,15 +183,15 @@ class FileBuilder(abc.ABC):
         ----------
         file_number : int
             The current file number to be writing to
-        data : List
+        data : List or RecordBatch
             List of records to be writen to file
         """
         pass
 
     def upload_to_google_drive(self, local_folder_name, file_name):
-        """ Checks whether a directory structure exists within a pre-defined
-        google drive location, creating such if need be, and uploads the file
-        there, or updates an existing one.
+        """ Upload a file to the folder of the run on google drive, or queue
+        it to be uploaded where the file builder is given a DriveUploader.
+        The folder is found, or created, once per run rather than per file.
 
         Parameters
         ----------
@@ -111,26 +200,8 @@ class FileBuilder(abc.ABC):
         file_name : String
             Name of file on local machine
         """
-        root_folder_id = self.__google_drive_connector.root_folder_id
-        timestamp_folder = self.__google_drive_connector.current_time_string
-        todays_date = datetime.now(timezone.utc).date().strftime('%Y-%m-%d')
-
-        # Check if a folder for today's date exists, create if it doesn't
-        date_folder_id = self.__google_drive_connector\
-            .get_folder_id(todays_date, root_folder_id)
-        if date_folder_id is None:
-            date_folder_id = self.__google_drive_connector\
-                .create_folder(todays_date, root_folder_id)
-
-        # Check if a folder for the timestamp exists, create if it doesn't
-        timestamp_folder_id = self.__google_drive_connector \
-            .get_folder_id(timestamp_folder, date_folder_id)
-        if timestamp_folder_id is None:
-            timestamp_folder_id = self.__google_drive_connector \
-                .create_folder(timestamp_folder, date_folder_id)
-
-        self.__google_drive_connector\
-            .create_file(local_folder_name, file_name, timestamp_folder_id)
+        self.__google_drive_connector.upload_file(local_folder_name,
+                                                  file_name)
 
     def open_file(self):
         """ Open a file of initialised directory and name """
@@ -161,6 +232,101 @@ class FileBuilder(abc.ABC):
         """
         return self.__file_name
 
+    def open_output_file(self, file_name, newline=None, encoding=None):
+        """ Open a file of the output directory for writing text. Where the
+        domain object is configured with a compression, text written is
+        compressed as it is written, such that the uncompressed file is
+        never held in memory or written to disk.
+
+        Parameters
+        ----------
+        file_name : String
+            Name of the file, as returned by get_numbered_file_name
+        newline : String
+            How line endings are translated, as for the built-in open
+        encoding : String
+            Encoding of the text, as for the built-in open
+
+        Returns
+        -------
+        File
+            The file, opened for writing text
+        """
+
+        file_path = os.path.join(self.__output_dir, file_name)
+
+        if self.__compression is None:
+            return open(file_path, 'w', buffering=WRITE_BUFFER_SIZE,
+                        encoding=encoding, newline=newline)
+        elif self.__compression == 'gzip':
+            compressed_file = gzip.open(
+                file_path, 'wb', compresslevel=GZIP_COMPRESSION_LEVEL
+            )
+        elif self.__compression == 'zstd':
+            compressed_file = zstandard.open(file_path, 'wb')
+        else:
+            compressed_file = lz4.frame.open(file_path, 'wb')
+
+        return io.TextIOWrapper(compressed_file, encoding=encoding,
+                                newline=newline)
+
+    def get_compression(self):
+        """ Return the compression output files are written with
+
+        Returns
+        -------
+        String
+            One of COMPRESSIONS, or None if files are not compressed
+        """
+        return self.__compression
+
+    def get_json_serializer(self):
+        """ Return the name of the serialiser of records to JSON
+
+        Returns
+        -------
+        String
+            One of JSON_SERIALIZERS, or None for the fastest installed
+        """
+        return self.__json_serializer
+
+    def get_numbered_file_name(self, file_number):
+        """ Return the name of the file of a given number. Where the run is
+        one of several shards, files are numbered in turn across the shards,
+        such that every shard may write any number of files without two
+        shards writing files of the same name: the first file of shard 1 of
+        3 is numbered 1, its second file 4, and so on.
+
+        Parameters
+        ----------
+        file_number : int
+            The number of the file among those written by this run
+
+        Returns
+        -------
+        String
+            The file name, including the number of the file among those
+            written by every shard
+        """
+
+        output_file_number = \
+            file_number * self.__shard_count + self.__shard_index
+        return self.__file_name.format(f'{output_file_number:03}')
+
+    def set_shard(self, shard_index, shard_count):
+        """ Set the shard the run is, of how many, for numbering files
+
+        Parameters
+        ----------
+        shard_index : int
+            Index of the shard of the run, from 0
+        shard_count : int
+            Number of shards
+        """
+
+        self.__shard_index = shard_index
+        self.__shard_count = shard_count
+
     def get_google_drive_connector(self):
         """ Return the google drive connector object
 
@@ -200,6 +366,73 @@ class FileBuilder(abc.ABC):
         """
         return self.__max_objects_per_file
 
+    def get_max_bytes_per_file(self):
+        """ Returns the maximum size of each file in bytes, before
+        compression, beyond which records are written to the next file.
+
+        Returns
+        -------
+        int
+            The maximum size of each file, or None if files are limited only
+            by their number of records.
+        """
+        return self.__max_bytes_per_file
+
+    def has_file_layout(self):
+        """ Returns whether every file is written with the same layout, such
+        as the columns of a CSV file, fixed by the first records written.
+
+        Files are written by child processes, each given its own copy of the
+        file builder for every job, so the layout must be fixed before the
+        first copy is made: by the write parent thread from the first
+        records taken from the created record queue (see fix_file_layout),
+        or, in the 'fused' execution mode, from the child process which
+        writes the first file (see get_file_layout and set_file_layout).
+        File builders whose files have no such layout need do neither.
+
+        Returns
+        -------
+        bool
+            True if the file builder fixes a layout for every file
+        """
+        return False
+
+    def fix_file_layout(self, data):
+        """ Fix the layout of every file from the given records, unless it is
+        already fixed. Does nothing for file builders without a layout.
+
+        Parameters
+        ----------
+        data : List or RecordBatch
+            The first records to be written
+        """
+        pass
+
+    def get_file_layout(self):
+        """ Returns the layout every file is written with, which may be
+        pickled to be given to set_file_layout of another copy of the file
+        builder
+
+        Returns
+        -------
+        object
+            The layout, or None if it is not yet fixed or the file builder
+            has none
+        """
+        return None
+
+    def set_file_layout(self, file_layout):
+        """ Set the layout every file is written with, as returned by
+        get_file_layout. Does nothing for file builders without a layout.
+
+        Parameters
+        ----------
+        file_layout : object
+            The layout, or None to leave it to be fixed by the first records
+            written
+        """
+        pass
+
     def google_drive_connector_exists(self):
         """ Returns a boolean specifying whether a google drive connector
         exists for the file builder. This will only occur when the domain
@@ -212,3 +445,25 @@ class FileBuilder(abc.ABC):
             Google Drive after being written locally
         """
         return self.__google_drive_connector is not None
+
+
+def get_missing_compression_package(compression):
+    """ Return the package a compression requires which is not installed
+
+    Parameters
+    ----------
+    compression : String
+        One of COMPRESSIONS
+
+    Returns
+    -------
+    String
+        Name of the package to install, or None if the compression can be
+        used
+    """
+
+    installed_packages = {'zstandard': zstandard, 'lz4': lz4}
+    package = COMPRESSIONS[compression]['package']
+    if package is not None and installed_packages[package] is None:
+        return package
+    return None
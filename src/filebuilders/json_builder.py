@@ -1,24 +1,24 @@
-from filebuilders.file_builder import FileBuilder
+from filebuilders.text_file_builder import TextFileBuilder
+from filebuilders.json_serializers import get_json_serializer
 import ujson
-import os
 
 
-class JSONBuilder(FileBuilder):
-    """ A class to generate a JSON file from records. Uses ujson to process
-    each dictionary into JSON. """
+class JSONBuilder(TextFileBuilder):
+    """ A class to generate a JSON file from records, as a single array.
+    Each record is serialised by the configured serialiser and written to
+    the file in turn, so that the array is never held in memory whole. """
 
-    def build(self, file_number, data):
-        output_dir = self.get_output_directory()
-        file_name = self.get_file_name().format(f'{file_number:03}')
+    def format_records(self, data):
+        return map(get_json_serializer(self.get_json_serializer()), data)
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+    def get_file_header(self):
+        return '['
 
-        with open(os.path.join(output_dir, file_name), 'w') as output_file:
-            ujson.dump(data, output_file)
+    def get_record_separator(self):
+        return ','
 
-        if self.google_drive_connector_exists():
-            self.upload_to_google_drive(output_dir, file_name)
+    def get_file_footer(self):
+        return ']'
 
     def append_data(self, data):
         self.file.write(ujson.dumps(data) + ',')
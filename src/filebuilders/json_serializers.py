@@ -0,0 +1,154 @@
+""" Serialisers of records to JSON, for the JSON and JSONL file builders.
+
+Each serialiser takes a record, or list of records, and returns it as a
+compact JSON string. Dates, times and datetimes are serialised as ISO 8601
+strings by every serialiser, so the choice of serialiser changes only the
+escaping of the output: ujson escapes forward slashes and non-ASCII
+characters, while orjson and json do not.
+
+orjson is the fastest, but is only used where installed, and cannot
+serialise integers beyond 64 bits, such as long numeric dummy fields;
+records holding such integers are serialised by json instead.
+"""
+
+import json
+
+import ujson
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serialisers by name, as given by a domain object's 'json_serializer', and
+# the package each requires, if not part of the standard library
+JSON_SERIALIZERS = {
+    'orjson': {'package': 'orjson'},
+    'ujson': {'package': 'ujson'},
+    'json': {'package': None}
+}
+
+
+def get_json_serializer(name=None):
+    """ Return the serialiser of a given name
+
+    Parameters
+    ----------
+    name : String
+        One of JSON_SERIALIZERS, or None for orjson where it is installed,
+        otherwise ujson
+
+    Returns
+    -------
+    function
+        Function taking a value and returning it serialised as a JSON string
+    """
+
+    if name is None:
+        name = 'ujson' if orjson is None else 'orjson'
+
+    if name == 'orjson':
+        return serialize_with_orjson
+    elif name == 'ujson':
+        return serialize_with_ujson
+    return serialize_with_json
+
+
+def get_missing_json_serializer_package(name):
+    """ Return the package a serialiser requires which is not installed
+
+    Parameters
+    ----------
+    name : String
+        One of JSON_SERIALIZERS
+
+    Returns
+    -------
+    String
+        Name of the package to install, or None if the serialiser can be
+        used
+    """
+
+    if JSON_SERIALIZERS[name]['package'] == 'orjson' and orjson is None:
+        return 'orjson'
+    return None
+
+
+def serialize_with_orjson(value):
+    """ Return a value serialised as a JSON string by orjson, or by json
+    where it holds an integer beyond 64 bits
+
+    Parameters
+    ----------
+    value : object
+        Value to serialise
+
+    Returns
+    -------
+    String
+        The value as JSON
+    """
+
+    try:
+        return orjson.dumps(value, default=serialize_default).decode()
+    except TypeError:
+        return serialize_with_json(value)
+
+
+def serialize_with_ujson(value):
+    """ Return a value serialised as a JSON string by ujson
+
+    Parameters
+    ----------
+    value : object
+        Value to serialise
+
+    Returns
+    -------
+    String
+        The value as JSON
+    """
+    return ujson.dumps(value, default=serialize_default)
+
+
+def serialize_with_json(value):
+    """ Return a value serialised as a JSON string by the standard library,
+    without whitespace between items
+
+    Parameters
+    ----------
+    value : object
+        Value to serialise
+
+    Returns
+    -------
+    String
+        The value as JSON
+    """
+    return json.dumps(value, default=serialize_default, ensure_ascii=False,
+                      separators=(',', ':'))
+
+
+def serialize_default(value):
+    """ Return a value which a serialiser cannot serialise natively as one
+    it can: dates, times and datetimes as ISO 8601 strings
+
+    Parameters
+    ----------
+    value : object
+        Value to serialise
+
+    Returns
+    -------
+    String
+        The value in ISO 8601 format
+
+    Raises
+    ------
+    TypeError
+        If the value cannot be serialised
+    """
+
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'{value!r} is not JSON serializable')
@@ -0,0 +1,25 @@
+from filebuilders.columnar_file_builder import ColumnarFileBuilder
+import pyarrow.parquet
+
+# Parquet codec of each compression, and of uncompressed output, as Parquet
+# files are conventionally compressed with Snappy
+PARQUET_COMPRESSIONS = {
+    None: 'snappy',
+    'gzip': 'gzip',
+    'zstd': 'zstd',
+    'lz4': 'lz4'
+}
+
+
+class ParquetBuilder(ColumnarFileBuilder):
+    """ A class to generate a Parquet file from records. Uses pyarrow to
+    achieve this. Each file is written as a single row group, as no file
+    holds more than max_objects_per_file records, and is compressed by
+    Parquet itself with the configured compression. """
+
+    def write_table(self, file_path, table):
+        pyarrow.parquet.write_table(
+            table, file_path,
+            row_group_size=self.get_max_objects_per_file() or None,
+            compression=PARQUET_COMPRESSIONS[self.get_compression()]
+        )
@@ -0,0 +1,184 @@
+import os
+
+
+class RollingFileWriter:
+    """ A class to write records to the numbered files of a TextFileBuilder
+    a record at a time, keeping the current file open between writes, such
+    that records are written as they arrive rather than a file's worth at a
+    time.
+
+    The writer rolls over to the next file number once the current file
+    holds the maximum number of records per file, or once the next record
+    would take it beyond the maximum number of bytes per file, if given. A
+    file is never empty, so a single record which alone exceeds the maximum
+    number of bytes is written to a file of its own. Sizes are those of the
+    text written, encoded as UTF-8, before any compression.
+
+    Attributes
+    ----------
+    file_builder : TextFileBuilder
+        Instantiated file builder formatting the records and naming files
+    max_records_per_file : int
+        The maximum number of records in each file
+    max_bytes_per_file : int
+        The maximum size of each file in bytes, or None for no limit
+    number_of_next_file_to_write : int
+        The number of the file records are written to next
+    output_file : File
+        The file being written, or None if no file is open
+    number_of_records_in_file : int
+        The number of records written to the open file
+    number_of_bytes_in_file : int
+        The number of bytes written to the open file, including its header
+
+    Methods
+    -------
+    write(data)
+        Write records to the open file, rolling over to further files as
+        needed, and return the files closed
+    close()
+        Finish and close the open file, if any, and return it
+    abandon()
+        Close the open file, if any, without finishing it
+    open_next_file()
+        Open the next numbered file and write its header
+    """
+
+    def __init__(self, file_builder, number_of_first_file_to_write=0):
+        """ Initialise the writer, with no file open
+
+        Parameters
+        ----------
+        file_builder : TextFileBuilder
+            Instantiated file builder, pre-configured with the maximum
+            number of records, and bytes, per file
+        number_of_first_file_to_write : int
+            The number of the first file to write. Defaults to 0
+        """
+
+        self.__file_builder = file_builder
+        self.__max_records_per_file = file_builder.get_max_objects_per_file()
+        self.__max_bytes_per_file = file_builder.get_max_bytes_per_file()
+        self.__number_of_next_file_to_write = number_of_first_file_to_write
+        self.__output_file = None
+        self.__number_of_records_in_file = 0
+        self.__number_of_bytes_in_file = 0
+
+    def write(self, data):
+        """ Write records to the open file, opening the next file first if
+        none is open, and rolling over to the next file whenever the open
+        one is full
+
+        Parameters
+        ----------
+        data : List or RecordBatch
+            Records to write
+
+        Returns
+        -------
+        dict
+            Number of records written to each file closed, by file number
+        """
+
+        record_separator = self.__file_builder.get_record_separator()
+        separator_size = get_encoded_size(record_separator)
+        footer_size = get_encoded_size(self.__file_builder.get_file_footer())
+        max_bytes_per_file = self.__max_bytes_per_file
+        file_record_counts = {}
+
+        for formatted_record in self.__file_builder.format_records(data):
+            record_size = get_encoded_size(formatted_record)
+
+            if self.__output_file is not None and (
+                    self.__number_of_records_in_file
+                    >= self.__max_records_per_file
+                    or max_bytes_per_file is not None
+                    and self.__number_of_bytes_in_file + separator_size
+                    + record_size + footer_size > max_bytes_per_file):
+                file_record_counts.update(self.close())
+
+            if self.__output_file is None:
+                self.open_next_file()
+            else:
+                self.__output_file.write(record_separator)
+                self.__number_of_bytes_in_file += separator_size
+
+            self.__output_file.write(formatted_record)
+            self.__number_of_bytes_in_file += record_size
+            self.__number_of_records_in_file += 1
+
+        return file_record_counts
+
+    def close(self):
+        """ Write the footer of the open file, if any, close it and upload it
+        to google drive where configured
+
+        Returns
+        -------
+        dict
+            Number of records written to the file closed, by file number,
+            or an empty dict if no file was open
+        """
+
+        if self.__output_file is None:
+            return {}
+
+        file_number = self.__number_of_next_file_to_write
+        file_name = self.__file_builder.get_numbered_file_name(file_number)
+        number_of_records = self.__number_of_records_in_file
+
+        self.__output_file.write(self.__file_builder.get_file_footer())
+        self.abandon()
+        self.__number_of_next_file_to_write += 1
+
+        if self.__file_builder.google_drive_connector_exists():
+            self.__file_builder.upload_to_google_drive(
+                self.__file_builder.get_output_directory(), file_name
+            )
+
+        return {file_number: number_of_records}
+
+    def abandon(self):
+        """ Close the open file, if any, as it is, such that a file left
+        unfinished by a failure is not held open """
+
+        if self.__output_file is not None:
+            self.__output_file.close()
+            self.__output_file = None
+
+    def open_next_file(self):
+        """ Open the next numbered file for writing and write its header """
+
+        output_dir = self.__file_builder.get_output_directory()
+        os.makedirs(output_dir, exist_ok=True)
+
+        header = self.__file_builder.get_file_header()
+        self.__output_file = self.__file_builder.open_records_file(
+            self.__file_builder.get_numbered_file_name(
+                self.__number_of_next_file_to_write
+            )
+        )
+        self.__output_file.write(header)
+        self.__number_of_records_in_file = 0
+        self.__number_of_bytes_in_file = get_encoded_size(header)
+
+
+def get_encoded_size(text):
+    """ Return the size of text encoded as UTF-8
+
+    Parameters
+    ----------
+    text : String
+        The text
+
+    Returns
+    -------
+    int
+        The number of bytes of the encoded text
+    """
+
+    # text is almost always ASCII, whose size is its length, so it is only
+    # encoded otherwise
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-8'))
@@ -0,0 +1,120 @@
+from filebuilders.file_builder import FileBuilder
+import abc
+import os
+
+
+class TextFileBuilder(FileBuilder):
+    """ A base class for file builders writing records as text, one
+    formatted record after another. Defines an abstract method
+    format_records for which a concrete implementation is provided in all
+    children.
+
+    A file is its header, its formatted records separated by the record
+    separator, then its footer. Files are written either whole by build, or
+    a record at a time by a RollingFileWriter, which rolls over to the next
+    file once one reaches max_bytes_per_file.
+
+    Methods
+    -------
+    build(file_number, data)
+        Write records to the file of the given number
+    format_records(data) : Abstract
+        Return each record formatted as text
+    open_records_file(file_name)
+        Open an output file for writing formatted records
+    get_file_header()
+        Returns the text at the start of every file
+    get_record_separator()
+        Returns the text between consecutive records
+    get_file_footer()
+        Returns the text at the end of every file
+    """
+
+    def build(self, file_number, data):
+        output_dir = self.get_output_directory()
+        file_name = self.get_numbered_file_name(file_number)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        # records are formatted one at a time, so a RecordBatch is never
+        # held as dictionaries all at once
+        formatted_records = iter(self.format_records(data))
+        record_separator = self.get_record_separator()
+
+        with self.open_records_file(file_name) as output_file:
+            output_file.write(self.get_file_header())
+            output_file.write(next(formatted_records, ''))
+            if record_separator:
+                output_file.writelines(
+                    f'{record_separator}{formatted_record}'
+                    for formatted_record in formatted_records
+                )
+            else:
+                output_file.writelines(formatted_records)
+            output_file.write(self.get_file_footer())
+
+        if self.google_drive_connector_exists():
+            self.upload_to_google_drive(output_dir, file_name)
+
+    @abc.abstractmethod
+    def format_records(self, data):
+        """ Return each of the given records formatted as text, without the
+        record separator
+
+        Parameters
+        ----------
+        data : List or RecordBatch
+            Records to format
+
+        Returns
+        -------
+        Iterable
+            Each record as a string, in order
+        """
+        pass
+
+    def open_records_file(self, file_name):
+        """ Open an output file for writing formatted records, compressed if
+        configured
+
+        Parameters
+        ----------
+        file_name : String
+            Name of the file, as returned by get_numbered_file_name
+
+        Returns
+        -------
+        File
+            The file, opened for writing text
+        """
+        return self.open_output_file(file_name)
+
+    def get_file_header(self):
+        """ Return the text at the start of every file, before its records
+
+        Returns
+        -------
+        String
+            The header, empty by default
+        """
+        return ''
+
+    def get_record_separator(self):
+        """ Return the text between consecutive records of a file
+
+        Returns
+        -------
+        String
+            The separator, empty by default
+        """
+        return ''
+
+    def get_file_footer(self):
+        """ Return the text at the end of every file, after its records
+
+        Returns
+        -------
+        String
+            The footer, empty by default
+        """
+        return ''
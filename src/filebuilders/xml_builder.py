@@ -1,55 +1,219 @@
-from filebuilders.file_builder import FileBuilder
-import os
-import dicttoxml
+from filebuilders.text_file_builder import TextFileBuilder
+from domainobjectfactories.record_batch import RecordBatch
+from functools import lru_cache
+from numbers import Number
+from xml.dom.minidom import parseString
+from xml.sax.saxutils import escape
 
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" ?>'
 
-class XMLBuilder(FileBuilder):
-    """ A class to generate an XML file from records. Uses the dicttoxml
-    library to achieve this. """
+# Characters escaped in element text and attribute values, in addition to
+# '&', '<' and '>', which are always escaped
+ESCAPED_ENTITIES = {'"': '&quot;', "'": '&apos;'}
 
-    def build(self, file_number, data):
-        output_dir = self.get_output_directory()
-        file_name = self.get_file_name().format(f'{file_number:03}')
-        root_element_name = self.get_root_element_name()
 
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+class XMLBuilder(TextFileBuilder):
+    """ A class to generate an XML file from records. Each record is written
+    straight to the file as it is formatted, as an element named by the
+    'xml_item_name' of the config within a root element named by its
+    'xml_root_element', so that the document is never held in memory whole.
 
-        with open(os.path.join(output_dir, file_name), 'w') as output_file:
-            # convert data to bytes
-            item_func = self.get_item_func()
-            xml = dicttoxml.dicttoxml(
-                data, custom_root=root_element_name,
-                ids=False, item_func=item_func
+    Records are formatted as the dicttoxml library formatted them, less the
+    'type' attributes of strings, integers and dictionaries: each field is an
+    element named by its key, holding its escaped value. Floats, booleans,
+    None and lists keep their 'type' attribute, and the items of lists are
+    elements named by 'xml_item_name'. """
+
+    def format_records(self, data):
+        item_name = self.get_item_name()
+
+        if isinstance(data, RecordBatch):
+            # the tags of each field are found once for the whole batch
+            field_tags = [get_element_tags(field_name)
+                          for field_name in data.get_field_names()]
+            return (
+                format_element(item_name, ''.join([
+                    format_field(tags, value, item_name)
+                    for tags, value in zip(field_tags, row)
+                ])) for row in data.get_rows()
             )
 
-            # convert from bytes into string
-            xml = str(xml, 'utf-8')
-            xml = xml.replace(' type=\"str\"', '')\
-                .replace(' type=\"dict\"', '')\
-                .replace(' type=\"int\"', '')
-            output_file.write(xml)
-
-        if self.google_drive_connector_exists():
-            self.upload_to_google_drive(output_dir, file_name)
-
-    def get_item_func(self):
-        """ This is a helper method to create a compatible argument for the
-        dicttoxml.dicttoxml method's item_func parameter. This parameter
-        expects a callable that takes one parameter (the xml root element name)
-        and returns the item name for each XML block nested under that root.
-        The callable can only take 1 parameter, but a reference to 'self' is
-        needed to retrieve the item name, so this wrapper function is used to
-        overcome this."""
+        return (format_element(item_name, format_fields(record, item_name))
+                for record in data)
 
-        item_name = self.get_item_name()
+    def open_records_file(self, file_name):
+        return self.open_output_file(file_name, encoding='utf-8')
+
+    def get_file_header(self):
+        return f'{XML_DECLARATION}<{self.get_root_element_name()}>'
+
+    def get_file_footer(self):
+        return f'</{self.get_root_element_name()}>'
+
+
+def format_element(name, content):
+    """ Return an element of the given name holding the given, already
+    formatted, content
+
+    Parameters
+    ----------
+    name : String
+        Name of the element
+    content : String
+        Formatted content of the element
+
+    Returns
+    -------
+    String
+        The element
+    """
+    return f'<{name}>{content}</{name}>'
+
+
+def format_fields(record, item_name):
+    """ Return the fields of a record as consecutive elements
+
+    Parameters
+    ----------
+    record : dict
+        Record to format
+    item_name : String
+        Name of the elements holding the items of any lists in the record
+
+    Returns
+    -------
+    String
+        An element for each field of the record
+    """
+    return ''.join([format_field(get_element_tags(key), value, item_name)
+                    for key, value in record.items()])
+
+
+def format_field(tags, value, item_name):
+    """ Return an element holding a single value, with a 'type' attribute
+    for values other than strings, integers, dates and dictionaries
+
+    Parameters
+    ----------
+    tags : tuple
+        Start of the opening tag and the closing tag of the element, as
+        returned by get_element_tags
+    value : object
+        The value of the element
+    item_name : String
+        Name of the elements holding the items of the value, if a list
+
+    Returns
+    -------
+    String
+        The element
+
+    Raises
+    ------
+    TypeError
+        If the value is of a type which cannot be formatted
+    """
+
+    opening_tag, closing_tag = tags
+    value_type = type(value)
+
+    if value_type is str:
+        return f'{opening_tag}>{escape(value, ESCAPED_ENTITIES)}{closing_tag}'
+    elif value_type is int:
+        return f'{opening_tag}>{value}{closing_tag}'
+    elif value_type is bool:
+        return f'{opening_tag} type="bool">{str(value).lower()}{closing_tag}'
+    elif value_type is float:
+        return f'{opening_tag} type="float">{value}{closing_tag}'
+    elif isinstance(value, Number):
+        return f'{opening_tag} type="number">{value}{closing_tag}'
+    elif hasattr(value, 'isoformat'):
+        return f'{opening_tag}>{value.isoformat()}{closing_tag}'
+    elif isinstance(value, dict):
+        return f'{opening_tag}>{format_fields(value, item_name)}{closing_tag}'
+    elif value is None:
+        return f'{opening_tag} type="null">{closing_tag}'
+    elif isinstance(value, (list, tuple, set)):
+        item_tags = get_element_tags(item_name)
+        items = ''.join([format_field(item_tags, item, item_name)
+                         for item in value])
+        return f'{opening_tag} type="list">{items}{closing_tag}'
+
+    raise TypeError(f'Unsupported data type: {value} ({value_type.__name__})')
+
+
+@lru_cache(maxsize=None)
+def get_element_tags(key):
+    """ Return the tags of the element holding the value of a field, named
+    by the field's key where that is a valid XML name. Otherwise a numeric
+    key is prefixed with 'n', spaces in the key are replaced with
+    underscores, or failing both the element is named 'key' and given the
+    key as its 'name' attribute.
+
+    Parameters
+    ----------
+    key : String
+        Key of the field
+
+    Returns
+    -------
+    tuple
+        The opening tag of the element without its closing '>', such that
+        attributes may be added, and the closing tag of the element
+    """
+
+    name = escape(str(key), ESCAPED_ENTITIES)
+
+    if not is_valid_xml_name(name):
+        if name.isdigit():
+            name = f'n{name}'
+        elif is_float(name):
+            name = f'n{float(name)}'
+        elif is_valid_xml_name(name.replace(' ', '_')):
+            name = name.replace(' ', '_')
+        else:
+            return f'<key name="{name}"', '</key>'
+
+    return f'<{name}', f'</{name}>'
+
+
+def is_valid_xml_name(name):
+    """ Return whether an element may be given a name
+
+    Parameters
+    ----------
+    name : String
+        Name of the element
+
+    Returns
+    -------
+    bool
+        True if an element with the name can be parsed
+    """
+
+    try:
+        parseString(f'{XML_DECLARATION}<{name}>foo</{name}>')
+        return True
+    except Exception:
+        return False
+
+
+def is_float(name):
+    """ Return whether a name is a number
+
+    Parameters
+    ----------
+    name : String
+        Name to test
 
-        def item_func(_):
-            """ This function can access the item_name from the local scope
-            of the surrounding function, which overcomes the issue of returning
-            the item_name without taking in 'self' as a parameter.
-            Note the parameter is not used, but provided to comply with the
-            calling module"""
-            return item_name
+    Returns
+    -------
+    bool
+        True if the name can be read as a float
+    """
 
-        return item_func
+    try:
+        float(name)
+        return True
+    except ValueError:
+        return False
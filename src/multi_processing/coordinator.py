@@ -1,8 +1,23 @@
-from multiprocessing import Manager, Process
+import pickle
+import uuid
+from threading import Thread
 from multi_processing.creator import Creator
 from multi_processing.writer import Writer
+from multi_processing.streaming_writer import StreamingWriter
+from multi_processing.worker_pools import DIRECT_TRANSPORT, \
+    MANAGER_TRANSPORT
+from multi_processing import pool_tasks
+from multi_processing.in_flight_budget import InFlightBudget
 import math
 
+# Execution modes for a domain object. In the 'pipelined' mode, records are
+# created over the create pool, handed to the write parent thread, and written
+# over the write pool. In the 'fused' mode, each child process of the create
+# pool creates one output file's worth of records and writes that file itself.
+PIPELINED_EXECUTION_MODE = 'pipelined'
+FUSED_EXECUTION_MODE = 'fused'
+EXECUTION_MODES = [PIPELINED_EXECUTION_MODE, FUSED_EXECUTION_MODE]
+
 # Class to coordinate the multiprocessing implementation. It is
 # required to abstract the multiprocessing logic from any unpickleable
 # objects, such as the database connection.
@@ -12,33 +27,58 @@ class Coordinator:
     """ Coordination class for the multiprocessing implementation. Required
     to abstract multiprocessing calls from unpickleable objects in the main
     program, such as database connections. Holds, instantiates and passes job
-    queues to create and write processes, additionally starts these.
+    queues to create and write parent threads, additionally starts these.
+
+    The parent threads only orchestrate jobs; the jobs themselves are run
+    over the long-lived pools of child processes held by a WorkerPools
+    object, which is shared by the Coordinators of every domain object.
 
     Attributes
     ----------
-    create_job_queue : Multiprocessing Queue
-        Multiprocessing-safe, holds jobs for the create parent process to
-        dequeue and run
-    created_record_queue : Multiprocessing Queue
-        Multiprocessing-safe, holds lists of records created by the create
-        parent process for the write parent process to dequeue and write to
-        file
+    create_job_queue : Queue
+        Thread-safe, holds jobs for the create parent thread to dequeue and
+        run. Uses the transport given by 'created_record_transport' in the
+        user config
+    created_record_queue : Queue
+        Thread-safe, holds lists of records created by the create parent
+        thread for the write parent thread to dequeue and write to file. Uses
+        the transport given by 'created_record_transport' in the user config,
+        or the 'manager' transport where the object factory creates records
+        in chunks, as create child processes then put to it directly
     create_coordinator : Creator
-        Manages the create parent processes and pool of child processes. Holds
-        both 'create_job_queue' and 'created_record_queue' to dequeue jobs
-        from the former, and put the created records from those jobs in the
-        latter.
+        Manages the create parent thread and its use of the pool of child
+        processes. Holds both 'create_job_queue' and 'created_record_queue'
+        to dequeue jobs from the former, and put the created records from
+        those jobs in the latter.
     write_coordinator : Writer
-        Manages the write  parent processes and pool of child processes.
-        Holds the 'created_record_queue', dequeuing batches of jobs from it as
-        they arrive and running them over its pool of subprocesses.
+        Manages the write parent thread and its use of the pool of child
+        processes. Holds the 'created_record_queue', dequeuing batches of
+        jobs from it as they arrive and running them over its pool of
+        subprocesses. A StreamingWriter where files are limited to
+        'max_bytes_per_file', which writes records itself as they arrive.
+    in_flight_budget : InFlightBudget
+        Limit on the number of records on the created record queue, as given
+        by 'max_records_in_flight' in the user config, shared by the create
+        and write parent threads
     object_factory : Creatable
         Instantiated subclass of Creatable to be used for creating the records
         when running create jobs
-    parent_processes : list
-        Contains pointers to the create and write parent processes such that
-        they can accessed be terminated upon completion.
-...........................................
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest, from which an
+        interrupted run is resumed, or None
+    shard : tuple
+        Index of the shard of the run and the number of shards, where only
+        the shard's slice of the create jobs is to be run, otherwise None
+    resume_point : tuple
+        The start ID of the first create job to run, the number of the first
+        file to write, and the number of created records to discard, as
+        given by the progress of the domain object
+    parent_threads : list
+        Contains pointers to the create and write parent threads such that
+        they can be joined upon completion.
+    parent_thread_exceptions : list
+        Exceptions raised by the create and write parent threads
+
     Methods
     -------
     populate_create_job_queue()
@@ -46,17 +86,39 @@ class Coordinator:
         to generate and the maximum number of records per job as specified in
         the user config
 
-    start_create_parent_process()
-        Start the create parent process and append to 'parent_processes'
+    start_create_parent_thread()
+        Start the create parent thread and append to 'parent_threads'
+
+    start_write_parent_thread()
+        Start the write parent thread and append to 'parent_threads'
+
+    run_parent_thread(parent_process, *args)
+        Run the parent process of a coordinator, keeping any exception it
+        raises
+
+    join_parent_threads()
+        Wait for create & write coordinators to terminate, raising any
+        exception either raised
+
+    get_create_jobs(number_of_records_per_job)
+        Return the create jobs covering every record to be created, each of
+        at most the given number of records
+
+    get_shard_create_jobs(create_jobs)
+        Return the slice of the create jobs to be run by the shard of the
+        run, if the domain object is sharded
 
-    start_write_parent_process(pool_size)
-        Start the write parent process and append to 'parent_processes'
+    run_fused_jobs()
+        Create and write every output file over the create pool, one file per
+        job, when in the 'fused' execution mode
 
-    join_parent_processes()
-        Wait for create & write coordinators to terminate
+    report_queue_depth()
+        Print the depth of the created record queue and the records in flight
+        over the run, once the parent threads have finished
     """
 
-    def __init__(self, file_builder, object_factory):
+    def __init__(self, file_builder, object_factory, worker_pools,
+                 progress=None, shard=None):
         """Set initial values of instance attributes. Process coordinators will
         not run until their 'parent_process' methods are called.
 
@@ -68,25 +130,79 @@ class Coordinator:
         object_factory : Creatable
             Instantiated and pre-configured object factory which produces
             the current object.
+        worker_pools : WorkerPools
+            Long-lived pools of create and write child processes, through
+            which the queues between parent threads are also created
+        progress : DomainObjectProgress
+            Progress of the domain object in the run manifest. Jobs and files
+            recorded as done are skipped, and further progress is recorded
+            to it. Defaults to None, recording nothing
+        shard : tuple
+            Index of the shard of the run and the number of shards, where
+            the run is one of several shards each creating a slice of the
+            records of the domain object. Defaults to None, creating every
+            record
         """
 
-        queue_manager = Manager()
-        self.__create_job_queue = queue_manager.Queue()
-        self.__created_record_queue = queue_manager.Queue()
+        self.__progress = progress
+        self.__shard = shard
+        self.__resume_point = (0, 0, 0) if progress is None \
+            else progress.get_resume_point()
+        _, number_of_first_file_to_write, number_of_records_to_skip = \
+            self.__resume_point
+
+        transport = object_factory.get_shared_args().get(
+            'created_record_transport', DIRECT_TRANSPORT
+        )
+        self.__create_job_queue = worker_pools.create_queue(transport)
+
+        # child processes put records onto the created record queue directly
+        # when the object factory creates records in chunks, so the queue and
+        # the budget on the records it holds are held by the queue manager
+        maximum_number_of_records_in_flight = \
+            object_factory.get_shared_args().get('max_records_in_flight')
+        if object_factory.creates_records_in_chunks():
+            self.__created_record_queue = \
+                worker_pools.create_queue(MANAGER_TRANSPORT)
+            self.__in_flight_budget = InFlightBudget(
+                maximum_number_of_records_in_flight,
+                worker_pools.get_queue_manager()
+            )
+        else:
+            self.__created_record_queue = \
+                worker_pools.create_queue(transport)
+            self.__in_flight_budget = InFlightBudget(
+                maximum_number_of_records_in_flight
+            )
 
         self.__create_coordinator = Creator(
             self.__create_job_queue,
-            self.__created_record_queue
+            self.__created_record_queue,
+            worker_pools.get_create_pool(),
+            self.__in_flight_budget,
+            progress
         )
 
-        self.__write_coordinator = Writer(
+        # files limited in size are written a record at a time as records
+        # arrive, rather than a file's worth at a time over the write pool
+        writer_class = Writer if file_builder.get_max_bytes_per_file() \
+            is None else StreamingWriter
+        self.__write_coordinator = writer_class(
             self.__created_record_queue,
             file_builder.get_max_objects_per_file(),
-            file_builder
+            file_builder,
+            worker_pools.get_write_pool(),
+            self.__in_flight_budget,
+            progress,
+            number_of_first_file_to_write,
+            number_of_records_to_skip
         )
 
+        self.__file_builder = file_builder
         self.__object_factory = object_factory
-        self.__parent_processes = []
+        self.__create_pool = worker_pools.get_create_pool()
+        self.__parent_threads = []
+        self.__parent_thread_exceptions = []
 
     def populate_create_job_queue(self):
         """Populate the create job queue with create jobs.
@@ -98,73 +214,221 @@ class Coordinator:
         objects.
 
         A termination flag is added to the queue last. This informs the
-        create parent process to stop awaiting instruction once read, causing
+        create parent thread to stop awaiting instruction once read, causing
         it to terminate once the currently-running jobs have ceased.
+
+        Where the run is one of several shards, only the shard's slice of
+        the jobs is added. When resuming an interrupted run, jobs whose
+        records were all written by the previous run are not added.
         """
 
-        number_of_records_to_create = self.__object_factory.get_record_count()
         number_of_records_per_job = self.__object_factory.get_shared_args()[
             'number_of_records_per_job'
         ]
+        first_start_id = self.__resume_point[0]
+
+        create_jobs = self.get_shard_create_jobs(
+            self.get_create_jobs(number_of_records_per_job)
+        )
+
+        for create_job in create_jobs:
+            if create_job['start_id'] >= first_start_id:
+                self.__create_job_queue.put(create_job)
+
+        self.__create_job_queue.put("terminate")
+
+    def get_create_jobs(self, number_of_records_per_job):
+        """ Return the create jobs covering every record to be created by the
+        object factory, in order of their start IDs.
+
+        Parameters
+        ----------
+        number_of_records_per_job : int
+            The maximum quantity of records in a single create job
+
+        Returns
+        -------
+        List
+            Create jobs, each a dictionary of 'quantity' and 'start_id'
+        """
+
+        number_of_records_to_create = self.__object_factory.get_record_count()
 
         # round up using math.ceil to ensure a job is created for residual
         # records that do not take up a whole file's worth of records
 
-        number_of_create_jobs_to_queue = math.ceil(
+        number_of_create_jobs = math.ceil(
             number_of_records_to_create / number_of_records_per_job
         )
 
         number_of_records_without_create_jobs = number_of_records_to_create
         start_id = 0
+        create_jobs = []
 
-        for _ in range(number_of_create_jobs_to_queue):
+        for _ in range(number_of_create_jobs):
             quantity = min(
                 number_of_records_without_create_jobs,
                 number_of_records_per_job
             )
 
-            create_job = {
+            create_jobs.append({
                 'quantity': quantity,
                 'start_id': start_id
-            }
-
-            self.__create_job_queue.put(create_job)
+            })
 
             start_id += number_of_records_per_job
             number_of_records_without_create_jobs -= quantity
 
-        self.__create_job_queue.put("terminate")
+        return create_jobs
+
+    def get_shard_create_jobs(self, create_jobs):
+        """ Return the slice of the given create jobs to be run by the shard
+        of the run, if it is one of several shards creating the records of
+        the domain object, otherwise every job. Each shard is given a run of
+        consecutive jobs, and so of IDs, with the number of jobs given to
+        any two shards differing by at most one.
+
+        Parameters
+        ----------
+        create_jobs : List
+            Every create job of the domain object, in order of start ID
+
+        Returns
+        -------
+        List
+            The create jobs to be run by this run
+        """
 
-    def start_create_parent_process(self):
-        """ Start the create parent process """
+        if self.__shard is None:
+            return create_jobs
 
-        create_parent_process = Process(
-            target=self.__create_coordinator.parent_process,
-            args=(self.__object_factory,)
+        shard_index, shard_count = self.__shard
+        number_of_create_jobs = len(create_jobs)
+        return create_jobs[
+            shard_index * number_of_create_jobs // shard_count:
+            (shard_index + 1) * number_of_create_jobs // shard_count
+        ]
+
+    def run_fused_jobs(self):
+        """ Create and write every output file of the domain object over the
+        create pool, and wait for all files to be written.
+
+        A fused job is a create job of one output file's worth of records,
+        extended with the number of the file to write them to. The
+        coordinator only assigns file numbers and ID ranges; each child
+        process creates its job's records and passes them straight to the
+        file builder.
+
+        Each file is recorded to the run manifest, if any, once written, and
+        files recorded as written by a previous run are not written again.
+        """
+
+        fused_jobs = self.get_shard_create_jobs(self.get_create_jobs(
+            self.__file_builder.get_max_objects_per_file()
+        ))
+
+        for file_number, fused_job in enumerate(fused_jobs):
+            fused_job['file_number'] = file_number
+
+        if self.__progress is not None:
+            files_written = self.__progress.get_files_written()
+            fused_jobs = [fused_job for fused_job in fused_jobs
+                          if fused_job['file_number'] not in files_written]
+
+        pool_tasks.run_fused_jobs(
+            fused_jobs,
+            self.__create_pool,
+            uuid.uuid4().hex,
+            pickle.dumps(self.__object_factory),
+            self.__file_builder,
+            self.__progress
         )
 
-        create_parent_process.start()
+    def start_create_parent_thread(self):
+        """ Start the create parent thread """
+
+        create_parent_thread = Thread(
+            target=self.run_parent_thread,
+            args=(self.__create_coordinator.parent_process,
+                  self.__object_factory)
+        )
 
-        self.__parent_processes.append(create_parent_process)
+        create_parent_thread.start()
 
-    def start_write_parent_process(self):
-        """ Starts the write parent process """
+        self.__parent_threads.append(create_parent_thread)
+
+    def start_write_parent_thread(self):
+        """ Starts the write parent thread """
 
         number_of_write_child_processes =\
             self.__object_factory.get_shared_args()[
                 'number_of_write_child_processes'
             ]
 
-        write_parent_process = Process(
-            target=self.__write_coordinator.parent_process,
-            args=(number_of_write_child_processes,)
+        write_parent_thread = Thread(
+            target=self.run_parent_thread,
+            args=(self.__write_coordinator.parent_process,
+                  number_of_write_child_processes)
         )
 
-        write_parent_process.start()
+        write_parent_thread.start()
+
+        self.__parent_threads.append(write_parent_thread)
+
+    def run_parent_thread(self, parent_process, *args):
+        """ Run the parent process of the create or write coordinator,
+        keeping any exception it raises to be raised by
+        join_parent_threads
+
+        Parameters
+        ----------
+        parent_process : function
+            The parent process of the coordinator
+        args
+            Arguments of the parent process
+        """
+
+        try:
+            parent_process(*args)
+        except Exception as exception:
+            self.__parent_thread_exceptions.append(exception)
+
+    def join_parent_threads(self):
+        """ Waits for the create and write parent threads to terminate.
+
+        Raises
+        ------
+        Exception
+            The first exception raised by either parent thread, if any, such
+            that the domain object is not recorded as complete
+        """
 
-        self.__parent_processes.append(write_parent_process)
+        for thread in self.__parent_threads:
+            thread.join()
+
+        if self.__parent_thread_exceptions:
+            raise self.__parent_thread_exceptions[0]
+
+    def report_queue_depth(self):
+        """ Print the greatest and mean depth of the created record queue,
+        as sampled by the write parent thread, along with the greatest number
+        of records in flight and the time creation spent waiting for the
+        write parent thread. Called once the parent threads have finished.
+        """
 
-    def join_parent_processes(self):
-        """Waits for spawned child processes to terminate."""
-        for process in self.__parent_processes:
-            process.join()
+        samples = self.__write_coordinator.get_queue_depth_samples()
+        if not samples:
+            return
+
+        in_flight_budget = self.__in_flight_budget
+        maximum_number_of_records = \
+            in_flight_budget.get_maximum_number_of_records()
+        budget = 'unlimited' if maximum_number_of_records is None \
+            else maximum_number_of_records
+
+        print(f"{self.__file_builder.get_file_name().format('*')}: "
+              f"created record queue depth max {max(samples)}, "
+              f"mean {sum(samples) / len(samples):.1f}; records in flight "
+              f"max {in_flight_budget.get_peak_number_of_records_in_flight()}"
+              f" of {budget}; creation waited "
+              f"{in_flight_budget.get_seconds_waited():.1f}s")
@@ -1,6 +1,9 @@
-import time
+import pickle
+import queue
+import uuid
 from multi_processing import pool_tasks
-
+from multi_processing.in_flight_budget import InFlightBudget
+from domainobjectfactories.record_batch import concatenate_records
 
 class Creator:
     """ A class to coordinate the creation of domain objects as specified by
@@ -14,45 +17,67 @@ class Creator:
     quantity of records in a 'create job' is specified in the 'shared_args'
     section of the user config by the 'number_of_records_per_job' key.
 
-    The create parent process will wait until the 'create_job_queue' is not
-    empty, at which point it will dequeue 'create jobs' and add them to a list.
+    The create parent thread blocks on the 'create_job_queue' until a 'create
+    job' arrives, at which point it will dequeue 'create jobs' and add them to
+    a list.
     It will not dequeue more than double the number of child create processes
     worth of create jobs at a time to ensure that the child processes work on
     reasonable sized batches of create jobs.
 
-    The dequeued 'create jobs' in the list are executed over a pool of child
-    create processes which, upon termination of all child processes, returns
-    a list of created records. This list contains the collated output from that
-    batch of 'create jobs'.
+    The dequeued 'create jobs' in the list are executed over the long-lived
+    pool of child create processes which, upon completion of all jobs in the
+    list, returns a list of created records. This list contains the collated
+    output from that batch of 'create jobs'.
 
     As batches of 'create jobs' are run, the returned lists of records are
     added to a FIFO 'generated_record_queue'. This queue is shared between the
     create and write parent processes.
 
+    Where the object factory creates records in chunks, each child process
+    instead puts every chunk of records it creates onto the
+    'generated_record_queue' itself, so records are written as they are
+    created rather than once the batch of jobs is finished.
+
+    Records are added to an 'in flight budget' before being put onto the
+    queue, which blocks while the budget is exhausted. Creation therefore
+    waits for the write parent thread to take records from the queue
+    whenever writing falls behind.
+
+    Where a run manifest is kept, the number of records created by each job
+    is recorded to it before the records are put onto the queue, so that an
+    interrupted run can tell which jobs' records were written.
+
     Attributes
     ----------
     create_job_queue : Multiprocess Queue
         Multiprocess safe queue from which jobs to create records are taken
     created_record_queue : Multiprocess Queue
         Multiprocess safe queue into which lists of created records are placed
+    create_pool : Multiprocessing Pool
+        Long-lived pool of child processes over which create jobs are run
+    in_flight_budget : InFlightBudget
+        Limit on the number of records on the created record queue
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest, or None
     terminate_dequeued : Boolean
         Boolean flag which when True indicates the coordinator is to terminate
 
     Methods
     -------
     parent_process(object_factory)
-        Until the "terminate" flag is dequeued, cycle through a loop that waits
-        until the create job queue is not empty, then dequeues and runs a batch
-        of jobs, and puts a list of created records from that batch onto the
-        created record queue.
-    sleep_while_create_job_queue_empty()
-        Sleep whilst the create job queue is empty
+        Until the "terminate" flag is dequeued, cycle through a loop that
+        blocks until a create job is on the queue, then dequeues and runs a
+        batch of jobs, and puts a list of created records from that batch onto
+        the created record queue.
+    wait_for_create_job()
+        Block until a create job is on the queue, and return it
     get_dequeued_create_jobs(maximum_number_of_create_jobs_to_dequeue)
         Return a list containing a batch of jobs dequeued from the create job
         queue such that they can be run over a pool of child processes
     """
 
-    def __init__(self, create_job_queue, created_record_queue):
+    def __init__(self, create_job_queue, created_record_queue, create_pool,
+                 in_flight_budget=None, progress=None):
         """ Assign variables from input, and set termination to False
 
         Parameters
@@ -63,10 +88,22 @@ class Creator:
         created_record_queue : Multiprocessed Queue
             Queue containing lists of records creating from running
             'create jobs'
+        create_pool : Multiprocessing Pool
+            Long-lived pool of child processes over which create jobs are run
+        in_flight_budget : InFlightBudget
+            Limit on the number of records on the created record queue, which
+            is shared with the write parent thread. Defaults to no limit
+        progress : DomainObjectProgress
+            Progress of the domain object in the run manifest, to which
+            create jobs are recorded once run. Defaults to None, recording
+            nothing
         """
 
         self.create_job_queue = create_job_queue
         self.created_record_queue = created_record_queue
+        self.create_pool = create_pool
+        self.in_flight_budget = in_flight_budget or InFlightBudget()
+        self.progress = progress
         self.terminate_dequeued = False
 
     def parent_process(self, object_factory):
@@ -91,29 +128,75 @@ class Creator:
         maximum_number_of_create_jobs_to_dequeue = \
             number_of_create_child_processes * 2
 
-        while not self.terminate_dequeued:
-            self.sleep_while_create_job_queue_empty()
+        # the object factory is pickled once here rather than once per job,
+        # and cached under this key by each child process that runs a job
+        factory_key = uuid.uuid4().hex
+        pickled_object_factory = pickle.dumps(object_factory)
 
-            dequeued_create_jobs = self.get_dequeued_create_jobs(
-                maximum_number_of_create_jobs_to_dequeue
-            )
+        try:
+            while not self.terminate_dequeued:
+                dequeued_create_jobs = self.get_dequeued_create_jobs(
+                    maximum_number_of_create_jobs_to_dequeue
+                )
 
-            created_records_from_multiple_jobs = \
-                pool_tasks.run_create_jobs(
-                    dequeued_create_jobs,
-                    number_of_create_child_processes,
-                    object_factory
+                if object_factory.creates_records_in_chunks():
+                    # child processes put each chunk of records they create
+                    # onto the created record queue themselves
+                    pool_tasks.run_streaming_create_jobs(
+                        dequeued_create_jobs,
+                        self.create_pool,
+                        factory_key,
+                        pickled_object_factory,
+                        self.created_record_queue,
+                        self.in_flight_budget
+                    )
+                    continue
+
+                created_records_from_each_job = \
+                    pool_tasks.run_create_jobs_separately(
+                        dequeued_create_jobs,
+                        self.create_pool,
+                        factory_key,
+                        pickled_object_factory
+                    )
+
+                if self.progress is not None:
+                    self.progress.record_create_jobs(
+                        (create_job['start_id'], len(created_records))
+                        for create_job, created_records in zip(
+                            dequeued_create_jobs,
+                            created_records_from_each_job
+                        )
+                    )
+
+                created_records_from_multiple_jobs = concatenate_records(
+                    created_records_from_each_job
                 )
 
-            self.created_record_queue.put(created_records_from_multiple_jobs)
+                # wait for the write parent thread to catch up if the queue
+                # already holds as many records as the budget allows
+                self.in_flight_budget.add_records(
+                    len(created_records_from_multiple_jobs)
+                )
+                self.created_record_queue.put(
+                    created_records_from_multiple_jobs
+                )
+        finally:
+            # always release the write parent thread, even if a create job
+            # raised an exception
+            self.created_record_queue.put("terminate")
 
-        self.created_record_queue.put("terminate")
+    def wait_for_create_job(self):
+        """ Block until a create job (or the termination flag) is on the
+        queue, and return it
 
-    def sleep_while_create_job_queue_empty(self):
-        """ Sleep until jobs are on the queue """
+        Returns
+        -------
+        dict or String
+            The dequeued create job, or the termination flag
+        """
 
-        while self.create_job_queue.empty():
-            time.sleep(1)
+        return self.create_job_queue.get()
 
     def get_dequeued_create_jobs(
             self, maximum_number_of_create_jobs_to_dequeue
@@ -121,6 +204,9 @@ class Creator:
         """ Dequeues 'create jobs' from the Multiprocess Safe Queue
         'create_job_queue' and places them into a list for later execution.
 
+        Blocks until the first 'create job' arrives, then takes any further
+        'create jobs' already on the queue without waiting.
+
         If twice the number of create child processes are dequeued, then the
         list is returned - this is to ensure the pool of child processes will
         not run over an inefficiently large batch of 'create jobs'.
@@ -131,9 +217,6 @@ class Creator:
 
         Parameters
         ----------
-        object_factory : Creatable
-            Instantiated and pre-configured object factory which produces
-            the current object.
         maximum_number_of_create_jobs_to_dequeue : int
             the maximum number of jobs to dequeue for processing
 
@@ -146,15 +229,22 @@ class Creator:
         """
 
         dequeued_create_jobs = []
+        create_job = self.wait_for_create_job()
 
-        while not self.create_job_queue.empty() and len(dequeued_create_jobs) \
-                < maximum_number_of_create_jobs_to_dequeue:
-
-            create_job = self.create_job_queue.get()
-
+        while True:
             if create_job == "terminate":
                 self.terminate_dequeued = True
-            else:
-                dequeued_create_jobs.append(create_job)
+                break
+
+            dequeued_create_jobs.append(create_job)
+
+            if len(dequeued_create_jobs) \
+                    >= maximum_number_of_create_jobs_to_dequeue:
+                break
+
+            try:
+                create_job = self.create_job_queue.get_nowait()
+            except queue.Empty:
+                break
 
         return dequeued_create_jobs
@@ -0,0 +1,179 @@
+import threading
+import time
+from types import SimpleNamespace
+
+
+class InFlightBudget:
+    """ A limit on the number of created records waiting on the created
+    record queue of a domain object for the write parent thread to take
+    them. Records are added to the budget before being put onto the queue,
+    blocking while the budget is exhausted, and removed as the write parent
+    thread takes them from the queue. Creation is thereby throttled whenever
+    writing lags behind, rather than the queue growing without limit.
+
+    A batch of records larger than the whole budget is only admitted once no
+    other records are in flight, so that it cannot wait forever.
+
+    The budget also records the greatest number of records in flight and
+    the total time spent waiting for the budget, for reporting.
+
+    Where created records are put onto the queue by create child processes
+    rather than the create parent thread, the budget is held by a
+    multiprocessing manager, so it can be passed to child processes.
+
+    Attributes
+    ----------
+    maximum_number_of_records : int
+        The most records that may be in flight at once, or None for no limit
+    condition : Condition
+        Guards the counts below and signals when records are removed
+    state : Namespace or Namespace Proxy
+        Holds the number of records in flight, the greatest number of
+        records in flight, and the number of seconds spent waiting
+
+    Methods
+    -------
+    add_records(number_of_records)
+        Add records about to be put onto the queue, blocking while the
+        budget is exhausted
+    remove_records(number_of_records)
+        Remove records taken from the queue
+    get_number_of_records_in_flight()
+        Return the number of records currently in flight
+    get_peak_number_of_records_in_flight()
+        Return the greatest number of records that have been in flight
+    get_seconds_waited()
+        Return the total time spent waiting for the budget
+    get_maximum_number_of_records()
+        Return the most records that may be in flight at once
+    """
+
+    def __init__(self, maximum_number_of_records=None, manager=None):
+        """ Set the limit of the budget, with no records in flight.
+
+        Parameters
+        ----------
+        maximum_number_of_records : int
+            The most records that may be in flight at once, or None for no
+            limit
+        manager : Multiprocessing Manager
+            Manager to hold the budget's state, such that the budget can be
+            used by child processes, or None if it is only used by threads
+            of this process
+        """
+
+        self.__maximum_number_of_records = maximum_number_of_records
+
+        if manager is None:
+            self.__condition = threading.Condition()
+            self.__state = SimpleNamespace()
+        else:
+            self.__condition = manager.Condition()
+            self.__state = manager.Namespace()
+
+        self.__state.number_of_records_in_flight = 0
+        self.__state.peak_number_of_records_in_flight = 0
+        self.__state.seconds_waited = 0.0
+
+    def add_records(self, number_of_records):
+        """ Add records about to be put onto the queue, first waiting for
+        enough records to be removed if they would exceed the budget
+
+        Parameters
+        ----------
+        number_of_records : int
+            The number of records to be put onto the queue
+        """
+
+        with self.__condition:
+            wait_start = time.perf_counter()
+            waited = False
+
+            while self.__is_exhausted(number_of_records):
+                waited = True
+                self.__condition.wait()
+
+            in_flight = \
+                self.__state.number_of_records_in_flight + number_of_records
+            self.__state.number_of_records_in_flight = in_flight
+            if in_flight > self.__state.peak_number_of_records_in_flight:
+                self.__state.peak_number_of_records_in_flight = in_flight
+            if waited:
+                self.__state.seconds_waited += \
+                    time.perf_counter() - wait_start
+
+    def remove_records(self, number_of_records):
+        """ Remove records taken from the queue, waking any waiting to add
+        records
+
+        Parameters
+        ----------
+        number_of_records : int
+            The number of records taken from the queue
+        """
+
+        with self.__condition:
+            self.__state.number_of_records_in_flight -= number_of_records
+            self.__condition.notify_all()
+
+    def __is_exhausted(self, number_of_records):
+        """ Return whether the given number of records must wait to be added
+
+        Parameters
+        ----------
+        number_of_records : int
+            The number of records to be added
+
+        Returns
+        -------
+        bool
+            True if there is a limit, other records are in flight, and
+            adding the records would exceed the limit
+        """
+
+        in_flight = self.__state.number_of_records_in_flight
+        return self.__maximum_number_of_records is not None \
+            and in_flight > 0 \
+            and in_flight + number_of_records > \
+            self.__maximum_number_of_records
+
+    def get_number_of_records_in_flight(self):
+        """ Return the number of records currently in flight
+
+        Returns
+        -------
+        int
+            Records put onto the queue and not yet taken from it
+        """
+        return self.__state.number_of_records_in_flight
+
+    def get_peak_number_of_records_in_flight(self):
+        """ Return the greatest number of records that have been in flight
+
+        Returns
+        -------
+        int
+            Greatest number of records in flight at once
+        """
+        return self.__state.peak_number_of_records_in_flight
+
+    def get_seconds_waited(self):
+        """ Return the total time spent waiting for the budget, summed over
+        every thread or process that has waited
+
+        Returns
+        -------
+        float
+            Seconds spent waiting to add records
+        """
+        return self.__state.seconds_waited
+
+    def get_maximum_number_of_records(self):
+        """ Return the most records that may be in flight at once
+
+        Returns
+        -------
+        int
+            The limit of the budget, or None for no limit
+        """
+        return self.__maximum_number_of_records
@@ -1,97 +1,376 @@
-""" Pool Manager functionality for both create and write parent processes.
+""" Pool Manager functionality for both create and write parent threads.
 
-The create parent process executes the 'parent_process' method of the Creator
+The create parent thread executes the 'parent_process' method of the Creator
 class, which prepares a batch of 'create jobs' then calls the 'run_create_jobs'
 method of this module to run them over a pool of child processes.
 
-The write parent process similarly executes the 'parent_process' method of the
-Writer class, which waits until the parent process of the Creator class has run
+The write parent thread similarly executes the 'parent_process' method of the
+Writer class, which waits until the parent thread of the Creator class has run
 'create jobs' to produce records, then dequeues these created records and
 assigns them to 'write jobs' which are stored in a list.
 
 'Write jobs' are run by being passed to file builder objects to be written to
 file, and are run in batches over a pool of write child processes.
+
+Both pools are started once per run (see the WorkerPools class) and reused
+for every batch of jobs of every domain object.
+
+Object factories which create records in chunks have each child process put
+every chunk onto the created record queue as it is created, rather than
+returning all records of a job to the create parent thread at once.
+
+In the 'fused' execution mode there is no write parent thread: each 'fused
+job' is run over the create pool by a child process which both creates the
+records and writes them to file, so records are never sent back to the main
+process.
 """
 
-from multiprocessing import Pool, Lock
+import pickle
+from collections import OrderedDict
+from multiprocessing import Pool
+from domainobjectfactories.record_batch import RecordBatch, concatenate_records
 
+# The maximum number of unpickled object factories each create child process
+# keeps between jobs. Factories are evicted least recently used first, and are
+# simply unpickled again should a job for an evicted factory arrive.
+MAXIMUM_CACHED_OBJECT_FACTORIES = 16
 
-def run_create_jobs(
-        dequeued_create_jobs, number_of_create_child_processes, object_factory
-):
+# Object factories unpickled by this (create child) process, keyed by the
+# factory key assigned by the create parent thread of their domain object
+object_factories = OrderedDict()
+
+# Queue of the persistence service, set by make_global in create child
+# processes when using 'service' persistence
+persistence_queue = None
+
+
+def start_create_pool(number_of_create_child_processes,
+                      service_persistence_queue=None):
     """ Instantiates a Pool with a number of processes as given in the user
-    config by the 'number_of_create_child_processes' line, and begins execution
-    of the provided batch of 'create jobs' on the pool.
+    config by the 'number_of_create_child_processes' line. The pool is
+    long-lived, and is shared by every domain object created in a run.
 
     Parameters
     ----------
-    dequeued_create_jobs : list
-        List of create jobs taken from the create job queue
     number_of_create_child_processes : int
         The number of processes sitting within the pool for execution of jobs
         to be ran on.
-    object_factory : Creatable
-        Instantiated subclass of Creatable to be used to create records using
-        its create method
+    service_persistence_queue : Multiprocessing JoinableQueue
+        Queue of the persistence service that object factories are to send
+        records to persist to, or None for them to persist records directly
 
     Returns
     -------
-    List
-        List of created records collated from the results of each 'create job'.
+    Multiprocessing Pool
+        Pool over which 'create jobs' are run
     """
 
-    # multiprocessing lock used to define critical section in the
-    # InstrumentFactory class
-    local_lock = Lock()
-    create_pool = Pool(
+    return Pool(
         processes=number_of_create_child_processes,
         initializer=make_global,
-        initargs=(local_lock,)
+        initargs=(service_persistence_queue,)
     )
 
+
+def start_write_pool(number_of_write_child_processes):
+    """ Instantiates a Pool with a number of processes as given in the user
+    config by the 'number_of_write_child_processes' line. The pool is
+    long-lived, and is shared by every domain object written in a run.
+
+    Parameters
+    ----------
+    number_of_write_child_processes : int
+        The number of processes sitting within the pool for execution of jobs
+        to be ran on.
+
+    Returns
+    -------
+    Multiprocessing Pool
+        Pool over which 'write jobs' are run
+    """
+
+    return Pool(processes=number_of_write_child_processes)
+
+
+def run_create_jobs(
+        dequeued_create_jobs, create_pool, factory_key, pickled_object_factory
+):
+    """ Begins execution of the provided batch of 'create jobs' on the
+    long-lived pool of create child processes.
+
+    The object factory is pickled once per domain object by the create parent
+    thread rather than once per job. Each child process unpickles it the
+    first time it runs a job for that domain object, then reuses it for
+    subsequent jobs.
+
+    Parameters
+    ----------
+    dequeued_create_jobs : list
+        List of create jobs taken from the create job queue
+    create_pool : Multiprocessing Pool
+        The pool of create child processes to run the jobs over
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled instance of the Creatable subclass to be used to create
+        records using its create method
+
+    Returns
+    -------
+    List or RecordBatch
+        Created records collated from the results of each 'create job'.
+    """
+
+    # flatten the results of each job into a single list of records, or a
+    # single RecordBatch where the object factory creates RecordBatches
+    return concatenate_records(run_create_jobs_separately(
+        dequeued_create_jobs, create_pool, factory_key, pickled_object_factory
+    ))
+
+
+def run_create_jobs_separately(
+        dequeued_create_jobs, create_pool, factory_key, pickled_object_factory
+):
+    """ Runs the provided batch of 'create jobs' on the long-lived pool of
+    create child processes, as run_create_jobs, but returns the records
+    created by each job separately.
+
+    Parameters
+    ----------
+    dequeued_create_jobs : list
+        List of create jobs taken from the create job queue
+    create_pool : Multiprocessing Pool
+        The pool of create child processes to run the jobs over
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled instance of the Creatable subclass to be used to create
+        records using its create method
+
+    Returns
+    -------
+    List
+        The list or RecordBatch of records created by each 'create job', in
+        the order of the jobs
+    """
+
     # use a list comprehension to collect the result of each child processes
     # the apply_async method is used in such that multiple arguments can
     # be passed to the 'create_records_from_create_job' function, which is not
     # possible using the Pool.map method
-    nested_list_of_created_records = [
+    return [
         async_result_object.get() for async_result_object in [
             create_pool.apply_async(
                 create_records_from_create_job, args=(
-                    create_job, object_factory
+                    create_job, factory_key, pickled_object_factory
                 )
             ) for create_job in dequeued_create_jobs
         ]
     ]
 
-    # use a list comprehension to flatten the list of lists created above
-    created_records_from_multiple_jobs = [
-        created_record
-        for list_of_created_records in nested_list_of_created_records
-        for created_record in list_of_created_records
+
+def run_streaming_create_jobs(
+        dequeued_create_jobs, create_pool, factory_key, pickled_object_factory,
+        created_record_queue, in_flight_budget
+):
+    """ Runs the provided batch of 'create jobs' on the long-lived pool of
+    create child processes, for object factories which create records in
+    chunks, and waits for all of them to finish. Each child process puts
+    every chunk of records it creates onto the created record queue itself,
+    so the records of a job are written as they are created rather than
+    being collected and returned once the job is finished.
+
+    Parameters
+    ----------
+    dequeued_create_jobs : list
+        List of create jobs taken from the create job queue
+    create_pool : Multiprocessing Pool
+        The pool of create child processes to run the jobs over
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled instance of the Creatable subclass to be used to create
+        records using its create_chunks method
+    created_record_queue : Queue
+        Proxy to the queue read by the write parent thread, which must be
+        able to be put to by child processes
+    in_flight_budget : InFlightBudget
+        Limit on the number of records on the created record queue, which
+        must be held by a manager so as to be shared with child processes
+
+    Returns
+    -------
+    int
+        The number of records created by all of the 'create jobs'
+    """
+
+    async_result_objects = [
+        create_pool.apply_async(
+            stream_records_from_create_job, args=(
+                create_job, factory_key, pickled_object_factory,
+                created_record_queue, in_flight_budget
+            )
+        ) for create_job in dequeued_create_jobs
     ]
 
-    create_pool.close()
-    create_pool.join()
+    return sum(async_result_object.get()
+               for async_result_object in async_result_objects)
+
 
-    return created_records_from_multiple_jobs
+def run_fused_jobs(
+        fused_jobs, create_pool, factory_key, pickled_object_factory,
+        file_builder, progress=None
+):
+    """ Runs the provided 'fused jobs' over the long-lived pool of create
+    child processes, and waits for all of them to finish. Each child process
+    creates the records of a job and writes them straight to the job's output
+    file, so created records never return to the main process.
 
+    Parameters
+    ----------
+    fused_jobs : list
+        List of fused jobs, each a create job with the number of the file its
+        records are to be written to
+    create_pool : Multiprocessing Pool
+        The pool of create child processes to run the jobs over
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled instance of the Creatable subclass to be used to create
+        records using its create method
+    file_builder : FileBuilder
+        Instantiated subclass of FileBuilder used to write created records to
+        file
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest, to which each
+        output file is recorded once written, or None
+    """
+
+    fused_jobs = list(fused_jobs)
+
+    # each child process is given its own copy of the file builder, so where
+    # every file shares a layout not yet fixed, jobs are run one at a time
+    # until a child process returns the layout fixed by the first records
+    while fused_jobs and file_builder.has_file_layout() \
+            and file_builder.get_file_layout() is None:
+        fused_job = fused_jobs.pop(0)
+        number_of_records, file_layout = create_pool.apply(
+            create_and_build_file_from_fused_job, args=(
+                fused_job, factory_key, pickled_object_factory, file_builder
+            )
+        )
+        file_builder.set_file_layout(file_layout)
+        record_fused_job(fused_job, number_of_records, progress)
+
+    async_result_objects = [
+        create_pool.apply_async(
+            create_and_build_file_from_fused_job, args=(
+                fused_job, factory_key, pickled_object_factory, file_builder
+            )
+        ) for fused_job in fused_jobs
+    ]
 
-def make_global(local_lock):
-    """ helper function used in run_create_jobs that assigns the local_lock
-    parameter to a global lock variable. This is required since a
-    multiprocessing Lock object cannot otherwise be passed to a Pool method
-    since it is not pickleable (required due to implementation of Pool in the
-    multiprocessing module).
+    for fused_job, async_result_object in zip(fused_jobs,
+                                              async_result_objects):
+        number_of_records, _ = async_result_object.get()
+        record_fused_job(fused_job, number_of_records, progress)
+
+
+def record_fused_job(fused_job, number_of_records, progress):
+    """ Records the output file of a finished fused job to the progress of
+    the domain object, if any
+
+    Parameters
+    ----------
+    fused_job : dict
+        The fused job, with the number of its output file
+    number_of_records : int
+        The number of records written to the file
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest, or None
+    """
+
+    if progress is not None:
+        progress.record_files_written(
+            {fused_job['file_number']: number_of_records}
+        )
+
+
+def make_global(local_persistence_queue=None):
+    """ helper function used in run_create_jobs that assigns the
+    local_persistence_queue parameter to a global persistence_queue variable.
+    This is required since a multiprocessing queue cannot otherwise be passed
+    to a Pool method since it is not pickleable (required due to
+    implementation of Pool in the multiprocessing module).
 
     For more information see this SO thread (with line break for PEP8):
     https://stackoverflow.com/
     questions/25557686/python-sharing-a-lock-between-processes
     """
-    global lock
-    lock = local_lock
+    global persistence_queue
+    persistence_queue = local_persistence_queue
 
 
-def create_records_from_create_job(create_job, object_factory):
+def get_object_factory(factory_key, pickled_object_factory):
+    """ Returns the object factory for the given key, unpickling it only if
+    this child process has not already done so for an earlier job.
+
+    Parameters
+    ----------
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled instance of the Creatable subclass, unpickled on first use
+
+    Returns
+    -------
+    Creatable
+        Instantiated and pre-configured object factory
+    """
+
+    if factory_key in object_factories:
+        object_factories.move_to_end(factory_key)
+    else:
+        object_factories[factory_key] = pickle.loads(pickled_object_factory)
+        if len(object_factories) > MAXIMUM_CACHED_OBJECT_FACTORIES:
+            object_factories.popitem(last=False)
+
+    return object_factories[factory_key]
+
+
+def prepare_object_factory(factory_key, pickled_object_factory):
+    """ Returns the object factory for the given key, ready to run a job:
+    set to send persisted records to the persistence service, if any, and
+    with its dependency cache up to date with the database.
+
+    Parameters
+    ----------
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled instance of the Creatable subclass, unpickled on first use
+
+    Returns
+    -------
+    Creatable
+        Instantiated and pre-configured object factory
+    """
+
+    object_factory = get_object_factory(factory_key, pickled_object_factory)
+    object_factory.set_persistence_queue(persistence_queue)
+    object_factory.refresh_dependency_cache()
+    return object_factory
+
+
+def create_records_from_create_job(
+        create_job, factory_key, pickled_object_factory
+):
     """ Returns a list of records created as specified by a single 'create job'
 
     Parameters
@@ -99,57 +378,164 @@ def create_records_from_create_job(create_job, object_factory):
     create_job : dict
         dictionary specifying a quantity of records to create and the ID to
         start from (for domain objects with sequential unique IDs)
-    object_factory : Creatable
-        Instantiated and pre-configured object factory used to create
-        records from create jobs
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled, pre-configured object factory used to create records from
+        create jobs
 
     Returns
     -------
-    list
-        List containing all the records created for this job
+    list or RecordBatch
+        All the records created for this job
     """
 
+    object_factory = prepare_object_factory(
+        factory_key, pickled_object_factory
+    )
     quantity, start_id = create_job['quantity'], create_job['start_id']
+    object_factory.start_create_job(start_id)
 
-    # The InstrumentFactory is the only factory which has a critical section
-    # and therefore requires a lock
-    if object_factory.__class__.__name__ == "InstrumentFactory":
-        created_records = object_factory.create(quantity, start_id, lock=lock)
-    else:
-        created_records = object_factory.create(quantity, start_id)
+    return object_factory.create(quantity, start_id)
 
-    return created_records
 
+def stream_records_from_create_job(
+        create_job, factory_key, pickled_object_factory, created_record_queue,
+        in_flight_budget
+):
+    """ Creates the records specified by a single 'create job' in chunks,
+    putting each chunk onto the created record queue as soon as it is
+    created, for object factories which create records in chunks. Only one
+    chunk of records is held by the child process at a time.
 
-def run_write_jobs(write_jobs, number_of_write_child_processes, file_builder):
-    """ Instantiates a Pool with a number of processes as given in the user
-    config by the 'number_of_write_child_processes' line, and begins execution
-    of the provided batch of 'write jobs' on the pool.
+    Parameters
+    ----------
+    create_job : dict
+        dictionary specifying a quantity of records to create and the ID to
+        start from (for domain objects with sequential unique IDs)
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled, pre-configured object factory used to create records from
+        create jobs
+    created_record_queue : Queue
+        Proxy to the queue read by the write parent thread
+    in_flight_budget : InFlightBudget
+        Limit on the number of records on the created record queue, waited
+        on before each chunk is put onto it
+
+    Returns
+    -------
+    int
+        The number of records created for this job
+    """
+
+    object_factory = prepare_object_factory(
+        factory_key, pickled_object_factory
+    )
+    quantity, start_id = create_job['quantity'], create_job['start_id']
+    object_factory.start_create_job(start_id)
+
+    number_of_records = 0
+    for records in object_factory.create_chunks(quantity, start_id):
+        if len(records):
+            in_flight_budget.add_records(len(records))
+            created_record_queue.put(records)
+            number_of_records += len(records)
+
+    return number_of_records
+
+
+def create_and_build_file_from_fused_job(
+        fused_job, factory_key, pickled_object_factory, file_builder
+):
+    """ Function to be called by each process in the create pool in parallel,
+    each taking a different fused job as input. Creates the records specified
+    by the job and writes them to the job's output file in-process.
+
+    Parameters
+    ----------
+    fused_job : dict
+        dictionary specifying a quantity of records to create, the ID to
+        start from, and the number used to uniquely name the output file
+    factory_key : String
+        Key uniquely identifying the object factory of the domain object
+        being created
+    pickled_object_factory : bytes
+        Pickled, pre-configured object factory used to create records
+    file_builder : FileBuilder
+        Instantiated subclass of FileBuilder used to write the output file
+
+    Returns
+    -------
+    tuple
+        The number of records written, and the layout of the file (see
+        FileBuilder.get_file_layout), fixed by the records if it was not
+        already
+    """
+
+    records = create_records_from_create_job(
+        fused_job, factory_key, pickled_object_factory
+    )
+
+    # some factories return an iterable other than a list or RecordBatch, so
+    # collect it
+    if not isinstance(records, (list, RecordBatch)):
+        records = list(records)
+
+    # domain objects dependent on others may create no records for a job
+    if len(records):
+        file_builder.build(fused_job['file_number'], records)
+
+    return len(records), file_builder.get_file_layout()
+
+
+def run_write_jobs(write_jobs, write_pool, file_builder, progress=None):
+    """ Begins execution of the provided batch of 'write jobs' on the
+    long-lived pool of write child processes, and waits for all of them to
+    finish.
 
     Parameters
     ----------
     write_jobs : list
         List of write jobs to be run over the pool of child processes
-    number_of_write_child_processes : int
-        The number of processes sitting within the pool for execution of jobs
-        to be ran on.
+    write_pool : Multiprocessing Pool
+        The pool of write child processes to run the jobs over
     file_builder : FileBuilder
         Instantiated subclass of FileBuilder used to write created records to
         file
-    """
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest, to which the
+        output files written are recorded, or None
 
-    write_pool = Pool(number_of_write_child_processes)
+    Raises
+    ------
+    Exception
+        The exception raised by the first write job which failed, once the
+        files written before it are recorded
+    """
 
     # the apply_async method is used in a for loop such that multiple arguments
     # can be passed to the 'build_file_from_write_job' function, which is not
     # possible using the Pool.map method
-    for write_job in write_jobs:
+    async_result_objects = [
         write_pool.apply_async(
             build_file_from_write_job, args=(write_job, file_builder)
-        )
+        ) for write_job in write_jobs
+    ]
 
-    write_pool.close()
-    write_pool.join()
+    file_record_counts = {}
+    try:
+        for write_job, async_result_object in zip(write_jobs,
+                                                  async_result_objects):
+            async_result_object.get()
+            file_record_counts[write_job['file_number']] = \
+                len(write_job['records'])
+    finally:
+        if progress is not None and file_record_counts:
+            progress.record_files_written(file_record_counts)
 
 
 def build_file_from_write_job(write_job, file_builder):
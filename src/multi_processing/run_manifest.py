@@ -0,0 +1,494 @@
+import hashlib
+import os
+import threading
+import ujson
+
+# File to which the progress of a run is recorded, in the working directory
+# alongside the dependency database, such that an interrupted run can be
+# resumed with the '--resume' command line argument
+RUN_MANIFEST_FILE_NAME = 'run_manifest.jsonl'
+
+
+class RunManifest:
+    """ A record of the progress of a run, such that a run which is
+    interrupted can be resumed rather than started over.
+
+    The manifest is saved as a journal of JSON lines: the first holds the
+    digest of the config of the run, and each change of progress is appended
+    as a further line as it is made, so that recording progress costs the
+    same however much has been recorded. The lines are folded together into
+    the progress of the run when it is resumed. A line left partially written
+    by an interrupted run is discarded.
+
+    For each domain object of the user config, the manifest records whether
+    it has been completed, the number of rows in each table it persists to
+    when it was started, the create jobs whose records have been handed to
+    the write parent thread, and the output files which have been written
+    with the number of records in each. Domain objects are identified by
+    their position in the user config as well as their name, as a domain
+    object may appear in the config more than once.
+
+    The manifest also holds a digest of the config of the run, so that a run
+    is only resumed with the config it was started with.
+
+    Attributes
+    ----------
+    file_path : String
+        Path of the file the manifest is saved to
+    lock : Lock
+        Guards the manifest, which is updated by the parent threads of every
+        domain object being processed
+    manifest : dict
+        The recorded progress of the run
+
+    Methods
+    -------
+    start_run(configuration_digest)
+        Begin recording a new run, discarding any previously recorded
+    resume_run(configuration_digest)
+        Load the recorded progress of a previous run with the same config
+    get_domain_object_progress(index, name)
+        Return the recorded progress of a single domain object
+    get_entry(key)
+        Return the recorded progress of a domain object
+    record_event(event)
+        Apply a change to the progress of a domain object and append it to
+        the file
+    """
+
+    def __init__(self, file_path=RUN_MANIFEST_FILE_NAME):
+        """ Set the file the manifest is saved to. Nothing is recorded until
+        a run is started or resumed.
+
+        Parameters
+        ----------
+        file_path : String
+            Path of the file the manifest is saved to
+        """
+
+        self.__file_path = file_path
+        self.__lock = threading.RLock()
+        self.__manifest = None
+
+    def start_run(self, configuration_digest):
+        """ Begin recording a new run, discarding the progress of any
+        previous run
+
+        Parameters
+        ----------
+        configuration_digest : String
+            Digest of the config of the run, as given by
+            get_configuration_digest
+        """
+
+        with self.__lock:
+            self.__manifest = {
+                'configuration_digest': configuration_digest,
+                'domain_objects': {}
+            }
+            with open(self.__file_path, 'w') as manifest_file:
+                manifest_file.write(ujson.dumps(
+                    {'configuration_digest': configuration_digest}
+                ) + '\n')
+
+    def resume_run(self, configuration_digest):
+        """ Load the recorded progress of a previous run, if there is one and
+        it was started with the same config
+
+        Parameters
+        ----------
+        configuration_digest : String
+            Digest of the config of the run, as given by
+            get_configuration_digest
+
+        Returns
+        -------
+        bool
+            True if the progress of a previous run was loaded, False if there
+            is no manifest or it was recorded with a different config
+        """
+
+        if not os.path.isfile(self.__file_path):
+            return False
+
+        with open(self.__file_path, 'rb') as manifest_file:
+            lines = manifest_file.readlines()
+
+        events = []
+        length_of_events = 0
+        for line in lines:
+            # a line without a line break was being written when the run was
+            # interrupted
+            if not line.endswith(b'\n'):
+                break
+            try:
+                events.append(ujson.loads(line))
+            except ValueError:
+                break
+            length_of_events += len(line)
+
+        if not events or \
+                events[0].get('configuration_digest') != configuration_digest:
+            return False
+
+        domain_objects = {}
+        for event in events[1:]:
+            apply_event(domain_objects, event)
+
+        with self.__lock:
+            self.__manifest = {
+                'configuration_digest': configuration_digest,
+                'domain_objects': domain_objects
+            }
+            # further events are appended after the last one read in full
+            if length_of_events < sum(map(len, lines)):
+                os.truncate(self.__file_path, length_of_events)
+        return True
+
+    def get_domain_object_progress(self, index, name):
+        """ Return the recorded progress of a single domain object
+
+        Parameters
+        ----------
+        index : int
+            Position of the domain object in the user config
+        name : String
+            Name of the domain object
+
+        Returns
+        -------
+        DomainObjectProgress
+            View of the progress of the domain object, through which further
+            progress is recorded
+        """
+        return DomainObjectProgress(self, f'{index}:{name}')
+
+    def get_entry(self, key):
+        """ Return the recorded progress of a domain object, or None if it has
+        not been started. Used by DomainObjectProgress.
+
+        Parameters
+        ----------
+        key : String
+            Key of the domain object in the manifest
+
+        Returns
+        -------
+        dict
+            The recorded progress of the domain object
+        """
+
+        with self.__lock:
+            return self.__manifest['domain_objects'].get(key)
+
+    def record_event(self, event):
+        """ Apply a change to the recorded progress of a domain object, and
+        append it to the manifest's file. Used by DomainObjectProgress.
+
+        Parameters
+        ----------
+        event : dict
+            The change, as applied by apply_event
+        """
+
+        line = ujson.dumps(event) + '\n'
+        with self.__lock:
+            apply_event(self.__manifest['domain_objects'], event)
+            with open(self.__file_path, 'a') as manifest_file:
+                manifest_file.write(line)
+
+
+class DomainObjectProgress:
+    """ The recorded progress of a single domain object of a run, held by a
+    RunManifest. Every change is appended to the manifest's file immediately.
+
+    Attributes
+    ----------
+    run_manifest : RunManifest
+        The manifest holding the progress
+    key : String
+        Key of the domain object in the manifest
+
+    Methods
+    -------
+    is_started()
+        Return whether the domain object was started by this or a previous
+        run
+    is_complete()
+        Return whether every record of the domain object has been written
+    start(persisted_table_sizes)
+        Record that the domain object has been started
+    complete()
+        Record that every record of the domain object has been written
+    record_provided_by_snapshot()
+        Record that the domain object's records were imported from a
+        dependency snapshot, rather than created by the run
+    is_provided_by_snapshot()
+        Return whether the domain object's records were imported from a
+        dependency snapshot
+    record_create_jobs(create_jobs)
+        Record create jobs whose records have been created
+    record_files_written(file_record_counts)
+        Record output files which have been written
+    get_persisted_table_sizes()
+        Return the sizes of the tables the domain object persists to, as
+        they were when it was started
+    get_files_written()
+        Return the numbers of the output files written
+    get_resume_point()
+        Return where to resume creating and writing records
+    """
+
+    def __init__(self, run_manifest, key):
+        """ Set the manifest and key of the domain object
+
+        Parameters
+        ----------
+        run_manifest : RunManifest
+            The manifest holding the progress
+        key : String
+            Key of the domain object in the manifest
+        """
+
+        self.__run_manifest = run_manifest
+        self.__key = key
+
+    def is_started(self):
+        """ Return whether the domain object was started by this or a
+        previous run
+
+        Returns
+        -------
+        bool
+            True if the domain object has been started
+        """
+        return self.__get_entry() is not None
+
+    def is_complete(self):
+        """ Return whether every record of the domain object has been written
+        and persisted
+
+        Returns
+        -------
+        bool
+            True if the domain object has been completed
+        """
+        entry = self.__get_entry()
+        return entry is not None and entry['complete']
+
+    def start(self, persisted_table_sizes):
+        """ Record that the domain object has been started, discarding any
+        progress recorded for it previously
+
+        Parameters
+        ----------
+        persisted_table_sizes : dict
+            The greatest row ID of each table the domain object persists
+            records to, before it has persisted any
+        """
+
+        self.__run_manifest.record_event({'key': self.__key, 'entry': {
+            'complete': False,
+            'persisted_table_sizes': persisted_table_sizes,
+            'create_jobs': [],
+            'files_written': {}
+        }})
+
+    def complete(self):
+        """ Record that every record of the domain object has been written and
+        persisted """
+
+        self.__run_manifest.record_event({'key': self.__key,
+                                          'complete': True})
+
+    def record_provided_by_snapshot(self):
+        """ Record that the records the domain object persists were imported
+        from a dependency snapshot, so the domain object is not to be created
+        by the run """
+
+        self.__run_manifest.record_event({'key': self.__key, 'entry': {
+            'complete': True,
+            'provided_by_snapshot': True,
+            'persisted_table_sizes': {},
+            'create_jobs': [],
+            'files_written': {}
+        }})
+
+    def is_provided_by_snapshot(self):
+        """ Return whether the records the domain object persists were
+        imported from a dependency snapshot
+
+        Returns
+        -------
+        bool
+            True if the domain object is provided by a dependency snapshot
+        """
+        entry = self.__get_entry()
+        return entry is not None and entry.get('provided_by_snapshot', False)
+
+    def record_create_jobs(self, create_jobs):
+        """ Record create jobs whose records have been created, and are about
+        to be handed to the write parent thread
+
+        Parameters
+        ----------
+        create_jobs : List
+            Start ID of each create job and the number of records it created
+        """
+
+        self.__run_manifest.record_event({
+            'key': self.__key,
+            'create_jobs': [[start_id, number_of_records]
+                            for start_id, number_of_records in create_jobs]
+        })
+
+    def record_files_written(self, file_record_counts):
+        """ Record output files which have been written
+
+        Parameters
+        ----------
+        file_record_counts : dict
+            Number of records written to each output file, by file number
+        """
+
+        self.__run_manifest.record_event({
+            'key': self.__key,
+            'files_written': {str(file_number): number_of_records
+                              for file_number, number_of_records
+                              in file_record_counts.items()}
+        })
+
+    def get_persisted_table_sizes(self):
+        """ Return the greatest row ID of each table the domain object
+        persists to, as they were when it was started
+
+        Returns
+        -------
+        dict
+            Greatest row ID by table name
+        """
+        return self.__get_entry()['persisted_table_sizes']
+
+    def get_files_written(self):
+        """ Return the numbers of the output files written
+
+        Returns
+        -------
+        set
+            Numbers of every output file recorded as written
+        """
+
+        entry = self.__get_entry()
+        if entry is None:
+            return set()
+        return {int(file_number) for file_number in entry['files_written']}
+
+    def get_resume_point(self):
+        """ Return where to resume creating and writing the records of the
+        domain object, where its records are written to files in the order
+        of their create jobs.
+
+        Only the leading output files written without a gap are kept. Every
+        create job whose records all went to those files is skipped. The
+        first remaining create job may have had some of its records written
+        to the last of those files; the same number of its records are to be
+        discarded when it is created again, which leaves the output intact
+        only if the job creates the same records again.
+
+        Returns
+        -------
+        tuple
+            The start ID from which create jobs are to be run, the number of
+            the first output file to write, and the number of records to
+            discard from the first create job run
+        """
+
+        entry = self.__get_entry()
+        if entry is None:
+            return 0, 0, 0
+
+        files_written = entry['files_written']
+        number_of_files = 0
+        number_of_records_written = 0
+        while str(number_of_files) in files_written:
+            number_of_records_written += files_written[str(number_of_files)]
+            number_of_files += 1
+
+        number_of_records_created = 0
+        for start_id, number_of_records in sorted(entry['create_jobs']):
+            if number_of_records_created + number_of_records > \
+                    number_of_records_written:
+                return (start_id, number_of_files,
+                        number_of_records_written - number_of_records_created)
+            number_of_records_created += number_of_records
+
+        # every record created was written, so resume after the last job
+        # recorded, if any
+        if entry['create_jobs']:
+            start_id = max(start_id for start_id, _ in entry['create_jobs'])
+            return start_id + 1, number_of_files, 0
+        return 0, number_of_files, 0
+
+    def __get_entry(self):
+        """ Return the recorded progress of the domain object
+
+        Returns
+        -------
+        dict
+            The recorded progress, or None if the domain object has not been
+            started
+        """
+        return self.__run_manifest.get_entry(self.__key)
+
+
+def apply_event(domain_objects, event):
+    """ Apply a change recorded to the manifest to the progress of the
+    domain objects of a run. An event holds the key of a domain object and
+    one of: 'entry', its new progress, replacing any recorded; 'complete';
+    'create_jobs', further create jobs; or 'files_written', further output
+    files written.
+
+    Parameters
+    ----------
+    domain_objects : dict
+        Progress of each domain object by key, updated in place
+    event : dict
+        The change
+    """
+
+    key = event['key']
+    if 'entry' in event:
+        domain_objects[key] = event['entry']
+        return
+
+    entry = domain_objects[key]
+    if 'complete' in event:
+        entry['complete'] = event['complete']
+    if 'create_jobs' in event:
+        entry['create_jobs'].extend(event['create_jobs'])
+    if 'files_written' in event:
+        entry['files_written'].update(event['files_written'])
+
+
+def get_configuration_digest(configurations):
+    """ Return a digest of the user config of a run, used to ensure a run is
+    only resumed with the config it was started with
+
+    Parameters
+    ----------
+    configurations : Configuration
+        The parsed configurations of the run
+
+    Returns
+    -------
+    String
+        Hexadecimal SHA-256 digest of the user config
+    """
+
+    user_config = {
+        'factory_definitions': configurations.get_factory_definitions(),
+        'shared_args': configurations.get_shared_args()
+    }
+    return hashlib.sha256(
+        ujson.dumps(user_config, sort_keys=True).encode()
+    ).hexdigest()
@@ -0,0 +1,173 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Scheduler:
+    """ Runs the domain objects of a config concurrently, subject to the
+    dependencies between them.
+
+    A domain object depends on another where it reads records persisted to
+    the dependency database by the other, e.g. trades read instruments and
+    accounts. The dependencies of each domain object are declared by the
+    'dependencies' list of its entry in the 'dev_factory_args' section of the
+    dev config. A domain object is started only once every configured domain
+    object it depends on has finished, and domain objects with no outstanding
+    dependencies are run at the same time, each over the run's shared pools
+    of create and write child processes. The wall time of a run therefore
+    tends towards that of its longest chain of dependent domain objects
+    rather than the sum of all of them.
+
+    Dependencies on domain objects which are not in the config are ignored,
+    as when domain objects were created sequentially.
+
+    Attributes
+    ----------
+    maximum_concurrent_domain_objects : int
+        The maximum number of domain objects to process at once, or None for
+        no limit
+    domain_objects : list
+        Name, dependencies and processing function of each domain object
+        added, in order of addition
+
+    Methods
+    -------
+    add_domain_object(name, dependencies, process)
+        Add a domain object to be run, with the names of the domain objects
+        it depends on and a function which processes it
+    get_dependency_graph()
+        Return the indices of the domain objects each added domain object
+        depends on
+    run()
+        Process every added domain object, waiting for all to finish
+    """
+
+    def __init__(self, maximum_concurrent_domain_objects=None):
+        """ Set initial values of instance attributes.
+
+        Parameters
+        ----------
+        maximum_concurrent_domain_objects : int
+            The maximum number of domain objects to process at once. Defaults
+            to None, meaning every domain object whose dependencies have
+            finished is started immediately
+        """
+
+        self.__maximum_concurrent_domain_objects = \
+            maximum_concurrent_domain_objects
+        self.__domain_objects = []
+
+    def add_domain_object(self, name, dependencies, process):
+        """ Add a domain object to be run by the scheduler.
+
+        Parameters
+        ----------
+        name : String
+            Name of the domain object, as used in the user config
+        dependencies : list
+            Names of the domain objects which must finish before this one is
+            started
+        process : function
+            Function taking no arguments which creates and writes every
+            record of the domain object
+        """
+
+        self.__domain_objects.append({
+            'name': name,
+            'dependencies': set(dependencies),
+            'process': process
+        })
+
+    def get_dependency_graph(self):
+        """ Return, for each added domain object, the indices of the added
+        domain objects it depends on. Where a domain object name appears more
+        than once in the config, its dependants depend on every occurrence.
+
+        Returns
+        -------
+        list
+            Set of indices into the added domain objects for each domain
+            object, in order of addition
+        """
+
+        return [
+            {
+                index for index, candidate in enumerate(self.__domain_objects)
+                if candidate['name'] in domain_object['dependencies']
+            } for domain_object in self.__domain_objects
+        ]
+
+    def run(self):
+        """ Process every added domain object, starting each as soon as its
+        dependencies have finished, and wait for all of them to finish.
+
+        Should processing a domain object raise an exception, no further
+        domain objects are started and the exception is re-raised once those
+        already started have finished.
+
+        Raises
+        ------
+        ValueError
+            If the dependencies between the added domain objects are cyclic
+        """
+
+        dependency_graph = self.get_dependency_graph()
+        self.check_for_cycles(dependency_graph)
+
+        pending = list(range(len(self.__domain_objects)))
+        finished = set()
+        running = {}
+
+        maximum_workers = self.__maximum_concurrent_domain_objects or \
+            max(len(pending), 1)
+
+        with ThreadPoolExecutor(max_workers=maximum_workers) as executor:
+            while pending or running:
+                ready = [index for index in pending
+                         if dependency_graph[index] <= finished]
+
+                for index in ready:
+                    if len(running) == maximum_workers:
+                        break
+                    pending.remove(index)
+                    future = executor.submit(
+                        self.__domain_objects[index]['process']
+                    )
+                    running[future] = index
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    finished.add(running.pop(future))
+                    if future.exception() is not None:
+                        wait(running)
+                        raise future.exception()
+
+    def check_for_cycles(self, dependency_graph):
+        """ Ensure the domain objects can be run in some order, i.e. that no
+        domain object depends on itself, directly or through others.
+
+        Parameters
+        ----------
+        dependency_graph : list
+            Set of indices of the domain objects each domain object depends
+            on, as returned by get_dependency_graph
+
+        Raises
+        ------
+        ValueError
+            If the dependencies between the added domain objects are cyclic
+        """
+
+        resolved = set()
+        unresolved = set(range(len(dependency_graph)))
+
+        while unresolved:
+            resolvable = {index for index in unresolved
+                          if dependency_graph[index] <= resolved}
+            if not resolvable:
+                names = sorted({self.__domain_objects[index]['name']
+                                for index in unresolved})
+                raise ValueError(
+                    f"Cyclic dependencies between domain objects: {names}"
+                )
+            resolved |= resolvable
+            unresolved -= resolvable
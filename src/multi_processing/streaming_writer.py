@@ -0,0 +1,80 @@
+from multi_processing.writer import Writer
+from filebuilders.rolling_file_writer import RollingFileWriter
+
+
+class StreamingWriter(Writer):
+    """ A Writer for domain objects whose files are limited to a maximum
+    number of bytes, configured by 'max_bytes_per_file'. How many records
+    fit in such a file is only known once they are formatted, so rather than
+    dividing records into write jobs of a file's worth each, the write
+    parent thread writes every list of records to a RollingFileWriter as it
+    is taken from the created record queue. The file being written is kept
+    open between lists, and is rolled over to the next file number once
+    full.
+
+    Only the list of records being written is held by the write parent
+    thread, so memory is bounded by the size of a create job and the in
+    flight budget rather than by the size of a file. Files are written by
+    the write parent thread itself, one at a time, rather than over the
+    pool of write child processes.
+
+    Each file is recorded to the run manifest, if any, once closed.
+
+    Methods
+    -------
+    parent_process(number_of_write_child_processes)
+        Write records to files as they are taken from the created record
+        queue, until the termination flag is taken
+    record_files_written(file_record_counts)
+        Record closed files to the run manifest, if any
+    """
+
+    def parent_process(self, number_of_write_child_processes):
+        """ Write each list of records taken from the created record queue to
+        the rolling file writer, until the termination flag is taken, then
+        close the last file. Should writing fail, the remaining records are
+        discarded and the exception is raised.
+
+        Parameters
+        ----------
+        number_of_write_child_processes : int
+            The number of processes running in the write pool, unused as
+            files are written by the write parent thread
+        """
+
+        file_writer = RollingFileWriter(self.file_builder,
+                                        self.number_of_next_file_to_write)
+
+        try:
+            while True:
+                dequeued_created_records = self.wait_for_created_records()
+                if dequeued_created_records == "terminate":
+                    self.terminate_dequeued = True
+                    break
+
+                if self.number_of_records_to_skip:
+                    dequeued_created_records = self.skip_records(
+                        dequeued_created_records
+                    )
+
+                self.record_files_written(
+                    file_writer.write(dequeued_created_records)
+                )
+
+            self.record_files_written(file_writer.close())
+        except Exception:
+            file_writer.abandon()
+            self.discard_created_records()
+            raise
+
+    def record_files_written(self, file_record_counts):
+        """ Record closed files to the run manifest, if any
+
+        Parameters
+        ----------
+        file_record_counts : dict
+            Number of records written to each file, by file number
+        """
+
+        if self.progress is not None and file_record_counts:
+            self.progress.record_files_written(file_record_counts)
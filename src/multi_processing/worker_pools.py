@@ -0,0 +1,174 @@
+import queue
+import threading
+from multiprocessing import Manager
+from multi_processing import pool_tasks
+from database.persistence_service import PersistenceService, \
+    SERVICE_PERSISTENCE, DIRECT_PERSISTENCE
+
+# Transports for the queues between the create and write parent threads.
+# 'direct' queues live in the main process alongside both parent threads, so
+# created records pass from the create pool to the write pool without a
+# further round trip. 'manager' queues are proxies to a queue held by a
+# separate manager server process, through which every item is pickled twice
+# more; they are kept as a fallback and for queues that child processes must
+# put to directly.
+DIRECT_TRANSPORT = 'direct'
+MANAGER_TRANSPORT = 'manager'
+TRANSPORTS = [DIRECT_TRANSPORT, MANAGER_TRANSPORT]
+
+
+class WorkerPools:
+    """ Long-lived pools of create and write child processes, started once
+    per run and shared by the Coordinator of every domain object. Starting
+    the pools once avoids paying the cost of forking and tearing down child
+    processes for every batch of jobs, and allows child processes to keep
+    per-process state (such as an unpickled object factory and its database
+    connection) between jobs.
+
+    Queues between the create and write parent threads are created through
+    this object with the transport named by 'created_record_transport' in the
+    user config. The queue manager backing the 'manager' transport is started
+    the first time such a queue is requested, and is shared between
+    Coordinators.
+
+    Where 'persistence_mode' in the user config is 'service', a
+    PersistenceService process is also started, to which create child
+    processes send the records they persist to the dependency database.
+
+    Attributes
+    ----------
+    create_pool : Multiprocessing Pool
+        Pool of child processes over which 'create jobs' are run
+    write_pool : Multiprocessing Pool
+        Pool of child processes over which 'write jobs' are run
+    queue_manager : Multiprocessing Manager
+        Manager providing multiprocessing-safe queues, None until first used
+    persistence_service : PersistenceService
+        The single writer to the dependency database, None unless using
+        'service' persistence
+
+    Methods
+    -------
+    get_create_pool()
+        Return the pool of create child processes
+    get_write_pool()
+        Return the pool of write child processes
+    get_queue_manager()
+        Return the manager used to create multiprocessing-safe queues,
+        starting it if necessary
+    create_queue(transport)
+        Return a new queue using the given transport
+    flush_persisted_records()
+        Wait for all records sent to the persistence service to be persisted
+    close()
+        Wait for all outstanding jobs to finish, then stop the pools, the
+        queue manager and the persistence service
+    """
+
+    def __init__(self, shared_args):
+        """ Start the create and write pools.
+
+        Parameters
+        ----------
+        shared_args : dict
+            User arguments defining the number of create and write child
+            processes to start, and how created records are persisted
+        """
+
+        self.__queue_manager = None
+        self.__queue_manager_lock = threading.Lock()
+
+        self.__persistence_service = None
+        persistence_queue = None
+        if shared_args.get('persistence_mode', DIRECT_PERSISTENCE) == \
+                SERVICE_PERSISTENCE:
+            self.__persistence_service = PersistenceService()
+            persistence_queue = \
+                self.__persistence_service.get_persistence_queue()
+
+        self.__create_pool = pool_tasks.start_create_pool(
+            shared_args['number_of_create_child_processes'],
+            persistence_queue
+        )
+        self.__write_pool = pool_tasks.start_write_pool(
+            shared_args['number_of_write_child_processes']
+        )
+
+    def get_create_pool(self):
+        """ Return the pool of create child processes
+
+        Returns
+        -------
+        Multiprocessing Pool
+            Pool over which 'create jobs' are run
+        """
+        return self.__create_pool
+
+    def get_write_pool(self):
+        """ Return the pool of write child processes
+
+        Returns
+        -------
+        Multiprocessing Pool
+            Pool over which 'write jobs' are run
+        """
+        return self.__write_pool
+
+    def get_queue_manager(self):
+        """ Return the manager used to create multiprocessing-safe queues,
+        starting it the first time it is requested
+
+        Returns
+        -------
+        Multiprocessing Manager
+            Manager shared by all Coordinators in this run
+        """
+        # Coordinators of concurrently running domain objects may request
+        # the manager at the same time, so only one thread may start it
+        with self.__queue_manager_lock:
+            if self.__queue_manager is None:
+                self.__queue_manager = Manager()
+        return self.__queue_manager
+
+    def create_queue(self, transport=DIRECT_TRANSPORT):
+        """ Return a new queue using the given transport
+
+        Parameters
+        ----------
+        transport : String
+            One of 'direct' or 'manager', as described in TRANSPORTS
+
+        Returns
+        -------
+        Queue
+            An in-process queue for the 'direct' transport, or a proxy to a
+            queue held by the queue manager for the 'manager' transport
+        """
+        if transport == MANAGER_TRANSPORT:
+            return self.get_queue_manager().Queue()
+        return queue.Queue()
+
+    def flush_persisted_records(self):
+        """ Wait for all records sent to the persistence service so far to
+        be persisted, such that domain objects depending on them can be
+        created. Returns immediately unless using 'service' persistence,
+        where create child processes persist records themselves before their
+        jobs finish.
+        """
+
+        if self.__persistence_service is not None:
+            self.__persistence_service.flush()
+
+    def close(self):
+        """ Wait for all outstanding jobs to finish, then stop the pools, the
+        queue manager and the persistence service """
+
+        for pool in (self.__create_pool, self.__write_pool):
+            pool.close()
+            pool.join()
+
+        if self.__queue_manager is not None:
+            self.__queue_manager.shutdown()
+
+        if self.__persistence_service is not None:
+            self.__persistence_service.stop()
@@ -1,5 +1,8 @@
-import time
+import queue
+from collections import deque
 from multi_processing import pool_tasks
+from multi_processing.in_flight_budget import InFlightBudget
+from domainobjectfactories.record_batch import concatenate_records
 
 
 class Writer:
@@ -7,10 +10,23 @@ class Writer:
     compiling pre-generated records from a Multiprocessed Queue into larger
     sets such that files can be written in user-requested sizes.
 
-    The write parent process waits until the 'generated_record_queue' is not
-    empty, at which point it retrieves lists of records from the queue and
-    collates all records from those lists into a
-    'dequeued_created_records_not_yet_written_to_file' list.
+    The write parent thread blocks on the 'generated_record_queue' until a
+    list of records arrives, at which point it retrieves lists of records from
+    the queue and collates those lists, as they are, into a
+    'dequeued_created_records_not_yet_written_to_file' deque. Lists are not
+    flattened until a write job is made from them, so that RecordBatches
+    created by object factories reach the file builders whole.
+
+    Dequeued records are removed from the 'in flight budget' shared with
+    the create parent thread, allowing creation to continue if it was
+    waiting for the budget. The depth of the queue is sampled each time an
+    item is taken from it, for reporting once the domain object is written.
+
+    Where a run manifest is kept, the files of each batch of write jobs are
+    recorded to it once written, with the number of records in each. When
+    resuming an interrupted run, the writer starts from the first file not
+    yet written, first discarding any records already written to the files
+    before it.
 
     It then creates a list of 'write jobs', each of which is a dictionary
     containing a portion of the records from the
@@ -18,19 +34,23 @@ class Writer:
     and the ID of the output file. A single output file can have multiple
     'write jobs', but a 'write job' can only refer to one output file.
 
-    The 'write jobs' in the list are run over a pool of child write processes,
-    which build the output files then terminate. Upon termination of all
-    processes, the 'write job' list is emptied and the next iteration begins by
-    dequeuing any further records from the 'generated_record_queue'.
+    The 'write jobs' in the list are run over the long-lived pool of child
+    write processes, which build the output files. Upon completion of all
+    'write jobs' in the list, the 'write job' list is emptied and the next
+    iteration begins by dequeuing any further records from the
+    'generated_record_queue'.
 
     Attributes
     ----------
     created_record_queue : Multiprocessed Queue
         Contains results of the generation process. Each element is a list of
         lists of records.
-    dequeued_created_records_not_yet_written_to_file : list
-        list collating all records dequeued from the created record queue that
-        have not yet been written to file
+    dequeued_created_records_not_yet_written_to_file : deque
+        deque collating all lists or RecordBatches of records dequeued from
+        the created record queue that have not yet been written to file
+    number_of_records_not_yet_written_to_file : int
+        The total number of records held in
+        'dequeued_created_records_not_yet_written_to_file'
     number_of_next_file_to_write : int
         The current file number to be writing to.
     max_records_per_file : int
@@ -42,26 +62,55 @@ class Writer:
     file_builder : FileBuilder
         Instantiated file builder, pre-configured to output the necessary file
         extension.
+    write_pool : Multiprocessing Pool
+        Long-lived pool of child processes over which write jobs are run
+    in_flight_budget : InFlightBudget
+        Limit on the number of records on the created record queue
+    queue_depth_samples : list
+        The number of items on the created record queue each time an item
+        was taken from it
+    progress : DomainObjectProgress
+        Progress of the domain object in the run manifest, or None
+    number_of_records_to_skip : int
+        The number of records still to be discarded from the front of the
+        created record queue, as they were written by a previous run
 
     Methods
     -------
     parent_process()
         Begin the cycle of waiting for, handling and running jobs. Continue
         this until termination instruction observed
-    sleep_while_created_record_queue_empty()
-        Sleeps until items are observed on the Multiprocessed Queue.
+    wait_for_created_records()
+        Blocks until an item is on the Multiprocessed Queue, and returns it.
+    take_created_records(dequeued_created_records)
+        Sample the queue depth and remove dequeued records from the in flight
+        budget.
     create_write_jobs()
-        Takes items from the created records queue and adds write jobs to
-        the write jobs list representing these records. If a terminate
-        instruction is dequeued, the appropriate flag is set.
+        Takes items from the created records queue, blocking until the first
+        arrives, and adds write jobs to the write jobs list representing
+        these records. If a terminate instruction is dequeued, the
+        appropriate flag is set.
     get_write_job()
         Create a single write job representing the records at the front of
-        the 'dequeued_created_records_not_yet_written_to_file' list. Delete
-        these records from the list, then return the write job.
+        the 'dequeued_created_records_not_yet_written_to_file' deque. Delete
+        these records from the deque, then return the write job.
+    run_write_jobs()
+        Run the write jobs list over the pool of child processes, recording
+        the files written, and empty it
+    discard_created_records()
+        Take and discard records from the created record queue until the
+        termination flag is taken
+    skip_records(dequeued_created_records)
+        Discard records written by a previous run from the front of the
+        given records
+    get_queue_depth_samples()
+        Return the sampled depths of the created record queue
     """
 
     def __init__(
-            self, created_record_queue, max_records_per_file, file_builder
+            self, created_record_queue, max_records_per_file, file_builder,
+            write_pool, in_flight_budget=None, progress=None,
+            number_of_first_file_to_write=0, number_of_records_to_skip=0
     ):
         """ Initialise instance attributes.
 
@@ -75,61 +124,143 @@ class Writer:
         file_builder : File_Builder
             Instantiated file builder, pre-configured to output the necessary
             file extension.
+        write_pool : Multiprocessing Pool
+            Long-lived pool of child processes over which write jobs are run
+        in_flight_budget : InFlightBudget
+            Limit on the number of records on the created record queue, which
+            is shared with the create parent thread. Defaults to no limit
+        progress : DomainObjectProgress
+            Progress of the domain object in the run manifest, to which
+            files are recorded once written. Defaults to None, recording
+            nothing
+        number_of_first_file_to_write : int
+            The number of the first file to write, being the number of files
+            written by a previous run when resuming. Defaults to 0
+        number_of_records_to_skip : int
+            The number of records first taken from the created record queue
+            to discard rather than write, being those written by a previous
+            run when resuming. Defaults to 0
         """
 
         self.created_record_queue = created_record_queue
-        self.dequeued_created_records_not_yet_written_to_file = []
-        self.number_of_next_file_to_write = 0
+        self.dequeued_created_records_not_yet_written_to_file = deque()
+        self.number_of_records_not_yet_written_to_file = 0
+        self.number_of_next_file_to_write = number_of_first_file_to_write
         self.max_records_per_file = max_records_per_file
         self.write_jobs = []
         self.terminate_dequeued = False
         self.file_builder = file_builder
+        self.write_pool = write_pool
+        self.in_flight_budget = in_flight_budget or InFlightBudget()
+        self.queue_depth_samples = []
+        self.progress = progress
+        self.number_of_records_to_skip = number_of_records_to_skip
 
     def parent_process(self, number_of_write_child_processes):
         """ Begin the cycle of waiting for, handling, and running jobs,
         continuing this until an instruction to terminate is observed. Once
         observed, calculate any residual write to be made and terminate.
+        Should a write job fail, the remaining records are discarded and the
+        write job's exception is raised.
 
         Parameters
         ----------
         number_of_write_child_processes : int
-            The number of processes running in the generator's pool
+            The number of processes running in the write pool, used to size
+            batches of write jobs
         """
 
         maximum_number_of_write_jobs_to_create = \
             2 * number_of_write_child_processes
 
+        try:
+            while not self.terminate_dequeued:
+                self.create_write_jobs(
+                    maximum_number_of_write_jobs_to_create
+                )
+                self.run_write_jobs()
+        except Exception:
+            self.discard_created_records()
+            raise
+
+        if self.number_of_records_not_yet_written_to_file:
+            # there are some residual records remaining
+            self.write_jobs.append(self.get_write_job())
+            self.run_write_jobs()
+
+    def run_write_jobs(self):
+        """ Run the write jobs in the write jobs list over the write pool,
+        record the files written to the run manifest, if any, and empty the
+        list
+
+        Raises
+        ------
+        Exception
+            The exception raised by the first write job which failed
+        """
+
+        write_jobs = self.write_jobs
+        self.write_jobs = []
+        pool_tasks.run_write_jobs(
+            write_jobs,
+            self.write_pool,
+            self.file_builder,
+            self.progress
+        )
+
+    def discard_created_records(self):
+        """ Take and discard lists of records from the created record queue
+        until the termination flag is taken, such that the create parent
+        thread is never left waiting on the in flight budget once writing
+        has failed """
+
         while not self.terminate_dequeued:
-            self.sleep_while_created_record_queue_empty()
-            self.create_write_jobs(
-                maximum_number_of_write_jobs_to_create
-            )
-            pool_tasks.run_write_jobs(
-                self.write_jobs,
-                number_of_write_child_processes,
-                self.file_builder
-            )
-            self.write_jobs = []
-
-        if self.dequeued_created_records_not_yet_written_to_file:
-            # list is not empty - there are some residual records remaining
-            pool_tasks.run_write_jobs(
-                [self.get_write_job()],
-                number_of_write_child_processes,
-                self.file_builder
-            )
+            if self.wait_for_created_records() == "terminate":
+                self.terminate_dequeued = True
+
+    def wait_for_created_records(self):
+        """ Block until a list of records (or the termination flag) is on the
+        queue, and return it
+
+        Returns
+        -------
+        List or String
+            The dequeued list of records, or the termination flag
+        """
+
+        return self.take_created_records(self.created_record_queue.get())
+
+    def take_created_records(self, dequeued_created_records):
+        """ Account for an item just taken from the created record queue:
+        sample the depth of the queue, and remove any records from the in
+        flight budget
+
+        Parameters
+        ----------
+        dequeued_created_records : List, RecordBatch or String
+            The dequeued records, or the termination flag
+
+        Returns
+        -------
+        List, RecordBatch or String
+            The given records or termination flag
+        """
+
+        self.queue_depth_samples.append(self.created_record_queue.qsize())
 
-    def sleep_while_created_record_queue_empty(self):
-        """ Sleep until records are on the queue """
+        if not isinstance(dequeued_created_records, str):
+            self.in_flight_budget.remove_records(
+                len(dequeued_created_records)
+            )
 
-        while self.created_record_queue.empty():
-            time.sleep(1)
-        return
+        return dequeued_created_records
 
     def create_write_jobs(self, maximum_number_of_write_jobs_to_create):
         """ Takes items from the created records queue and adds write jobs to
-        the write jobs list representing these records. If a terminate
-        instruction is dequeued, the appropriate flag is set.
+        the write jobs list representing these records. Blocks until the
+        first item arrives, then takes any further items already on the
+        queue without waiting. If a terminate instruction is dequeued, the
+        appropriate flag is set.
 
         Parameters
         ----------
@@ -137,45 +268,118 @@ class Writer:
             The maximum number of write jobs to add to self.write_jobs
         """
 
-        while not self.created_record_queue.empty() and \
-                len(self.write_jobs) < maximum_number_of_write_jobs_to_create:
-
-            dequeued_created_records = self.created_record_queue.get()
+        dequeued_created_records = self.wait_for_created_records()
 
+        while True:
             if dequeued_created_records == "terminate":
                 self.terminate_dequeued = True
-            else:
-                self.dequeued_created_records_not_yet_written_to_file.extend(
+                break
+
+            if self.number_of_records_to_skip:
+                dequeued_created_records = self.skip_records(
+                    dequeued_created_records
+                )
+
+            # domain objects dependent on others may create no records
+            if len(dequeued_created_records):
+                # the layout of every file is fixed before any is written, as
+                # each write job is given its own copy of the file builder
+                self.file_builder.fix_file_layout(dequeued_created_records)
+                self.dequeued_created_records_not_yet_written_to_file.append(
                     dequeued_created_records
                 )
-                while len(
-                        self.dequeued_created_records_not_yet_written_to_file
-                ) >= self.max_records_per_file:
-                    self.write_jobs.append(self.get_write_job())
+                self.number_of_records_not_yet_written_to_file += \
+                    len(dequeued_created_records)
+
+            while self.number_of_records_not_yet_written_to_file \
+                    >= self.max_records_per_file:
+                self.write_jobs.append(self.get_write_job())
+
+            if len(self.write_jobs) >= maximum_number_of_write_jobs_to_create:
+                break
+
+            try:
+                dequeued_created_records = self.take_created_records(
+                    self.created_record_queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+
+    def skip_records(self, dequeued_created_records):
+        """ Discard as many records as are still to be skipped from the front
+        of the given records
+
+        Parameters
+        ----------
+        dequeued_created_records : List or RecordBatch
+            Records taken from the created record queue
+
+        Returns
+        -------
+        List or RecordBatch
+            The records remaining
+        """
+
+        number_of_records_skipped = min(self.number_of_records_to_skip,
+                                        len(dequeued_created_records))
+        self.number_of_records_to_skip -= number_of_records_skipped
+        return dequeued_created_records[number_of_records_skipped:]
 
     def get_write_job(self):
         """ Create a single write job representing the records at the front of
-        the 'dequeued_created_records_not_yet_written_to_file' list. Delete
-        these records from the list, then return the write job.
+        the 'dequeued_created_records_not_yet_written_to_file' deque. Delete
+        these records from the deque, then return the write job.
+
+        Records are taken from as many of the dequeued lists or RecordBatches
+        as needed, splitting the last of these if it holds more records than
+        are needed, and are combined by concatenate_records; the records of a
+        write job are a RecordBatch if each of its parts is one.
+
+        Returns
+        -------
+        dict
+            Write job holding the number of the file to write and its records
         """
 
         number_of_records = min(
-            self.max_records_per_file, len(
-                self.dequeued_created_records_not_yet_written_to_file
-            )
+            self.max_records_per_file,
+            self.number_of_records_not_yet_written_to_file
         )
 
+        parts = []
+        number_of_records_needed = number_of_records
+        while number_of_records_needed:
+            records = \
+                self.dequeued_created_records_not_yet_written_to_file[0]
+            if len(records) <= number_of_records_needed:
+                self.dequeued_created_records_not_yet_written_to_file\
+                    .popleft()
+                parts.append(records)
+                number_of_records_needed -= len(records)
+            else:
+                parts.append(records[:number_of_records_needed])
+                self.dequeued_created_records_not_yet_written_to_file[0] = \
+                    records[number_of_records_needed:]
+                number_of_records_needed = 0
+
         write_job = {
             'file_number': self.number_of_next_file_to_write,
-            'records': self.dequeued_created_records_not_yet_written_to_file[
-                       :number_of_records
-                       ]
+            'records': parts[0] if len(parts) == 1
+            else concatenate_records(parts)
         }
 
         self.number_of_next_file_to_write += 1
-
-        del self.dequeued_created_records_not_yet_written_to_file[
-            :number_of_records
-            ]
+        self.number_of_records_not_yet_written_to_file -= number_of_records
 
         return write_job
+
+    def get_queue_depth_samples(self):
+        """ Return the number of items on the created record queue each time
+        an item was taken from it
+
+        Returns
+        -------
+        List
+            Sampled queue depths, in order
+        """
+        return self.queue_depth_samples
@@ -0,0 +1,163 @@
+import threading
+import traceback
+
+# Default number of threads uploading files to Google Drive at once
+DEFAULT_NUMBER_OF_UPLOAD_THREADS = 4
+
+# Number of files which may wait on the upload queue per upload thread,
+# beyond which child processes wait to queue further files
+QUEUED_UPLOADS_PER_THREAD = 2
+
+
+class DriveUploadService:
+    """ Threads of the main process uploading output files to Google Drive,
+    such that files are uploaded while further files are written rather than
+    by the child process which wrote each, in turn.
+
+    Files to upload are put on the service's queue as (local folder name,
+    file name) tuples by file builders, through the DriveUploader returned
+    by get_uploader. The queue is bounded, so child processes writing files
+    faster than they can be uploaded wait for the uploads to catch up rather
+    than queueing files without limit.
+
+    The folder files are uploaded to is found, or created, once when the
+    service is started, before any file is written.
+
+    Attributes
+    ----------
+    google_drive_connector : GoogleDriveConnector
+        Connector through which files are uploaded
+    upload_queue : Queue
+        Queue of files to upload, which must be a multiprocessing-safe
+        queue where files are queued by child processes
+    failed : threading.Event
+        Set should uploading any file fail
+    threads : list
+        The upload threads
+
+    Methods
+    -------
+    get_uploader()
+        Return an uploader queueing files on the service's queue
+    flush()
+        Wait for every file queued so far to be uploaded
+    stop()
+        Upload every outstanding file, then stop the upload threads
+    """
+
+    def __init__(self, google_drive_connector, upload_queue,
+                 number_of_upload_threads=DEFAULT_NUMBER_OF_UPLOAD_THREADS):
+        """ Find the folder files are uploaded to, then start the upload
+        threads
+
+        Parameters
+        ----------
+        google_drive_connector : GoogleDriveConnector
+            Connector through which files are uploaded
+        upload_queue : Queue
+            Empty queue, of at most QUEUED_UPLOADS_PER_THREAD files per
+            upload thread, on which files to upload are to be put
+        number_of_upload_threads : int
+            Number of files uploaded at once. Defaults to
+            DEFAULT_NUMBER_OF_UPLOAD_THREADS
+        """
+
+        google_drive_connector.get_upload_folder_id()
+
+        self.__google_drive_connector = google_drive_connector
+        self.__upload_queue = upload_queue
+        self.__failed = threading.Event()
+        self.__threads = [
+            threading.Thread(target=self.run_upload_thread, daemon=True)
+            for _ in range(number_of_upload_threads)
+        ]
+        for thread in self.__threads:
+            thread.start()
+
+    def run_upload_thread(self):
+        """ Target of each upload thread. Uploads files from the queue until
+        a None is dequeued. """
+
+        while True:
+            upload = self.__upload_queue.get()
+            try:
+                if upload is None:
+                    return
+                self.__google_drive_connector.upload_file(*upload)
+            except Exception:
+                traceback.print_exc()
+                self.__failed.set()
+            finally:
+                self.__upload_queue.task_done()
+
+    def get_uploader(self):
+        """ Return an uploader queueing files on the service's queue, to be
+        given to file builders
+
+        Returns
+        -------
+        DriveUploader
+            Uploader which may be passed to child processes
+        """
+        return DriveUploader(self.__upload_queue)
+
+    def flush(self):
+        """ Wait for every file queued so far to be uploaded
+
+        Raises
+        ------
+        RuntimeError
+            If the service failed to upload any file
+        """
+
+        self.__upload_queue.join()
+        if self.__failed.is_set():
+            raise RuntimeError("Google Drive upload service failed to " +
+                               "upload files, see its output above")
+
+    def stop(self):
+        """ Upload every outstanding file, then stop the upload threads """
+
+        for _ in self.__threads:
+            self.__upload_queue.put(None)
+        for thread in self.__threads:
+            thread.join()
+
+
+class DriveUploader:
+    """ Queues files to be uploaded by a DriveUploadService. Holds only the
+    service's queue, so may be given to file builders run by child
+    processes.
+
+    Attributes
+    ----------
+    upload_queue : Queue
+        Queue of the upload service
+
+    Methods
+    -------
+    upload_file(local_folder_name, file_name)
+        Queue a file to be uploaded
+    """
+
+    def __init__(self, upload_queue):
+        """ Initialise the uploader
+
+        Parameters
+        ----------
+        upload_queue : Queue
+            Queue of the upload service
+        """
+        self.__upload_queue = upload_queue
+
+    def upload_file(self, local_folder_name, file_name):
+        """ Queue a file to be uploaded, waiting while the queue is full
+
+        Parameters
+        ----------
+        local_folder_name : String
+            Directory on local machine where the file was written
+        file_name : String
+            Name of the file
+        """
+        self.__upload_queue.put((local_folder_name, file_name))
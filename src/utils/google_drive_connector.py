@@ -1,5 +1,7 @@
 import pickle
 import os.path
+import threading
+from datetime import datetime, timezone
 from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -7,14 +9,132 @@ from googleapiclient.http import MediaFileUpload
 
 
 class GoogleDriveConnector():
+    """ Connection to Google Drive, through which the output files of a run
+    are uploaded to a folder named by the time the run started, within a
+    folder named by the date, within the root folder.
+
+    The folder files are uploaded to is found, or created, once per
+    connector rather than once per file. Drive services are not thread
+    safe, so each thread uploading through the connector is given a service
+    of its own.
+
+    Attributes
+    ----------
+    root_folder_id : String
+        ID of the Drive folder holding the folder of each date
+    current_time_string : String
+        Name of the folder of the run within the folder of its date
+    build_service : function
+        Returns a new Drive service, by default authorised with the
+        credentials of the user
+    thread_services : threading.local
+        Drive service of each thread
+    upload_folder_id : String
+        ID of the folder files are uploaded to, once found
+    upload_folder_lock : threading.Lock
+        Held while the folder files are uploaded to is found
+
+    Methods
+    -------
+    get_service()
+        Return the Drive service of the current thread
+    get_upload_folder_id()
+        Return the ID of the folder files are uploaded to, creating it if
+        need be
+    upload_file(local_folder_name, file_name)
+        Upload a file to the folder of the run
+    """
+
     # If modifying these scopes, delete the file token.pickle.
     SCOPES = ['https://www.googleapis.com/auth/drive']
 
-    def __init__(self, root_folder_id, current_time_string):
-        creds = self.build_creds()
-        self.service = build('drive', 'v3', credentials=creds)
+    def __init__(self, root_folder_id, current_time_string,
+                 build_service=None):
+        if build_service is None:
+            creds = self.build_creds()
+
+            def build_service():
+                return build('drive', 'v3', credentials=creds)
+
+        self.build_service = build_service
+        self.thread_services = threading.local()
         self.root_folder_id = root_folder_id
         self.current_time_string = current_time_string
+        self.upload_folder_id = None
+        self.upload_folder_lock = threading.Lock()
+
+    def get_service(self):
+        """ Return the Drive service of the current thread, building it the
+        first time the thread uses the connector
+
+        Returns
+        -------
+        Resource
+            Drive service for use by the current thread only
+        """
+
+        service = getattr(self.thread_services, 'service', None)
+        if service is None:
+            service = self.thread_services.service = self.build_service()
+        return service
+
+    def get_upload_folder_id(self):
+        """ Return the ID of the folder files are uploaded to, named by the
+        time the run started within a folder named by today's date, finding
+        or creating each folder only the first time this is called
+
+        Returns
+        -------
+        String
+            ID of the folder
+        """
+
+        # threads uploading at once must not each create the folders
+        with self.upload_folder_lock:
+            if self.upload_folder_id is None:
+                todays_date = \
+                    datetime.now(timezone.utc).date().strftime('%Y-%m-%d')
+                date_folder_id = self.get_or_create_folder(
+                    todays_date, self.root_folder_id
+                )
+                self.upload_folder_id = self.get_or_create_folder(
+                    self.current_time_string, date_folder_id
+                )
+        return self.upload_folder_id
+
+    def get_or_create_folder(self, folder_name, parent_folder_id):
+        """ Return the ID of a folder, creating it if it does not exist
+
+        Parameters
+        ----------
+        folder_name : String
+            Name of the folder
+        parent_folder_id : String
+            ID of the folder holding it
+
+        Returns
+        -------
+        String
+            ID of the folder
+        """
+
+        folder_id = self.get_folder_id(folder_name, parent_folder_id)
+        if folder_id is None:
+            folder_id = self.create_folder(folder_name, parent_folder_id)
+        return folder_id
+
+    def upload_file(self, local_folder_name, file_name):
+        """ Upload a file to the folder of the run
+
+        Parameters
+        ----------
+        local_folder_name : String
+            Directory on local machine where the file was written
+        file_name : String
+            Name of the file
+        """
+        self.create_file(local_folder_name, file_name,
+                         self.get_upload_folder_id())
 
     def build_creds(self):
         creds = None
@@ -45,7 +165,8 @@ class GoogleDriveConnector():
             'mimeType': 'application/vnd.google-apps.folder',
             'parents': [parent_folder_id]
         }
-        return self.service.files().create(body=folder_metadata, fields='id')\
+        return self.get_service().files()\
+                   .create(body=folder_metadata, fields='id')\
                    .execute().get('id')
 
     def get_folder_id(self, folder_name, parent_folder_id):
@@ -55,7 +176,7 @@ class GoogleDriveConnector():
         if parent_folder_id is not None:
             q +=  " and parents in '{0}'".format(parent_folder_id)
 
-        folders = self.service.files()\
+        folders = self.get_service().files()\
                       .list(q=q.format(folder_name),
                             spaces='drive',
                             fields='nextPageToken, files(id, name)',
@@ -69,7 +190,7 @@ class GoogleDriveConnector():
         if parent_folder_id is not None:
             q +=  " and parents in '{0}'".format(parent_folder_id)
 
-        files = self.service.files()\
+        files = self.get_service().files()\
                     .list(q=q.format(file_name),
                           spaces='drive',
                           fields='nextPageToken, files(id, name)',
@@ -85,8 +206,8 @@ class GoogleDriveConnector():
             }
 
         media = MediaFileUpload(file_location, resumable=True)
-        request = self.service.files().create(media_body=media,
-                                              body=file_metadata)
+        request = self.get_service().files().create(media_body=media,
+                                                    body=file_metadata)
         response = None
         while response is None:
             status, response = request.next_chunk()
@@ -96,12 +217,12 @@ class GoogleDriveConnector():
     def update_file(self, file_path, file_name, file_id):
         file_location = os.path.join(file_path, file_name)
         media_body = MediaFileUpload(file_location, resumable=True)
-        self.service.files().update(fileId=file_id,
-                                    media_body=media_body).execute()
+        self.get_service().files().update(fileId=file_id,
+                                          media_body=media_body).execute()
 
     def delete_folder(self, folder_id):
         """ For testing purposes only """
         try:
-            self.service.files().delete(fileId=folder_id).execute()
+            self.get_service().files().delete(fileId=folder_id).execute()
         except Exception as e:
             print(f'error deleting folder: {e}')
@@ -6,6 +6,14 @@ Error list to be returned, and used as a basis to feedback to the user that
 the configuration as-is is insufficient for successful operation.
 """
 from validator.validation_result import ValidationResult
+from multi_processing.worker_pools import TRANSPORTS
+from multi_processing.coordinator import EXECUTION_MODES
+from database.persistence_service import PERSISTENCE_MODES
+from filebuilders.file_builder import COMPRESSIONS, \
+    INTERNALLY_COMPRESSED_FILE_TYPES, SIZE_LIMITED_FILE_TYPES, \
+    get_missing_compression_package
+from filebuilders.json_serializers import JSON_SERIALIZERS, \
+    get_missing_json_serializer_package
 
 
 def validate(configurations):
@@ -43,11 +51,24 @@ def validate(configurations):
     errors = [
         validate_record_counts(factory_definitions),
         validate_max_file_size(factory_definitions),
+        validate_max_bytes_per_file(factory_definitions),
         validate_google_drive_flag(factory_definitions),
         validate_output_file_extensions(dev_file_builder_args,
                                         factory_definitions),
+        validate_compression(factory_definitions),
+        validate_json_serializer(factory_definitions),
         validate_pool_sizes_non_zero(shared_args),
-        validate_number_of_records_per_job(shared_args, factory_definitions)
+        validate_number_of_records_per_job(shared_args, factory_definitions),
+        validate_created_record_transport(shared_args),
+        validate_execution_mode(shared_args),
+        validate_number_of_concurrent_domain_objects(shared_args),
+        validate_number_of_records_per_insert(shared_args),
+        validate_number_of_records_per_chunk(shared_args),
+        validate_number_of_upload_threads(shared_args),
+        validate_max_records_in_flight(shared_args),
+        validate_seed(shared_args),
+        validate_shard(shared_args),
+        validate_persistence_mode(shared_args)
     ]
 
     # Remove instances of None or empty lists from error list
@@ -115,6 +136,50 @@ def validate_max_file_size(factory_definitions):
     return errors
 
 
+def validate_max_bytes_per_file(factory_definitions):
+    """ Ensure the optional maximum number of bytes per file of each domain
+    object, if given, is an integer greater than 0, and that files of its
+    output file type can be limited in size.
+
+    Parameters
+    ----------
+    factory_definitions : dict
+        Dictionary of string:dict key/value pairs where keys are names of
+        domain objects, and each value is a dictionary containing the
+        configuration settings for that domain object.
+
+    Returns
+    -------
+    List
+        List of strings detailing each domain object where the maximum
+        number of bytes per file is erroneous. Empty where there are no
+        errors to be found.
+    """
+
+    errors = []
+    for domain_object, config in factory_definitions.items():
+        max_bytes_per_file = config.get('max_bytes_per_file')
+        if max_bytes_per_file is None:
+            continue
+
+        if not isinstance(max_bytes_per_file, int) or \
+                isinstance(max_bytes_per_file, bool) or \
+                max_bytes_per_file <= 0:
+            errors.append("- Invalid 'max_bytes_per_file' " +
+                          f"\'{max_bytes_per_file}\' for domain object " +
+                          f"\'{domain_object}\', must be an integer " +
+                          "greater than 0")
+            continue
+
+        file_type = config['output_file_type']
+        if file_type not in SIZE_LIMITED_FILE_TYPES:
+            errors.append("- 'max_bytes_per_file' for domain object " +
+                          f"\'{domain_object}\' is not supported by file " +
+                          f"type \'{file_type}\', only by " +
+                          f"{SIZE_LIMITED_FILE_TYPES}")
+    return errors
+
+
 def validate_output_file_extensions(dev_file_builder_args,
                                     factory_definitions):
     """ Ensure the file extension for each object is valid as per the defined
@@ -151,6 +216,97 @@ def validate_output_file_extensions(dev_file_builder_args,
     return errors
 
 
+def validate_compression(factory_definitions):
+    """ Ensure the optional compression of each domain object, if given, is
+    one of those supported, by its file type where its files are compressed
+    by their own library, and that any package it requires is installed.
+
+    Parameters
+    ----------
+    factory_definitions : dict
+        Dictionary of string:dict key/value pairs where keys are names of
+        domain objects, and each value is a dictionary containing the
+        configuration settings for that domain object.
+
+    Returns
+    -------
+    List
+        List of strings detailing each domain object where the compression
+        is erroneous. Empty where there are no errors to be found.
+    """
+
+    errors = []
+    for domain_object, config in factory_definitions.items():
+        compression = config.get('compression')
+        if compression is None:
+            continue
+
+        if not isinstance(compression, str) or \
+                compression not in COMPRESSIONS:
+            errors.append(f"- Invalid 'compression' \'{compression}\' for " +
+                          f"domain object \'{domain_object}\', must be one " +
+                          f"of {tuple(COMPRESSIONS)}")
+            continue
+
+        file_type = config['output_file_type']
+        if file_type in INTERNALLY_COMPRESSED_FILE_TYPES:
+            # such files are compressed by their own library
+            if compression not in INTERNALLY_COMPRESSED_FILE_TYPES[file_type]:
+                errors.append(f"- Compression \'{compression}\' for domain " +
+                              f"object \'{domain_object}\' is not " +
+                              f"supported by file type \'{file_type}\'")
+            continue
+
+        missing_package = get_missing_compression_package(compression)
+        if missing_package is not None:
+            errors.append(f"- Compression \'{compression}\' for domain " +
+                          f"object \'{domain_object}\' requires the " +
+                          f"\'{missing_package}\' package to be installed")
+    return errors
+
+
+def validate_json_serializer(factory_definitions):
+    """ Ensure the optional JSON serialiser of each domain object, if given,
+    is one of those supported, and that any package it requires is
+    installed.
+
+    Parameters
+    ----------
+    factory_definitions : dict
+        Dictionary of string:dict key/value pairs where keys are names of
+        domain objects, and each value is a dictionary containing the
+        configuration settings for that domain object.
+
+    Returns
+    -------
+    List
+        List of strings detailing each domain object where the JSON
+        serialiser is erroneous. Empty where there are no errors to be found.
+    """
+
+    errors = []
+    for domain_object, config in factory_definitions.items():
+        json_serializer = config.get('json_serializer')
+        if json_serializer is None:
+            continue
+
+        if not isinstance(json_serializer, str) or \
+                json_serializer not in JSON_SERIALIZERS:
+            errors.append("- Invalid 'json_serializer' " +
+                          f"\'{json_serializer}\' for domain object " +
+                          f"\'{domain_object}\', must be one of " +
+                          f"{tuple(JSON_SERIALIZERS)}")
+            continue
+
+        missing_package = get_missing_json_serializer_package(json_serializer)
+        if missing_package is not None:
+            errors.append(f"- JSON serialiser \'{json_serializer}\' for " +
+                          f"domain object \'{domain_object}\' requires " +
+                          f"the \'{missing_package}\' package to be " +
+                          "installed")
+    return errors
+
+
 def get_file_extensions(dev_file_builder_args):
     """ Retrieve the file extensions currently supported as per their config
     definitions.
@@ -284,3 +440,274 @@ def validate_google_drive_flag(factory_definitions):
                           f"\'{google_drive_flag}\' for domain object " +
                           f"\'{domain_object}\'")
     return errors
+
+
+def validate_created_record_transport(shared_args):
+    """ Ensure the optional created record transport, if given, is one of
+    those supported.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the transport is not supported,
+        empty otherwise.
+    """
+
+    errors = []
+    transport = shared_args.get('created_record_transport')
+    if transport is not None and transport not in TRANSPORTS:
+        errors.append("- Invalid 'created_record_transport' " +
+                      f"\'{transport}\', must be one of {TRANSPORTS}")
+    return errors
+
+
+def validate_execution_mode(shared_args):
+    """ Ensure the optional execution mode, if given, is one of those
+    supported.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the execution mode is not
+        supported, empty otherwise.
+    """
+
+    errors = []
+    execution_mode = shared_args.get('execution_mode')
+    if execution_mode is not None and execution_mode not in EXECUTION_MODES:
+        errors.append(f"- Invalid 'execution_mode' \'{execution_mode}\', " +
+                      f"must be one of {EXECUTION_MODES}")
+    return errors
+
+
+def validate_number_of_concurrent_domain_objects(shared_args):
+    """ Ensure the optional maximum number of domain objects to process at
+    once, if given, is a positive integer.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the number is not a positive
+        integer, empty otherwise.
+    """
+
+    errors = []
+    number_of_concurrent_domain_objects = shared_args.get(
+        'number_of_concurrent_domain_objects'
+    )
+    if number_of_concurrent_domain_objects is not None and (
+            not isinstance(number_of_concurrent_domain_objects, int) or
+            number_of_concurrent_domain_objects <= 0):
+        errors.append("- 'number_of_concurrent_domain_objects' must be a " +
+                      "positive integer.")
+    return errors
+
+
+def validate_number_of_records_per_insert(shared_args):
+    """ Ensure the optional maximum number of records inserted into the
+    dependency database per transaction, if given, is a positive integer.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the number is not a positive
+        integer, empty otherwise.
+    """
+
+    errors = []
+    number_of_records_per_insert = shared_args.get(
+        'number_of_records_per_insert'
+    )
+    if number_of_records_per_insert is not None and (
+            not isinstance(number_of_records_per_insert, int) or
+            number_of_records_per_insert <= 0):
+        errors.append("- 'number_of_records_per_insert' must be a " +
+                      "positive integer.")
+    return errors
+
+
+def validate_number_of_records_per_chunk(shared_args):
+    """ Ensure the optional maximum number of records in each chunk created
+    by object factories which create records in chunks, if given, is a
+    positive integer.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the number is not a positive
+        integer, empty otherwise.
+    """
+
+    errors = []
+    number_of_records_per_chunk = shared_args.get(
+        'number_of_records_per_chunk'
+    )
+    if number_of_records_per_chunk is not None and (
+            not isinstance(number_of_records_per_chunk, int) or
+            number_of_records_per_chunk <= 0):
+        errors.append("- 'number_of_records_per_chunk' must be a " +
+                      "positive integer.")
+    return errors
+
+
+def validate_number_of_upload_threads(shared_args):
+    """ Ensure the optional number of threads uploading files to Google
+    Drive at once, if given, is a positive integer.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the number is not a positive
+        integer, empty otherwise.
+    """
+
+    errors = []
+    number_of_upload_threads = shared_args.get('number_of_upload_threads')
+    if number_of_upload_threads is not None and (
+            not isinstance(number_of_upload_threads, int) or
+            number_of_upload_threads <= 0):
+        errors.append("- 'number_of_upload_threads' must be a " +
+                      "positive integer.")
+    return errors
+
+
+def validate_max_records_in_flight(shared_args):
+    """ Ensure the optional maximum number of created records waiting to be
+    written, if given, is a positive integer.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the number is not a positive
+        integer, empty otherwise.
+    """
+
+    errors = []
+    max_records_in_flight = shared_args.get('max_records_in_flight')
+    if max_records_in_flight is not None and (
+            not isinstance(max_records_in_flight, int) or
+            max_records_in_flight <= 0):
+        errors.append("- 'max_records_in_flight' must be a " +
+                      "positive integer.")
+    return errors
+
+
+def validate_seed(shared_args):
+    """ Ensure the optional seed of the random number generators, if given,
+    is an integer.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the seed is not an integer, empty
+        otherwise.
+    """
+
+    errors = []
+    seed = shared_args.get('seed')
+    if seed is not None and (
+            not isinstance(seed, int) or isinstance(seed, bool)):
+        errors.append("- 'seed' must be an integer.")
+    return errors
+
+
+def validate_shard(shared_args):
+    """ Ensure the optional number of shards, if given, is a positive integer
+    and the index of the shard of the run is an integer from 0 to one less
+    than the number of shards. A shard index may not be given without the
+    number of shards.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of error messages for the shard count and index, if invalid.
+    """
+
+    errors = []
+    shard_count = shared_args.get('shard_count')
+    shard_index = shared_args.get('shard_index')
+
+    if shard_count is None:
+        if shard_index is not None:
+            errors.append("- 'shard_index' requires 'shard_count'.")
+        return errors
+
+    if not isinstance(shard_count, int) or shard_count <= 0:
+        errors.append("- 'shard_count' must be a positive integer.")
+    elif shard_index is not None and (
+            not isinstance(shard_index, int) or
+            not 0 <= shard_index < shard_count):
+        errors.append("- 'shard_index' must be an integer from 0 to " +
+                      "'shard_count' - 1.")
+    return errors
+
+
+def validate_persistence_mode(shared_args):
+    """ Ensure the optional persistence mode, if given, is one of those
+    supported.
+
+    Parameters
+    ----------
+    shared_args : dict
+        Dictionary of the "shared_config" section of the config file
+
+    Returns
+    -------
+    List
+        List of a single error message if the persistence mode is not
+        supported, empty otherwise.
+    """
+
+    errors = []
+    persistence_mode = shared_args.get('persistence_mode')
+    if persistence_mode is not None and \
+            persistence_mode not in PERSISTENCE_MODES:
+        errors.append("- Invalid 'persistence_mode' " +
+                      f"\'{persistence_mode}\', must be one of " +
+                      f"{PERSISTENCE_MODES}")
+    return errors
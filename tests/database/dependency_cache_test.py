@@ -0,0 +1,122 @@
+import sys
+
+sys.path.insert(0, 'tests/')
+from utils import helper_methods as helper
+from utils import shared_tests as shared
+from database.dependency_cache import DependencyCache
+
+TABLE_NAME = "test_accounts"
+TABLE_DEF = {"account_id": "text",
+             "account_type": "text"}
+
+
+def set_up_test_table(accounts):
+    """ Create a committed test table holding the given accounts, and return
+    the database connection used """
+    database = helper.create_db()
+    helper.drop_test_table(database, TABLE_NAME)
+    helper.create_test_table(database, TABLE_NAME, TABLE_DEF)
+    database.persist_batch(TABLE_NAME, accounts)
+    database.commit_changes()
+    return database
+
+
+def test_random_row_with_valid_attribute():
+    """ Test that only rows with a valid attribute value are selected """
+    database = set_up_test_table([['1', 'ICP'], ['2', 'ECP'], ['3', 'FIRM']])
+    cache = DependencyCache(database)
+
+    for _ in range(20):
+        row = cache.get_random_row_with_valid_attribute(
+            TABLE_NAME, 'account_type', ['ICP', 'ECP']
+        )
+        assert row['account_type'] in ['ICP', 'ECP']
+
+    helper.drop_test_table(database, TABLE_NAME)
+
+
+def test_random_row_with_no_valid_attribute():
+    """ Test that None is returned when no row has a valid attribute value """
+    database = set_up_test_table([['1', 'ICP']])
+    cache = DependencyCache(database)
+
+    row = cache.get_random_row_with_valid_attribute(
+        TABLE_NAME, 'account_type', ['FIRM']
+    )
+    shared.expected_value(None, row)
+
+    helper.drop_test_table(database, TABLE_NAME)
+
+
+def test_invalidate_reloads_table():
+    """ Test that rows persisted through the cache's own connection are seen
+    once the table is invalidated """
+    database = set_up_test_table([['1', 'ICP']])
+    cache = DependencyCache(database)
+    shared.expected_value(1, len(cache.get_rows(TABLE_NAME)))
+
+    database.persist_batch(TABLE_NAME, [['2', 'ICP']])
+    database.commit_changes()
+    shared.expected_value(1, len(cache.get_rows(TABLE_NAME)))
+
+    cache.invalidate(TABLE_NAME)
+    shared.expected_value(2, len(cache.get_rows(TABLE_NAME)))
+
+    helper.drop_test_table(database, TABLE_NAME)
+
+
+def test_refresh_reloads_after_other_connection_commits():
+    """ Test that rows committed by another connection are seen once the
+    cache is refreshed """
+    database = set_up_test_table([['1', 'ICP']])
+    cache = DependencyCache(database)
+    shared.expected_value(1, len(cache.get_rows(TABLE_NAME)))
+
+    cache.refresh()
+    shared.expected_value(1, len(cache.get_rows(TABLE_NAME)))
+
+    other_database = helper.create_db()
+    other_database.persist_batch(TABLE_NAME, [['2', 'ECP']])
+    other_database.commit_changes()
+    other_database.close_connection()
+
+    cache.refresh()
+    shared.expected_value(2, len(cache.get_rows(TABLE_NAME)))
+
+    helper.drop_test_table(database, TABLE_NAME)
+
+
+def test_refresh_keeps_unchanged_tables():
+    """ Test that commits by another connection to other tables, or made
+    before a table was loaded, do not discard the cached table """
+    database = set_up_test_table([['1', 'ICP']])
+    other_table_name = "test_other_accounts"
+    helper.drop_test_table(database, other_table_name)
+    helper.create_test_table(database, other_table_name, TABLE_DEF)
+    database.commit_changes()
+
+    other_database = helper.create_db()
+    cache = DependencyCache(database)
+    cache.get_rows(other_table_name)
+    other_database.persist_batch(TABLE_NAME, [['2', 'ECP']])
+    other_database.commit_changes()
+    rows = cache.get_rows(TABLE_NAME)
+    shared.expected_value(2, len(rows))
+
+    cache.refresh()
+    assert cache.get_rows(TABLE_NAME) is rows
+
+    other_database.persist_batch(other_table_name, [['3', 'ICP']])
+    other_database.commit_changes()
+    cache.refresh()
+    assert cache.get_rows(TABLE_NAME) is rows
+    shared.expected_value(1, len(cache.get_rows(other_table_name)))
+
+    other_database.persist_batch(TABLE_NAME, [['4', 'ICP']])
+    other_database.commit_changes()
+    other_database.close_connection()
+    cache.refresh()
+    shared.expected_value(3, len(cache.get_rows(TABLE_NAME)))
+
+    helper.drop_test_table(database, TABLE_NAME)
+    helper.drop_test_table(database, other_table_name)
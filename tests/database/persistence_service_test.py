@@ -0,0 +1,67 @@
+import sys
+
+import pytest
+
+sys.path.insert(0, 'tests/')
+from utils import helper_methods as helper
+from database.persistence_service import PersistenceService
+
+TABLE_NAME = "test_persisted_accounts"
+TABLE_DEF = {"account_id": "text",
+             "account_type": "text"}
+
+
+@pytest.fixture
+def database():
+    """ Create an empty committed test table, dropped after the test """
+    database = helper.create_db()
+    helper.drop_test_table(database, TABLE_NAME)
+    helper.create_test_table(database, TABLE_NAME, TABLE_DEF)
+    database.commit_changes()
+    yield database
+    helper.drop_test_table(database, TABLE_NAME)
+    database.commit_changes()
+
+
+def test_flush_makes_batches_visible(database):
+    """ Test that every batch queued before a flush is persisted and visible
+    to other connections once the flush returns """
+    service = PersistenceService()
+    try:
+        for account_id in range(3):
+            service.get_persistence_queue().put(
+                (TABLE_NAME, [[str(account_id), 'ICP']])
+            )
+        service.flush()
+
+        assert sorted(helper.query_db(TABLE_NAME, 'account_id')) == \
+            ['0', '1', '2']
+    finally:
+        service.stop()
+
+
+def test_flush_raises_on_failed_batch(database):
+    """ Test that a batch which cannot be persisted fails the service, such
+    that the next flush raises """
+    service = PersistenceService()
+    try:
+        service.get_persistence_queue().put(
+            ('test_missing_table', [['1', 'ICP']])
+        )
+        with pytest.raises(RuntimeError):
+            service.flush()
+    finally:
+        service.stop()
+
+
+def test_stop_drains_queue(database):
+    """ Test that stopping the service persists every batch still on the
+    queue before the service process ends """
+    service = PersistenceService()
+    for account_id in range(100):
+        service.get_persistence_queue().put(
+            (TABLE_NAME, [[str(account_id), 'ECP']])
+        )
+    service.stop()
+
+    assert len(helper.query_db(TABLE_NAME)) == 100
@@ -75,17 +75,52 @@ def test_persist_batch():
     helper.drop_test_table(database, table_name)
 
 
-def test_format_list_for_insertion():
-    """ Test that a list for insertion is correctly formatted ready for the
-    SQL insert query """
+def test_persist_batch_with_quotes():
+    """ Test that the persist batch method inserts values containing quotes
+    unchanged """
+
+    table_name = "test_instruments"
+    table_def = {"ric": "text",
+                 "cusip": "text",
+                 "isin": "text"}
 
     database = helper.create_db()
+    helper.drop_test_table(database, table_name)
+    helper.create_test_table(database, table_name, table_def)
+
+    instrument_list = [["ric'1", 'cusip"1', "TEST_ISIN"]]
+
+    database.persist_batch(table_name, instrument_list)
+
+    rows = [[row['ric'], row['cusip'], row['isin']]
+            for row in database.retrieve(table_name)]
+    shared.expected_value(instrument_list, rows)
+
+    helper.drop_test_table(database, table_name)
+
 
-    instrument = ['ric', 'cusip', 'TEST_ISIN']
-    expecetd_string = "('ric','cusip','TEST_ISIN')"
+def test_persist_batch_in_chunks():
+    """ Test that the persist batch method inserts and commits every record
+    when the records span several chunks """
 
-    formated_string = database.format_list_for_insertion(instrument)
-    shared.expected_value(expecetd_string, formated_string)
+    table_name = "test_instruments"
+    table_def = {"ric": "text",
+                 "cusip": "text",
+                 "isin": "text"}
+
+    database = helper.create_db()
+    helper.drop_test_table(database, table_name)
+    helper.create_test_table(database, table_name, table_def)
+
+    instrument_list = [[f'ric{i}', f'cusip{i}', 'TEST_ISIN']
+                       for i in range(10)]
+
+    database.persist_batch(table_name, instrument_list, chunk_size=3)
+
+    shared.expected_value(False, database.get_connection().in_transaction)
+    shared.expected_value(10, database.get_table_size(table_name))
+
+    helper.drop_test_table(database, table_name)
 
 
 def test_retrieve():
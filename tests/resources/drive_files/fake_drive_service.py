@@ -0,0 +1,129 @@
+""" A local, in-memory stand-in for the Google Drive v3 service, answering
+the requests made by GoogleDriveConnector, such that uploads can be tested
+and benchmarked offline.
+
+Every request may be given a latency, slept through before the request is
+answered, to model the round trip to Drive. The number of requests of each
+kind is counted, and the content of each uploaded file is kept.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+
+class FakeDriveService:
+    """ In-memory Drive holding files and folders by ID. Thread safe, so a
+    single service may be shared by every thread of a connector. """
+
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.files_by_id = {}
+        self.request_counts = Counter()
+        self.lock = threading.Lock()
+
+    def files(self):
+        return FakeFilesResource(self)
+
+    def add_file(self, metadata, content=None):
+        """ Add a file, or folder, returning its ID """
+        with self.lock:
+            file_id = f'id{len(self.files_by_id)}'
+            self.files_by_id[file_id] = dict(metadata, id=file_id,
+                                             content=content)
+            return file_id
+
+    def find_files(self, name=None, parent_id=None, mime_type=None):
+        """ Return the files and folders matching all of the given terms """
+        with self.lock:
+            return [
+                {'id': file['id'], 'name': file['name']}
+                for file in self.files_by_id.values()
+                if (name is None or file['name'] == name)
+                and (parent_id is None or parent_id in file['parents'])
+                and (mime_type is None or file.get('mimeType') == mime_type)
+            ]
+
+    def get_files_in_folder(self, folder_id):
+        """ Return the content of every file in a folder, by file name """
+        with self.lock:
+            return {file['name']: file['content']
+                    for file in self.files_by_id.values()
+                    if folder_id in file['parents']}
+
+    def respond(self, request_kind, response):
+        """ Count a request and answer it once its latency has passed """
+        with self.lock:
+            self.request_counts[request_kind] += 1
+        time.sleep(self.latency)
+        return response()
+
+
+class FakeFilesResource:
+    """ The 'files' resource of the service """
+
+    def __init__(self, service):
+        self.service = service
+
+    def create(self, body, fields=None, media_body=None):
+        if media_body is None:
+            return FakeRequest(self.service, 'create_folder',
+                               lambda: {'id': self.service.add_file(body)})
+        return FakeUploadRequest(self.service, body, media_body)
+
+    def list(self, q, spaces=None, fields=None):
+        terms = dict(re.findall(r"(name|parents in|mimeType)\s*=?\s*'([^']*)'",
+                                q))
+        return FakeRequest(self.service, 'list', lambda: {
+            'files': self.service.find_files(terms.get('name'),
+                                             terms.get('parents in'),
+                                             terms.get('mimeType'))
+        })
+
+    def update(self, fileId, media_body):
+        def update_file():
+            self.service.files_by_id[fileId]['content'] = \
+                read_media(media_body)
+            return {'id': fileId}
+        return FakeRequest(self.service, 'update', update_file)
+
+    def delete(self, fileId):
+        def delete_file():
+            del self.service.files_by_id[fileId]
+        return FakeRequest(self.service, 'delete', delete_file)
+
+
+class FakeRequest:
+    """ A request answered once executed """
+
+    def __init__(self, service, request_kind, response):
+        self.service = service
+        self.request_kind = request_kind
+        self.response = response
+
+    def execute(self):
+        return self.service.respond(self.request_kind, self.response)
+
+
+class FakeUploadRequest:
+    """ A resumable upload, completed in a single chunk """
+
+    def __init__(self, service, metadata, media_body):
+        self.service = service
+        self.metadata = metadata
+        self.media_body = media_body
+
+    def next_chunk(self):
+        response = self.service.respond('upload', lambda: {
+            'id': self.service.add_file(self.metadata,
+                                        read_media(self.media_body))
+        })
+        return None, response
+
+
+def read_media(media_body):
+    """ Return the content of a MediaFileUpload """
+    return media_body.getbytes(0, media_body.size())
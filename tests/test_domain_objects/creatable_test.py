@@ -0,0 +1,158 @@
+import sys
+
+import pytest
+
+sys.path.insert(0, 'tests/')
+from utils import helper_methods as helper
+from utils import shared_tests as shared
+from domainobjectfactories.instrument_factory import InstrumentFactory
+from domainobjectfactories.price_factory import PriceFactory
+
+""" Tests of the batch creation methods of the Creatable class, which create
+values for many records at once. Each should create values matching those
+created by the corresponding single-value method, as plain Python types. """
+
+
+def test_create_random_strings():
+    """ strings must be of the given length and of the requested
+    characters only """
+    strings = shared.domain_obj.create_random_strings(100, 10)
+    assert len(strings) == 100
+    for value in strings:
+        assert type(value) is str
+        assert len(value) == 10
+        assert value.isalnum() and value == value.upper()
+
+    digits = shared.domain_obj.create_random_strings(
+        100, 5, include_letters=False
+    )
+    assert all(value.isdigit() for value in digits)
+
+
+def test_create_random_integers():
+    """ integers must be within the given range, or of the given length """
+    integers = shared.domain_obj.create_random_integers(100, min=3, max=5)
+    assert len(integers) == 100
+    assert all(type(value) is int and 3 <= value <= 5 for value in integers)
+
+    for length in (1, 10, 25):
+        integers = shared.domain_obj.create_random_integers(
+            100, length=length, negative=True
+        )
+        assert all(len(str(-value)) == length for value in integers)
+
+
+def test_create_random_decimals():
+    """ decimals must be floats within the given range to at most the given
+    number of decimal places """
+    decimals = shared.domain_obj.create_random_decimals(100, min=1, max=10)
+    assert len(decimals) == 100
+    for value in decimals:
+        assert type(value) is float
+        assert 1 <= value <= 10
+        assert len(str(value).split('.')[1]) <= 2
+
+
+def test_create_random_choices():
+    """ choices must be selected from those given, keeping their type """
+    currencies = shared.domain_obj.create_currencies(100)
+    assert len(currencies) == 100
+    assert set(currencies) <= set(shared.domain_obj.CURRENCIES)
+
+    booleans = shared.domain_obj.create_random_booleans(100)
+    assert all(type(value) is bool for value in booleans)
+
+
+def test_dummy_field_plan():
+    """ dummy fields must be named in config order, with the type and length
+    given in config, whether created for one record or many at once """
+    factory = PriceFactory({
+        'file_type_args': {'xml_item_name': 'price'},
+        'dummy_fields': [
+            {'field_count': 2, 'data_type': 'string', 'data_length': 4},
+            {'field_count': 0, 'data_type': 'string', 'data_length': 1},
+            {'field_count': 3, 'data_type': 'numeric', 'data_length': 6}
+        ]
+    }, {})
+    field_names = [f'price_field{number}' for number in range(1, 6)]
+
+    assert factory.get_dummy_field_plan() is factory.get_dummy_field_plan()
+    assert [key for key, _ in factory.create_dummy_field_generator()] == \
+        field_names
+
+    records = factory.add_dummy_fields([{'id': i} for i in range(50)])
+    for record in records:
+        assert list(record) == ['id'] + field_names
+        assert all(type(record[name]) is str and len(record[name]) == 4
+                   for name in field_names[:2])
+        assert all(type(record[name]) is int and len(str(record[name])) == 6
+                   for name in field_names[2:])
+
+
+def test_seed_random_generators():
+    """ jobs must draw the same values for the same seed and start id, and
+    different values for a different start id, seed, or no seed """
+
+    def get_values(shared_args, start_id):
+        factory = PriceFactory(None, shared_args)
+        factory.seed_random_generators(start_id)
+        return (factory.create_random_string(20),
+                factory.create_random_strings(5, 20))
+
+    assert get_values({'seed': 1}, 0) == get_values({'seed': 1}, 0)
+    assert get_values({'seed': 1}, 0) != get_values({'seed': 1}, 1000)
+    assert get_values({'seed': 1}, 0) != get_values({'seed': 2}, 0)
+    assert get_values({}, 0) != get_values({}, 0)
+
+
+def test_lookup_table():
+    """ prerequisite tables must be loaded once, as read-only columns, and
+    random rows selected from them keeping each row's values together """
+    helper.delete_local_database()
+    exchanges = helper.create_db().retrieve('exchanges')
+    factory = InstrumentFactory(None, {'seed': 1})
+
+    lookup_table = factory.get_lookup_table('exchanges')
+    assert lookup_table is factory.get_lookup_table('exchanges')
+    assert lookup_table['exchange_code'].tolist() == \
+        [row['exchange_code'] for row in exchanges]
+    with pytest.raises(ValueError):
+        lookup_table['exchange_code'][0] = 'XX'
+
+    factory.seed_random_generators(0)
+    values = factory.get_random_lookup_values('exchanges', 100)
+    assert list(values) == list(exchanges[0].keys())
+    selected_rows = set(zip(*values.values()))
+    assert len(values['exchange_code']) == 100
+    assert all(type(value) is str for value in values['exchange_code'])
+    assert selected_rows <= {tuple(row) for row in exchanges}
+
+    factory.seed_random_generators(0)
+    assert factory.get_random_lookup_values('exchanges', 100) == values
+
+
+def test_retrieve_batch_records_by_job_key():
+    """ where seeded, batches must follow the order of the create jobs
+    persisting the records, and their order within each job, whatever the
+    order the jobs ran in """
+    helper.delete_local_database()
+    factory = PriceFactory(None, {'seed': 1})
+
+    factory.start_create_job(3)
+    for counterparty_id in ('3', '4'):
+        factory.persist_record([counterparty_id])
+    factory.persist_records('counterparties')
+    factory.start_create_job(0)
+    for counterparty_ids in (('0', '1'), ('2',)):
+        for counterparty_id in counterparty_ids:
+            factory.persist_record([counterparty_id])
+        factory.persist_records('counterparties')
+
+    def get_ids(amount, start_pos):
+        return [row['id'] for row in factory.retrieve_batch_records(
+            'counterparties', amount, start_pos
+        )]
+
+    assert get_ids(3, 1) == ['1', '2', '3']
+    assert get_ids(5, 3) == ['3', '4']
+    assert get_ids(2, 5) == []
@@ -0,0 +1,55 @@
+import sys
+import pytest
+
+sys.path.insert(0, 'src/')
+from domainobjectfactories.record_batch import RecordBatch, concatenate_records
+
+RECORDS = [{'id': i, 'name': f'record{i}'} for i in range(5)]
+
+
+def test_record_batch_behaves_as_list_of_records():
+    """ a batch must produce the records it was created from, by iteration,
+    indexing and as rows of values ordered as its field names """
+    batch = RecordBatch.from_records(RECORDS)
+    assert len(batch) == 5
+    assert batch.get_field_names() == ['id', 'name']
+    assert batch.get_column('id') == [0, 1, 2, 3, 4]
+    assert list(batch) == RECORDS
+    assert batch.to_records() == RECORDS
+    assert batch[2] == RECORDS[2]
+    assert list(batch.get_rows())[1] == (1, 'record1')
+
+
+def test_record_batch_slice_and_concatenate():
+    """ slices must be RecordBatches, and concatenating them must restore
+    the records in order, ignoring empty batches """
+    batch = RecordBatch.from_records(RECORDS)
+    head, tail = batch[:2], batch[2:]
+    assert isinstance(head, RecordBatch) and len(head) == 2
+
+    joined = RecordBatch.concatenate([head, RecordBatch({}), tail])
+    assert joined.to_records() == RECORDS
+    assert len(RecordBatch.concatenate([])) == 0
+
+
+def test_record_batch_invalid_columns():
+    """ columns must be of the same length, and batches of different fields
+    cannot be concatenated """
+    with pytest.raises(ValueError):
+        RecordBatch({'id': [1, 2], 'name': ['a']})
+
+    with pytest.raises(ValueError):
+        RecordBatch.concatenate([RecordBatch({'id': [1]}),
+                                 RecordBatch({'name': ['a']})])
+
+
+def test_concatenate_records():
+    """ records must be concatenated into a RecordBatch only if every part
+    is one, otherwise into a list of records """
+    batch = RecordBatch.from_records(RECORDS)
+    assert isinstance(concatenate_records([batch[:2], batch[2:]]),
+                      RecordBatch)
+
+    records = concatenate_records([batch[:2], RECORDS[2:]])
+    assert isinstance(records, list)
+    assert records == RECORDS
@@ -1,10 +1,16 @@
 import sys
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
 sys.path.insert(0, 'tests/')
 from utils import shared_tests as shared
 from utils import helper_methods as helper
+from domainobjectfactories.tampa_poc.swap_position_factory import \
+    SwapPositionFactory
+
+NUMBER_OF_RECORDS_PER_CHUNK = 7
+NUMBER_OF_DAYS = 3
 
 
 @pytest.mark.skip(reason="Object being tested belongs to Tampa PoC and is "
@@ -39,3 +45,83 @@ def swap_position_quantity_valid(record):
         assert 1 <= quantity <= 10000
     else:
         assert -10000 <= quantity <= -1
+
+
+def set_up_swap_position_factory():
+    """ Create a database of instruments and swap contracts, and return a
+    seeded swap position factory creating positions of them in small
+    chunks """
+    helper.delete_local_database()
+    database = helper.create_db()
+    database.persist_batch('instruments', [
+        [str(i), f'RIC{i}', str(i), f'ISIN{i}', 'XNYS'] for i in range(5)
+    ])
+    database.persist_batch('swap_contracts', [[str(i), i] for i in range(3)])
+    database.commit_changes()
+
+    start_date = datetime.now(timezone.utc).date() \
+        - timedelta(days=NUMBER_OF_DAYS - 1)
+    return SwapPositionFactory({
+        'custom_args': {'ins_per_swap': {'min': 2, 'max': 3},
+                        'start_date': start_date.strftime('%Y%m%d')},
+        'file_type_args': {'xml_item_name': 'swap_position'},
+        'dummy_fields': []
+    }, {'number_of_records_per_chunk': NUMBER_OF_RECORDS_PER_CHUNK,
+        'seed': 1})
+
+
+def without_time_stamps(records):
+    """ Return records without their creation time, which differs between
+    otherwise equal records """
+    return [{field: value for field, value in record.items()
+             if field != 'time_stamp'} for record in records]
+
+
+def test_swap_position_chunks_are_bounded():
+    """ Test that every chunk holds at most 'number_of_records_per_chunk'
+    swap positions, with every position of every swap contract created """
+    factory = set_up_swap_position_factory()
+    factory.seed_random_generators(0)
+
+    chunks = list(factory.create_chunks(3, 0))
+
+    assert all(0 < len(chunk) <= NUMBER_OF_RECORDS_PER_CHUNK
+               for chunk in chunks)
+    assert all(len(chunk) == NUMBER_OF_RECORDS_PER_CHUNK
+               for chunk in chunks[:-1])
+    positions = [record for chunk in chunks for record in chunk]
+    assert {record['swap_contract_id'] for record in positions} == \
+        {'0', '1', '2'}
+    assert len(positions) % (len(factory.POSITION_TYPES)
+                             * NUMBER_OF_DAYS) == 0
+
+
+def test_swap_position_chunks_persist_end_of_day_positions():
+    """ Test that the end of day positions of each chunk are persisted
+    before the chunk is produced """
+    factory = set_up_swap_position_factory()
+    factory.seed_random_generators(0)
+
+    number_of_end_of_day_positions = 0
+    for chunk in factory.create_chunks(3, 0):
+        number_of_end_of_day_positions += sum(
+            record['position_type'] == 'E' for record in chunk
+        )
+        assert len(helper.query_db('swap_positions')) == \
+            number_of_end_of_day_positions
+    assert number_of_end_of_day_positions > 0
+
+
+def test_swap_positions_created_as_chunks():
+    """ Test that create returns the swap positions of every chunk, in
+    order """
+    factory = set_up_swap_position_factory()
+
+    factory.seed_random_generators(0)
+    chunks = list(factory.create_chunks(3, 0))
+    factory.seed_random_generators(0)
+    records = factory.create(3, 0)
+
+    assert without_time_stamps(records) == without_time_stamps(
+        [record for chunk in chunks for record in chunk]
+    )
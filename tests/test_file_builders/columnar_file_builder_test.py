@@ -0,0 +1,125 @@
+import pickle
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+pyarrow = pytest.importorskip('pyarrow')
+import pyarrow.ipc
+import pyarrow.parquet
+
+sys.path.insert(0, 'src/')
+from filebuilders.arrow_builder import ArrowBuilder
+from filebuilders.parquet_builder import ParquetBuilder
+from domainobjectfactories.record_batch import RecordBatch
+
+RECORDS = [
+    {'trade_id': i, 'currency': 'USD', 'price': i / 4,
+     'created_timestamp': datetime(2020, 1, 2, tzinfo=timezone.utc),
+     'trade_field1': 'ABCD', 'trade_field2': 10 ** 24 + i}
+    for i in range(10)
+]
+
+
+def get_builder(builder_class, output_type, tmp_path, compression=None):
+    """ Return a builder of the given class writing to the given directory,
+    with a string and a numeric dummy field """
+    factory_config = {
+        'output_file_type': output_type,
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': 4,
+        'file_type_args': {'xml_item_name': 'trade'},
+        'dummy_fields': [
+            {'field_count': 1, 'data_type': 'string', 'data_length': 4},
+            {'field_count': 1, 'data_type': 'numeric', 'data_length': 25}
+        ]
+    }
+    if compression is not None:
+        factory_config['compression'] = compression
+    return builder_class(None, factory_config)
+
+
+def read_parquet(file_path):
+    """ Return the table of a Parquet file """
+    return pyarrow.parquet.read_table(file_path)
+
+
+def read_arrow(file_path):
+    """ Return the table of an Arrow IPC file """
+    with pyarrow.OSFile(str(file_path), 'rb') as source:
+        return pyarrow.ipc.open_file(source).read_all()
+
+
+BUILDERS = [(ParquetBuilder, 'PARQUET', read_parquet),
+            (ArrowBuilder, 'ARROW', read_arrow)]
+
+
+@pytest.mark.parametrize('builder_class,output_type,read', BUILDERS)
+def test_columnar_file_of_records(builder_class, output_type, read,
+                                  tmp_path):
+    """ records must be written with their values, and dummy fields typed
+    from config, whether given as dictionaries or a RecordBatch, by copies
+    of the builder pickled once its schema is fixed """
+    builder = get_builder(builder_class, output_type, tmp_path)
+    builder.fix_file_layout(RECORDS[:4])
+    pickle.loads(pickle.dumps(builder)).build(0, RECORDS[:4])
+    pickle.loads(pickle.dumps(builder)).build(
+        1, RecordBatch.from_records(RECORDS[4:])
+    )
+
+    for file_number, records in ((0, RECORDS[:4]), (1, RECORDS[4:])):
+        file_name = builder.get_numbered_file_name(file_number)
+        table = read(tmp_path / file_name)
+        assert table.to_pylist() == records
+
+    schema = builder.get_schema()
+    assert schema.field('trade_field1').type == pyarrow.string()
+    assert schema.field('trade_field2').type == pyarrow.decimal128(25, 0)
+    assert schema.field('trade_id').type == pyarrow.int64()
+
+
+@pytest.mark.parametrize('builder_class,output_type,read', BUILDERS)
+def test_columnar_file_of_differing_records(builder_class, output_type,
+                                            read, tmp_path):
+    """ later files must keep the schema fixed from the first records, with
+    missing fields null """
+    builder = get_builder(builder_class, output_type, tmp_path)
+    first_records = [{'trade_id': 0, 'currency': 'USD'}]
+    builder.fix_file_layout(first_records)
+    pickle.loads(pickle.dumps(builder)).build(0, first_records)
+    pickle.loads(pickle.dumps(builder)).build(1, [{'trade_id': 1}])
+
+    for file_number in range(2):
+        table = read(tmp_path / builder.get_numbered_file_name(file_number))
+        assert table.schema == builder.get_schema()
+    assert table.to_pylist() == [{'trade_id': 1, 'currency': None}]
+
+
+@pytest.mark.parametrize('builder_class,output_type,read', BUILDERS)
+def test_columnar_file_of_null_fields(builder_class, output_type, read,
+                                      tmp_path):
+    """ a field None in every one of the first records must be typed as a
+    string, such that later files may hold its values """
+    builder = get_builder(builder_class, output_type, tmp_path)
+    builder.fix_file_layout(RecordBatch({'trade_id': [0],
+                                         'parent_id': [None]}))
+    assert builder.get_schema().field('parent_id').type == pyarrow.string()
+
+    pickle.loads(pickle.dumps(builder)).build(
+        0, [{'trade_id': 1, 'parent_id': 'T0'}]
+    )
+    table = read(tmp_path / builder.get_numbered_file_name(0))
+    assert table.to_pylist() == [{'trade_id': 1, 'parent_id': 'T0'}]
+
+
+@pytest.mark.parametrize('builder_class,output_type,read', BUILDERS)
+def test_compressed_columnar_file(builder_class, output_type, read,
+                                  tmp_path):
+    """ files must be compressed by their own library, keeping their names """
+    builder = get_builder(builder_class, output_type, tmp_path, 'zstd')
+    builder.build(0, RECORDS)
+
+    file_name = builder.get_numbered_file_name(0)
+    assert file_name == f'test_000.{output_type.lower()}'
+    assert read(tmp_path / file_name).to_pylist() == RECORDS
@@ -0,0 +1,134 @@
+import csv
+import gzip
+import pickle
+import sys
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from filebuilders.csv_builder import CSVBuilder
+from domainobjectfactories.record_batch import RecordBatch
+
+
+def get_builder(tmp_path):
+    """ Return a CSV builder writing to the given directory """
+    return CSVBuilder(None, {
+        'output_file_type': 'CSV',
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': 10
+    })
+
+
+def read(tmp_path, file_number):
+    """ Return the rows of a CSV file written by the builder """
+    with open(tmp_path / f'test_{file_number:03}.csv', newline='') as file:
+        return list(csv.reader(file))
+
+
+def test_csv_of_records(tmp_path):
+    """ records must be written in the order of their fields """
+    records = [{'id': i, 'name': f'a,"{i}"', 'price': i / 2}
+               for i in range(3)]
+    get_builder(tmp_path).build(0, records)
+    assert read(tmp_path, 0) == [
+        ['id', 'name', 'price'],
+        ['0', 'a,"0"', '0.0'], ['1', 'a,"1"', '0.5'], ['2', 'a,"2"', '1.0']
+    ]
+
+
+def test_csv_matches_csv_writer(tmp_path):
+    """ values of every type must be written as by the csv library """
+    utc_time = datetime(2020, 1, 2, 12, tzinfo=timezone.utc)
+    columns = {
+        'id': [1, 2, 3, 4],
+        'name': ['a', 'b,c', 'say "hi"', 'two\nlines'],
+        'price': [0.1, 2.0, -3.25, 1e20],
+        'is_otc': [True, False, True, False],
+        'notional': [Decimal('1.0'), Decimal('1.00'), None, 5],
+        'settlement_date': [date(2020, 1, 3), None, date(2020, 1, 4), None],
+        'created_timestamp': [
+            None, utc_time, utc_time.replace(microsecond=1),
+            utc_time.astimezone(timezone(timedelta(hours=1)))
+        ],
+        'value_datetime': [utc_time] * 4
+    }
+    records = RecordBatch(columns).to_records()
+    get_builder(tmp_path).build(0, records)
+
+    with open(tmp_path / 'expected.csv', 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(record.values() for record in records)
+    with open(tmp_path / 'expected.csv', newline='') as expected_file, \
+            open(tmp_path / 'test_000.csv', newline='') as file:
+        assert file.read() == expected_file.read()
+
+
+def test_csv_of_single_column(tmp_path):
+    """ empty values of a single column must be quoted """
+    get_builder(tmp_path).build(0, [{'name': ''}, {'name': 'a'}])
+    assert read(tmp_path, 0) == [['name'], [''], ['a']]
+
+
+def test_csv_of_records_with_differing_fields(tmp_path):
+    """ the columns must be the fields of every record of the first file,
+    kept for later files, with missing fields written as '-' """
+    builder = get_builder(tmp_path)
+    builder.build(0, [{'id': 0}, {'id': 1, 'parent_id': 0}])
+    builder.build(1, [{'parent_id': 1, 'id': 2}, {'id': 3}])
+
+    assert read(tmp_path, 0) == [['id', 'parent_id'], ['0', '-'],
+                                 ['1', '0']]
+    assert read(tmp_path, 1) == [['id', 'parent_id'], ['2', '1'],
+                                 ['3', '-']]
+
+    with pytest.raises(ValueError):
+        builder.build(2, [{'id': 4, 'child_id': 5}])
+
+
+def test_csv_columns_of_pickled_builders(tmp_path):
+    """ copies of a builder pickled once its columns are fixed, as given to
+    each write job, must write every file with the same columns """
+    builder = get_builder(tmp_path)
+    first_records = [{'id': 0}, {'id': 1, 'parent_id': 0}]
+    builder.fix_file_layout(first_records)
+
+    pickle.loads(pickle.dumps(builder)).build(0, first_records)
+    pickle.loads(pickle.dumps(builder)).build(1, [{'parent_id': 1, 'id': 2}])
+
+    assert read(tmp_path, 0) == [['id', 'parent_id'], ['0', '-'],
+                                 ['1', '0']]
+    assert read(tmp_path, 1) == [['id', 'parent_id'], ['2', '1']]
+
+
+def test_csv_of_record_batch(tmp_path):
+    """ a RecordBatch must be written as its records would be """
+    records = [{'id': i, 'is_otc': i % 2 == 0} for i in range(3)]
+    get_builder(tmp_path / 'records').build(0, records)
+    get_builder(tmp_path / 'batch').build(
+        0, RecordBatch.from_records(records)
+    )
+    assert read(tmp_path / 'records', 0) == read(tmp_path / 'batch', 0)
+
+
+def test_compressed_csv(tmp_path):
+    """ a compressed file must decompress to the file written without
+    compression, and be named with the extension of its compression """
+    records = [{'id': i, 'name': f'name {i}'} for i in range(100)]
+    get_builder(tmp_path).build(0, records)
+    builder = CSVBuilder(None, {
+        'output_file_type': 'CSV',
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': 10,
+        'compression': 'gzip'
+    })
+    builder.build(0, records)
+
+    assert builder.get_numbered_file_name(0) == 'test_000.csv.gz'
+    with gzip.open(tmp_path / 'test_000.csv.gz', 'rb') as compressed_file, \
+            open(tmp_path / 'test_000.csv', 'rb') as file:
+        assert compressed_file.read() == file.read()
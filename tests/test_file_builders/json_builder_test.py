@@ -0,0 +1,70 @@
+import json
+import sys
+from datetime import date, datetime, timezone
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from filebuilders.json_builder import JSONBuilder
+from filebuilders.json_serializers import JSON_SERIALIZERS, \
+    get_missing_json_serializer_package
+from filebuilders.jsonl_builder import JSONLBuilder
+from domainobjectfactories.record_batch import RecordBatch
+
+RECORDS = [
+    {'trade_id': i, 'trader_id': 'A/B é', 'price': i / 4, 'is_otc': True,
+     'parent_id': None,
+     'booking_datetime': datetime(2020, 1, 2, 3, 4, 5, i, timezone.utc),
+     'value_date': date(2020, 1, 3), 'trade_field1': 10 ** 24 + i}
+    for i in range(3)
+]
+
+# the records as they are to be read from JSON
+EXPECTED_RECORDS = [
+    dict(record, booking_datetime=record['booking_datetime'].isoformat(),
+         value_date='2020-01-03')
+    for record in RECORDS
+]
+
+JSON_SERIALIZER_NAMES = [
+    name for name in JSON_SERIALIZERS
+    if get_missing_json_serializer_package(name) is None
+]
+
+
+def build(builder_class, output_type, json_serializer, data, tmp_path):
+    """ Return the contents of a file built from the given records """
+    builder = builder_class(None, {
+        'output_file_type': output_type,
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': 10,
+        'json_serializer': json_serializer
+    })
+    builder.build(0, data)
+    with open(tmp_path / f'test_000.{output_type.lower()}',
+              encoding='utf-8') as file:
+        return file.read()
+
+
+@pytest.mark.parametrize('json_serializer', JSON_SERIALIZER_NAMES)
+def test_json_of_records(json_serializer, tmp_path):
+    """ records must be written as a JSON array by every serialiser, with
+    dates in ISO 8601 format, whether given as dictionaries or a
+    RecordBatch """
+    for data in (RECORDS, RecordBatch.from_records(RECORDS)):
+        content = build(JSONBuilder, 'JSON', json_serializer, data,
+                        tmp_path)
+        assert json.loads(content) == EXPECTED_RECORDS
+
+    assert build(JSONBuilder, 'JSON', json_serializer, [], tmp_path) == '[]'
+
+
+@pytest.mark.parametrize('json_serializer', JSON_SERIALIZER_NAMES)
+def test_jsonl_of_records(json_serializer, tmp_path):
+    """ records must be written a line each by every serialiser, with dates
+    in ISO 8601 format """
+    content = build(JSONLBuilder, 'JSONL', json_serializer, RECORDS,
+                    tmp_path)
+    assert [json.loads(line) for line in content.split('\n')] == \
+        EXPECTED_RECORDS
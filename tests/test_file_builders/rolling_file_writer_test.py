@@ -0,0 +1,128 @@
+import csv
+import json
+import sys
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from filebuilders.csv_builder import CSVBuilder
+from filebuilders.json_builder import JSONBuilder
+from filebuilders.jsonl_builder import JSONLBuilder
+from filebuilders.rolling_file_writer import RollingFileWriter
+from filebuilders.xml_builder import XMLBuilder
+from domainobjectfactories.record_batch import RecordBatch
+
+RECORDS = [{'trade_id': i, 'trader_id': 'A' * (i % 7), 'price': i / 4}
+           for i in range(50)]
+
+BUILDERS = (('CSV', CSVBuilder), ('JSON', JSONBuilder),
+            ('JSONL', JSONLBuilder), ('XML', XMLBuilder))
+
+
+def get_file_builder(builder_class, output_type, tmp_path,
+                     max_objects_per_file=1000, max_bytes_per_file=None):
+    """ Return a file builder writing files of the given limits """
+    return builder_class(None, {
+        'output_file_type': output_type,
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': max_objects_per_file,
+        'max_bytes_per_file': max_bytes_per_file,
+        'file_type_args': {'xml_root_element': 'trades',
+                           'xml_item_name': 'trade'}
+    })
+
+
+def write(file_builder, created_records):
+    """ Write lists of records through a rolling file writer, returning the
+    number of records written to each file """
+    file_writer = RollingFileWriter(file_builder)
+    file_record_counts = {}
+    for records in created_records:
+        file_record_counts.update(file_writer.write(records))
+    file_record_counts.update(file_writer.close())
+    return file_record_counts
+
+
+def read_files(file_builder, tmp_path, number_of_files):
+    """ Return the contents of each numbered file, as bytes """
+    return [(tmp_path / file_builder.get_numbered_file_name(number))
+            .read_bytes() for number in range(number_of_files)]
+
+
+@pytest.mark.parametrize('output_type, builder_class', BUILDERS)
+def test_files_within_max_bytes(output_type, builder_class, tmp_path):
+    """ files must be rolled over before exceeding the maximum size, each
+    file being complete, and together holding every record in order """
+    file_builder = get_file_builder(builder_class, output_type, tmp_path,
+                                    max_bytes_per_file=300)
+
+    file_record_counts = write(file_builder, [RECORDS[:20], RECORDS[20:]])
+    contents = read_files(file_builder, tmp_path, len(file_record_counts))
+
+    assert len(contents) > 1
+    assert all(len(content) <= 300 for content in contents)
+    assert sum(file_record_counts.values()) == len(RECORDS)
+
+    if output_type == 'CSV':
+        rows = [row for content in contents for row in
+                list(csv.reader(content.decode().splitlines()))[1:]]
+        assert [int(row[0]) for row in rows] == list(range(len(RECORDS)))
+    elif output_type == 'JSON':
+        records = [record for content in contents
+                   for record in json.loads(content)]
+        assert records == RECORDS
+    elif output_type == 'JSONL':
+        records = [json.loads(line) for content in contents
+                   for line in content.decode().split('\n')]
+        assert records == RECORDS
+    else:
+        assert all(content.endswith(b'</trades>') for content in contents)
+        assert sum(content.count(b'<trade>') for content in contents) == \
+            len(RECORDS)
+
+
+@pytest.mark.parametrize('output_type, builder_class', BUILDERS)
+def test_single_file_as_built(output_type, builder_class, tmp_path):
+    """ records fitting in a single file must be written as build writes
+    them, whether given as dictionaries or a RecordBatch """
+    for data in (RECORDS, RecordBatch.from_records(RECORDS)):
+        file_builder = get_file_builder(builder_class, output_type,
+                                        tmp_path, max_bytes_per_file=10 ** 6)
+        assert write(file_builder, [data[:30], data[30:]]) == {0: 50}
+        written = read_files(file_builder, tmp_path, 1)[0]
+
+        file_builder.build(0, data)
+        assert written == read_files(file_builder, tmp_path, 1)[0]
+
+
+def test_files_filled(tmp_path):
+    """ files must only be rolled over once the next record does not fit """
+    file_builder = get_file_builder(JSONLBuilder, 'JSONL', tmp_path,
+                                    max_bytes_per_file=300)
+    file_record_counts = write(file_builder, [RECORDS])
+    contents = read_files(file_builder, tmp_path, len(file_record_counts))
+
+    lines = [line for content in contents for line in content.split(b'\n')]
+    number_of_records_written = 0
+    for content in contents[:-1]:
+        number_of_records_written += content.count(b'\n') + 1
+        next_line = lines[number_of_records_written]
+        assert len(content) + 1 + len(next_line) > 300
+
+
+def test_files_within_max_records(tmp_path):
+    """ files must also be rolled over once holding the maximum number of
+    records """
+    file_builder = get_file_builder(JSONLBuilder, 'JSONL', tmp_path,
+                                    max_objects_per_file=20,
+                                    max_bytes_per_file=10 ** 6)
+    assert write(file_builder, [RECORDS]) == {0: 20, 1: 20, 2: 10}
+
+
+def test_oversized_record(tmp_path):
+    """ a record larger than the maximum size must be written to a file of
+    its own """
+    file_builder = get_file_builder(JSONLBuilder, 'JSONL', tmp_path,
+                                    max_bytes_per_file=10)
+    assert write(file_builder, [RECORDS[:3]]) == {0: 1, 1: 1, 2: 1}
@@ -0,0 +1,77 @@
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import dicttoxml
+
+sys.path.insert(0, 'src/')
+from filebuilders.xml_builder import XMLBuilder
+from domainobjectfactories.record_batch import RecordBatch
+
+RECORDS = [
+    {
+        'id': 1,
+        'name': 'Smith & Sons <"Ltd"> \'A\'',
+        'price': 9.99,
+        'quantity': -20,
+        'is_otc': True,
+        'is_active': False,
+        'parent_id': None,
+        'created_timestamp': datetime(2020, 1, 2, 3, 4, 5, 6, timezone.utc),
+        'settlement_date': date(2020, 1, 3),
+        'notional': Decimal('12.50'),
+        'legs': ['pay', 'receive'],
+        'nested': {'currency': 'USD', 'amounts': [1, 2.5]},
+        '2': 'numeric key',
+        '1.5': 'float key',
+        'has space': 'spaced key',
+        '<bad>': 'invalid key'
+    },
+    {'id': 2, 'name': '', 'price': 0.0, 'quantity': 0, 'is_otc': False,
+     'parent_id': None, 'created_timestamp': None, 'settlement_date': None,
+     'notional': Decimal('0'), 'legs': [], 'nested': {}, '2': '', '1.5': '',
+     'has space': '', '<bad>': ''}
+]
+
+
+def build(records, tmp_path):
+    """ Return the contents of an XML file built from the given records """
+    builder = XMLBuilder(None, {
+        'output_file_type': 'XML',
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': 10,
+        'file_type_args': {'xml_root_element': 'tests',
+                           'xml_item_name': 'test'}
+    })
+    builder.build(0, records)
+    with open(tmp_path / 'test_000.xml', encoding='utf-8') as xml_file:
+        return xml_file.read()
+
+
+def build_with_dicttoxml(records):
+    """ Return the XML the builder wrote from the given records when it used
+    the dicttoxml library """
+    xml = dicttoxml.dicttoxml(records, custom_root='tests', ids=False,
+                              item_func=lambda _: 'test')
+    return str(xml, 'utf-8').replace(' type="str"', '')\
+        .replace(' type="dict"', '').replace(' type="int"', '')
+
+
+def test_xml_matches_dicttoxml(tmp_path):
+    """ records must be written exactly as they were by dicttoxml """
+    assert build(RECORDS, tmp_path) == build_with_dicttoxml(RECORDS)
+
+
+def test_xml_of_record_batch(tmp_path):
+    """ a RecordBatch must be written as its records would be """
+    records = [{key: record.get(key) for key in RECORDS[0]}
+               for record in RECORDS]
+    assert build(RecordBatch.from_records(records), tmp_path) == \
+        build_with_dicttoxml(records)
+
+
+def test_xml_of_no_records(tmp_path):
+    """ an empty root element must be written where there are no records """
+    assert build([], tmp_path) == \
+        '<?xml version="1.0" encoding="UTF-8" ?><tests></tests>'
@@ -1,4 +1,13 @@
+import copy
+import queue
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, 'src/')
 from src.utils.google_drive_connector import GoogleDriveConnector
+from src.utils.drive_upload_service import DriveUploadService
 from src.filebuilders.csv_builder import CSVBuilder
 from src.filebuilders.json_builder import JSONBuilder
 from src.filebuilders.xml_builder import XMLBuilder
@@ -6,30 +15,27 @@ from src.filebuilders.jsonl_builder import JSONLBuilder
 from tests.resources.drive_files.config_stub import csv_config, xml_config, \
     json_config, jsonl_config
 from tests.resources.drive_files.data_stub import data
-from datetime import datetime, timezone
-import pytest
+from tests.resources.drive_files.fake_drive_service import FakeDriveService
 
 folder_creation_timestamp = '000000'
 
 
-@pytest.fixture(scope='module', autouse=True)
-def gd_conn():
-    """This is a setup/teardown function (called a fixture in pytest)
-    All code before the yield statement is setup, and any test that is
-    passed this function name as a parameter will have access to the object
-    from the yield statement.
-
-    All code after 'yield' is teardown, executed once at
-    the end of the last test in the module.
+@pytest.fixture()
+def drive_service():
+    """ An offline, in-memory Drive, holding only the root folder """
+    drive_service = FakeDriveService()
+    drive_service.files_by_id['root'] = {
+        'id': 'root', 'name': 'root', 'parents': [],
+        'mimeType': 'application/vnd.google-apps.folder'
+    }
+    return drive_service
 
-    Useful documentation: https://docs.pytest.org/en/latest/fixture.html
-    """
-    # SETUP:
-    gd_conn = GoogleDriveConnector("root", folder_creation_timestamp)
-    yield gd_conn
 
-    # TEAR DOWN:
-    delete_folder(gd_conn)
+@pytest.fixture()
+def gd_conn(drive_service):
+    """ A connector to the offline Drive """
+    return GoogleDriveConnector("root", folder_creation_timestamp,
+                                build_service=lambda: drive_service)
 
 
 def get_folder_id(gd_conn):
@@ -39,10 +45,13 @@ def get_folder_id(gd_conn):
     return gd_conn.get_folder_id(folder_creation_timestamp, date_folder_id)
 
 
-def upload(gd_conn, fb_class, fb_config):
-    fb = fb_class(gd_conn, fb_config)
+def upload(google_drive_connector, fb_class, fb_config, tmp_path,
+           file_number=1):
+    config = copy.deepcopy(fb_config)
+    config['output_directory'] = str(tmp_path)
+    fb = fb_class(google_drive_connector, config)
     # build file locally and upload to google drive
-    fb.build(1, data)
+    fb.build(file_number, data)
 
 
 def file_exists(gd_conn, file_name):
@@ -55,31 +64,55 @@ def file_exists(gd_conn, file_name):
         return file_id is not None
 
 
-def delete_folder(gd_conn):
-    """ for tear down - deletes drive folder and all contents"""
-    folder_id = get_folder_id(gd_conn)
-    gd_conn.delete_folder(folder_id)
-
-
-def test_csv_upload(gd_conn):
-    upload(gd_conn, CSVBuilder, csv_config)
-    file_name = 'csv_test_file_001.csv'
-    assert file_exists(gd_conn, file_name)
-
-
-def test_xml_upload(gd_conn):
-    upload(gd_conn, XMLBuilder, xml_config)
-    file_name = 'xml_test_file_001.xml'
-    assert file_exists(gd_conn, file_name)
-
-
-def test_json_upload(gd_conn):
-    upload(gd_conn, JSONBuilder, json_config)
-    file_name = 'json_test_file_001.json'
-    assert file_exists(gd_conn, file_name)
-
-
-def test_jsonl_upload(gd_conn):
-    upload(gd_conn, JSONLBuilder, jsonl_config)
-    file_name = 'jsonl_test_file_001.jsonl'
+@pytest.mark.parametrize('fb_class, fb_config, file_name', (
+    (CSVBuilder, csv_config, 'csv_test_file_001.csv'),
+    (XMLBuilder, xml_config, 'xml_test_file_001.xml'),
+    (JSONBuilder, json_config, 'json_test_file_001.json'),
+    (JSONLBuilder, jsonl_config, 'jsonl_test_file_001.jsonl')
+))
+def test_upload(gd_conn, drive_service, fb_class, fb_config, file_name,
+                tmp_path):
+    upload(gd_conn, fb_class, fb_config, tmp_path)
     assert file_exists(gd_conn, file_name)
+    assert drive_service.get_files_in_folder(get_folder_id(gd_conn)) == \
+        {file_name: (tmp_path / file_name).read_bytes()}
+
+
+def test_folders_found_once(gd_conn, drive_service, tmp_path):
+    """ the folders files are uploaded to must be found, or created, only
+    once however many files are uploaded """
+    for file_number in range(5):
+        upload(gd_conn, JSONLBuilder, jsonl_config, tmp_path, file_number)
+
+    assert drive_service.request_counts == {'list': 2, 'create_folder': 2,
+                                            'upload': 5}
+
+
+def test_upload_service(gd_conn, drive_service, tmp_path):
+    """ files queued by file builders must all be uploaded by the upload
+    service's threads, once, with the folders created only once """
+    upload_service = DriveUploadService(gd_conn, queue.Queue(4), 3)
+    uploader = upload_service.get_uploader()
+    try:
+        for file_number in range(10):
+            upload(uploader, CSVBuilder, csv_config, tmp_path, file_number)
+        upload_service.flush()
+    finally:
+        upload_service.stop()
+
+    uploaded_files = drive_service.get_files_in_folder(get_folder_id(gd_conn))
+    assert sorted(uploaded_files) == \
+        [f'csv_test_file_{file_number:03}.csv' for file_number in range(10)]
+    assert drive_service.request_counts['create_folder'] == 2
+    assert drive_service.request_counts['upload'] == 10
+
+
+def test_upload_service_failure(gd_conn, drive_service, tmp_path):
+    """ a failed upload must be raised once the queued files are flushed """
+    upload_service = DriveUploadService(gd_conn, queue.Queue(4), 2)
+    try:
+        upload_service.get_uploader().upload_file(str(tmp_path), 'missing')
+        with pytest.raises(RuntimeError):
+            upload_service.flush()
+    finally:
+        upload_service.stop()
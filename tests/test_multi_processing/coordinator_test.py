@@ -0,0 +1,141 @@
+import csv
+import sys
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from multi_processing.coordinator import Coordinator
+from multi_processing.worker_pools import WorkerPools
+from filebuilders.csv_builder import CSVBuilder
+from domainobjectfactories.creatable import Creatable
+
+SHARED_ARGS = {'number_of_create_child_processes': 2,
+               'number_of_write_child_processes': 1,
+               'number_of_records_per_job': 10,
+               'execution_mode': 'fused'}
+
+
+class IdFactory(Creatable):
+    """ Object factory creating records holding only their IDs """
+
+    def create(self, record_count, start_id):
+        return [{'id': i} for i in range(start_id, start_id + record_count)]
+
+
+class RecordedProgress:
+    """ Progress of a domain object, keeping the files recorded as written
+    after those written by a previous run """
+
+    def __init__(self, files_written=()):
+        self.files_written_before = set(files_written)
+        self.files_written = {}
+
+    def get_resume_point(self):
+        return 0, 0, 0
+
+    def get_files_written(self):
+        return self.files_written_before
+
+    def record_files_written(self, file_record_counts):
+        self.files_written.update(file_record_counts)
+
+
+@pytest.fixture
+def worker_pools():
+    """ Start pools of child processes, stopped after the test """
+    worker_pools = WorkerPools(SHARED_ARGS)
+    yield worker_pools
+    worker_pools.close()
+
+
+def get_file_builder(tmp_path):
+    """ Return a CSV builder writing files of at most 10 records to the
+    given directory """
+    return CSVBuilder(None, {
+        'output_file_type': 'CSV',
+        'file_name': 'test',
+        'output_directory': str(tmp_path),
+        'max_objects_per_file': 10
+    })
+
+
+def get_object_factory(record_count):
+    """ Return an object factory creating the given number of records """
+    return IdFactory({'fixed_args': {'record_count': record_count},
+                      'dummy_fields': []}, SHARED_ARGS)
+
+
+def read_ids(tmp_path, file_builder, file_number):
+    """ Return the IDs of the records of a file written by the builder """
+    file_path = tmp_path / file_builder.get_numbered_file_name(file_number)
+    with open(file_path, newline='') as file:
+        return [int(row['id']) for row in csv.DictReader(file)]
+
+
+def test_fused_run_writes_every_file(worker_pools, tmp_path):
+    """ a fused run must write a file of each job's records, numbered in
+    order of their IDs, recording the number of records of each file """
+    file_builder = get_file_builder(tmp_path)
+    progress = RecordedProgress()
+
+    Coordinator(file_builder, get_object_factory(25), worker_pools,
+                progress).run_fused_jobs()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+        ['test_000.csv', 'test_001.csv', 'test_002.csv']
+    for file_number, start_id, record_count in ((0, 0, 10), (1, 10, 10),
+                                                (2, 20, 5)):
+        assert read_ids(tmp_path, file_builder, file_number) == \
+            list(range(start_id, start_id + record_count))
+    assert progress.files_written == {0: 10, 1: 10, 2: 5}
+
+
+def test_fused_run_skips_files_written(worker_pools, tmp_path):
+    """ a resumed fused run must not write again the files recorded as
+    written by a previous run """
+    file_builder = get_file_builder(tmp_path)
+    progress = RecordedProgress(files_written={0, 1})
+
+    Coordinator(file_builder, get_object_factory(25), worker_pools,
+                progress).run_fused_jobs()
+
+    assert [path.name for path in tmp_path.iterdir()] == ['test_002.csv']
+    assert read_ids(tmp_path, file_builder, 2) == list(range(20, 25))
+    assert progress.files_written == {2: 5}
+
+
+@pytest.mark.parametrize('shard_count', [1, 2, 3, 7])
+def test_shards_create_disjoint_jobs_and_files(worker_pools, tmp_path,
+                                               shard_count):
+    """ the shards of a run must together run every create job, each job by
+    one shard only, and write files of distinct names, even where there
+    are more shards than jobs """
+    object_factory = get_object_factory(45)
+    shard_ids = []
+    shard_file_names = []
+
+    for shard_index in range(shard_count):
+        file_builder = get_file_builder(tmp_path)
+        file_builder.set_shard(shard_index, shard_count)
+        coordinator = Coordinator(file_builder, object_factory, worker_pools,
+                                  shard=(shard_index, shard_count))
+        create_jobs = coordinator.get_shard_create_jobs(
+            coordinator.get_create_jobs(10)
+        )
+
+        shard_ids.append([
+            record_id for create_job in create_jobs
+            for record_id in range(create_job['start_id'],
+                                   create_job['start_id']
+                                   + create_job['quantity'])
+        ])
+        shard_file_names.append({
+            file_builder.get_numbered_file_name(file_number)
+            for file_number in range(len(create_jobs))
+        })
+
+    # each shard is given a run of consecutive jobs, in order of shard
+    assert [record_id for ids in shard_ids for record_id in ids] == \
+        list(range(45))
+    assert sum(map(len, shard_file_names)) == \
+        len(set.union(*shard_file_names)) == 5
@@ -0,0 +1,45 @@
+import sys
+import threading
+
+sys.path.insert(0, 'src/')
+from multi_processing.in_flight_budget import InFlightBudget
+
+
+def test_budget_blocks_until_records_removed():
+    """ adding records beyond the budget must wait until enough records have
+    been removed, and be recorded as waiting """
+    budget = InFlightBudget(100)
+    budget.add_records(60)
+
+    added = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (budget.add_records(60), added.set())
+    )
+    thread.start()
+    assert not added.wait(timeout=0.2)
+
+    budget.remove_records(60)
+    assert added.wait(timeout=5)
+    thread.join()
+
+    assert budget.get_number_of_records_in_flight() == 60
+    assert budget.get_peak_number_of_records_in_flight() == 60
+    assert budget.get_seconds_waited() > 0
+
+
+def test_budget_admits_oversized_batch_when_empty():
+    """ a batch larger than the whole budget must be admitted when no other
+    records are in flight """
+    budget = InFlightBudget(10)
+    budget.add_records(50)
+    assert budget.get_number_of_records_in_flight() == 50
+    assert budget.get_peak_number_of_records_in_flight() == 50
+
+
+def test_unlimited_budget():
+    """ without a maximum, records must never wait """
+    budget = InFlightBudget()
+    for _ in range(10):
+        budget.add_records(1000)
+    assert budget.get_peak_number_of_records_in_flight() == 10000
+    assert budget.get_seconds_waited() == 0
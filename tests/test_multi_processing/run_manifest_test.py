@@ -0,0 +1,125 @@
+import os
+import sys
+
+sys.path.insert(0, 'src/')
+from multi_processing.run_manifest import RunManifest
+
+
+def get_progress(tmp_path, index=0, name='trade'):
+    """ Return the progress of a domain object of a new run recorded to a
+    manifest in the given directory """
+    run_manifest = RunManifest(os.path.join(tmp_path, 'run_manifest.jsonl'))
+    run_manifest.start_run('digest')
+    return run_manifest.get_domain_object_progress(index, name)
+
+
+def test_resume_run(tmp_path):
+    """ progress must be loaded from the manifest file only by a run of the
+    same config """
+    file_path = os.path.join(tmp_path, 'run_manifest.jsonl')
+    assert not RunManifest(file_path).resume_run('digest')
+
+    run_manifest = RunManifest(file_path)
+    run_manifest.start_run('digest')
+    progress = run_manifest.get_domain_object_progress(0, 'instrument')
+    progress.start({'instruments': 0})
+    progress.complete()
+    run_manifest.get_domain_object_progress(1, 'trade').start({})
+
+    resumed_manifest = RunManifest(file_path)
+    assert not resumed_manifest.resume_run('other digest')
+    assert resumed_manifest.resume_run('digest')
+    assert resumed_manifest.get_domain_object_progress(
+        0, 'instrument').is_complete()
+    trade_progress = resumed_manifest.get_domain_object_progress(1, 'trade')
+    assert trade_progress.is_started() and not trade_progress.is_complete()
+    assert not resumed_manifest.get_domain_object_progress(
+        2, 'price').is_started()
+
+
+def test_resume_point(tmp_path):
+    """ create jobs whose records were all written must be skipped, and the
+    records of the next job already written must be discarded """
+    progress = get_progress(tmp_path)
+    assert progress.get_resume_point() == (0, 0, 0)
+
+    progress.start({})
+    progress.record_create_jobs([(0, 10), (10, 10)])
+    progress.record_create_jobs([(20, 10)])
+    progress.record_files_written({0: 8, 1: 8})
+    # file 3 was written, but file 2 was not, so file 3 is written again
+    progress.record_files_written({3: 8})
+
+    assert progress.get_files_written() == {0, 1, 3}
+    assert progress.get_resume_point() == (10, 2, 6)
+
+
+def test_resume_point_after_all_records_written(tmp_path):
+    """ a domain object whose created records were all written must resume
+    after its last create job, even where jobs created no records """
+    progress = get_progress(tmp_path)
+    progress.start({})
+    progress.record_create_jobs([(0, 5), (5, 0), (10, 5)])
+    progress.record_files_written({0: 5, 1: 5})
+
+    assert progress.get_resume_point() == (11, 2, 0)
+
+
+def test_start_discards_progress(tmp_path):
+    """ starting a domain object again must discard its progress """
+    progress = get_progress(tmp_path)
+    progress.start({'instruments': 5})
+    progress.record_create_jobs([(0, 10)])
+    progress.record_files_written({0: 10})
+
+    progress.start({'instruments': 0})
+
+    assert progress.get_persisted_table_sizes() == {'instruments': 0}
+    assert progress.get_files_written() == set()
+    assert progress.get_resume_point() == (0, 0, 0)
+
+
+def test_progress_appended_to_manifest(tmp_path):
+    """ each change of progress must be appended to the manifest's file as a
+    line, rather than the whole manifest being written again """
+    file_path = os.path.join(tmp_path, 'run_manifest.jsonl')
+    run_manifest = RunManifest(file_path)
+    run_manifest.start_run('digest')
+    progress = run_manifest.get_domain_object_progress(0, 'trade')
+    progress.start({})
+
+    with open(file_path) as manifest_file:
+        lines_before = manifest_file.readlines()
+    progress.record_create_jobs([(0, 10)])
+    progress.record_files_written({0: 10})
+    with open(file_path) as manifest_file:
+        lines_after = manifest_file.readlines()
+
+    assert lines_after[:len(lines_before)] == lines_before
+    assert len(lines_after) == len(lines_before) + 2
+
+
+def test_resume_discards_partially_written_line(tmp_path):
+    """ a change left partially written by an interrupted run must be
+    discarded on resuming, and further changes recorded after the last
+    change written in full """
+    file_path = os.path.join(tmp_path, 'run_manifest.jsonl')
+    run_manifest = RunManifest(file_path)
+    run_manifest.start_run('digest')
+    progress = run_manifest.get_domain_object_progress(0, 'trade')
+    progress.start({})
+    progress.record_create_jobs([(0, 10)])
+    progress.record_files_written({0: 10})
+    with open(file_path, 'a') as manifest_file:
+        manifest_file.write('{"key": "0:trade", "files_wri')
+
+    resumed_manifest = RunManifest(file_path)
+    assert resumed_manifest.resume_run('digest')
+    progress = resumed_manifest.get_domain_object_progress(0, 'trade')
+    assert progress.get_files_written() == {0}
+    progress.record_files_written({1: 10})
+
+    resumed_manifest = RunManifest(file_path)
+    assert resumed_manifest.resume_run('digest')
+    assert resumed_manifest.get_domain_object_progress(
+        0, 'trade').get_files_written() == {0, 1}
@@ -0,0 +1,114 @@
+import sys
+import threading
+import pytest
+
+sys.path.insert(0, 'src/')
+from multi_processing.scheduler import Scheduler
+
+
+def get_recording_process(name, events, started=None, release=None):
+    """ Return a function recording the start and end of processing the named
+    domain object, optionally signalling that it has started and waiting to
+    be released before ending """
+
+    def process():
+        events.append(('start', name))
+        if started is not None:
+            started.set()
+        if release is not None:
+            assert release.wait(timeout=5)
+        events.append(('end', name))
+
+    return process
+
+
+def test_dependencies_finish_before_dependants_start():
+    """ Ensure a domain object starts only after its dependencies end, even
+    where it is added to the scheduler before them """
+    events = []
+    scheduler = Scheduler()
+    scheduler.add_domain_object(
+        'trade', ['account', 'instrument'],
+        get_recording_process('trade', events)
+    )
+    scheduler.add_domain_object(
+        'instrument', [], get_recording_process('instrument', events)
+    )
+    scheduler.add_domain_object(
+        'account', [], get_recording_process('account', events)
+    )
+    scheduler.run()
+
+    assert events.index(('start', 'trade')) > \
+        events.index(('end', 'instrument'))
+    assert events.index(('start', 'trade')) > \
+        events.index(('end', 'account'))
+    assert len(events) == 6
+
+
+def test_independent_domain_objects_run_concurrently():
+    """ Ensure independent domain objects are processed at the same time """
+    events = []
+    instrument_started, account_started = threading.Event(), threading.Event()
+
+    scheduler = Scheduler()
+    scheduler.add_domain_object(
+        'instrument', [], get_recording_process(
+            'instrument', events, instrument_started, account_started
+        )
+    )
+    scheduler.add_domain_object(
+        'account', [], get_recording_process(
+            'account', events, account_started, instrument_started
+        )
+    )
+    scheduler.run()
+
+    assert len(events) == 4
+
+
+def test_unconfigured_dependencies_ignored():
+    """ Ensure dependencies on domain objects not added are ignored """
+    events = []
+    scheduler = Scheduler()
+    scheduler.add_domain_object(
+        'price', ['instrument'], get_recording_process('price', events)
+    )
+    scheduler.run()
+
+    assert events == [('start', 'price'), ('end', 'price')]
+
+
+def test_cyclic_dependencies_raise():
+    """ Ensure cyclic dependencies are rejected before anything runs """
+    events = []
+    scheduler = Scheduler()
+    scheduler.add_domain_object(
+        'a', ['b'], get_recording_process('a', events)
+    )
+    scheduler.add_domain_object(
+        'b', ['a'], get_recording_process('b', events)
+    )
+
+    with pytest.raises(ValueError):
+        scheduler.run()
+    assert events == []
+
+
+def test_failure_stops_dependants():
+    """ Ensure an exception processing a domain object is raised, and its
+    dependants are never started """
+    events = []
+
+    def fail():
+        raise RuntimeError('failed')
+
+    scheduler = Scheduler()
+    scheduler.add_domain_object('instrument', [], fail)
+    scheduler.add_domain_object(
+        'price', ['instrument'], get_recording_process('price', events)
+    )
+
+    with pytest.raises(RuntimeError):
+        scheduler.run()
+    assert events == []
@@ -0,0 +1,95 @@
+import importlib
+import sqlite3
+import sys
+
+sys.path.insert(0, 'tests/')
+from utils import helper_methods as helper
+from database.sqlite_database import import_snapshot
+
+
+def import_app():
+    """ Import app.py, whose utils package has the name of the package of
+    test helper methods, which is set aside while app.py is imported """
+    tests_utils = sys.modules.pop('utils', None)
+    sys.path.insert(0, 'src/')
+    try:
+        return importlib.import_module('app')
+    finally:
+        sys.path.remove('src/')
+        if tests_utils is not None:
+            sys.modules['utils'] = tests_utils
+
+
+app = import_app()
+
+INSTRUMENTS = [[str(i), f'RIC{i}', str(i), f'ISIN{i}', 'XNYS']
+               for i in range(3)]
+
+
+def set_up_instruments():
+    """ Create a new dependency database holding committed instruments, and
+    return its connection """
+    helper.delete_local_database()
+    database = helper.create_db()
+    database.persist_batch('instruments', INSTRUMENTS)
+    database.commit_changes()
+    return database
+
+
+def test_get_shard():
+    """ a domain object must be sliced between the shards of a sharded run,
+    unless each of its jobs reads a slice of a table persisted by the run """
+    shared_args = {'shard_count': 3, 'shard_index': 1}
+
+    assert app.get_shard({}, {}, set()) is None
+    assert app.get_shard({'shard_count': 1, 'shard_index': 0}, {},
+                         set()) is None
+    assert app.get_shard(shared_args, {}, set()) == (1, 3)
+    assert app.get_shard(shared_args, {'source_table': 'swap_contracts'},
+                         {'swap_contracts'}) is None
+    assert app.get_shard(shared_args, {'source_table': 'swap_contracts'},
+                         {'instruments'}) == (1, 3)
+
+
+def test_is_provided_by_snapshot():
+    """ a domain object must be provided by a snapshot only where every
+    table it persists to already holds records """
+    set_up_instruments().close_connection()
+
+    assert app.is_provided_by_snapshot(
+        {'persisted_tables': ['instruments']}
+    )
+    assert not app.is_provided_by_snapshot(
+        {'persisted_tables': ['instruments', 'accounts']}
+    )
+    assert not app.is_provided_by_snapshot({'persisted_tables': []})
+    assert not app.is_provided_by_snapshot({})
+
+
+def test_snapshot_round_trip(tmp_path):
+    """ an imported snapshot must hold the records of the exported database,
+    and be left unchanged by records persisted after it is imported """
+    snapshot_path = str(tmp_path / 'snapshot.db')
+    database = set_up_instruments()
+    database.export_snapshot(snapshot_path)
+    database.close_connection()
+
+    helper.delete_local_database()
+    import_snapshot(snapshot_path)
+    database = helper.create_db()
+    assert [list(row) for row in database.retrieve('instruments')] == \
+        INSTRUMENTS
+    assert len(database.retrieve('exchanges')) > 0
+
+    database.persist_batch('instruments',
+                           [['3', 'RIC3', '3', 'ISIN3', 'XNYS']])
+    database.commit_changes()
+    database.close_connection()
+
+    snapshot = sqlite3.connect(snapshot_path)
+    try:
+        assert snapshot.execute(
+            "SELECT COUNT(*) FROM instruments"
+        ).fetchone()[0] == len(INSTRUMENTS)
+    finally:
+        snapshot.close()
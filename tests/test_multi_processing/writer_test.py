@@ -0,0 +1,186 @@
+import csv
+import json
+import pickle
+import queue
+import sys
+from multiprocessing.pool import ThreadPool
+
+import pytest
+
+sys.path.insert(0, 'src/')
+from multi_processing.writer import Writer
+from multi_processing.streaming_writer import StreamingWriter
+from filebuilders.csv_builder import CSVBuilder
+from filebuilders.jsonl_builder import JSONLBuilder
+from domainobjectfactories.record_batch import RecordBatch
+
+
+def get_csv_builder(output_directory='.'):
+    """ Return a CSV builder writing to the given directory """
+    return CSVBuilder(None, {
+        'output_file_type': 'CSV',
+        'file_name': 'test',
+        'output_directory': str(output_directory),
+        'max_objects_per_file': 10
+    })
+
+
+def get_write_jobs(created_records, max_records_per_file, file_builder=None):
+    """ Return the write jobs made by a writer from the given lists of
+    created records, including the job for any residual records """
+    created_record_queue = queue.Queue()
+    for records in created_records:
+        created_record_queue.put(records)
+    created_record_queue.put('terminate')
+
+    writer = Writer(created_record_queue, max_records_per_file,
+                    file_builder or get_csv_builder(), None)
+    writer.create_write_jobs(len(created_records) * 10)
+    if writer.number_of_records_not_yet_written_to_file:
+        writer.write_jobs.append(writer.get_write_job())
+    return writer.write_jobs
+
+
+def test_write_jobs_of_record_batches():
+    """ record batches must be split and combined into files of at most the
+    maximum number of records, in order, remaining RecordBatches """
+    created_records = [
+        RecordBatch({'id': list(range(start, start + 4))})
+        for start in range(0, 12, 4)
+    ] + [RecordBatch({})]
+
+    write_jobs = get_write_jobs(created_records, 5)
+
+    assert [job['file_number'] for job in write_jobs] == [0, 1, 2]
+    for job in write_jobs:
+        assert isinstance(job['records'], RecordBatch)
+    assert [job['records'].get_column('id') for job in write_jobs] == \
+        [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9], [10, 11]]
+
+
+def test_write_jobs_of_lists():
+    """ lists of records must be split and combined into files of at most
+    the maximum number of records, in order """
+    created_records = [[{'id': i} for i in range(start, start + 3)]
+                       for start in range(0, 9, 3)]
+
+    write_jobs = get_write_jobs(created_records, 4)
+
+    assert [[record['id'] for record in job['records']]
+            for job in write_jobs] == [[0, 1, 2, 3], [4, 5, 6, 7], [8]]
+
+
+def test_write_jobs_fix_file_layout(tmp_path):
+    """ the columns of every file must be fixed from the first records
+    before write jobs are made, such that a copy of the file builder
+    pickled for each write job writes the same columns """
+    created_records = [[{'id': 0}, {'id': 1, 'parent_id': 0}],
+                       [{'parent_id': 1, 'id': 2}, {'id': 3}]]
+    file_builder = get_csv_builder(tmp_path)
+
+    write_jobs = get_write_jobs(created_records, 2, file_builder)
+
+    assert file_builder.get_field_names() == ['id', 'parent_id']
+    for write_job in write_jobs:
+        pickle.loads(pickle.dumps(file_builder)).build(
+            write_job['file_number'], write_job['records']
+        )
+    for file_number in range(2):
+        with open(tmp_path / file_builder.get_numbered_file_name(file_number),
+                  newline='') as file:
+            assert next(csv.reader(file)) == ['id', 'parent_id']
+
+
+def test_write_jobs_when_resuming():
+    """ a resumed writer must discard the records already written, and
+    continue numbering files from the first file not yet written """
+    created_record_queue = queue.Queue()
+    for start in range(6, 12, 3):
+        created_record_queue.put([{'id': i} for i in range(start, start + 3)])
+    created_record_queue.put('terminate')
+
+    writer = Writer(created_record_queue, 3, get_csv_builder(), None,
+                    number_of_first_file_to_write=2,
+                    number_of_records_to_skip=4)
+    writer.create_write_jobs(10)
+    if writer.number_of_records_not_yet_written_to_file:
+        writer.write_jobs.append(writer.get_write_job())
+
+    assert [job['file_number'] for job in writer.write_jobs] == [2]
+    assert [record['id'] for record in writer.write_jobs[0]['records']] == \
+        [10, 11]
+
+
+class FailingFileBuilder:
+    """ File builder failing to write any file but the first """
+
+    def fix_file_layout(self, data):
+        pass
+
+    def build(self, file_number, records):
+        if file_number:
+            raise ValueError(f'file {file_number} failed')
+
+
+def test_failed_write_job_raises():
+    """ a failed write job must raise its exception from the writer, once
+    every created record has been taken from the queue """
+    created_record_queue = queue.Queue()
+    for start in range(0, 12, 3):
+        created_record_queue.put([{'id': i} for i in range(start, start + 3)])
+    created_record_queue.put('terminate')
+
+    with ThreadPool(1) as write_pool:
+        writer = Writer(created_record_queue, 3, FailingFileBuilder(),
+                        write_pool)
+        with pytest.raises(ValueError, match='file 1 failed'):
+            writer.parent_process(1)
+
+    assert created_record_queue.empty()
+
+
+class RecordedProgress:
+    """ Progress of a domain object, keeping the files recorded as written """
+
+    def __init__(self):
+        self.files_written = {}
+
+    def record_files_written(self, file_record_counts):
+        self.files_written.update(file_record_counts)
+
+
+def test_streaming_writer_rolls_over_files(tmp_path):
+    """ a streaming writer must write records to files as they are taken
+    from the queue, skipping those already written, rolling over files once
+    full and recording each file once written """
+    created_record_queue = queue.Queue()
+    for start in range(0, 30, 10):
+        created_record_queue.put(
+            RecordBatch({'id': list(range(start, start + 10))})
+        )
+    created_record_queue.put('terminate')
+
+    file_builder = JSONLBuilder(None, {
+        'output_file_type': 'JSONL', 'file_name': 'test',
+        'output_directory': str(tmp_path), 'max_objects_per_file': 100,
+        'max_bytes_per_file': 50
+    })
+    progress = RecordedProgress()
+
+    writer = StreamingWriter(created_record_queue, 100, file_builder, None,
+                             progress=progress,
+                             number_of_first_file_to_write=1,
+                             number_of_records_to_skip=5)
+    writer.parent_process(1)
+
+    number_of_files = len(progress.files_written)
+    assert number_of_files > 1
+    assert list(progress.files_written) == list(range(1, number_of_files + 1))
+    assert sum(progress.files_written.values()) == 25
+    ids = []
+    for file_number, number_of_records in progress.files_written.items():
+        lines = (tmp_path / file_builder.get_numbered_file_name(file_number)) \
+            .read_text().split('\n')
+        assert len(lines) == number_of_records
+        ids += [json.loads(line)['id'] for line in lines]
+    assert ids == list(range(5, 30))
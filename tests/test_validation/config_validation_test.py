@@ -232,3 +232,270 @@ def test_google_drive_flag_failure():
 
     success = validator.validate(configurations).check_success()
     assert success is False
+
+
+def get_success_for_compression(compression):
+    """ helper method that returns the validation result for the default
+    config with the domain object compressed as given """
+    changed_factory_definitions = copy.deepcopy(default_factory_definitions)
+    changed_factory_definitions[0]['instrument']['compression'] = compression
+    configurations = configuration.Configuration(
+        {
+            "factory_definitions": changed_factory_definitions,
+            "shared_args": default_shared_args,
+            "dev_file_builder_args": default_dev_file_builder_args,
+            "dev_factory_args": default_dev_factory_args
+        }
+    )
+
+    return validator.validate(configurations).check_success()
+
+
+def test_max_bytes_per_file_success():
+    """ Ensure a positive size for a text file type, or no size, succeeds """
+    for file_type, max_bytes_per_file in (('CSV', 1), ('JSONL', 2 ** 30),
+                                          ('PARQUET', None)):
+        assert not validator.validate_max_bytes_per_file({
+            'instrument': {'output_file_type': file_type,
+                           'max_bytes_per_file': max_bytes_per_file}
+        })
+
+
+def test_max_bytes_per_file_failure():
+    """ Ensure a size other than a positive integer, or a size for a file
+    type which cannot be limited in size, fails """
+    for file_type, max_bytes_per_file in (('CSV', 0), ('CSV', -1),
+                                          ('CSV', 1.5), ('CSV', '100'),
+                                          ('CSV', True), ('PARQUET', 100),
+                                          ('ARROW', 100)):
+        assert validator.validate_max_bytes_per_file({
+            'instrument': {'output_file_type': file_type,
+                           'max_bytes_per_file': max_bytes_per_file}
+        })
+
+
+def test_compression_success():
+    """ Ensure gzip compression, which needs no further package, succeeds """
+    assert get_success_for_compression('gzip') is True
+
+
+def test_compression_failure():
+    """ Ensure an unsupported compression fails """
+    for compression in ('zip', 'GZIP', 1):
+        assert get_success_for_compression(compression) is False
+
+
+def test_compression_of_internally_compressed_file_types():
+    """ Ensure a compression is validated against those supported by file
+    types which compress files themselves, whose packages are not needed """
+    for file_type, compression, valid in (('PARQUET', 'gzip', True),
+                                          ('PARQUET', 'zstd', True),
+                                          ('ARROW', 'lz4', True),
+                                          ('ARROW', 'gzip', False)):
+        errors = validator.validate_compression({
+            'instrument': {'output_file_type': file_type,
+                           'compression': compression}
+        })
+        assert (not errors) is valid
+
+
+def test_json_serializer_success():
+    """ Ensure the standard library serialiser, always installed, and no
+    serialiser succeed """
+    for json_serializer in ('json', 'ujson', None):
+        assert not validator.validate_json_serializer(
+            {'instrument': {'json_serializer': json_serializer}}
+        )
+
+
+def test_json_serializer_failure():
+    """ Ensure an unsupported serialiser fails """
+    for json_serializer in ('simplejson', 'JSON', 1):
+        assert validator.validate_json_serializer(
+            {'instrument': {'json_serializer': json_serializer}}
+        )
+
+
+def get_success_for_changed_shared_arg(shared_arg, value):
+    """ helper method that returns the validation result for the default
+    config with a single shared argument set to the given value """
+    changed_shared_args = copy.deepcopy(default_shared_args)
+    changed_shared_args[shared_arg] = value
+    configurations = configuration.Configuration(
+        {
+            "factory_definitions": default_factory_definitions,
+            "shared_args": changed_shared_args,
+            "dev_file_builder_args": default_dev_file_builder_args,
+            "dev_factory_args": default_dev_factory_args
+        }
+    )
+
+    return validator.validate(configurations).check_success()
+
+
+def test_created_record_transport_success():
+    """ Ensure each supported created record transport succeeds """
+    for transport in ('direct', 'manager'):
+        assert get_success_for_changed_shared_arg(
+            'created_record_transport', transport
+        ) is True
+
+
+def test_created_record_transport_failure():
+    """ Ensure an unsupported created record transport fails """
+    assert get_success_for_changed_shared_arg(
+        'created_record_transport', 'carrier_pigeon'
+    ) is False
+
+
+def test_execution_mode_success():
+    """ Ensure each supported execution mode succeeds """
+    for execution_mode in ('pipelined', 'fused'):
+        assert get_success_for_changed_shared_arg(
+            'execution_mode', execution_mode
+        ) is True
+
+
+def test_execution_mode_failure():
+    """ Ensure an unsupported execution mode fails """
+    assert get_success_for_changed_shared_arg(
+        'execution_mode', 'sequential'
+    ) is False
+
+
+def test_number_of_concurrent_domain_objects_success():
+    """ Ensure a positive number of concurrent domain objects succeeds """
+    assert get_success_for_changed_shared_arg(
+        'number_of_concurrent_domain_objects', 2
+    ) is True
+
+
+def test_number_of_concurrent_domain_objects_failure():
+    """ Ensure a zero or non-integer number of concurrent domain objects
+    fails """
+    for number_of_concurrent_domain_objects in (0, -1, 1.5, '2'):
+        assert get_success_for_changed_shared_arg(
+            'number_of_concurrent_domain_objects',
+            number_of_concurrent_domain_objects
+        ) is False
+
+
+def test_number_of_records_per_insert_success():
+    """ Ensure a positive number of records per insert succeeds """
+    assert get_success_for_changed_shared_arg(
+        'number_of_records_per_insert', 5000
+    ) is True
+
+
+def test_number_of_records_per_insert_failure():
+    """ Ensure a zero or non-integer number of records per insert fails """
+    for number_of_records_per_insert in (0, 2.5, '5000'):
+        assert get_success_for_changed_shared_arg(
+            'number_of_records_per_insert', number_of_records_per_insert
+        ) is False
+
+
+def test_number_of_records_per_chunk_success():
+    """ Ensure a positive number of records per chunk succeeds """
+    assert get_success_for_changed_shared_arg(
+        'number_of_records_per_chunk', 1000
+    ) is True
+
+
+def test_number_of_records_per_chunk_failure():
+    """ Ensure a zero or non-integer number of records per chunk fails """
+    for number_of_records_per_chunk in (0, 2.5, '1000'):
+        assert get_success_for_changed_shared_arg(
+            'number_of_records_per_chunk', number_of_records_per_chunk
+        ) is False
+
+
+def test_number_of_upload_threads_success():
+    """ Ensure a positive number of upload threads succeeds """
+    assert get_success_for_changed_shared_arg(
+        'number_of_upload_threads', 8
+    ) is True
+
+
+def test_number_of_upload_threads_failure():
+    """ Ensure a zero or non-integer number of upload threads fails """
+    for number_of_upload_threads in (0, 2.5, '8'):
+        assert get_success_for_changed_shared_arg(
+            'number_of_upload_threads', number_of_upload_threads
+        ) is False
+
+
+def test_max_records_in_flight_success():
+    """ Ensure a positive maximum number of records in flight succeeds """
+    assert get_success_for_changed_shared_arg(
+        'max_records_in_flight', 100000
+    ) is True
+
+
+def test_max_records_in_flight_failure():
+    """ Ensure a zero or non-integer maximum number of records in flight
+    fails """
+    for max_records_in_flight in (0, -1, '100000'):
+        assert get_success_for_changed_shared_arg(
+            'max_records_in_flight', max_records_in_flight
+        ) is False
+
+
+def test_seed_success():
+    """ Ensure an integer seed succeeds """
+    assert get_success_for_changed_shared_arg('seed', 42) is True
+
+
+def test_seed_failure():
+    """ Ensure a non-integer seed fails """
+    for seed in (4.2, '42', True):
+        assert get_success_for_changed_shared_arg('seed', seed) is False
+
+
+def get_success_for_shard(shard_count, shard_index):
+    """ helper method that returns the validation result for the default
+    config with the given shard count and index, omitting either if None """
+    changed_shared_args = copy.deepcopy(default_shared_args)
+    for shared_arg, value in (('shard_count', shard_count),
+                              ('shard_index', shard_index)):
+        if value is not None:
+            changed_shared_args[shared_arg] = value
+    configurations = configuration.Configuration(
+        {
+            "factory_definitions": default_factory_definitions,
+            "shared_args": changed_shared_args,
+            "dev_file_builder_args": default_dev_file_builder_args,
+            "dev_factory_args": default_dev_factory_args
+        }
+    )
+
+    return validator.validate(configurations).check_success()
+
+
+def test_shard_success():
+    """ Ensure a shard index within the shard count succeeds """
+    for shard_count, shard_index in ((1, 0), (4, 0), (4, 3), (4, None)):
+        assert get_success_for_shard(shard_count, shard_index) is True
+
+
+def test_shard_failure():
+    """ Ensure a non-positive shard count, or a shard index outside of it or
+    without it, fails """
+    for shard_count, shard_index in ((0, 0), (4, 4), (4, -1), (2.0, 0),
+                                     (None, 0), (4, '1')):
+        assert get_success_for_shard(shard_count, shard_index) is False
+
+
+def test_persistence_mode_success():
+    """ Ensure each supported persistence mode succeeds """
+    for persistence_mode in ('direct', 'service'):
+        assert get_success_for_changed_shared_arg(
+            'persistence_mode', persistence_mode
+        ) is True
+
+
+def test_persistence_mode_failure():
+    """ Ensure an unsupported persistence mode fails """
+    assert get_success_for_changed_shared_arg(
+        'persistence_mode', 'batched'
+    ) is False
@@ -1,6 +1,5 @@
 import os
 import sys
-from multiprocessing import Lock
 
 import ujson
 
@@ -16,8 +15,10 @@ from domainobjectfactories import back_office_position_factory, \
 
 # Helper Methods
 def delete_local_database():
-    if os.path.exists('dependencies.db'):
-        os.remove('dependencies.db')
+    for file_name in ('dependencies.db', 'dependencies.db-wal',
+                      'dependencies.db-shm'):
+        if os.path.exists(file_name):
+            os.remove(file_name)
 
 
 def create_db():
@@ -65,7 +66,7 @@ def create_front_office_position(amount=1):
 
 def create_instrument(amount=1):
     obj = instrument_factory.InstrumentFactory(None, None)
-    return obj.create(amount, 0, Lock())
+    return obj.create(amount, 0)
 
 
 def create_trade(amount=1):